@@ -40,20 +40,33 @@ class ExtractionTool(storage_media_tool.StorageMediaTool):
         input_reader=input_reader, output_writer=output_writer)
     self._buffer_size = 0
     self._enable_profiling = False
+    self._event_object_batch_flush_interval = 0
+    self._event_object_batch_size = 0
+    self._file_range_size = 0
     self._filter_object = None
+    self._hasher_file_size_limit = 0
     self._hasher_names_string = None
+    self._hasher_read_size = 0
+    self._maximum_queued_size = 0
+    self._maximum_total_queued_size = 0
     self._mount_path = None
+    self._number_of_storage_writers = 1
     self._old_preprocess = False
     self._operating_system = None
     self._output_module = None
     self._parser_filter_string = None
+    self._parser_timeout = 0
     self._process_archive_files = False
     self._profiling_sample_rate = self._DEFAULT_PROFILING_SAMPLE_RATE
     self._profiling_type = u'all'
     self._queue_size = self._DEFAULT_QUEUE_SIZE
+    self._schedule_largest_first = False
     self._single_process_mode = False
+    self._storage_random_access = False
     self._storage_serializer_format = definitions.SERIALIZER_FORMAT_PROTOBUF
     self._text_prepend = None
+    self._use_shared_memory_queue = False
+    self._worker_serialization = False
 
     self.list_hashers = False
     self.list_parsers_and_plugins = False
@@ -92,20 +105,36 @@ class ExtractionTool(storage_media_tool.StorageMediaTool):
     Raises:
       BadConfigOption: if the options are invalid.
     """
-    self._buffer_size = getattr(options, u'buffer_size', 0)
-    if self._buffer_size:
-      # TODO: turn this into a generic function that supports more size
-      # suffixes both MB and MiB and also that does not allow m as a valid
-      # indicator for MiB since m represents milli not Mega.
-      try:
-        if self._buffer_size[-1].lower() == u'm':
-          self._buffer_size = int(self._buffer_size[:-1], 10)
-          self._buffer_size *= self._BYTES_IN_A_MIB
-        else:
-          self._buffer_size = int(self._buffer_size, 10)
-      except ValueError:
-        raise errors.BadConfigOption(
-            u'Invalid buffer size: {0:s}.'.format(self._buffer_size))
+    self._buffer_size = self._ParseSize(
+        getattr(options, u'buffer_size', 0), u'buffer size')
+
+    self._event_object_batch_size = getattr(
+        options, u'event_object_batch_size', 0)
+    if self._event_object_batch_size < 0:
+      raise errors.BadConfigOption(
+          u'Invalid event object batch size: {0:d}.'.format(
+              self._event_object_batch_size))
+
+    self._event_object_batch_flush_interval = getattr(
+        options, u'event_object_batch_flush_interval', 0)
+    if self._event_object_batch_flush_interval < 0:
+      raise errors.BadConfigOption(
+          u'Invalid event object batch flush interval: {0:f}.'.format(
+              self._event_object_batch_flush_interval))
+
+    self._file_range_size = self._ParseSize(
+        getattr(options, u'file_range_size', 0), u'file range size')
+
+    self._hasher_file_size_limit = self._ParseSize(
+        getattr(options, u'hasher_file_size_limit', 0),
+        u'hasher file size limit')
+    self._hasher_read_size = self._ParseSize(
+        getattr(options, u'hasher_read_size', 0), u'hasher read size')
+
+    self._parser_timeout = getattr(options, u'parser_timeout', 0)
+    if self._parser_timeout < 0:
+      raise errors.BadConfigOption(
+          u'Invalid parser timeout: {0:d}.'.format(self._parser_timeout))
 
     queue_size = getattr(options, u'queue_size', None)
     if queue_size:
@@ -115,6 +144,25 @@ class ExtractionTool(storage_media_tool.StorageMediaTool):
         raise errors.BadConfigOption(
             u'Invalid queue size: {0:s}.'.format(queue_size))
 
+    self._maximum_queued_size = self._ParseSize(
+        getattr(options, u'queue_memory_budget', 0), u'queue memory budget')
+    self._maximum_total_queued_size = self._ParseSize(
+        getattr(options, u'queues_memory_budget', 0),
+        u'queues memory budget')
+
+    self._schedule_largest_first = getattr(
+        options, u'schedule_largest_first', False)
+
+    self._use_shared_memory_queue = getattr(
+        options, u'shared_memory_queue', False)
+
+    # The size of the shared memory queue is bounded by its ring buffer,
+    # which is sized by the queue memory budget.
+    if self._use_shared_memory_queue and self._maximum_total_queued_size:
+      raise errors.BadConfigOption(
+          u'Queues memory budget not supported by the shared memory queue, '
+          u'use the queue memory budget instead.')
+
   def _ParseProfilingOptions(self, options):
     """Parses the profiling options.
 
@@ -137,6 +185,37 @@ class ExtractionTool(storage_media_tool.StorageMediaTool):
 
     self._profiling_type = getattr(options, u'profiling_type', u'all')
 
+  def _ParseSize(self, size, description):
+    """Parses a size option value.
+
+    Args:
+      size: string containing the size in bytes, or in MiB if the size
+            has an "m" suffix.
+      description: string containing a description of the option for
+                   the error message.
+
+    Returns:
+      The size in bytes.
+
+    Raises:
+      BadConfigOption: if the size is invalid.
+    """
+    if not size:
+      return 0
+
+    if isinstance(size, (int, long)):
+      return size
+
+    # TODO: support more size suffixes both MB and MiB and also do not allow
+    # m as a valid indicator for MiB since m represents milli not Mega.
+    try:
+      if size[-1].lower() == u'm':
+        return int(size[:-1], 10) * self._BYTES_IN_A_MIB
+      return int(size, 10)
+    except ValueError:
+      raise errors.BadConfigOption(
+          u'Invalid {0:s}: {1:s}.'.format(description, size))
+
   def _ParseStorageOptions(self, options):
     """Parses the storage options.
 
@@ -154,6 +233,19 @@ class ExtractionTool(storage_media_tool.StorageMediaTool):
               serializer_format))
     self._storage_serializer_format = serializer_format
 
+    self._storage_random_access = getattr(
+        options, u'storage_random_access', False)
+
+    number_of_storage_writers = getattr(options, u'storage_writers', 1)
+    if number_of_storage_writers < 1:
+      raise errors.BadConfigOption(
+          u'Invalid number of storage writers: {0:d}.'.format(
+              number_of_storage_writers))
+    self._number_of_storage_writers = number_of_storage_writers
+
+    self._worker_serialization = getattr(
+        options, u'worker_serialization', False)
+
   def AddExtractionOptions(self, argument_group):
     """Adds the extraction options to the argument group.
 
@@ -225,12 +317,93 @@ class ExtractionTool(storage_media_tool.StorageMediaTool):
         action=u'store', default=0,
         help=u'The buffer size for the output (defaults to 196MiB).')
 
+    argument_group.add_argument(
+        u'--event_batch_flush_interval', u'--event-batch-flush-interval',
+        dest=u'event_object_batch_flush_interval', action=u'store',
+        type=float, default=0, metavar=u'SECONDS', help=(
+            u'The number of seconds after which a worker pushes a partial '
+            u'batch of events onto the event queue. Only applies to multi '
+            u'process mode (defaults to 1 second).'))
+
+    argument_group.add_argument(
+        u'--event_batch_size', u'--event-batch-size',
+        dest=u'event_object_batch_size', action=u'store', type=int,
+        default=0, metavar=u'NUMBER', help=(
+            u'The maximum number of events a worker pushes onto the event '
+            u'queue at once, where 1 disables batching. Only applies to '
+            u'multi process mode (defaults to 100).'))
+
+    argument_group.add_argument(
+        u'--file_range_size', u'--file-range-size', dest=u'file_range_size',
+        action=u'store', default=0, metavar=u'SIZE', help=(
+            u'Split files that are larger than SIZE, in bytes or in MiB with '
+            u'a "m" suffix, into ranges that are parsed in parallel, if '
+            u'the parser supports splitting. Only applies to multi process '
+            u'mode (defaults to not splitting files).'))
+
+    argument_group.add_argument(
+        u'--hasher_file_size_limit', u'--hasher-file-size-limit',
+        dest=u'hasher_file_size_limit', action=u'store', default=0,
+        metavar=u'SIZE', help=(
+            u'The maximum size of a file that is hashed in bytes or in MiB '
+            u'with a "m" suffix. Larger files are not hashed (defaults to '
+            u'no limit).'))
+
+    argument_group.add_argument(
+        u'--hasher_read_size', u'--hasher-read-size',
+        dest=u'hasher_read_size', action=u'store', default=0,
+        metavar=u'SIZE', help=(
+            u'The number of bytes read per read operation when hashing '
+            u'a file in bytes or in MiB with a "m" suffix. The hashers are '
+            u'updated in parallel threads per block of data (defaults to '
+            u'1MiB).'))
+
+    argument_group.add_argument(
+        u'--parser_timeout', u'--parser-timeout', dest=u'parser_timeout',
+        action=u'store', type=int, default=0, metavar=u'SECONDS', help=(
+            u'The maximum number of seconds a parser is allowed to parse '
+            u'a file, after which the parsing of the file is aborted. '
+            u'The aborted and slow files are reported in the storage file '
+            u'(defaults to no limit).'))
+
     argument_group.add_argument(
         u'--queue_size', u'--queue-size', dest=u'queue_size', action=u'store',
         default=0, help=(
             u'The maximum number of queued items per worker '
             u'(defaults to {0:d})').format(self._DEFAULT_QUEUE_SIZE))
 
+    argument_group.add_argument(
+        u'--queue_memory_budget', u'--queue-memory-budget',
+        dest=u'queue_memory_budget', action=u'store', default=0,
+        metavar=u'SIZE', help=(
+            u'The maximum size of the items queued per queue in bytes or in '
+            u'MiB with a "m" suffix. Processes that produce items wait while '
+            u'a queue exceeds its budget (defaults to no limit).'))
+
+    argument_group.add_argument(
+        u'--queues_memory_budget', u'--queues-memory-budget',
+        dest=u'queues_memory_budget', action=u'store', default=0,
+        metavar=u'SIZE', help=(
+            u'The maximum size of the items queued on all the queues in '
+            u'bytes or in MiB with a "m" suffix (defaults to no limit).'))
+
+    argument_group.add_argument(
+        u'--schedule_largest_first', u'--schedule-largest-first',
+        dest=u'schedule_largest_first', action=u'store_true', default=False,
+        help=(
+            u'Process the files with the largest estimated processing cost '
+            u'first, where the cost is based on the size and type of '
+            u'the file. Only applies to multi process mode.'))
+
+    argument_group.add_argument(
+        u'--shared_memory_queue', u'--shared-memory-queue',
+        dest=u'shared_memory_queue', action=u'store_true', default=False,
+        help=(
+            u'Pass the path specifications and events between processes '
+            u'using a shared memory ring buffer instead of a pipe. Only '
+            u'applies to multi process mode and is not supported on '
+            u'Windows.'))
+
   def AddProfilingOptions(self, argument_group):
     """Adds the profiling options to the argument group.
 
@@ -276,6 +449,30 @@ class ExtractionTool(storage_media_tool.StorageMediaTool):
             u'objects. This parameter can be used to change that behavior. '
             u'The choices are "proto" and "json".'))
 
+    argument_group.add_argument(
+        u'--random_access', u'--random-access', dest=u'storage_random_access',
+        action=u'store_true', default=False, help=(
+            u'Store the events without compression. This increases the size '
+            u'of the storage file but allows to read tagged and grouped '
+            u'events directly instead of decompressing all events that '
+            u'precede them.'))
+
+    argument_group.add_argument(
+        u'--storage_writers', u'--storage-writers', dest=u'storage_writers',
+        action=u'store', type=int, default=1, metavar=u'NUMBER', help=(
+            u'The number of storage writer processes [defaults to 1]. If '
+            u'more than 1 every storage writer writes its stores to a '
+            u'separate part file, which are merged into the storage file '
+            u'when processing has completed. Only applies to multi process '
+            u'mode.'))
+
+    argument_group.add_argument(
+        u'--worker_serialization', u'--worker-serialization',
+        dest=u'worker_serialization', action=u'store_true', default=False,
+        help=(
+            u'Serialize the events in the extraction workers instead of in '
+            u'the storage writer. Only applies to multi process mode.'))
+
   def ParseOptions(self, options):
     """Parses tool specific options.
 
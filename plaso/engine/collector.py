@@ -2,6 +2,7 @@
 """Generic collector that supports both file system and image files."""
 
 import hashlib
+import heapq
 import logging
 
 from dfvfs.helpers import file_system_searcher
@@ -87,7 +88,7 @@ class Collector(queue.ItemQueueProducer):
       return
 
     if file_entry.IsFile():
-      self.ProduceItem(path_spec)
+      self._fs_collector.CollectFileEntry(file_entry)
 
     else:
       self._ProcessFileSystem(path_spec, find_specs=find_specs)
@@ -134,6 +135,17 @@ class Collector(queue.ItemQueueProducer):
     """
     self._fs_collector.SetCollectDirectoryMetadata(collect_directory_metadata)
 
+  def SetFileRangeSize(self, file_range_size):
+    """Sets the file range size.
+
+    Args:
+      file_range_size: the size of the ranges of a file that are produced
+                       separately. Files that are larger are split into
+                       ranges if a parser supports splitting. A value of 0
+                       represents files are not split.
+    """
+    self._fs_collector.SetFileRangeSize(file_range_size)
+
   def SetFilter(self, filter_find_specs):
     """Sets the collection filter find specifications.
 
@@ -143,6 +155,17 @@ class Collector(queue.ItemQueueProducer):
     """
     self._filter_find_specs = filter_find_specs
 
+  def SetScheduleLargestFirst(self, schedule_largest_first):
+    """Sets the schedule largest first flag.
+
+    Args:
+      schedule_largest_first: Boolean value to indicate the path
+                              specifications of the files with the largest
+                              estimated processing cost should be produced
+                              first.
+    """
+    self._fs_collector.SetScheduleLargestFirst(schedule_largest_first)
+
   def SignalAbort(self):
     """Signals the collector to abort."""
     self._fs_collector.SignalAbort()
@@ -150,7 +173,43 @@ class Collector(queue.ItemQueueProducer):
 
 
 class FileSystemCollector(queue.ItemQueueProducer):
-  """Class that implements a file system collector object."""
+  """Class that implements a file system collector object.
+
+  By default the path specifications are produced in the order the file
+  entries are found. If schedule largest first is set the path specifications
+  are ordered by the estimated processing cost of the file entry, which is
+  the size of the file weighted by the relative cost of the parsers that are
+  expected to process it. This prevents a few large files that are found
+  late from determining the duration of the processing.
+
+  If a file range size is set, files that are larger are produced as path
+  specification ranges (instances of PathSpecRange) instead, so that parsers
+  that support splitting can parse the ranges of a file in parallel.
+  """
+
+  # The relative processing cost per file name, which is matched first,
+  # and per file name extension. The names and extensions are lower case.
+  _COST_WEIGHTS_PER_NAME = {
+      u'$mft': 2.0,
+      u'$usnjrnl': 2.0,
+      u'history': 3.0,
+      u'ntuser.dat': 3.0,
+      u'sam': 3.0,
+      u'security': 3.0,
+      u'software': 3.0,
+      u'system': 3.0,
+      u'usrclass.dat': 3.0}
+
+  _COST_WEIGHTS_PER_EXTENSION = {
+      u'.db': 3.0,
+      u'.evt': 2.0,
+      u'.evtx': 4.0,
+      u'.plist': 2.0,
+      u'.sqlite': 3.0}
+
+  # The maximum number of path specifications that are ordered before
+  # the ones with the largest estimated cost are produced.
+  _MAXIMUM_NUMBER_OF_SCHEDULED_PATH_SPECS = 100000
 
   def __init__(self, path_spec_queue):
     """Initializes the collector object.
@@ -168,7 +227,11 @@ class FileSystemCollector(queue.ItemQueueProducer):
     super(FileSystemCollector, self).__init__(path_spec_queue)
     self._collect_directory_metadata = True
     self._duplicate_file_check = False
+    self._file_range_size = 0
     self._hashlist = {}
+    self._schedule_largest_first = False
+    self._scheduled_path_specs = []
+    self._scheduled_sequence_number = 0
 
     self.number_of_file_entries = 0
 
@@ -211,6 +274,130 @@ class FileSystemCollector(queue.ItemQueueProducer):
 
     return ret_hash.hexdigest()
 
+  def _EstimateCost(self, file_entry):
+    """Estimates the processing cost of a file entry.
+
+    Args:
+      file_entry: the file entry (instance of dfvfs.FileEntry).
+
+    Returns:
+      A floating point value of the estimated cost, which is the size
+      of the file weighted by the relative cost of the parsers.
+    """
+    if not file_entry.IsFile():
+      return 0.0
+
+    stat_object = file_entry.GetStat()
+    size = getattr(stat_object, u'size', None) or 0
+
+    name = (file_entry.name or u'').lower()
+    weight = self._COST_WEIGHTS_PER_NAME.get(name, None)
+    if weight is None:
+      _, _, extension = name.rpartition(u'.')
+      weight = self._COST_WEIGHTS_PER_EXTENSION.get(
+          u'.{0:s}'.format(extension), 1.0)
+
+    return size * weight
+
+  def _GetFileRanges(self, file_entry):
+    """Determines the ranges of a file entry.
+
+    Args:
+      file_entry: the file entry (instance of dfvfs.FileEntry).
+
+    Returns:
+      A list of tuples of the offset and size of the ranges or None if
+      the file entry is not split.
+    """
+    if not self._file_range_size or not file_entry.IsFile():
+      return
+
+    try:
+      stat_object = file_entry.GetStat()
+    except (dfvfs_errors.AccessError, dfvfs_errors.BackEndError) as exception:
+      logging.warning(
+          u'Unable to determine size of file: {0:s} with error: {1:s}'.format(
+              file_entry.path_spec.comparable.replace(u'\n', u';'),
+              exception))
+      return
+
+    size = getattr(stat_object, u'size', None) or 0
+    if size <= self._file_range_size:
+      return
+
+    file_ranges = []
+    for range_offset in range(0, size, self._file_range_size):
+      range_size = min(self._file_range_size, size - range_offset)
+      file_ranges.append((range_offset, range_size))
+
+    return file_ranges
+
+  def _ProduceFileEntry(self, file_entry):
+    """Produces the path specification of a file entry.
+
+    If schedule largest first is set the path specification is added to
+    the scheduled path specifications instead.
+
+    Args:
+      file_entry: the file entry (instance of dfvfs.FileEntry).
+    """
+    self.number_of_file_entries += 1
+
+    file_ranges = self._GetFileRanges(file_entry)
+    if file_ranges:
+      items = [
+          PathSpecRange(file_entry.path_spec, range_offset, range_size)
+          for range_offset, range_size in file_ranges]
+    else:
+      items = [file_entry.path_spec]
+
+    if not self._schedule_largest_first:
+      self.ProduceItems(items)
+      return
+
+    try:
+      cost = self._EstimateCost(file_entry)
+    except (dfvfs_errors.AccessError, dfvfs_errors.BackEndError) as exception:
+      logging.warning(
+          u'Unable to estimate cost of file: {0:s} with error: {1:s}'.format(
+              file_entry.path_spec.comparable.replace(u'\n', u';'),
+              exception))
+      cost = 0.0
+
+    # The cost of a file that is split is divided over its ranges.
+    cost /= len(items)
+
+    for item in items:
+      # The sequence number keeps the order of path specifications with
+      # the same cost and prevents the path specifications being compared.
+      heapq.heappush(self._scheduled_path_specs, (
+          -cost, self._scheduled_sequence_number, item))
+      self._scheduled_sequence_number += 1
+
+    if (len(self._scheduled_path_specs) >
+        self._MAXIMUM_NUMBER_OF_SCHEDULED_PATH_SPECS):
+      self._ProduceScheduledPathSpecs(
+          maximum_number_of_remaining_path_specs=(
+              self._MAXIMUM_NUMBER_OF_SCHEDULED_PATH_SPECS / 2))
+
+  def _ProduceScheduledPathSpecs(
+      self, maximum_number_of_remaining_path_specs=0):
+    """Produces the scheduled path specifications largest cost first.
+
+    Args:
+      maximum_number_of_remaining_path_specs: optional maximum number of
+                                              scheduled path specifications
+                                              that remain after producing.
+                                              The default is 0.
+    """
+    while (len(self._scheduled_path_specs) >
+           maximum_number_of_remaining_path_specs):
+      if self._abort:
+        return
+
+      _, _, path_spec = heapq.heappop(self._scheduled_path_specs)
+      self.ProduceItem(path_spec)
+
   def _ProcessDirectory(self, file_entry):
     """Processes a directory and extract its metadata if necessary."""
     # Need to do a breadth-first search otherwise we'll hit the Python
@@ -241,8 +428,7 @@ class FileSystemCollector(queue.ItemQueueProducer):
         # This check is here to improve performance by not producing
         # path specifications that don't get processed.
         if self._collect_directory_metadata:
-          self.ProduceItem(sub_file_entry.path_spec)
-          self.number_of_file_entries += 1
+          self._ProduceFileEntry(sub_file_entry)
 
         sub_directories.append(sub_file_entry)
 
@@ -261,8 +447,7 @@ class FileSystemCollector(queue.ItemQueueProducer):
 
           self._hashlist.setdefault(inode, []).append(hash_value)
 
-        self.ProduceItem(sub_file_entry.path_spec)
-        self.number_of_file_entries += 1
+        self._ProduceFileEntry(sub_file_entry)
 
     for sub_file_entry in sub_directories:
       if self._abort:
@@ -289,14 +474,31 @@ class FileSystemCollector(queue.ItemQueueProducer):
         if self._abort:
           return
 
-        self.ProduceItem(path_spec)
-        self.number_of_file_entries += 1
+        if not self._file_range_size and not self._schedule_largest_first:
+          self.ProduceItem(path_spec)
+          self.number_of_file_entries += 1
+          continue
+
+        file_entry = file_system.GetFileEntryByPathSpec(path_spec)
+        if file_entry:
+          self._ProduceFileEntry(file_entry)
 
     else:
       file_entry = file_system.GetFileEntryByPathSpec(path_spec)
 
       self._ProcessDirectory(file_entry)
 
+    self._ProduceScheduledPathSpecs()
+
+  def CollectFileEntry(self, file_entry):
+    """Collects a single file entry.
+
+    Args:
+      file_entry: the file entry (instance of dfvfs.FileEntry).
+    """
+    self._ProduceFileEntry(file_entry)
+    self._ProduceScheduledPathSpecs()
+
   def SetCollectDirectoryMetadata(self, collect_directory_metadata):
     """Sets the collect directory metadata flag.
 
@@ -305,3 +507,48 @@ class FileSystemCollector(queue.ItemQueueProducer):
                                   directory metadata.
     """
     self._collect_directory_metadata = collect_directory_metadata
+
+  def SetFileRangeSize(self, file_range_size):
+    """Sets the file range size.
+
+    Args:
+      file_range_size: the size of the ranges of a file that are produced
+                       separately. Files that are larger are split into
+                       ranges if a parser supports splitting. A value of 0
+                       represents files are not split.
+    """
+    self._file_range_size = file_range_size
+
+  def SetScheduleLargestFirst(self, schedule_largest_first):
+    """Sets the schedule largest first flag.
+
+    Args:
+      schedule_largest_first: Boolean value to indicate the path
+                              specifications of the files with the largest
+                              estimated processing cost should be produced
+                              first.
+    """
+    self._schedule_largest_first = schedule_largest_first
+
+
+class PathSpecRange(object):
+  """Class that defines a range of the file entry of a path specification.
+
+  Attributes:
+    path_spec: the path specification (instance of dfvfs.PathSpec).
+    range_offset: the offset of the range relative to the start of the file.
+    range_size: the size of the range.
+  """
+
+  def __init__(self, path_spec, range_offset, range_size):
+    """Initializes the path specification range object.
+
+    Args:
+      path_spec: the path specification (instance of dfvfs.PathSpec).
+      range_offset: the offset of the range relative to the start of the file.
+      range_size: the size of the range.
+    """
+    super(PathSpecRange, self).__init__()
+    self.path_spec = path_spec
+    self.range_offset = range_offset
+    self.range_size = range_size
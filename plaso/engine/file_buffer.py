@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""The file header and tail buffer."""
+
+import os
+
+
+class FileHeaderAndTailBuffer(object):
+  """Class that buffers the header and tail data of a file.
+
+  The buffer reads the header and tail data of a file once, after which
+  the data is shared by the analysis stages of the extraction worker, such
+  as the signature scanners, via the file-like object interface of the
+  buffer. Reads outside the buffered data are passed to the file-like
+  object of the file.
+
+  When a hashing engine is provided the entire file is read in a single
+  sequential pass, which both hashes the data and fills the buffer.
+  """
+
+  DEFAULT_HEADER_SIZE = 65536
+  DEFAULT_READ_SIZE = 65536
+  DEFAULT_TAIL_SIZE = 65536
+
+  def __init__(
+      self, file_object, header_size=DEFAULT_HEADER_SIZE,
+      read_size=DEFAULT_READ_SIZE, tail_size=DEFAULT_TAIL_SIZE):
+    """Initializes the buffer object.
+
+    Args:
+      file_object: the file-like object (instance of dfvfs.FileIO).
+      header_size: optional maximum number of bytes of the header data.
+      read_size: optional number of bytes read per read operation of
+                 the sequential pass.
+      tail_size: optional maximum number of bytes of the tail data.
+    """
+    super(FileHeaderAndTailBuffer, self).__init__()
+    self._current_offset = 0
+    self._file_object = file_object
+    self._file_size = file_object.get_size()
+    self._header_data = b''
+    self._header_size = header_size
+    self._read_size = read_size
+    self._tail_data = b''
+    self._tail_offset = 0
+    self._tail_size = tail_size
+
+    # The number of bytes and read operations that were passed to the
+    # file-like object and the number of bytes that were read from
+    # the buffer.
+    self.number_of_buffered_bytes = 0
+    self.number_of_read_bytes = 0
+    self.number_of_reads = 0
+
+  def _ReadFileObject(self, offset, size):
+    """Reads data from the file-like object.
+
+    Args:
+      offset: the offset of the data.
+      size: the number of bytes to read.
+
+    Returns:
+      A byte string containing the data.
+    """
+    self._file_object.seek(offset, os.SEEK_SET)
+    data = self._file_object.read(size)
+
+    self.number_of_read_bytes += len(data)
+    self.number_of_reads += 1
+    return data
+
+  def close(self):
+    """Closes the buffer.
+
+    The file-like object of the file is not closed, since it is owned
+    by the caller.
+    """
+    return
+
+  def get_offset(self):
+    """Retrieves the current offset into the buffered file.
+
+    Returns:
+      The current offset.
+    """
+    return self._current_offset
+
+  def get_size(self):
+    """Retrieves the size of the buffered file.
+
+    Returns:
+      The size of the file in bytes.
+    """
+    return self._file_size
+
+  def read(self, size=None):
+    """Reads a byte string from the buffered file at the current offset.
+
+    Args:
+      size: optional number of bytes to read, where None represents all
+            remaining data.
+
+    Returns:
+      A byte string containing the data read.
+    """
+    if size is None or self._current_offset + size > self._file_size:
+      size = self._file_size - self._current_offset
+
+    if size <= 0:
+      return b''
+
+    start_offset = self._current_offset
+    end_offset = start_offset + size
+
+    if end_offset <= len(self._header_data):
+      data = self._header_data[start_offset:end_offset]
+      self.number_of_buffered_bytes += len(data)
+
+    elif (self._tail_data and start_offset >= self._tail_offset and
+          end_offset <= self._tail_offset + len(self._tail_data)):
+      data = self._tail_data[
+          start_offset - self._tail_offset:end_offset - self._tail_offset]
+      self.number_of_buffered_bytes += len(data)
+
+    else:
+      data = self._ReadFileObject(start_offset, size)
+
+    self._current_offset += len(data)
+    return data
+
+  def ReadHeaderAndTail(self, hashing_engine=None):
+    """Reads the header and tail data of the file.
+
+    Args:
+      hashing_engine: optional hashing engine (instance of HashingEngine)
+                      that is updated with the data of the entire file.
+    """
+    if not hashing_engine:
+      self._header_data = self._ReadFileObject(0, self._header_size)
+
+      header_end_offset = len(self._header_data)
+      if self._file_size > header_end_offset:
+        self._tail_offset = max(
+            header_end_offset, self._file_size - self._tail_size)
+        self._tail_data = self._ReadFileObject(
+            self._tail_offset, self._file_size - self._tail_offset)
+      return
+
+    header_data = []
+    header_size = 0
+    tail_data = b''
+    offset = 0
+
+    data = self._ReadFileObject(0, self._read_size)
+    while data:
+      hashing_engine.Update(data)
+
+      if header_size < self._header_size:
+        header_data.append(data[:self._header_size - header_size])
+        header_size += len(header_data[-1])
+
+      if len(data) >= self._tail_size:
+        tail_data = data[-self._tail_size:]
+      else:
+        tail_data = b''.join([tail_data, data])[-self._tail_size:]
+      offset += len(data)
+
+      # The file-like object continues at the end of the previous read.
+      data = self._file_object.read(self._read_size)
+      self.number_of_read_bytes += len(data)
+      self.number_of_reads += 1
+
+    self._header_data = b''.join(header_data)
+    self._tail_data = tail_data
+    self._tail_offset = offset - len(tail_data)
+
+  def seek(self, offset, whence=os.SEEK_SET):
+    """Seeks an offset within the buffered file.
+
+    Args:
+      offset: the offset to seek.
+      whence: optional value that indicates whether offset is an absolute
+              or relative position within the file.
+
+    Raises:
+      IOError: if the seek failed.
+    """
+    if whence == os.SEEK_CUR:
+      offset += self._current_offset
+    elif whence == os.SEEK_END:
+      offset += self._file_size
+    elif whence != os.SEEK_SET:
+      raise IOError(u'Unsupported whence.')
+
+    if offset < 0:
+      raise IOError(u'Invalid offset value less than zero.')
+
+    self._current_offset = offset
+
+  def tell(self):
+    """Retrieves the current offset into the buffered file.
+
+    Returns:
+      The current offset.
+    """
+    return self._current_offset
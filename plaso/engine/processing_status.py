@@ -76,6 +76,25 @@ class ExtractionWorkerStatus(object):
     self.status = None
 
 
+class QueueStatus(object):
+  """The queue status.
+
+  Attributes:
+    identifier: the queue identifier.
+    maximum_queued_size: the maximum size of the queued items in bytes,
+                         where 0 represents no limit.
+    queued_size: the size of the serialized form of the queued items
+                 in bytes.
+  """
+
+  def __init__(self):
+    """Initializes the queue status object."""
+    super(QueueStatus, self).__init__()
+    self.identifier = None
+    self.maximum_queued_size = 0
+    self.queued_size = 0
+
+
 class StorageWriterStatus(object):
   """The storage writer status.
 
@@ -110,6 +129,9 @@ class ProcessingStatus(object):
                     during processing.
     error_path_specs: a list of path specification strings that caused
                       critical errors during processing.
+    lost_path_specs: a list of display names of the file entries that were
+                     being processed by extraction workers that were killed,
+                     hence were possibly not completely processed.
   """
 
   # The idle timeout in seconds.
@@ -123,10 +145,12 @@ class ProcessingStatus(object):
     self._collector_completed_count = 0
     self._extraction_workers = {}
     self._extraction_workers_last_running_time = 0
-    self._storage_writer = None
+    self._queues = {}
+    self._storage_writers = {}
 
     self.error_detected = False
     self.error_path_specs = []
+    self.lost_path_specs = []
 
   @property
   def collector(self):
@@ -140,10 +164,39 @@ class ProcessingStatus(object):
         self._extraction_workers[identifier]
         for identifier in sorted(self._extraction_workers.keys())]
 
+  @property
+  def queues(self):
+    """The queue status objects sorted by identifier."""
+    return [
+        self._queues[identifier] for identifier in sorted(self._queues.keys())]
+
   @property
   def storage_writer(self):
-    """The storage writer status object."""
-    return self._storage_writer
+    """The status object of the first storage writer or None."""
+    storage_writers = self.storage_writers
+    if not storage_writers:
+      return
+    return storage_writers[0]
+
+  @property
+  def storage_writers(self):
+    """The storage writer status objects sorted by identifier."""
+    return [
+        self._storage_writers[identifier]
+        for identifier in sorted(self._storage_writers.keys())]
+
+  def AddLostPathSpec(self, identifier):
+    """Adds the path specification an extraction worker was processing.
+
+    This function should be called when an extraction worker was killed,
+    before its status is updated.
+
+    Args:
+      identifier: the extraction worker identifier.
+    """
+    extraction_worker_status = self._extraction_workers.get(identifier, None)
+    if extraction_worker_status and extraction_worker_status.display_name:
+      self.lost_path_specs.append(extraction_worker_status.display_name)
 
   def GetExtractionCompleted(self):
     """Determines the extraction completed status.
@@ -180,6 +233,39 @@ class ProcessingStatus(object):
       number_of_events += extraction_worker_status.number_of_events
     return number_of_events
 
+  def GetNumberOfStoredEvents(self):
+    """Retrieves the number of events received by the storage writers."""
+    number_of_events = 0
+    for storage_writer_status in iter(self._storage_writers.values()):
+      number_of_events += storage_writer_status.number_of_events
+    return number_of_events
+
+  def GetNumberOfDuplicatedPathSpecs(self):
+    """Retrieves the number of path specifications consumed more than once.
+
+    The number is only determined after the collector has completed.
+    """
+    if not self._collector_completed:
+      return 0
+
+    return max(
+        0, self.GetConsumedNumberOfPathSpecs() -
+        self.GetProducedNumberOfPathSpecs())
+
+  def GetNumberOfLostPathSpecs(self):
+    """Retrieves the number of path specifications that were not processed.
+
+    This includes the path specifications that were being processed
+    by extraction workers that were killed and, after the collector has
+    completed, the produced path specifications that were not consumed.
+    """
+    number_of_path_specs = len(self.lost_path_specs)
+    if self._collector_completed:
+      number_of_path_specs += max(
+          0, self.GetProducedNumberOfPathSpecs() -
+          self.GetConsumedNumberOfPathSpecs())
+    return number_of_path_specs
+
   def GetConsumedNumberOfPathSpecs(self):
     """Retrieves the number of consumed path specifications."""
     number_of_path_specs = 0
@@ -205,8 +291,8 @@ class ProcessingStatus(object):
     extraction_completed = self.GetExtractionCompleted()
     number_of_events = self.GetNumberOfExtractedEvents()
 
-    if (extraction_completed and self._storage_writer and
-        self._storage_writer.number_of_events == number_of_events):
+    if (extraction_completed and self._storage_writers and
+        self.GetNumberOfStoredEvents() == number_of_events):
       return True
 
     return False
@@ -308,6 +394,31 @@ class ProcessingStatus(object):
       extraction_worker_status.last_running_time = timestamp
       self._extraction_workers_last_running_time = timestamp
 
+  def GetQueuedSize(self):
+    """Retrieves the size of the items queued on all the queues in bytes."""
+    queued_size = 0
+    for queue_status in iter(self._queues.values()):
+      queued_size += queue_status.queued_size
+    return queued_size
+
+  def UpdateQueueStatus(self, identifier, queued_size, maximum_queued_size=0):
+    """Updates the queue status.
+
+    Args:
+      identifier: the queue identifier.
+      queued_size: the size of the serialized form of the queued items
+                   in bytes.
+      maximum_queued_size: optional maximum size of the queued items in bytes,
+                           where 0 represents no limit.
+    """
+    if identifier not in self._queues:
+      self._queues[identifier] = QueueStatus()
+
+    queue_status = self._queues[identifier]
+    queue_status.identifier = identifier
+    queue_status.maximum_queued_size = maximum_queued_size
+    queue_status.queued_size = queued_size
+
   def UpdateStorageWriterStatus(
       self, identifier, pid, number_of_events, status, process_status):
     """Updates the storage writer status.
@@ -320,31 +431,37 @@ class ProcessingStatus(object):
       status: string containing the storage writer status.
       process_status: string containing the process status.
     """
-    if not self._storage_writer:
-      self._storage_writer = StorageWriterStatus()
+    if identifier not in self._storage_writers:
+      self._storage_writers[identifier] = StorageWriterStatus()
+
+    storage_writer_status = self._storage_writers[identifier]
 
     number_of_events_delta = number_of_events
     if number_of_events_delta > 0:
-      number_of_events_delta -= self._storage_writer.number_of_events
+      number_of_events_delta -= storage_writer_status.number_of_events
 
-    self._storage_writer.identifier = identifier
-    self._storage_writer.number_of_events = number_of_events
-    self._storage_writer.number_of_events_delta = number_of_events_delta
-    self._storage_writer.pid = pid
-    self._storage_writer.process_status = process_status
-    self._storage_writer.status = status
+    storage_writer_status.identifier = identifier
+    storage_writer_status.number_of_events = number_of_events
+    storage_writer_status.number_of_events_delta = number_of_events_delta
+    storage_writer_status.pid = pid
+    storage_writer_status.process_status = process_status
+    storage_writer_status.status = status
 
     if number_of_events_delta > 0:
-      self._storage_writer.last_running_time = time.time()
+      storage_writer_status.last_running_time = time.time()
 
   def StorageWriterIdle(self):
-    """Determines if the storage writer is idle."""
+    """Determines if the storage writers are idle."""
+    last_running_time = 0
+    for storage_writer_status in iter(self._storage_writers.values()):
+      last_running_time = max(
+          last_running_time, storage_writer_status.last_running_time)
+
     timestamp = time.time()
-    if (self._storage_writer.last_running_time == 0 or
-        self._storage_writer.last_running_time >= timestamp):
+    if last_running_time == 0 or last_running_time >= timestamp:
       return False
 
-    timestamp -= self._storage_writer.last_running_time
+    timestamp -= last_running_time
     if timestamp < self._IDLE_TIMEOUT:
       return False
     return True
@@ -364,6 +481,12 @@ class ProcessingStatus(object):
   def WorkersRunning(self):
     """Determines if the workers are running."""
     for extraction_worker_status in iter(self._extraction_workers.values()):
+      # A worker that completed, for example because it was stopped by
+      # the engine, is no longer updated hence its last deltas are ignored.
+      if extraction_worker_status.status == (
+          definitions.PROCESSING_STATUS_COMPLETED):
+        continue
+
       if (extraction_worker_status.number_of_events_delta > 0 or
           extraction_worker_status.consumed_number_of_path_specs_delta > 0 or
           extraction_worker_status.produced_number_of_path_specs_delta > 0):
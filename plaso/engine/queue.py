@@ -10,6 +10,8 @@ scalability.
 """
 
 import abc
+import threading
+import time
 
 from plaso.lib import errors
 
@@ -18,9 +20,38 @@ class QueueAbort(object):
   """Class that implements a queue abort."""
 
 
+class QueueItemBatch(object):
+  """Class that implements a batch of queue items.
+
+  A batch allows to push multiple items onto a queue at once, which reduces
+  the overhead per item of queues that pass items between processes.
+
+  Attributes:
+    items: a list of the item objects.
+  """
+
+  def __init__(self, items):
+    """Initializes the queue item batch.
+
+    Args:
+      items: a list of the item objects.
+    """
+    super(QueueItemBatch, self).__init__()
+    self.items = items
+
+
 class Queue(object):
   """Class that implements the queue interface."""
 
+  def GetQueuedSize(self):
+    """Retrieves the size of the queued items.
+
+    Returns:
+      The size of the serialized form of the queued items in bytes or None
+      if the queue does not track the size.
+    """
+    return
+
   @abc.abstractmethod
   def IsEmpty(self):
     """Determines if the queue is empty."""
@@ -42,6 +73,71 @@ class Queue(object):
     """Closes the queue."""
 
 
+class QueueSizeBudget(object):
+  """Class that implements a queue size budget.
+
+  The budget limits the size of the items queued on one or more queues,
+  where the size of an item is the size of its serialized form. This
+  budget is intended for queues that are used within a single process.
+  """
+
+  def __init__(self, maximum_size=0):
+    """Initializes the queue size budget.
+
+    Args:
+      maximum_size: optional maximum size of the queued items in bytes.
+                    The default is 0, which represents no limit.
+    """
+    super(QueueSizeBudget, self).__init__()
+    self._maximum_size = maximum_size
+    self._size = 0
+
+  @property
+  def maximum_size(self):
+    """The maximum size of the queued items in bytes."""
+    return self._maximum_size
+
+  @property
+  def size(self):
+    """The size of the queued items in bytes."""
+    return self._size
+
+  def Allocate(self, size, block=True):
+    """Allocates size for an item from the budget.
+
+    The size is always allocated, use IsExhausted to determine if
+    the budget has been exceeded.
+
+    Args:
+      size: the size of the item in bytes.
+      block: optional boolean value to indicate the allocation should block
+             until the size is available. This has no effect for the single
+             process budget.
+
+    Returns:
+      A boolean value indicating the size was allocated.
+    """
+    self._size += size
+    return True
+
+  def Free(self, size):
+    """Frees size of an item from the budget.
+
+    Args:
+      size: the size of the item in bytes.
+    """
+    self._size -= size
+
+  def IsExhausted(self):
+    """Determines if the budget is exhausted.
+
+    Returns:
+      A boolean value indicating the size of the queued items reached
+      the maximum size.
+    """
+    return bool(self._maximum_size) and self._size >= self._maximum_size
+
+
 class QueueConsumer(object):
   """Class that implements the queue consumer interface.
 
@@ -128,6 +224,16 @@ class ItemQueueConsumer(QueueConsumer):
       if isinstance(item, QueueAbort):
         break
 
+      if isinstance(item, QueueItemBatch):
+        for batch_item in item.items:
+          if self._abort:
+            break
+
+          self._number_of_consumed_items += 1
+          self._ConsumeItem(batch_item, **kwargs)
+
+        continue
+
       self._number_of_consumed_items += 1
       self._ConsumeItem(item, **kwargs)
 
@@ -136,6 +242,13 @@ class ItemQueueProducer(QueueProducer):
   """Class that implements an item queue producer.
 
      The producer generates updates on the queue.
+
+     The producer can push the items onto the queue in batches. A batch is
+     pushed when it contains the maximum number of items, when the oldest
+     item in the batch exceeds the flush interval or when the producer is
+     flushed or closed. The flush interval is checked by a separate thread,
+     hence a partial batch is also pushed while no items are produced,
+     for example while a parser is processing a large file.
   """
 
   def __init__(self, queue_object):
@@ -145,6 +258,15 @@ class ItemQueueProducer(QueueProducer):
       queue_object: the queue object (instance of Queue).
     """
     super(ItemQueueProducer, self).__init__(queue_object)
+    self._batch = []
+    self._batch_flush_interval = 0
+    # The lock is only created when batching is enabled, since the producer
+    # is passed to other processes, which requires it to be picklable.
+    self._batch_lock = None
+    self._batch_size = 0
+    self._batch_start_time = 0
+    self._flush_thread = None
+    self._flush_thread_stop_event = None
     self._number_of_produced_items = 0
 
   @property
@@ -152,23 +274,98 @@ class ItemQueueProducer(QueueProducer):
     """The number of produced items."""
     return self._number_of_produced_items
 
+  def _FlushBatch(self):
+    """Pushes the items of the current batch onto the queue.
+
+    The caller should hold the batch lock.
+    """
+    if not self._batch:
+      return
+
+    batch = QueueItemBatch(self._batch)
+    self._batch = []
+    self._PushItem(batch)
+
   def _FlushQueue(self):
     """Flushes the queue callback for the QueueFull exception."""
     return
 
-  def ProduceItem(self, item):
-    """Produces an item onto the queue.
+  def _FlushThreadMain(self, stop_event):
+    """The main loop of the flush thread.
+
+    Args:
+      stop_event: the stop event (instance of threading.Event).
+    """
+    flush_interval = self._batch_flush_interval
+    while not stop_event.wait(flush_interval):
+      with self._batch_lock:
+        if (self._batch and
+            time.time() - self._batch_start_time >= flush_interval):
+          self._FlushBatch()
+
+  def _PushItem(self, item):
+    """Pushes an item onto the queue.
 
     Args:
       item: the item object.
     """
     try:
-      self._number_of_produced_items += 1
       self._queue.PushItem(item)
 
     except errors.QueueFull:
       self._FlushQueue()
 
+  def _StartFlushThread(self):
+    """Starts the flush thread."""
+    self._flush_thread_stop_event = threading.Event()
+    self._flush_thread = threading.Thread(
+        name=u'ItemQueueProducerFlushThread', target=self._FlushThreadMain,
+        args=(self._flush_thread_stop_event, ))
+    self._flush_thread.daemon = True
+    self._flush_thread.start()
+
+  def _StopFlushThread(self):
+    """Stops the flush thread."""
+    if not self._flush_thread:
+      return
+
+    self._flush_thread_stop_event.set()
+    self._flush_thread.join()
+
+    self._flush_thread = None
+    self._flush_thread_stop_event = None
+
+  def Flush(self):
+    """Pushes the items of the current batch onto the queue."""
+    if not self._batch_lock:
+      return
+
+    with self._batch_lock:
+      self._FlushBatch()
+
+  def ProduceItem(self, item):
+    """Produces an item onto the queue.
+
+    Args:
+      item: the item object.
+    """
+    self._number_of_produced_items += 1
+
+    if self._batch_size <= 1:
+      self._PushItem(item)
+      return
+
+    with self._batch_lock:
+      timestamp = time.time()
+      if not self._batch:
+        self._batch_start_time = timestamp
+
+      self._batch.append(item)
+
+      if (len(self._batch) >= self._batch_size or
+          timestamp - self._batch_start_time >= self._batch_flush_interval):
+        self._FlushBatch()
+
   def ProduceItems(self, items):
     """Produces items onto the queue.
 
@@ -178,9 +375,34 @@ class ItemQueueProducer(QueueProducer):
     for item in items:
       self.ProduceItem(item)
 
+  def SetBatchSize(self, batch_size, flush_interval=1.0):
+    """Sets the batch size.
+
+    Args:
+      batch_size: the maximum number of items in a batch. A value of 1 or less
+                  indicates the items are pushed onto the queue individually.
+      flush_interval: optional number of seconds after which a batch is pushed
+                      onto the queue even if it has not reached the maximum
+                      number of items. The default is 1.0.
+    """
+    self._StopFlushThread()
+    self.Flush()
+
+    self._batch_flush_interval = flush_interval
+    self._batch_size = batch_size
+
+    if batch_size > 1:
+      if not self._batch_lock:
+        self._batch_lock = threading.Lock()
+
+      if flush_interval > 0:
+        self._StartFlushThread()
+
   def Close(self):
     """Closes the queue backing this producer.
 
     The closing of the queue indicates the produce will not produce any more
     items."""
+    self._StopFlushThread()
+    self.Flush()
     self._queue.Close()
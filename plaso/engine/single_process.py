@@ -2,6 +2,7 @@
 """The single process processing engine."""
 
 import collections
+import cPickle
 import logging
 import pdb
 
@@ -61,20 +62,35 @@ class SingleProcessCollector(collector.Collector):
 class SingleProcessEngine(engine.BaseEngine):
   """Class that defines the single process engine."""
 
-  def __init__(self, maximum_number_of_queued_items=0):
+  def __init__(
+      self, maximum_number_of_queued_items=0, maximum_queued_size=0,
+      maximum_total_queued_size=0):
     """Initialize the single process engine object.
 
     Args:
       maximum_number_of_queued_items: The maximum number of queued items.
                                       The default is 0, which represents
                                       no limit.
+      maximum_queued_size: optional maximum size of the serialized form of
+                           the items queued per queue in bytes. The default
+                           is 0, which represents no limit.
+      maximum_total_queued_size: optional maximum size of the serialized form
+                                 of the items queued on all the queues of
+                                 the engine in bytes. The default is 0, which
+                                 represents no limit.
     """
+    size_budget = queue.QueueSizeBudget(
+        maximum_size=maximum_total_queued_size)
+
     path_spec_queue = SingleProcessQueue(
-        maximum_number_of_queued_items=maximum_number_of_queued_items)
+        maximum_number_of_queued_items=maximum_number_of_queued_items,
+        maximum_queued_size=maximum_queued_size, size_budget=size_budget)
     event_object_queue = SingleProcessQueue(
-        maximum_number_of_queued_items=maximum_number_of_queued_items)
+        maximum_number_of_queued_items=maximum_number_of_queued_items,
+        maximum_queued_size=maximum_queued_size, size_budget=size_budget)
     parse_error_queue = SingleProcessQueue(
-        maximum_number_of_queued_items=maximum_number_of_queued_items)
+        maximum_number_of_queued_items=maximum_number_of_queued_items,
+        maximum_queued_size=maximum_queued_size, size_budget=size_budget)
 
     super(SingleProcessEngine, self).__init__(
         path_spec_queue, event_object_queue, parse_error_queue)
@@ -170,9 +186,11 @@ class SingleProcessEngine(engine.BaseEngine):
 
   def ProcessSources(
       self, source_path_specs, storage_writer, filter_find_specs=None,
-      filter_object=None, hasher_names_string=None, include_directory_stat=True,
-      mount_path=None, parser_filter_string=None, process_archive_files=False,
-      resolver_context=None, status_update_callback=None, text_prepend=None):
+      filter_object=None, hasher_file_size_limit=0, hasher_names_string=None,
+      hasher_read_size=0, include_directory_stat=True,
+      mount_path=None, parser_filter_string=None, parser_timeout=0,
+      process_archive_files=False, resolver_context=None,
+      status_update_callback=None, text_prepend=None):
     """Processes the sources and extract event objects.
 
     Args:
@@ -183,14 +201,24 @@ class SingleProcessEngine(engine.BaseEngine):
                          of dfvfs.FindSpec). The default is None.
       filter_object: Optional filter object (instance of objectfilter.Filter).
                      The default is None.
+      hasher_file_size_limit: Optional maximum size of a file in bytes that
+                              is hashed. The default is 0, which represents
+                              no limit.
       hasher_names_string: Optional comma separated string of names of
                            hashers to enable. The default is None.
+      hasher_read_size: Optional number of bytes read per read operation
+                        when hashing a file. The default is 0, which
+                        represents the default read size.
       include_directory_stat: Optional boolean value to indicate whether
                               directory stat information should be collected.
                               The default is True.
       mount_path: Optional string containing the mount path. The default
                   is None.
       parser_filter_string: Optional parser filter string. The default is None.
+      parser_timeout: Optional maximum number of seconds a parser is allowed
+                      to parse a file entry, after which the parsing of
+                      the file entry is aborted. The default is 0, which
+                      represents no limit.
       process_archive_files: Optional boolean value to indicate if the worker
                              should scan for file entries inside files.
                              The default is False.
@@ -215,7 +243,11 @@ class SingleProcessEngine(engine.BaseEngine):
         process_archive_files=process_archive_files, text_prepend=text_prepend)
 
     if hasher_names_string:
-      extraction_worker.SetHashers(hasher_names_string)
+      extraction_worker.SetHashers(
+          hasher_names_string, hasher_file_size_limit=hasher_file_size_limit,
+          hasher_read_size=hasher_read_size)
+
+    extraction_worker.SetParserTimeout(parser_timeout)
 
     extraction_worker.InitializeParserObjects(
         parser_filter_string=parser_filter_string)
@@ -343,15 +375,30 @@ class SingleProcessItemQueueProducer(queue.ItemQueueProducer):
 class SingleProcessQueue(queue.Queue):
   """Single process queue."""
 
-  def __init__(self, maximum_number_of_queued_items=0):
+  def __init__(
+      self, maximum_number_of_queued_items=0, maximum_queued_size=0,
+      size_budget=None):
     """Initializes a single process queue object.
 
     Args:
       maximum_number_of_queued_items: The maximum number of queued items.
                                       The default is 0, which represents
                                       no limit.
+      maximum_queued_size: optional maximum size of the serialized form of
+                           the queued items in bytes. The default is 0,
+                           which represents no limit.
+      size_budget: optional queue size budget (instance of QueueSizeBudget)
+                   that is shared with other queues. The default is None.
     """
     super(SingleProcessQueue, self).__init__()
+    self._queue_size_budget = queue.QueueSizeBudget(
+        maximum_size=maximum_queued_size)
+    self._size_budget = size_budget
+
+    # The size of the items is only determined if there is a limit, since
+    # it requires the items to be serialized.
+    self._track_size = bool(
+        maximum_queued_size or (size_budget and size_budget.maximum_size))
 
     # The Queue interface defines the maximum number of queued items to be
     # 0 if unlimited as does the multi processing queue, but deque uses
@@ -360,10 +407,22 @@ class SingleProcessQueue(queue.Queue):
       maximum_number_of_queued_items = None
 
     # maxlen contains the maximum number of items allowed to be queued,
-    # where None represents unlimited.
+    # where None represents unlimited. The items are stored as a tuple
+    # of the item and its size.
     self._queue = collections.deque(
         maxlen=maximum_number_of_queued_items)
 
+  def GetQueuedSize(self):
+    """Retrieves the size of the queued items.
+
+    Returns:
+      The size of the serialized form of the queued items in bytes or None
+      if the queue does not track the size.
+    """
+    if not self._track_size:
+      return
+    return self._queue_size_budget.size
+
   def IsEmpty(self):
     """Determines if the queue is empty."""
     return len(self._queue) == 0
@@ -378,12 +437,23 @@ class SingleProcessQueue(queue.Queue):
 
     # Deque will drop the first item in the queue when maxlen is exceeded.
     if not self._queue.maxlen or number_of_items < self._queue.maxlen:
-      self._queue.append(item)
+      item_size = 0
+      if self._track_size:
+        item_size = len(cPickle.dumps(item, cPickle.HIGHEST_PROTOCOL))
+        self._queue_size_budget.Allocate(item_size)
+        if self._size_budget:
+          self._size_budget.Allocate(item_size)
+
+      self._queue.append((item, item_size))
       number_of_items += 1
 
     if self._queue.maxlen and number_of_items == self._queue.maxlen:
       raise errors.QueueFull
 
+    if self._queue_size_budget.IsExhausted() or (
+        self._size_budget and self._size_budget.IsExhausted()):
+      raise errors.QueueFull
+
   def PopItem(self):
     """Pops an item off the queue or None on timeout.
 
@@ -393,12 +463,19 @@ class SingleProcessQueue(queue.Queue):
     """
     try:
       # Using popleft to have FIFO behavior.
-      return self._queue.popleft()
+      item, item_size = self._queue.popleft()
     except IndexError:
       raise errors.QueueEmpty
     except KeyboardInterrupt:
       raise errors.QueueClose
 
+    if item_size:
+      self._queue_size_budget.Free(item_size)
+      if self._size_budget:
+        self._size_budget.Free(item_size)
+
+    return item
+
   def Close(self):
     """Closes this queue, indicating that no further items will be added to it.
 
@@ -3,8 +3,9 @@
 
 import logging
 import os
+import signal
+import time
 
-from dfvfs.analyzer import analyzer
 from dfvfs.lib import definitions as dfvfs_definitions
 from dfvfs.path import factory as path_spec_factory
 from dfvfs.resolver import resolver as path_spec_resolver
@@ -12,10 +13,14 @@ from dfvfs.resolver import resolver as path_spec_resolver
 import pysigscan
 
 from plaso.engine import collector
+from plaso.engine import file_buffer
 from plaso.engine import profiler
 from plaso.engine import queue
 from plaso.lib import definitions
 from plaso.lib import errors
+from plaso.lib import event
+from plaso.lib import specification
+from plaso.hashers import hashing_engine
 from plaso.hashers import manager as hashers_manager
 from plaso.parsers import manager as parsers_manager
 
@@ -31,7 +36,21 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
   are pushed on a storage queue for further processing.
   """
 
-  _DEFAULT_HASH_READ_SIZE = 4096
+  _ARCHIVE_TYPE_INDICATORS = frozenset([
+      dfvfs_definitions.TYPE_INDICATOR_TAR,
+      dfvfs_definitions.TYPE_INDICATOR_ZIP])
+
+  _COMPRESSED_STREAM_TYPE_INDICATORS = frozenset([
+      dfvfs_definitions.TYPE_INDICATOR_BZIP2,
+      dfvfs_definitions.TYPE_INDICATOR_GZIP])
+
+  # The number of seconds after which a parser that exceeded its time budget
+  # is interrupted again, if it did not stop after the first interruption.
+  _PARSER_TIMEOUT_INTERVAL = 1.0
+
+  # The number of seconds after which the parsing of a file entry is
+  # reported as slow.
+  _SLOW_PARSER_TIME = 60.0
 
   def __init__(
       self, identifier, path_spec_queue, event_queue_producer,
@@ -54,6 +73,8 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
     """
     super(BaseEventExtractionWorker, self).__init__(path_spec_queue)
     self._compressed_stream_path_spec = None
+    self._container_format_scanner = None
+    self._container_format_store = None
     self._current_display_name = u''
     self._current_file_entry = False
     self._enable_debug_output = False
@@ -61,15 +82,24 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
     self._identifier_string = u'Worker_{0:d}'.format(identifier)
     self._file_scanner = None
     self._filestat_parser_object = None
+    self._hasher_file_size_limit = 0
     self._hasher_names = None
+    self._hasher_read_size = hashing_engine.HashingEngine.DEFAULT_READ_SIZE
     self._non_sigscan_parser_names = None
+    self._number_of_buffered_bytes = 0
+    self._number_of_read_bytes = 0
     self._open_files = False
     self._parser_mediator = parser_mediator
+    self._parser_deadline = None
     self._parser_objects = None
+    self._parser_timeout = 0
+    self._parser_timer_active = False
+    self._previous_sigalrm_handler = None
     self._process_archive_files = False
     self._produced_number_of_path_specs = 0
     self._resolver_context = resolver_context
     self._specification_store = None
+    self._stop_event = None
 
     self._event_queue_producer = event_queue_producer
     self._parse_error_queue_producer = parse_error_queue_producer
@@ -84,16 +114,21 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
     self._profiling_sample = 0
     self._profiling_sample_rate = 1000
 
-  def _ConsumeItem(self, path_spec, **unused_kwargs):
+  def _ConsumeItem(self, item, **unused_kwargs):
     """Consumes an item callback for ConsumeItems.
 
     Args:
-      path_spec: a path specification (instance of dfvfs.PathSpec).
+      item: a path specification (instance of dfvfs.PathSpec) or a path
+            specification range (instance of PathSpecRange).
 
     Raises:
       QueueFull: If a queue is full.
     """
-    self._ProcessPathSpec(path_spec)
+    if isinstance(item, collector.PathSpecRange):
+      self._ProcessPathSpec(
+          item.path_spec, file_range=(item.range_offset, item.range_size))
+    else:
+      self._ProcessPathSpec(item)
 
     # TODO: work-around for now the compressed stream path spec
     # needs to be processed after the current path spec.
@@ -101,92 +136,168 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
       self._ProcessPathSpec(self._compressed_stream_path_spec)
       self._compressed_stream_path_spec = None
 
-  def _GetSignatureMatchParserNames(self, file_entry):
-    """Determines if a file matches one of the known signatures.
+    # Push the batched event objects of the path specification onto the queue,
+    # so that the storage writer does not wait for them while the worker
+    # waits for a next path specification.
+    self._event_queue_producer.Flush()
+
+    # The worker stops consuming items, after the current item has been
+    # processed, when it is signaled to stop. Unlike an abort this does
+    # not interrupt the parsing of the current item.
+    if self._stop_event and self._stop_event.is_set():
+      self._abort = True
+
+  def _AnalyzeFileEntry(self, file_entry, is_first_range):
+    """Analyzes the data of a file entry.
+
+    The header and tail data of the file entry are read once and shared by
+    the signature scanners that determine the archive or compressed stream
+    format and the parsers with a matching signature. If the file entry needs
+    to be hashed, the hashing engine is updated in the same sequential pass.
 
     Args:
       file_entry: A file entry object (instance of dfvfs.FileEntry).
+      is_first_range: Boolean value to indicate the range that contains
+                      the start of the file is processed, for which the file
+                      entry is hashed and its archive or compressed stream
+                      format is determined.
 
     Returns:
-      A list of parser names for which the file entry matches their
-      known signatures.
+      A tuple of a list of the archive and compressed stream format type
+      indicators and a list of parser names for which the file entry matches
+      their known signatures.
     """
+    hashing_engine_object = None
+    type_indicators = []
     parser_name_list = []
-    scan_state = pysigscan.scan_state()
 
     file_object = file_entry.GetFileObject()
     try:
-      self._file_scanner.scan_file_object(scan_state, file_object)
+      header_and_tail_buffer = file_buffer.FileHeaderAndTailBuffer(
+          file_object, read_size=self._hasher_read_size)
+
+      if is_first_range and self._hasher_names:
+        file_size = header_and_tail_buffer.get_size()
+        if (self._hasher_file_size_limit and
+            file_size > self._hasher_file_size_limit):
+          logging.info((
+              u'[AnalyzeFileEntry] not hashing file: {0:s} of size: {1:d} '
+              u'that exceeds the hasher file size limit.').format(
+                  self._current_display_name, file_size))
+
+        else:
+          logging.debug(u'[AnalyzeFileEntry] hashing file: {0:s}'.format(
+              self._current_display_name))
+
+          hasher_objects = hashers_manager.HashersManager.GetHasherObjects(
+              self._hasher_names)
+          hashing_engine_object = hashing_engine.HashingEngine(hasher_objects)
+
+      header_and_tail_buffer.ReadHeaderAndTail(
+          hashing_engine=hashing_engine_object)
+
+      if hashing_engine_object:
+        self._SetHashAttributes(hashing_engine_object.GetStringDigests())
+
+      if is_first_range:
+        type_indicators = self._GetSignatureMatches(
+            self._container_format_scanner, self._container_format_store,
+            header_and_tail_buffer)
+
+      if not type_indicators:
+        parser_name_list = self._GetSignatureMatches(
+            self._file_scanner, self._specification_store,
+            header_and_tail_buffer)
+
     finally:
+      if hashing_engine_object:
+        hashing_engine_object.Close()
+
       file_object.close()
 
-    for scan_result in scan_state.scan_results:
-      format_specification = (
-          self._specification_store.GetSpecificationBySignature(
-              scan_result.identifier))
+    logging.debug((
+        u'[AnalyzeFileEntry] read {0:d} bytes in {1:d} reads and {2:d} '
+        u'bytes from buffer for file: {3:s}').format(
+            header_and_tail_buffer.number_of_read_bytes,
+            header_and_tail_buffer.number_of_reads,
+            header_and_tail_buffer.number_of_buffered_bytes,
+            self._current_display_name))
 
-      if format_specification.identifier not in parser_name_list:
-        parser_name_list.append(format_specification.identifier)
+    self._number_of_buffered_bytes += (
+        header_and_tail_buffer.number_of_buffered_bytes)
+    self._number_of_read_bytes += header_and_tail_buffer.number_of_read_bytes
 
-    return parser_name_list
+    return type_indicators, parser_name_list
 
-  def _HashFileEntry(self, file_entry):
-    """Hashes the contents of a file entry.
+  def _GetContainerFormatSpecificationStore(self):
+    """Retrieves the specification store of the container formats.
 
-    The resulting digest hashes are set in the parser mediator as attribute
-    to add to event objects.
+    The container formats are the supported archive and compressed stream
+    formats, of which the identifiers are the dfVFS type indicators.
 
-    Args:
-      file_entry: The file entry object to be hashed (instance of
-                  dfvfs.FileEntry)
+    Returns:
+      A format specification store (instance of FormatSpecificationStore).
     """
-    if not file_entry.IsFile() or not self._hasher_names:
-      return
+    specification_store = specification.FormatSpecificationStore()
 
-    logging.debug(u'[HashFileEntry] hashing file: {0:s}'.format(
-        self._current_display_name))
+    format_specification = specification_store.AddNewSpecification(
+        dfvfs_definitions.TYPE_INDICATOR_BZIP2)
+    format_specification.AddNewSignature(b'BZh', offset=0)
 
-    hasher_objects = hashers_manager.HashersManager.GetHasherObjects(
-        self._hasher_names)
+    format_specification = specification_store.AddNewSpecification(
+        dfvfs_definitions.TYPE_INDICATOR_GZIP)
+    format_specification.AddNewSignature(b'\x1f\x8b\x08', offset=0)
 
-    file_object = file_entry.GetFileObject()
-    try:
-      file_object.seek(0, os.SEEK_SET)
+    format_specification = specification_store.AddNewSpecification(
+        dfvfs_definitions.TYPE_INDICATOR_TAR)
+    format_specification.AddNewSignature(b'ustar\x00', offset=257)
+    format_specification.AddNewSignature(b'ustar\x20\x20\x00', offset=257)
 
-      # We only do one read, then pass it to each of the hashers in turn.
-      data = file_object.read(self._DEFAULT_HASH_READ_SIZE)
-      while data:
-        for hasher in hasher_objects:
-          hasher.Update(data)
-        data = file_object.read(self._DEFAULT_HASH_READ_SIZE)
+    format_specification = specification_store.AddNewSpecification(
+        dfvfs_definitions.TYPE_INDICATOR_ZIP)
+    format_specification.AddNewSignature(b'PK\x03\x04', offset=0)
 
-    finally:
-      file_object.close()
+    return specification_store
 
-    # Get the digest values for every active hasher.
-    digests = {}
-    for hasher in hasher_objects:
-      digests[hasher.NAME] = hasher.GetStringDigest()
-      logging.debug(
-          u'[HashFileEntry] digest {0:s} calculated for file: {1:s}.'.format(
-              hasher.GetStringDigest(), self._current_display_name))
+  def _GetSignatureMatches(
+      self, scanner_object, specification_store, file_object):
+    """Determines the format specifications that match the data of a file.
 
-    if self._enable_profiling:
-      self._ProfilingSampleMemory()
+    Args:
+      scanner_object: A scanner object (instance of pysigscan.scanner).
+      specification_store: A format specification store (instance of
+                           FormatSpecificationStore).
+      file_object: A file-like object.
 
-    for hash_name, digest in iter(digests.items()):
-      attribute_name = u'{0:s}_hash'.format(hash_name)
-      self._parser_mediator.AddEventAttribute(attribute_name, digest)
+    Returns:
+      A list of the identifiers of the format specifications for which
+      the file matches their known signatures.
+    """
+    identifiers = []
+    scan_state = pysigscan.scan_state()
 
-    logging.debug(u'[HashFileEntry] completed hashing file: {0:s}'.format(
-        self._current_display_name))
+    scanner_object.scan_file_object(scan_state, file_object)
 
-  def _ParseFileEntryWithParser(self, parser_object, file_entry):
+    for scan_result in scan_state.scan_results:
+      format_specification = (
+          specification_store.GetSpecificationBySignature(
+              scan_result.identifier))
+
+      if format_specification.identifier not in identifiers:
+        identifiers.append(format_specification.identifier)
+
+    return identifiers
+
+  def _ParseFileEntryWithParser(
+      self, parser_object, file_entry, file_range=None):
     """Parses a file entry with a specific parser.
 
     Args:
       parser_object: A parser object (instance of BaseParser).
       file_entry: A file entry object (instance of dfvfs.FileEntry).
+      file_range: Optional tuple of the offset and size of the range of
+                  the file to parse. The default is None, which represents
+                  the entire file.
     """
     self._parser_mediator.ClearParserChain()
 
@@ -196,8 +307,32 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
     if self._parsers_profiler:
       self._parsers_profiler.StartTiming(parser_object.NAME)
 
+    aborted = False
+    deadline = None
+    start_time = time.time()
+    if self._parser_timeout:
+      deadline = start_time + self._parser_timeout
+
     try:
-      parser_object.UpdateChainAndParse(self._parser_mediator)
+      # The timer is stopped before any of the exceptions of the parser are
+      # handled, so that the handlers are not interrupted by the timer.
+      try:
+        if deadline:
+          self._StartParserTimer(deadline)
+
+        if file_range:
+          parser_object.UpdateChainAndParse(
+              self._parser_mediator, file_range=file_range)
+        else:
+          parser_object.UpdateChainAndParse(self._parser_mediator)
+
+      finally:
+        self._StopParserTimer()
+
+      # Note that a parser that checks the abort value of the parser mediator
+      # returns when it exceeded its time budget.
+      if deadline and time.time() > deadline:
+        aborted = True
 
     # We catch the IOError so we can determine the parser that generated
     # the error.
@@ -206,12 +341,22 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
           u'{0:s} unable to parse file: {1:s} with error: {2:s}'.format(
               parser_object.NAME, self._current_display_name, exception))
 
+    except errors.ParserTimeout:
+      # The signal can also be received while the timer is being stopped.
+      self._StopParserTimer()
+      aborted = True
+
     except errors.UnableToParseFile as exception:
       logging.debug(
           u'{0:s} unable to parse file: {1:s} with error: {2:s}'.format(
               parser_object.NAME, self._current_display_name, exception))
 
     finally:
+      elapsed_time = time.time() - start_time
+      if aborted or elapsed_time >= self._SLOW_PARSER_TIME:
+        self._ProduceSlowFileRecord(
+            parser_object.NAME, file_entry, file_range, elapsed_time, aborted)
+
       if self._parsers_profiler:
         self._parsers_profiler.StopTiming(parser_object.NAME)
 
@@ -221,25 +366,36 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
             u'[{0:s}] did not explicitly close file-object for file: '
             u'{1:s}.').format(parser_object.NAME, self._current_display_name))
 
-  def _ProcessArchiveFile(self, file_entry):
+  def _ParserTimeoutSignalHandler(
+      self, unused_signal_number, unused_stack_frame):
+    """Signal handler for the SIGALRM signal of the parser timer.
+
+    The parser timeout is raised by the parser mediator, which defers it
+    while an event object is being produced.
+
+    Args:
+      signal_number: Numeric representation of the signal.
+      stack_frame: The current stack frame (instance of frame object) or None.
+
+    Raises:
+      ParserTimeout: when a parser exceeded its time budget.
+    """
+    # The signal can be received after the parser has returned, but before
+    # the timer was stopped.
+    if self._parser_deadline is not None:
+      self._parser_mediator.SignalParserTimeout()
+
+  def _ProcessArchiveFile(self, file_entry, type_indicators):
     """Processes an archive file (file that contains file entries).
 
     Args:
       file_entry: A file entry object (instance of dfvfs.FileEntry).
+      type_indicators: A list of the archive format type indicators
+                       of the file.
 
     Returns:
       A boolean indicating if the file is an archive file.
     """
-    try:
-      type_indicators = analyzer.Analyzer.GetArchiveTypeIndicators(
-          file_entry.path_spec, resolver_context=self._resolver_context)
-    except IOError as exception:
-      logging.warning((
-          u'Analyzer failed to determine archive type indicators '
-          u'for file: {0:s} with error: {1:s}').format(
-              self._current_display_name, exception))
-      return False
-
     number_of_type_indicators = len(type_indicators)
     if number_of_type_indicators == 0:
       return False
@@ -294,25 +450,17 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
 
     return True
 
-  def _ProcessCompressedStreamFile(self, file_entry):
+  def _ProcessCompressedStreamFile(self, file_entry, type_indicators):
     """Processes an compressed stream file (file that contains file entries).
 
     Args:
       file_entry: A file entry object (instance of dfvfs.FileEntry).
+      type_indicators: A list of the compressed stream format type indicators
+                       of the file.
 
     Returns:
       A boolean indicating if the file is a compressed stream file.
     """
-    try:
-      type_indicators = analyzer.Analyzer.GetCompressedStreamTypeIndicators(
-          file_entry.path_spec, resolver_context=self._resolver_context)
-    except IOError as exception:
-      logging.warning((
-          u'Analyzer failed to determine compressed stream type indicators '
-          u'for file: {0:s} with error: {1:s}').format(
-              self._current_display_name, exception))
-      return False
-
     number_of_type_indicators = len(type_indicators)
     if number_of_type_indicators == 0:
       return False
@@ -353,15 +501,24 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
 
     return True
 
-  def _ProcessFileEntry(self, file_entry):
+  def _ProcessFileEntry(self, file_entry, file_range=None):
     """Processses a file entry.
 
+    If a file range is provided only the parsers that support splitting
+    parse the range. The file entry is hashed and parsed by the other parsers
+    when processing the range that contains the start of the file.
+
     Args:
       file_entry: A file entry object (instance of dfvfs.FileEntry).
+      file_range: Optional tuple of the offset and size of the range of
+                  the file to process. The default is None, which represents
+                  the entire file.
 
     Raises:
       RuntimeError: if the parser object is missing.
     """
+    is_first_range = not file_range or file_range[0] == 0
+
     self._current_file_entry = file_entry
     self._current_display_name = self._parser_mediator.GetDisplayName(
         file_entry)
@@ -372,22 +529,29 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
     self._parser_mediator.SetFileEntry(file_entry)
 
     try:
-      self._HashFileEntry(file_entry)
-
-      logging.debug(u'[ProcessFileEntry] parsing file: {0:s}'.format(
-          self._current_display_name))
-
       is_archive = False
       is_compressed_stream = False
       is_file = file_entry.IsFile()
 
       if is_file:
-        is_compressed_stream = self._ProcessCompressedStreamFile(file_entry)
+        type_indicators, parser_name_list = self._AnalyzeFileEntry(
+            file_entry, is_first_range)
+
+      logging.debug(u'[ProcessFileEntry] parsing file: {0:s}'.format(
+          self._current_display_name))
+
+      if is_file and type_indicators:
+        is_compressed_stream = self._ProcessCompressedStreamFile(
+            file_entry, [
+                type_indicator for type_indicator in type_indicators
+                if type_indicator in self._COMPRESSED_STREAM_TYPE_INDICATORS])
         if not is_compressed_stream:
-          is_archive = self._ProcessArchiveFile(file_entry)
+          is_archive = self._ProcessArchiveFile(
+              file_entry, [
+                  type_indicator for type_indicator in type_indicators
+                  if type_indicator in self._ARCHIVE_TYPE_INDICATORS])
 
       if is_file and not is_archive and not is_compressed_stream:
-        parser_name_list = self._GetSignatureMatchParserNames(file_entry)
         if not parser_name_list:
           parser_name_list = self._non_sigscan_parser_names
 
@@ -397,13 +561,21 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
             self._parser_mediator.ResetFileEntry()
             raise RuntimeError(u'No such parser: {0:s}'.format(parser_name))
 
+          if file_range and parser_object.SupportsSplitting():
+            parser_file_range = file_range
+          elif is_first_range:
+            parser_file_range = None
+          else:
+            continue
+
           logging.debug((
               u'[ProcessFileEntry] parsing file: {0:s} with parser: '
               u'{1:s}').format(self._current_display_name, parser_name))
 
-          self._ParseFileEntryWithParser(parser_object, file_entry)
+          self._ParseFileEntryWithParser(
+              parser_object, file_entry, file_range=parser_file_range)
 
-      elif self._filestat_parser_object:
+      elif self._filestat_parser_object and is_first_range:
         # TODO: for archive and compressed stream files is the desired behavior
         # to only apply the filestat parser?
         self._ParseFileEntryWithParser(self._filestat_parser_object, file_entry)
@@ -428,11 +600,14 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
     logging.debug(u'[ParseFileEntry] done processing: {0:s}'.format(
         self._current_display_name))
 
-  def _ProcessPathSpec(self, path_spec):
+  def _ProcessPathSpec(self, path_spec, file_range=None):
     """Processses a path specification.
 
     Args:
       path_spec: A path specification object (instance of dfvfs.PathSpec).
+      file_range: Optional tuple of the offset and size of the range of
+                  the file to process. The default is None, which represents
+                  the entire file.
     """
     try:
       file_entry = path_spec_resolver.Resolver.OpenFileEntry(
@@ -444,7 +619,7 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
                 path_spec.comparable))
         return
 
-      self._ProcessFileEntry(file_entry)
+      self._ProcessFileEntry(file_entry, file_range=file_range)
 
     except IOError as exception:
       logging.warning(
@@ -459,6 +634,37 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
               path_spec.comparable))
       logging.exception(exception)
 
+  def _ProduceSlowFileRecord(
+      self, parser_name, file_entry, file_range, elapsed_time, aborted):
+    """Produces a slow file record onto the event object queue.
+
+    Args:
+      parser_name: the name of the parser.
+      file_entry: the file entry object (instance of dfvfs.FileEntry).
+      file_range: tuple of the offset and size of the range of the file that
+                  was parsed or None if the entire file was parsed.
+      elapsed_time: the number of seconds the parser ran.
+      aborted: boolean value to indicate the parsing was aborted.
+    """
+    if file_range:
+      _, size = file_range
+    else:
+      stat_object = file_entry.GetStat()
+      size = getattr(stat_object, u'size', None) or 0
+
+    if aborted:
+      logging.warning((
+          u'{0:s} aborted parsing file: {1:s} after {2:.1f} seconds since it '
+          u'exceeded its time budget.').format(
+              parser_name, self._current_display_name, elapsed_time))
+    else:
+      logging.info(u'{0:s} took {1:.1f} seconds to parse file: {2:s}'.format(
+          parser_name, elapsed_time, self._current_display_name))
+
+    slow_file_record = event.SlowFileRecord(
+        parser_name, self._current_display_name, size, elapsed_time, aborted)
+    self._event_queue_producer.ProduceItem(slow_file_record)
+
   def _ProfilingSampleMemory(self):
     """Create a memory profiling sample."""
     if not self._memory_profiler:
@@ -485,6 +691,73 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
     if self._parsers_profiler:
       self._parsers_profiler.Write()
 
+  def _SetHashAttributes(self, digests):
+    """Sets the digest hashes as attributes in the parser mediator.
+
+    The digest hashes are added as attribute to event objects.
+
+    Args:
+      digests: A dictionary containing the string digests of the file entry
+               per hasher name.
+    """
+    if self._enable_profiling:
+      self._ProfilingSampleMemory()
+
+    for hash_name, digest in iter(digests.items()):
+      logging.debug((
+          u'[SetHashAttributes] digest {0:s} calculated for file: '
+          u'{1:s}.').format(digest, self._current_display_name))
+
+      attribute_name = u'{0:s}_hash'.format(hash_name)
+      self._parser_mediator.AddEventAttribute(attribute_name, digest)
+
+  def _StartParserTimer(self, deadline):
+    """Starts the timer that enforces the time budget of a parser.
+
+    The parser mediator signals parsers that check its abort value to abort
+    after the deadline. Parsers that do not check the abort value are
+    interrupted by a SIGALRM signal, on platforms that support interval
+    timers. The signal is repeated until the parser has stopped, for example
+    if the parser catches the exception raised by the signal handler.
+    The previous SIGALRM signal handler is restored when the timer is
+    stopped.
+
+    Args:
+      deadline: the POSIX timestamp after which the parser is aborted.
+    """
+    self._parser_deadline = deadline
+    self._parser_mediator.SetParserDeadline(deadline)
+
+    if hasattr(signal, u'setitimer'):
+      try:
+        self._previous_sigalrm_handler = signal.signal(
+            signal.SIGALRM, self._ParserTimeoutSignalHandler)
+      except ValueError:
+        # Signal handlers can only be set in the main thread.
+        return
+
+      self._parser_timer_active = True
+      signal.setitimer(
+          signal.ITIMER_REAL, max(deadline - time.time(), 0.001),
+          self._PARSER_TIMEOUT_INTERVAL)
+
+  def _StopParserTimer(self):
+    """Stops the timer that enforces the time budget of a parser."""
+    # The deadline is cleared first so that a signal received while stopping
+    # the timer does not raise.
+    self._parser_deadline = None
+
+    if self._parser_timer_active:
+      signal.setitimer(signal.ITIMER_REAL, 0)
+
+      # The previous handler is None if it was not set from Python.
+      if self._previous_sigalrm_handler is not None:
+        signal.signal(signal.SIGALRM, self._previous_sigalrm_handler)
+      self._previous_sigalrm_handler = None
+      self._parser_timer_active = False
+
+    self._parser_mediator.SetParserDeadline(None)
+
   @property
   def current_path_spec(self):
     """The current path specification."""
@@ -525,6 +798,10 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
     self._file_scanner = parsers_manager.ParsersManager.GetScanner(
         self._specification_store)
 
+    self._container_format_store = self._GetContainerFormatSpecificationStore()
+    self._container_format_scanner = parsers_manager.ParsersManager.GetScanner(
+        self._container_format_store)
+
     self._parser_objects = parsers_manager.ParsersManager.GetParserObjects(
         parser_filter_string=parser_filter_string)
 
@@ -544,11 +821,20 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
             self._identifier, os.getpid()))
 
     self.ConsumeItems()
+    self._event_queue_producer.Flush()
 
     logging.debug(
         u'Worker {0:d} (PID: {1:d}) stopped monitoring process queue.'.format(
             self._identifier, os.getpid()))
 
+    # The number of bytes read from the buffer are the bytes the analysis
+    # stages would otherwise have read from the file entries separately.
+    logging.debug((
+        u'Worker {0:d} (PID: {1:d}) analyzed file entries by reading '
+        u'{2:d} bytes and {3:d} bytes from buffer.').format(
+            self._identifier, os.getpid(), self._number_of_read_bytes,
+            self._number_of_buffered_bytes))
+
     self._status = definitions.PROCESSING_STATUS_COMPLETED
     self._current_file_entry = None
 
@@ -595,17 +881,27 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
     """
     self._parser_mediator.SetFilterObject(filter_object)
 
-  def SetHashers(self, hasher_names_string):
+  def SetHashers(
+      self, hasher_names_string, hasher_file_size_limit=0, hasher_read_size=0):
     """Initializes the hasher objects.
 
     Args:
       hasher_names_string: Comma separated string of names of
                            hashers to enable.
+      hasher_file_size_limit: Optional maximum size of a file in bytes that
+                              is hashed, where 0 represents no limit.
+                              The default is 0.
+      hasher_read_size: Optional number of bytes read per read operation
+                        when hashing a file, where 0 represents the default
+                        read size of the hashing engine. The default is 0.
     """
     names = hashers_manager.HashersManager.GetHasherNamesFromString(
         hasher_names_string)
     logging.debug(u'[SetHashers] Enabling hashers: {0:s}.'.format(names))
+    self._hasher_file_size_limit = hasher_file_size_limit
     self._hasher_names = names
+    self._hasher_read_size = (
+        hasher_read_size or hashing_engine.HashingEngine.DEFAULT_READ_SIZE)
 
   def SetMountPath(self, mount_path):
     """Sets the mount path.
@@ -615,6 +911,16 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
     """
     self._parser_mediator.SetMountPath(mount_path)
 
+  def SetParserTimeout(self, parser_timeout):
+    """Sets the parser timeout.
+
+    Args:
+      parser_timeout: the maximum number of seconds a parser is allowed to
+                      parse a file entry, after which the parsing of the file
+                      entry is aborted. A value of 0 represents no limit.
+    """
+    self._parser_timeout = parser_timeout
+
   def SetProcessArchiveFiles(self, process_archive_files):
     """Sets the process archive files mode.
 
@@ -624,6 +930,16 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
     """
     self._process_archive_files = process_archive_files
 
+  def SetStopEvent(self, stop_event):
+    """Sets the stop event.
+
+    Args:
+      stop_event: the stop event (instance of multiprocessing.Event) or None.
+                  The worker stops after the current item has been processed
+                  when this event is set.
+    """
+    self._stop_event = stop_event
+
   def SetTextPrepend(self, text_prepend):
     """Sets the text prepend.
 
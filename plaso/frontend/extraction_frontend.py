@@ -42,22 +42,42 @@ class ExtractionFrontend(storage_media_frontend.StorageMediaFrontend):
     self._debug_mode = False
     self._enable_profiling = False
     self._engine = None
+    self._event_object_batch_flush_interval = None
+    self._event_object_batch_size = None
+    self._file_range_size = 0
     self._filter_expression = None
     self._filter_object = None
+    self._hasher_file_size_limit = 0
+    self._hasher_read_size = 0
+    self._maximum_memory_usage = 0
+    self._maximum_number_of_extraction_workers = 0
+    self._maximum_queued_size = 0
+    self._maximum_total_queued_size = 0
+    self._maximum_worker_memory_usage = 0
+    self._maximum_worker_number_of_path_specs = 0
+    self._maximum_worker_runtime = 0
+    self._minimum_number_of_extraction_workers = 0
     self._mount_path = None
+    self._number_of_extraction_workers = 0
+    self._number_of_storage_writers = 1
     self._old_preprocess = False
     self._operating_system = None
     self._output_module = None
     self._parser_names = None
+    self._parser_timeout = 0
     self._preprocess = False
     self._process_archive_files = False
     self._profiling_sample_rate = self._DEFAULT_PROFILING_SAMPLE_RATE
     self._profiling_type = u'all'
     self._queue_size = self._DEFAULT_QUEUE_SIZE
+    self._schedule_largest_first = False
     self._single_process_mode = False
     self._show_worker_memory_information = False
     self._storage_file_path = None
+    self._storage_random_access = False
     self._text_prepend = None
+    self._use_shared_memory_queue = False
+    self._worker_serialization = False
 
   def _CheckStorageFile(self, storage_file_path):
     """Checks if the storage file path is valid.
@@ -412,10 +432,16 @@ class ExtractionFrontend(storage_media_frontend.StorageMediaFrontend):
       self._single_process_mode = True
 
     if self._single_process_mode:
-      self._engine = single_process.SingleProcessEngine(self._queue_size)
+      self._engine = single_process.SingleProcessEngine(
+          maximum_number_of_queued_items=self._queue_size,
+          maximum_queued_size=self._maximum_queued_size,
+          maximum_total_queued_size=self._maximum_total_queued_size)
     else:
       self._engine = multi_process.MultiProcessEngine(
-          maximum_number_of_queued_items=self._queue_size)
+          maximum_number_of_queued_items=self._queue_size,
+          maximum_queued_size=self._maximum_queued_size,
+          maximum_total_queued_size=self._maximum_total_queued_size,
+          use_shared_memory_queue=self._use_shared_memory_queue)
 
     self._engine.SetEnableDebugOutput(self._debug_mode)
     self._engine.SetEnableProfiling(
@@ -474,12 +500,20 @@ class ExtractionFrontend(storage_media_frontend.StorageMediaFrontend):
       storage_writer = storage.FileStorageWriter(
           self._engine.event_object_queue, self._storage_file_path,
           buffer_size=self._buffer_size, pre_obj=pre_obj,
+          random_access=self._storage_random_access,
           serializer_format=storage_serializer_format)
 
       storage_writer.SetEnableProfiling(
           self._enable_profiling,
           profiling_type=self._profiling_type)
 
+    # Event objects can only be serialized by the workers if they are
+    # written to a storage file.
+    if self._worker_serialization and not self._output_module:
+      worker_serializer_format = storage_serializer_format
+    else:
+      worker_serializer_format = None
+
     processing_status = None
     try:
       if self._single_process_mode:
@@ -489,10 +523,13 @@ class ExtractionFrontend(storage_media_frontend.StorageMediaFrontend):
             source_path_specs, storage_writer,
             filter_find_specs=filter_find_specs,
             filter_object=self._filter_object,
+            hasher_file_size_limit=self._hasher_file_size_limit,
             hasher_names_string=hasher_names_string,
+            hasher_read_size=self._hasher_read_size,
             include_directory_stat=include_directory_stat,
             mount_path=self._mount_path,
             parser_filter_string=parser_filter_string,
+            parser_timeout=self._parser_timeout,
             process_archive_files=self._process_archive_files,
             resolver_context=self._resolver_context,
             status_update_callback=status_update_callback,
@@ -501,17 +538,36 @@ class ExtractionFrontend(storage_media_frontend.StorageMediaFrontend):
       else:
         logging.debug(u'Starting extraction in multi process mode.')
 
-        # TODO: pass number_of_extraction_workers.
         processing_status = self._engine.ProcessSources(
             source_path_specs, storage_writer,
             enable_sigsegv_handler=enable_sigsegv_handler,
+            event_object_batch_flush_interval=(
+                self._event_object_batch_flush_interval),
+            event_object_batch_size=self._event_object_batch_size,
+            file_range_size=self._file_range_size,
             filter_find_specs=filter_find_specs,
             filter_object=self._filter_object,
+            hasher_file_size_limit=self._hasher_file_size_limit,
             hasher_names_string=hasher_names_string,
+            hasher_read_size=self._hasher_read_size,
             include_directory_stat=include_directory_stat,
+            maximum_memory_usage=self._maximum_memory_usage,
+            maximum_number_of_extraction_workers=(
+                self._maximum_number_of_extraction_workers),
+            maximum_worker_memory_usage=self._maximum_worker_memory_usage,
+            maximum_worker_number_of_path_specs=(
+                self._maximum_worker_number_of_path_specs),
+            maximum_worker_runtime=self._maximum_worker_runtime,
+            minimum_number_of_extraction_workers=(
+                self._minimum_number_of_extraction_workers),
             mount_path=self._mount_path,
+            number_of_extraction_workers=self._number_of_extraction_workers,
+            number_of_storage_writers=self._number_of_storage_writers,
             parser_filter_string=parser_filter_string,
+            parser_timeout=self._parser_timeout,
             process_archive_files=self._process_archive_files,
+            schedule_largest_first=self._schedule_largest_first,
+            serializer_format=worker_serializer_format,
             status_update_callback=status_update_callback,
             show_memory_usage=self._show_worker_memory_information,
             text_prepend=self._text_prepend)
@@ -562,6 +618,122 @@ class ExtractionFrontend(storage_media_frontend.StorageMediaFrontend):
     self._profiling_sample_rate = profiling_sample_rate
     self._profiling_type = profiling_type
 
+  def SetEventObjectBatchingOptions(self, batch_size=0, flush_interval=0):
+    """Sets the event object batching options.
+
+    Args:
+      batch_size: optional maximum number of event objects an extraction
+                  worker pushes onto the event object queue at once.
+                  A value of 1 disables batching. The default is 0, which
+                  represents the default batch size.
+      flush_interval: optional number of seconds after which an extraction
+                      worker pushes a partial batch of event objects onto
+                      the event object queue. The default is 0, which
+                      represents the default flush interval.
+    """
+    self._event_object_batch_flush_interval = flush_interval or None
+    self._event_object_batch_size = batch_size or None
+
+  def SetFileRangeSize(self, file_range_size):
+    """Sets the file range size.
+
+    Args:
+      file_range_size: the size of the ranges, in bytes, that files which are
+                       larger are split into, so that the ranges can be parsed
+                       in parallel in multi process mode. A value of 0
+                       represents files are not split.
+    """
+    self._file_range_size = file_range_size
+
+  def SetHashingOptions(self, file_size_limit=0, read_size=0):
+    """Sets the hashing options.
+
+    Args:
+      file_size_limit: optional maximum size of a file in bytes that is
+                       hashed. The default is 0, which represents no limit.
+      read_size: optional number of bytes read per read operation when
+                 hashing a file. The default is 0, which represents
+                 the default read size.
+    """
+    self._hasher_file_size_limit = file_size_limit
+    self._hasher_read_size = read_size
+
+  def SetNumberOfExtractionWorkers(
+      self, number_of_extraction_workers, maximum_memory_usage=0,
+      maximum_number_of_extraction_workers=0,
+      minimum_number_of_extraction_workers=0):
+    """Sets the number of extraction workers.
+
+    Args:
+      number_of_extraction_workers: the number of extraction worker processes
+                                    used in multi process mode. A value of 0
+                                    represents the number is determined
+                                    by the engine.
+      maximum_memory_usage: optional maximum total memory usage of
+                            the processes in bytes. The default is 0, which
+                            represents no limit.
+      maximum_number_of_extraction_workers: optional maximum number of
+                                            extraction worker processes.
+                                            The default is 0, which represents
+                                            the engine maximum.
+      minimum_number_of_extraction_workers: optional minimum number of
+                                            extraction worker processes.
+                                            The default is 0, which represents
+                                            the engine minimum.
+    """
+    self._maximum_memory_usage = maximum_memory_usage
+    self._maximum_number_of_extraction_workers = (
+        maximum_number_of_extraction_workers)
+    self._minimum_number_of_extraction_workers = (
+        minimum_number_of_extraction_workers)
+    self._number_of_extraction_workers = number_of_extraction_workers
+
+  def SetNumberOfStorageWriters(self, number_of_storage_writers):
+    """Sets the number of storage writers.
+
+    Args:
+      number_of_storage_writers: the number of storage writer processes used
+                                 in multi process mode.
+    """
+    self._number_of_storage_writers = number_of_storage_writers
+
+  def SetParserTimeout(self, parser_timeout):
+    """Sets the parser timeout.
+
+    Args:
+      parser_timeout: the maximum number of seconds a parser is allowed to
+                      parse a file entry, after which the parsing of the file
+                      entry is aborted and reported as such in the storage
+                      file. A value of 0 represents no limit.
+    """
+    self._parser_timeout = parser_timeout
+
+  def SetQueueSizeBudget(
+      self, maximum_queued_size=0, maximum_total_queued_size=0):
+    """Sets the queue size budget.
+
+    Args:
+      maximum_queued_size: optional maximum size of the serialized form of
+                           the items queued per queue in bytes. The default
+                           is 0, which represents no limit.
+      maximum_total_queued_size: optional maximum size of the serialized form
+                                 of the items queued on all the queues in
+                                 bytes. The default is 0, which represents
+                                 no limit.
+    """
+    self._maximum_queued_size = maximum_queued_size
+    self._maximum_total_queued_size = maximum_total_queued_size
+
+  def SetScheduleLargestFirst(self, schedule_largest_first):
+    """Sets whether the largest files should be scheduled first.
+
+    Args:
+      schedule_largest_first: boolean value to indicate the files with
+                              the largest estimated processing cost should
+                              be processed first in multi process mode.
+    """
+    self._schedule_largest_first = schedule_largest_first
+
   def SetStorageFile(self, storage_file_path):
     """Sets the storage file path.
 
@@ -570,6 +742,16 @@ class ExtractionFrontend(storage_media_frontend.StorageMediaFrontend):
     """
     self._storage_file_path = storage_file_path
 
+  def SetStorageRandomAccess(self, random_access):
+    """Sets whether the storage should be written for random access.
+
+    Args:
+      random_access: boolean value to indicate the store streams should be
+                     written without compression, so that individual events
+                     can be read without decompressing the preceding events.
+    """
+    self._storage_random_access = random_access
+
   def SetStorageSerializer(self, storage_serializer_format):
     """Sets the storage serializer.
 
@@ -585,6 +767,51 @@ class ExtractionFrontend(storage_media_frontend.StorageMediaFrontend):
 
     self._storage_serializer_format = storage_serializer_format
 
+  def SetUseSharedMemoryQueue(self, use_shared_memory_queue):
+    """Sets whether the queues should use shared memory.
+
+    Args:
+      use_shared_memory_queue: boolean value to indicate the queues should
+                               use a shared memory ring buffer in multi
+                               process mode.
+    """
+    self._use_shared_memory_queue = use_shared_memory_queue
+
+  def SetWorkerLimits(
+      self, maximum_memory_usage=0, maximum_number_of_path_specs=0,
+      maximum_runtime=0):
+    """Sets the limits after which an extraction worker is replaced.
+
+    In multi process mode an extraction worker that exceeds one of its limits
+    is replaced by a new extraction worker, after it has processed its
+    current path specification.
+
+    Args:
+      maximum_memory_usage: optional maximum memory usage of an extraction
+                            worker process in bytes. The default is 0, which
+                            represents no limit.
+      maximum_number_of_path_specs: optional maximum number of path
+                                    specifications an extraction worker
+                                    processes. The default is 0, which
+                                    represents no limit.
+      maximum_runtime: optional maximum number of seconds an extraction
+                       worker runs. The default is 0, which represents
+                       no limit.
+    """
+    self._maximum_worker_memory_usage = maximum_memory_usage
+    self._maximum_worker_number_of_path_specs = maximum_number_of_path_specs
+    self._maximum_worker_runtime = maximum_runtime
+
+  def SetWorkerSerialization(self, worker_serialization):
+    """Sets whether the event objects should be serialized by the workers.
+
+    Args:
+      worker_serialization: boolean value to indicate the event objects should
+                            be serialized by the extraction workers in multi
+                            process mode.
+    """
+    self._worker_serialization = worker_serialization
+
   def SetShowMemoryInformation(self, show_memory=True):
     """Sets a flag telling the worker monitor to show memory information.
 
@@ -42,6 +42,7 @@ class PsortFrontend(analysis_frontend.AnalysisFrontend):
 
     self._analysis_process_info = []
     self._data_location = None
+    self._enable_prefetching = False
     self._filter_buffer = None
     self._filter_expression = None
     self._filter_object = None
@@ -183,6 +184,15 @@ class PsortFrontend(analysis_frontend.AnalysisFrontend):
     for item, value in analysis_queue_consumer.counter.iteritems():
       counter[item] = value
 
+  def SetEnablePrefetching(self, enable_prefetching):
+    """Enables or disables prefetching of the stores of the storage file.
+
+    Args:
+      enable_prefetching: boolean value to indicate if the events should be
+                          deserialized in worker processes.
+    """
+    self._enable_prefetching = enable_prefetching
+
   def SetFilter(self, filter_object, filter_expression):
     """Set the filter information.
 
@@ -341,7 +351,11 @@ class PsortFrontend(analysis_frontend.AnalysisFrontend):
         self._filter_buffer = bufferlib.CircularBuffer(time_slice.duration)
 
     with storage_file:
-      storage_file.SetStoreLimit(self._filter_object)
+      storage_file.SetEnablePrefetching(self._enable_prefetching)
+      # Event objects that do not match the filter are needed by the time
+      # slicer, hence they can only be prefiltered without a filter buffer.
+      storage_file.SetStoreLimit(
+          self._filter_object, prefilter_events=not self._filter_buffer)
 
       # TODO: allow for single processing.
       # TODO: add upper queue limit.
@@ -511,6 +525,12 @@ class PsortFrontend(analysis_frontend.AnalysisFrontend):
 
       event_object = storage_file.GetSortedEntry()
 
+    # Event objects rejected by the prefilter of the storage file did not
+    # match the filter.
+    if my_filter:
+      counter[u'Events Filtered Out'] += (
+          storage_file.number_of_prefiltered_events)
+
     for analysis_queue in analysis_queues:
       analysis_queue.Close()
     if output_buffer.duplicate_counter:
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""The threaded hashing engine.
+
+The hashing engine updates every hasher in a separate thread, hence multiple
+digest hashes are calculated concurrently. This is effective since hashlib
+releases the global interpreter lock (GIL) while hashing large blocks of data.
+"""
+
+import logging
+import Queue
+import threading
+
+
+class _HasherThread(threading.Thread):
+  """Class that defines a thread that updates a hasher."""
+
+  def __init__(self, hasher_object, maximum_number_of_queued_blocks):
+    """Initializes the hasher thread object.
+
+    Args:
+      hasher_object: the hasher object (instance of BaseHasher).
+      maximum_number_of_queued_blocks: the maximum number of blocks of data
+                                       that are queued for the hasher.
+    """
+    super(_HasherThread, self).__init__(
+        name=u'HasherThread_{0:s}'.format(hasher_object.NAME))
+    self._hasher_object = hasher_object
+    self._queue = Queue.Queue(maxsize=maximum_number_of_queued_blocks)
+    self.daemon = True
+    self.exception = None
+
+  def PushData(self, data):
+    """Pushes a block of data onto the queue of the thread.
+
+    Args:
+      data: a byte string or None to signal the thread to stop.
+    """
+    self._queue.put(data)
+
+  def run(self):
+    """Updates the hasher with the queued blocks of data."""
+    while True:
+      data = self._queue.get()
+      if data is None:
+        break
+
+      # The remaining data is consumed after an exception so that the thread
+      # pushing the data does not block.
+      if self.exception:
+        continue
+
+      try:
+        self._hasher_object.Update(data)
+      except Exception as exception:  # pylint: disable=broad-except
+        self.exception = exception
+
+
+class HashingEngine(object):
+  """Class that defines the threaded hashing engine.
+
+  The blocks of data are shared by the hasher threads without being copied,
+  since a byte string is immutable.
+  """
+
+  # The default number of bytes that should be read per block of data.
+  DEFAULT_READ_SIZE = 1024 * 1024
+
+  # The maximum number of blocks of data that are queued per hasher, which
+  # allows reading the next block while the hashers update.
+  _MAXIMUM_NUMBER_OF_QUEUED_BLOCKS = 4
+
+  # The minimum size of a block of data for which the hashers are updated
+  # in threads, since hashlib only releases the GIL for larger blocks and
+  # smaller files are hashed faster without the overhead of the threads.
+  _MINIMUM_THREADED_DATA_SIZE = 65536
+
+  def __init__(self, hasher_objects):
+    """Initializes the hashing engine object.
+
+    Args:
+      hasher_objects: a list of hasher objects (instances of BaseHasher).
+    """
+    super(HashingEngine, self).__init__()
+    self._hasher_objects = hasher_objects
+    self._hasher_threads = []
+
+  def _StartHasherThreads(self):
+    """Starts a thread per hasher."""
+    for hasher_object in self._hasher_objects:
+      hasher_thread = _HasherThread(
+          hasher_object, self._MAXIMUM_NUMBER_OF_QUEUED_BLOCKS)
+      hasher_thread.start()
+      self._hasher_threads.append(hasher_thread)
+
+  def _StopHasherThreads(self):
+    """Stops the hasher threads.
+
+    Returns:
+      The exception of the first hasher thread that failed to update its
+      hasher or None.
+    """
+    for hasher_thread in self._hasher_threads:
+      hasher_thread.PushData(None)
+
+    exception = None
+    for hasher_thread in self._hasher_threads:
+      hasher_thread.join()
+      if not exception:
+        exception = hasher_thread.exception
+
+    self._hasher_threads = []
+    return exception
+
+  def Close(self):
+    """Closes the hashing engine.
+
+    This function stops the hasher threads, for example when the data could
+    not be read, after which the hashing engine should not be updated.
+    """
+    if self._hasher_threads:
+      self._StopHasherThreads()
+
+  def GetStringDigests(self):
+    """Retrieves the digests of the hashers expressed as unicode strings.
+
+    This function waits for the hasher threads to process the remaining
+    blocks of data, after which the hashing engine should not be updated.
+
+    Returns:
+      A dictionary containing the string digests per hasher name.
+
+    Raises:
+      RuntimeError: if a hasher thread failed to update its hasher.
+    """
+    if self._hasher_threads:
+      exception = self._StopHasherThreads()
+      if exception:
+        raise RuntimeError(
+            u'Unable to update hasher with error: {0!s}'.format(exception))
+
+    digests = {}
+    for hasher_object in self._hasher_objects:
+      digests[hasher_object.NAME] = hasher_object.GetStringDigest()
+
+    return digests
+
+  def Update(self, data):
+    """Updates the hashers with a new block of data.
+
+    Repeated calls to update are equivalent to one single call with the
+    concatenation of the arguments.
+
+    Args:
+      data: a byte string with which to update the hashers.
+    """
+    if (not self._hasher_threads and len(self._hasher_objects) > 1 and
+        len(data) >= self._MINIMUM_THREADED_DATA_SIZE):
+      logging.debug(u'[HashingEngine] starting {0:d} hasher threads.'.format(
+          len(self._hasher_objects)))
+      self._StartHasherThreads()
+
+    if not self._hasher_threads:
+      for hasher_object in self._hasher_objects:
+        hasher_object.Update(data)
+
+    else:
+      for hasher_thread in self._hasher_threads:
+        hasher_thread.PushData(data)
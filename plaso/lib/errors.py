@@ -35,6 +35,10 @@ class NoFormatterFound(Error):
   """Raised when no formatter is found for a particular event."""
 
 
+class ParserTimeout(Error):
+  """Class that defines parser timeout errors."""
+
+
 class PathNotFound(Error):
   """Raised when a preprocessor fails to fill in a path variable."""
 
@@ -469,3 +469,31 @@ class PreprocessObject(object):
 #              dfvfs.PathSpec). The default is None.
 ParseError = collections.namedtuple(
     u'ParseError', u'name description path_spec')
+
+
+# Named tuple that defines a serialized event object, which allows
+# the storage writer to store an event object without deserializing it.
+#
+# Attributes:
+#   timestamp: The timestamp of the event object.
+#   data_type: The data type of the event object.
+#   parser: The parser chain of the event object or None.
+#   plugin: The name of the plugin of the event object or None.
+#   data: A byte string containing the serialized form of the event object.
+SerializedEventObject = collections.namedtuple(
+    u'SerializedEventObject', u'timestamp data_type parser plugin data')
+
+
+# Named tuple that defines a slow file record, which describes a file entry
+# that took a parser long to parse or of which the parsing was aborted since
+# the parser exceeded its time budget.
+#
+# Attributes:
+#   parser: The name of the parser.
+#   display_name: The display name of the file entry.
+#   size: The number of bytes of the file entry, or of the range of the file
+#         entry, that was parsed.
+#   elapsed_time: The number of seconds the parser ran.
+#   aborted: Boolean value to indicate the parsing was aborted.
+SlowFileRecord = collections.namedtuple(
+    u'SlowFileRecord', u'parser display_name size elapsed_time aborted')
@@ -42,6 +42,11 @@ class FilterObject(object):
     """Return a list of fields for adaptive output modules."""
     return []
 
+  @property
+  def matcher(self):
+    """Return the compiled filter matcher or None if not available."""
+    return self._matcher
+
   @property
   def separator(self):
     """Return a separator for adaptive output modules."""
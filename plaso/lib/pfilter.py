@@ -442,6 +442,74 @@ class TimeRangeCache(object):
       return last, first
 
 
+def GetAttributeConstraints(matcher):
+  """Retrieves the parser and data type constraints of a compiled filter.
+
+  Only the parts of the filter that are guaranteed to hold for every matching
+  event object are considered, e.g. "parser is 'winevtx'" or "data_type is
+  'fs:stat' or data_type is 'windows:evtx:record'". Negated expressions and
+  other operators do not constrain the values.
+
+  Args:
+    matcher: the compiled filter (instance of objectfilter.Filter).
+
+  Returns:
+    A dictionary containing the attribute name, either "data_type" or "parser",
+    as key and a set of the values one of which a matching event object must
+    have as value. Attributes that are not constrained are not included.
+  """
+  if isinstance(matcher, objectfilter.AndFilter):
+    constraints = {}
+    for child_matcher in matcher.args:
+      child_constraints = GetAttributeConstraints(child_matcher)
+      for attribute_name, values in child_constraints.iteritems():
+        if attribute_name in constraints:
+          constraints[attribute_name] &= values
+        else:
+          constraints[attribute_name] = set(values)
+    return constraints
+
+  if isinstance(matcher, objectfilter.OrFilter):
+    constraints = None
+    for child_matcher in matcher.args:
+      child_constraints = GetAttributeConstraints(child_matcher)
+      if constraints is None:
+        constraints = child_constraints
+        continue
+
+      # An attribute is only constrained if every alternative constrains it.
+      for attribute_name in constraints.keys():
+        if attribute_name in child_constraints:
+          constraints[attribute_name] |= child_constraints[attribute_name]
+        else:
+          del constraints[attribute_name]
+    return constraints or {}
+
+  if not isinstance(matcher, objectfilter.GenericBinaryOperator):
+    return {}
+
+  if not matcher.bool_value:
+    return {}
+
+  attribute_name = matcher.left_operand
+  if not isinstance(attribute_name, basestring):
+    return {}
+
+  attribute_name = attribute_name.lower()
+  if attribute_name not in (u'data_type', u'parser'):
+    return {}
+
+  if isinstance(matcher, ParserList):
+    return {attribute_name: set(matcher.compiled_list)}
+
+  if isinstance(matcher, objectfilter.Equals):
+    value = matcher.right_operand
+    if isinstance(value, basestring):
+      return {attribute_name: set([value])}
+
+  return {}
+
+
 def GetMatcher(query, quiet=False):
   """Return a filter match object for a given query."""
   matcher = None
@@ -9,11 +9,12 @@ The storage file is essentially split up in two categories:
    +  Other files, these contain grouping information, tag, collection
       information or other metadata describing the content of the store files.
 
-The store itself is a collection of four files:
+The store itself is a collection of five files:
   plaso_meta.<store_number>
   plaso_proto.<store_number>
   plaso_index.<store_number>
   plaso_timestamps.<store_number>
+  plaso_string_table.<store_number>
 
 The plaso_proto file within each store contains several serialized EventObjects
 or events that are serialized (as a protobuf). All of the EventObjects within
@@ -25,14 +26,24 @@ The other files that make up the store are:
 
   + plaso_meta
 
-Simple text file using YAML for storing metadata information about the store.::
+Simple text file using JSON for storing metadata information about the store,
+such as the time range and the number of events per data type and parser.::
 
   definition, example:
-    variable: value
-    a_list: [value, value, value]
+    {"variable": value, "a_list": [value, value, value]}
 
 This can be used to filter out which proto files should be included
-in processing.
+in processing. Storage files of version 1 use YAML instead of JSON.
+
+The metadata of all the stores that are written in a single session are
+also stored in a catalogue file:
+
+  plaso_catalogue.<number of the first store of the session>
+
+The catalogue is a JSON dictionary with the store numbers as keys and the
+store metadata as values. The catalogues are read once when the storage file
+is opened, so that the metadata of the individual stores does not need to be
+read separately.
 
 + plaso_index
 
@@ -71,6 +82,47 @@ The structure of a proto file is:
 | size |  protobuf (plaso_storage_proto) | size | proto...|
 +------+---------------------------------+------+------...+
 
+  + plaso_string_table
+
+Frequently repeated attribute values, such as the parser, data type and path
+specification, are stored once per store in the string table. The serialized
+EventObjects refer to these values by their index in the string table. A path
+specification is deserialized once per store, hence the EventObjects read from
+the same store and file share a single path specification object. The
+structure of the string table file is:
++------+-------+------+------...+
+| size | value | size | value...|
++------+-------+------+------...+
+
+Storage files of version 2 and earlier do not contain string tables.
+
+By default the store files are ZIP compressed, which means that in order to
+read a specific entry all the data preceding it needs to be decompressed.
+When the storage file is written with random access enabled the plaso_proto,
+plaso_index and plaso_timestamps files are stored without compression. The
+data of these files is then read directly from a memory map of the storage
+file, which allows to seek any entry in constant time.
+
+Every time event tags are stored three streams are written:
+
+  plaso_tagging.<number>
+  plaso_tag_index.<number>
+  plaso_tag_sorted_index.<number>
+
+The plaso_tagging stream contains the serialized event tags and the
+plaso_tag_index stream the offset of every event tag. The plaso_tag_sorted_index
+stream contains the same offsets for the event tags of event objects that are
+identified by store number and index, sorted by a 64-bit integer key of the
+store number and index. It is stored without compression so that the event tag
+of an event object can be looked up by bisection in the memory map of the
+storage file. The offsets of event tags of event objects that are identified
+by UUID are stored as a JSON dictionary in the plaso_tag_uuid_index stream.
+
+The stores can be written by multiple storage writers, each writing to
+a separate part storage file. The part storage files are merged into a single
+storage file afterwards. The merge copies the compressed streams of each store
+as-is and only renumbers the stores.
+
 For further details about the storage design see:
   http://plaso.kiddaland.net/developer/libraries/storage
 """
@@ -80,13 +132,21 @@ For further details about the storage design see:
 # other tools. This file will then contain the queueing mechanism and other
 # plaso specific mechanism, making it easier to import the storage library.
 
+import array
+import bisect
 import collections
 import construct
+import copy
 import heapq
+import json
 import logging
+import mmap
+import multiprocessing
+import os
 # TODO: replace all instances of struct by construct!
 import struct
 import sys
+import tempfile
 import zipfile
 
 from google.protobuf import message
@@ -107,6 +167,7 @@ from plaso.lib import utils
 from plaso.proto import plaso_storage_pb2
 from plaso.serializer import json_serializer
 from plaso.serializer import protobuf_serializer
+from plaso.serializer import string_table
 
 
 class _EventTagIndexValue(object):
@@ -135,16 +196,21 @@ class _EventTagIndexValue(object):
   TAG_TYPE_NUMERIC = 1
   TAG_TYPE_UUID = 2
 
-  def __init__(self, identifier, store_number=0, store_offset=0):
+  def __init__(
+      self, identifier, event_key=None, store_number=0, store_offset=0):
     """Initializes the tag index value.
 
     Args:
       identifier: the identifier string.
+      event_key: optional key of the tagged event object, as used by the
+                 sorted event tag index, or None if the event object is
+                 identified by UUID. The default is None.
       store_number: optional store number. The default is 0.
       store_offset: optional offset relative to the start of the store.
                     The default 0.
     """
     super(_EventTagIndexValue, self).__init__()
+    self.event_key = event_key
     self.identifier = identifier
     self.store_number = store_number
     self.store_offset = store_offset
@@ -172,16 +238,492 @@ class _EventTagIndexValue(object):
 
     tag_entry = tag_index_struct.get('tag', {})
     if tag_type == cls.TAG_TYPE_NUMERIC:
+      event_store_number = tag_entry.get(u'store_number', 0)
+      event_store_index = tag_entry.get(u'store_index', 0)
       tag_identifier = u'{0:d}:{1:d}'.format(
-          tag_entry.get(u'store_number', 0),
-          tag_entry.get(u'store_index', 0))
+          event_store_number, event_store_index)
+      event_key = _EventTagSortedIndex.GetKey(
+          event_store_number, event_store_index)
 
     else:
       tag_identifier = tag_entry.get(u'event_uuid', '0')
+      event_key = None
 
     store_offset = tag_index_struct.get(u'offset')
     return _EventTagIndexValue(
-        tag_identifier, store_number=store_number, store_offset=store_offset)
+        tag_identifier, event_key=event_key, store_number=store_number,
+        store_offset=store_offset)
+
+
+class _EventTagSortedIndex(object):
+  """Class that defines the sorted event tag index of a tagging stream.
+
+  The sorted index maps the store number and index of a tagged event object
+  to the offset of its event tag in the corresponding plaso_tagging stream.
+  The keys are 64-bit integers that contain the store number in the upper
+  and the store index in the lower 32 bits. The index data consists of
+  the sorted keys as 64-bit little-endian integers followed by the offsets
+  as 32-bit little-endian integers, so that a key can be bisected without
+  converting the index into Python objects.
+  """
+
+  _ENTRY_SIZE = 12
+  _KEY_SIZE = 8
+
+  def __init__(self, data):
+    """Initializes the sorted event tag index.
+
+    Args:
+      data: a byte string or buffer object containing the index data.
+    """
+    super(_EventTagSortedIndex, self).__init__()
+    self._data = data
+    self._number_of_entries = len(data) // self._ENTRY_SIZE
+
+  def __getitem__(self, entry_index):
+    """Retrieves the key of a specific entry.
+
+    Args:
+      entry_index: the entry index.
+
+    Returns:
+      An integer containing the key.
+
+    Raises:
+      IndexError: if the entry index is out of bounds.
+    """
+    if entry_index < 0 or entry_index >= self._number_of_entries:
+      raise IndexError(u'Entry index out of bounds.')
+
+    return struct.unpack_from('<q', self._data, entry_index * self._KEY_SIZE)[0]
+
+  def __len__(self):
+    """Retrieves the number of entries."""
+    return self._number_of_entries
+
+  @classmethod
+  def GetKey(cls, store_number, store_index):
+    """Retrieves the key of an event object.
+
+    Args:
+      store_number: the store number of the event object.
+      store_index: the store index of the event object.
+
+    Returns:
+      An integer containing the key.
+    """
+    return (store_number << 32) | store_index
+
+  @classmethod
+  def GetIndexData(cls, entries):
+    """Retrieves the index data of entries.
+
+    Args:
+      entries: a list of tuples of the key and the offset of the event tag,
+               in the order the event tags were written.
+
+    Returns:
+      A byte string containing the index data.
+    """
+    # The sort is stable, hence of duplicate keys the last written entry
+    # is the last one in the index.
+    entries = sorted(entries, key=lambda entry: entry[0])
+
+    number_of_entries = len(entries)
+    keys_data = struct.pack(
+        '<{0:d}q'.format(number_of_entries), *[key for key, _ in entries])
+    offsets_data = struct.pack(
+        '<{0:d}I'.format(number_of_entries),
+        *[offset for _, offset in entries])
+
+    return b''.join([keys_data, offsets_data])
+
+  def GetOffset(self, key):
+    """Retrieves the offset of the event tag of an event object.
+
+    Args:
+      key: the key of the event object.
+
+    Returns:
+      The offset of the event tag in the plaso_tagging stream or None if
+      the event object is not tagged.
+    """
+    entry_index = bisect.bisect_right(self, key) - 1
+    if entry_index < 0 or self[entry_index] != key:
+      return
+
+    offsets_offset = self._number_of_entries * self._KEY_SIZE
+    return struct.unpack_from(
+        '<I', self._data, offsets_offset + (entry_index * 4))[0]
+
+
+class _StoredStream(object):
+  """Class that implements a seekable stream of an uncompressed ZIP member.
+
+  Since zipfile.ZipExtFile is not seekable, the data of ZIP members that
+  are stored without compression is read directly from a memory map of the
+  ZIP container instead.
+  """
+
+  def __init__(self, container_map, data_offset, data_size):
+    """Initializes the stream.
+
+    Args:
+      container_map: the memory map of the ZIP container (instance of
+                     mmap.mmap).
+      data_offset: the offset of the data relative to the start of
+                   the ZIP container.
+      data_size: the size of the data.
+    """
+    super(_StoredStream, self).__init__()
+    self._container_map = container_map
+    self._current_offset = 0
+    self._data_offset = data_offset
+    self._data_size = data_size
+
+  def close(self):
+    """Closes the stream.
+
+    The memory map is owned by the storage file and is not closed.
+    """
+    self._container_map = None
+
+  def GetDataBuffer(self):
+    """Retrieves a read-only buffer of the stream data.
+
+    The buffer references the memory map, hence the data is not copied.
+
+    Returns:
+      A buffer object of the stream data.
+    """
+    return buffer(self._container_map, self._data_offset, self._data_size)
+
+  def read(self, size=None):
+    """Reads a byte string from the stream.
+
+    Args:
+      size: optional number of bytes to read. The default is None,
+            which represents all remaining data.
+
+    Returns:
+      A byte string containing the data read.
+    """
+    if self._current_offset >= self._data_size:
+      return b''
+
+    if size is None or size < 0:
+      end_offset = self._data_size
+    else:
+      end_offset = min(self._current_offset + size, self._data_size)
+
+    data = self._container_map[
+        self._data_offset + self._current_offset:
+        self._data_offset + end_offset]
+    self._current_offset = end_offset
+    return data
+
+  def seek(self, offset, whence=os.SEEK_SET):
+    """Seeks an offset within the stream.
+
+    Args:
+      offset: the offset to seek.
+      whence: optional value that indicates whether offset is an absolute
+              or relative position within the stream. The default is
+              os.SEEK_SET.
+
+    Raises:
+      IOError: if the seek failed.
+    """
+    if whence == os.SEEK_CUR:
+      offset += self._current_offset
+    elif whence == os.SEEK_END:
+      offset += self._data_size
+    elif whence != os.SEEK_SET:
+      raise IOError(u'Unsupported whence.')
+
+    if offset < 0:
+      raise IOError(u'Invalid offset value less than zero.')
+
+    self._current_offset = offset
+
+  def seekable(self):
+    """Determines if the stream is seekable."""
+    return True
+
+  def tell(self):
+    """Retrieves the current offset into the stream."""
+    return self._current_offset
+
+
+class _StoreIndexCache(object):
+  """Class that implements a least recently used cache of store indexes.
+
+  The store index contains the offsets of the entries in the plaso_proto
+  stream of a store. The size of the cache is bound by the total size
+  of the cached indexes, except for the most recently used index which
+  is always kept.
+  """
+
+  def __init__(self, maximum_size):
+    """Initializes the store index cache.
+
+    Args:
+      maximum_size: the maximum size of the cached store indexes in bytes.
+    """
+    super(_StoreIndexCache, self).__init__()
+    self._maximum_size = maximum_size
+    self._size = 0
+    self._store_indexes = collections.OrderedDict()
+
+  def _RemoveLeastRecentlyUsed(self):
+    """Removes the least recently used indexes that exceed the maximum size."""
+    while self._size > self._maximum_size and len(self._store_indexes) > 1:
+      _, store_index = self._store_indexes.popitem(last=False)
+      self._size -= len(store_index) * store_index.itemsize
+
+  def Empty(self):
+    """Empties the cache."""
+    self._size = 0
+    self._store_indexes = collections.OrderedDict()
+
+  def GetStoreIndex(self, store_number):
+    """Retrieves a store index.
+
+    Args:
+      store_number: the store number.
+
+    Returns:
+      The store index (instance of array.array) or None if not cached.
+    """
+    store_index = self._store_indexes.pop(store_number, None)
+    if store_index is not None:
+      # Re-insert the store index to mark it as the most recently used.
+      self._store_indexes[store_number] = store_index
+    return store_index
+
+  def SetMaximumSize(self, maximum_size):
+    """Sets the maximum size of the cache.
+
+    Args:
+      maximum_size: the maximum size of the cached store indexes in bytes.
+    """
+    self._maximum_size = maximum_size
+    self._RemoveLeastRecentlyUsed()
+
+  def SetStoreIndex(self, store_number, store_index):
+    """Caches a store index.
+
+    Args:
+      store_number: the store number.
+      store_index: the store index (instance of array.array).
+    """
+    previous_store_index = self._store_indexes.pop(store_number, None)
+    if previous_store_index is not None:
+      self._size -= len(previous_store_index) * previous_store_index.itemsize
+
+    self._store_indexes[store_number] = store_index
+    self._size += len(store_index) * store_index.itemsize
+    self._RemoveLeastRecentlyUsed()
+
+
+# The serialized string tables of the stores, which are set once per prefetch
+# worker process by the pool initializer, and the parsed string tables.
+_PREFETCH_STRING_TABLE_DATA = {}
+_PREFETCH_STRING_TABLES = {}
+
+
+def _InitializePrefetchProcess(string_table_data_per_store):
+  """Initializes a prefetch worker process.
+
+  Args:
+    string_table_data_per_store: a dictionary containing the serialized
+                                 string table per store number.
+  """
+  _PREFETCH_STRING_TABLE_DATA.clear()
+  _PREFETCH_STRING_TABLE_DATA.update(string_table_data_per_store)
+  _PREFETCH_STRING_TABLES.clear()
+
+
+def _DeserializeEventObjects(
+    event_object_serializer, store_number, serialized_entries):
+  """Deserializes event objects in a prefetch worker process.
+
+  Args:
+    event_object_serializer: the event object serializer.
+    store_number: the number of the store.
+    serialized_entries: a list of tuples of the entry index and the serialized
+                        event object.
+
+  Returns:
+    A list of event objects (instances of EventObject).
+  """
+  # The string table is only parsed once per store by every worker process.
+  store_string_table = _PREFETCH_STRING_TABLES.get(store_number, None)
+  if not store_string_table:
+    string_table_data = _PREFETCH_STRING_TABLE_DATA.get(store_number, None)
+    if string_table_data is not None:
+      store_string_table = string_table.StringTable.ReadSerialized(
+          string_table_data)
+      _PREFETCH_STRING_TABLES[store_number] = store_string_table
+
+  event_objects = []
+  for entry_index, event_object_data in serialized_entries:
+    event_object = event_object_serializer.ReadSerialized(
+        event_object_data, string_table=store_string_table)
+    event_object.store_number = store_number
+    event_object.store_index = entry_index
+    event_objects.append(event_object)
+
+  return event_objects
+
+
+class _StorePrefetchReader(object):
+  """Class that deserializes the entries of a store ahead of time.
+
+  The serialized entries are read in batches and deserialized by a pool of
+  worker processes. A bounded number of batches is pending per store, so that
+  the deserialization of the stores overlaps with the merge.
+  """
+
+  def __init__(
+      self, storage_file, store_number, process_pool, batch_size=256,
+      maximum_number_of_pending_batches=4):
+    """Initializes the store prefetch reader.
+
+    Args:
+      storage_file: the storage file (instance of StorageFile).
+      store_number: the number of the store.
+      process_pool: the worker process pool (instance of
+                    multiprocessing.Pool).
+      batch_size: optional maximum number of entries per batch.
+                  The default is 256.
+      maximum_number_of_pending_batches: optional maximum number of batches
+                                         that are being deserialized.
+                                         The default is 4.
+    """
+    super(_StorePrefetchReader, self).__init__()
+    self._batch_size = batch_size
+    self._end_of_stream = False
+    self._event_objects = collections.deque()
+    self._maximum_number_of_pending_batches = maximum_number_of_pending_batches
+    self._pending_batches = collections.deque()
+    self._process_pool = process_pool
+    self._storage_file = storage_file
+    self._store_number = store_number
+
+  def QueueBatches(self):
+    """Reads serialized entries and queues them for deserialization."""
+    maximum_number_of_pending_batches = self._maximum_number_of_pending_batches
+    while (not self._end_of_stream and
+           len(self._pending_batches) < maximum_number_of_pending_batches):
+      serialized_entries = []
+      while len(serialized_entries) < self._batch_size:
+        # pylint: disable=protected-access
+        event_object_data, entry_index = (
+            self._storage_file._GetEventObjectProtobufString(
+                self._store_number))
+        if not event_object_data:
+          self._end_of_stream = True
+          break
+
+        # pylint: disable=protected-access
+        if not self._storage_file._PrefilterEventObjectData(
+            self._store_number, event_object_data):
+          continue
+
+        serialized_entries.append((entry_index, event_object_data))
+
+      if serialized_entries:
+        # pylint: disable=protected-access
+        async_result = self._process_pool.apply_async(
+            _DeserializeEventObjects, (
+                self._storage_file._event_object_serializer,
+                self._store_number, serialized_entries))
+        self._pending_batches.append(async_result)
+
+  def GetEventObject(self):
+    """Retrieves the next event object of the store.
+
+    Returns:
+      An event object (instance of EventObject) or None if no more entries
+      are available.
+    """
+    if not self._event_objects:
+      self.QueueBatches()
+      if not self._pending_batches:
+        return
+
+      async_result = self._pending_batches.popleft()
+      self._event_objects.extend(async_result.get())
+
+      # Keep the pool busy while the batch is being merged.
+      self.QueueBatches()
+
+    return self._event_objects.popleft()
+
+
+class _TimestampIndex(object):
+  """Class that defines the timestamp index of a store.
+
+  The timestamp index provides a sequence interface to the timestamps in
+  the plaso_timestamps stream of a store, without converting them into
+  Python objects up front. Since the timestamps are sorted the bisect module
+  can be used to find the entries within a time range.
+  """
+
+  _TIMESTAMP_SIZE = 8
+
+  def __init__(self, data):
+    """Initializes the timestamp index.
+
+    Args:
+      data: a byte string or buffer object containing the timestamps
+            as 64-bit little-endian integers.
+    """
+    super(_TimestampIndex, self).__init__()
+    self._data = data
+    self._number_of_entries = len(data) // self._TIMESTAMP_SIZE
+
+  def __getitem__(self, entry_index):
+    """Retrieves the timestamp of a specific entry.
+
+    Args:
+      entry_index: the entry index.
+
+    Returns:
+      An integer containing the timestamp.
+
+    Raises:
+      IndexError: if the entry index is out of bounds.
+    """
+    if entry_index < 0:
+      entry_index += self._number_of_entries
+
+    if entry_index < 0 or entry_index >= self._number_of_entries:
+      raise IndexError(u'Entry index out of bounds.')
+
+    return struct.unpack_from(
+        '<q', self._data, entry_index * self._TIMESTAMP_SIZE)[0]
+
+  def __len__(self):
+    """Retrieves the number of entries."""
+    return self._number_of_entries
+
+  def GetEntryIndexRange(self, first_timestamp, last_timestamp):
+    """Retrieves the range of entries within a time range.
+
+    Args:
+      first_timestamp: the first timestamp of the time range.
+      last_timestamp: the last timestamp of the time range.
+
+    Returns:
+      A tuple of the index of the first entry within the time range and
+      the index of the entry following the last entry within the time range.
+    """
+    first_entry_index = bisect.bisect_left(self, first_timestamp)
+    end_entry_index = bisect.bisect_right(
+        self, last_timestamp, lo=first_entry_index)
+    return first_entry_index, end_entry_index
 
 
 class StorageFile(object):
@@ -189,6 +731,19 @@ class StorageFile(object):
 
   _STREAM_DATA_SEGMENT_SIZE = 1024
 
+  # The size of the data segments used to copy a stream.
+  _STREAM_COPY_SEGMENT_SIZE = 16 * 1024 * 1024
+
+  # The name prefixes of the streams that make up a store.
+  _STORE_STREAM_NAME_PREFIXES = frozenset([
+      u'plaso_index', u'plaso_meta', u'plaso_proto', u'plaso_string_table',
+      u'plaso_timestamps'])
+
+  # The store metadata keys that contain the values of the filter attributes.
+  _METADATA_CONSTRAINT_KEYS = {
+      u'data_type': u'data_type',
+      u'parser': u'parsers'}
+
   # Set the maximum buffer size to 196 MiB
   MAX_BUFFER_SIZE = 196 * 1024 * 1024
 
@@ -198,12 +753,33 @@ class StorageFile(object):
   # Set the maximum report protobuf string size to 24 MiB
   MAX_REPORT_PROTOBUF_SIZE = 24 * 1024 * 1024
 
+  # Set the default maximum size of the cached store indexes to 64 MiB
+  DEFAULT_INDEX_CACHE_SIZE = 64 * 1024 * 1024
+
   # Set the version of this storage mechanism.
-  STORAGE_VERSION = 1
+  STORAGE_VERSION = 3
 
   # Define structs.
   INTEGER = construct.ULInt32(u'integer')
 
+  _ZIP_LOCAL_FILE_HEADER_STRUCT = construct.Struct(
+      u'zip_local_file_header',
+      construct.Bytes(u'signature', 4),
+      construct.ULInt16(u'extract_version'),
+      construct.ULInt16(u'flags'),
+      construct.ULInt16(u'compression_method'),
+      construct.ULInt16(u'modification_time'),
+      construct.ULInt16(u'modification_date'),
+      construct.ULInt32(u'crc32'),
+      construct.ULInt32(u'compressed_size'),
+      construct.ULInt32(u'uncompressed_size'),
+      construct.ULInt16(u'filename_size'),
+      construct.ULInt16(u'extra_field_size'))
+
+  _ZIP_LOCAL_FILE_HEADER_SIZE = _ZIP_LOCAL_FILE_HEADER_STRUCT.sizeof()
+
+  _ZIP_LOCAL_FILE_HEADER_SIGNATURE = b'PK\x03\x04'
+
   source_short_map = {}
   for value in plaso_storage_pb2.EventObject.DESCRIPTOR.enum_types_by_name[
       u'SourceShort'].values:
@@ -211,6 +787,7 @@ class StorageFile(object):
 
   def __init__(
       self, output_file, buffer_size=0, read_only=False, pre_obj=None,
+      random_access=False,
       serializer_format=definitions.SERIALIZER_FORMAT_PROTOBUF):
     """Initializes the storage file.
 
@@ -222,6 +799,10 @@ class StorageFile(object):
                  for reading only. The default is false.
       pre_obj: Optional preprocessing object that gets stored inside
                the storage file. The default is None.
+      random_access: Optional boolean to indicate the store streams should
+                     be written without compression so that individual
+                     entries can be read with random access. The default
+                     is false.
       serializer_format: Optional storage serializer format. The default is
                          protobuf.
 
@@ -237,17 +818,35 @@ class StorageFile(object):
     self._buffer_first_timestamp = sys.maxint
     self._buffer_last_timestamp = 0
     self._buffer_size = 0
+    self._catalogue = {}
+    self._catalogue_read = False
+    self._container_file_object = None
+    self._container_map = None
+    self._entry_index_ranges = {}
     self._event_object_serializer = None
     self._event_tag_index = None
+    self._event_tag_uuid_index = None
     self._file_open = False
     self._file_number = 1
     self._first_file_number = None
     self._max_buffer_size = buffer_size or self.MAX_BUFFER_SIZE
+    self._number_of_prefiltered_events = 0
     self._output_file = output_file
     self._pre_obj = pre_obj
+    self._prefetch_number_of_processes = 0
+    self._prefetch_process_pool = None
+    self._prefetch_readers = {}
+    self._prefilter_values = {}
     self._proto_streams = {}
+    self._random_access = random_access
     self._read_only = None
+    self._prefilter_store_values = {}
     self._serializer_format_string = u''
+    self._session_catalogue = {}
+    self._store_index_cache = _StoreIndexCache(self.DEFAULT_INDEX_CACHE_SIZE)
+    self._string_table = string_table.StringTable()
+    self._string_tables = {}
+    self._timestamp_indexes = {}
     self._write_counter = 0
 
     self._SetSerializerFormat(serializer_format)
@@ -268,6 +867,11 @@ class StorageFile(object):
     """The file path."""
     return self._output_file
 
+  @property
+  def number_of_prefiltered_events(self):
+    """The number of event objects rejected by the prefilter."""
+    return self._number_of_prefiltered_events
+
   @property
   def serialization_format(self):
     """The serialization format."""
@@ -304,6 +908,8 @@ class StorageFile(object):
     if serializer:
       self._SetSerializerFormat(serializer)
 
+    self._ReadCatalogue()
+
     if not self._read_only:
       logging.debug(u'Writing to ZIP file with buffer size: {0:d}'.format(
           self._max_buffer_size))
@@ -351,94 +957,282 @@ class StorageFile(object):
   def _BuildTagIndex(self):
     """Builds the tag index that contains the offsets for each tag.
 
+    The sorted event tag index streams are used if available. Storage files
+    without these streams are read from the plaso_tag_index streams.
+
     Raises:
       IOError: if the stream cannot be opened.
     """
-    self._event_tag_index = {}
+    self._event_tag_index = []
+    self._event_tag_uuid_index = {}
 
-    for stream_name in self._GetStreamNames():
+    stream_names = frozenset(self._GetStreamNames())
+    for stream_name in sorted(stream_names):
       if not stream_name.startswith(u'plaso_tag_index.'):
         continue
 
-      file_object = self._OpenStream(stream_name, u'r')
-      if file_object is None:
-        raise IOError(u'Unable to open stream: {0:s}'.format(stream_name))
-
       _, _, store_number = stream_name.rpartition(u'.')
-      # TODO: catch exception.
-      store_number = int(store_number, 10)
+      try:
+        store_number = int(store_number, 10)
+      except ValueError:
+        continue
 
-      while True:
-        tag_index_value = _EventTagIndexValue.Read(
-            file_object, store_number)
-        if tag_index_value is None:
-          break
+      sorted_index_stream_name = u'plaso_tag_sorted_index.{0:06d}'.format(
+          store_number)
+      if sorted_index_stream_name in stream_names:
+        file_object = self._OpenSeekableStream(sorted_index_stream_name)
+        if file_object:
+          sorted_index_data = file_object.GetDataBuffer()
+        else:
+          sorted_index_data = self._ReadStream(sorted_index_stream_name)
+
+        uuid_index_stream_name = u'plaso_tag_uuid_index.{0:06d}'.format(
+            store_number)
+        if uuid_index_stream_name in stream_names:
+          uuid_index = json.loads(self._ReadStream(uuid_index_stream_name))
+          for event_uuid, store_offset in uuid_index.iteritems():
+            self._event_tag_uuid_index[event_uuid] = _EventTagIndexValue(
+                event_uuid, store_number=store_number,
+                store_offset=store_offset)
+
+      else:
+        file_object = self._OpenStream(stream_name, u'r')
+        if file_object is None:
+          raise IOError(u'Unable to open stream: {0:s}'.format(stream_name))
+
+        entries = []
+        while True:
+          tag_index_value = _EventTagIndexValue.Read(
+              file_object, store_number)
+          if tag_index_value is None:
+            break
+
+          if tag_index_value.event_key is None:
+            self._event_tag_uuid_index[tag_index_value.identifier] = (
+                tag_index_value)
+          else:
+            entries.append((
+                tag_index_value.event_key, tag_index_value.store_offset))
+
+        sorted_index_data = _EventTagSortedIndex.GetIndexData(entries)
+
+      self._event_tag_index.append(
+          (store_number, _EventTagSortedIndex(sorted_index_data)))
 
-        self._event_tag_index[tag_index_value.identifier] = tag_index_value
+    # Later tagging streams take precedence over earlier ones.
+    self._event_tag_index.reverse()
+
+  def _CopyStream(self, storage_file, source_stream_name, stream_name):
+    """Copies a stream from another storage file.
+
+    The data of the stream is copied as stored, hence compressed streams
+    are not decompressed and compressed again. Streams of which the local
+    file header cannot be copied as-is are read and written instead.
+
+    Args:
+      storage_file: the storage file (instance of StorageFile) that contains
+                    the stream.
+      source_stream_name: the name of the stream in the other storage file.
+      stream_name: the name of the stream in the storage file.
+
+    Raises:
+      IOError: if the stream cannot be copied.
+    """
+    zip_info = storage_file._zipfile.getinfo(source_stream_name)
+
+    # Bit 0 of the flags indicates the data is encrypted and bit 3 that
+    # the sizes are stored in a data descriptor after the data. Streams that
+    # require ZIP64 extensions are not copied as-is either.
+    if (zip_info.flag_bits & 0x09 or
+        zip_info.file_size > zipfile.ZIP64_LIMIT or
+        zip_info.compress_size > zipfile.ZIP64_LIMIT or
+        self._zipfile.fp.tell() > zipfile.ZIP64_LIMIT):
+      self._RewriteStream(storage_file, source_stream_name, stream_name)
+      return
+
+    source_file_object = storage_file._zipfile.fp
+    source_file_object.seek(zip_info.header_offset, os.SEEK_SET)
+
+    local_file_header = self._ZIP_LOCAL_FILE_HEADER_STRUCT.parse(
+        source_file_object.read(self._ZIP_LOCAL_FILE_HEADER_SIZE))
+    if local_file_header.signature != self._ZIP_LOCAL_FILE_HEADER_SIGNATURE:
+      raise IOError(
+          u'Unsupported local file header signature of stream: {0:s}'.format(
+              source_stream_name))
+
+    if local_file_header.flags & 0x09:
+      self._RewriteStream(storage_file, source_stream_name, stream_name)
+      return
+
+    source_file_object.seek(
+        local_file_header.filename_size + local_file_header.extra_field_size,
+        os.SEEK_CUR)
+
+    new_zip_info = zipfile.ZipInfo(
+        filename=stream_name, date_time=zip_info.date_time)
+    new_zip_info.compress_type = zip_info.compress_type
+    new_zip_info.external_attr = zip_info.external_attr
+    new_zip_info.CRC = zip_info.CRC
+    new_zip_info.compress_size = zip_info.compress_size
+    new_zip_info.file_size = zip_info.file_size
+
+    # ZipFile does not provide an interface to write data that is already
+    # compressed, hence the stream is written the same way ZipFile.writestr
+    # writes a stream.
+    file_object = self._zipfile.fp
+    new_zip_info.header_offset = file_object.tell()
+
+    # pylint: disable=protected-access
+    self._zipfile._writecheck(new_zip_info)
+    self._zipfile._didModify = True
+
+    file_object.write(new_zip_info.FileHeader(False))
+
+    data_size = zip_info.compress_size
+    while data_size > 0:
+      data = source_file_object.read(
+          min(data_size, self._STREAM_COPY_SEGMENT_SIZE))
+      if not data:
+        raise IOError(u'Unable to read stream: {0:s}'.format(
+            source_stream_name))
+
+      file_object.write(data)
+      data_size -= len(data)
+
+    file_object.flush()
+
+    self._zipfile.filelist.append(new_zip_info)
+    self._zipfile.NameToInfo[stream_name] = new_zip_info
 
   def _FlushBuffer(self):
     """Flushes the buffered streams to disk."""
     if not self._buffer_size:
       return
 
-    yaml_dict = {
-        u'range': (self._buffer_first_timestamp, self._buffer_last_timestamp),
+    store_metadata = {
+        u'range': [self._buffer_first_timestamp, self._buffer_last_timestamp],
         u'version': self.STORAGE_VERSION,
         u'data_type': list(self._count_data_type.viewkeys()),
         u'parsers': list(self._count_parser.viewkeys()),
         u'count': len(self._buffer),
+        u'parser_count': self._count_parser.most_common(),
         u'type_count': self._count_data_type.most_common()}
     self._count_data_type = collections.Counter()
     self._count_parser = collections.Counter()
 
     stream_name = u'plaso_meta.{0:06d}'.format(self._file_number)
-    # TODO: why have YAML serialization here?
-    self._WriteStream(stream_name, yaml.safe_dump(yaml_dict))
-
-    ofs = 0
-    proto_str = []
-    index_str = []
-    timestamp_str = []
-    for _ in range(len(self._buffer)):
-      timestamp, entry = heapq.heappop(self._buffer)
-      # TODO: Instead of appending to an array
-      # which is not optimal (loads up the entire max file
-      # size into memory) Zipfile should be extended to
-      # allow appending to files (implement lock).
-      try:
+    self._WriteStream(stream_name, json.dumps(store_metadata, sort_keys=True))
+
+    self._catalogue[self._file_number] = store_metadata
+    self._session_catalogue[self._file_number] = store_metadata
+
+    # The proto stream is written to a temporary file while the entries are
+    # removed from the buffer, so that the serialized entries are not kept
+    # in memory twice. The index and timestamps are built incrementally.
+    if isinstance(self._output_file, basestring):
+      temporary_directory = os.path.dirname(os.path.abspath(self._output_file))
+    else:
+      temporary_directory = None
+
+    proto_file_object = tempfile.NamedTemporaryFile(
+        dir=temporary_directory, prefix=u'plaso_proto.', delete=False)
+
+    try:
+      index_data = bytearray()
+      timestamp_data = bytearray()
+      proto_offset = 0
+      while self._buffer:
+        timestamp, _, entry = heapq.heappop(self._buffer)
+
         # Appending a timestamp to the timestamp index, this is used during
-        # time based filtering. If this is not done we would need to unserialize
-        # all events to get the timestamp value which is really slow.
-        timestamp_str.append(struct.pack('<q', timestamp))
-      except struct.error as exception:
-        # TODO: Instead of just logging the error unserialize the event
-        # and print out information from the event, eg. parser and path spec
-        # location. That way we can find the root cause and fix that instead of
-        # just catching the exception.
-        logging.error((
-            u'Unable to store event, not able to index timestamp value with '
-            u'error: {0:s} [timestamp: {1:d}]').format(exception, timestamp))
-        continue
-      index_str.append(struct.pack('<I', ofs))
-      packed = struct.pack('<I', len(entry)) + entry
-      ofs += len(packed)
-      proto_str.append(packed)
+        # time based filtering. If this is not done we would need to
+        # unserialize all events to get the timestamp value which is
+        # really slow. Timestamps that cannot be indexed are not buffered.
+        timestamp_data.extend(struct.pack('<q', timestamp))
+        index_data.extend(struct.pack('<I', proto_offset))
+        proto_file_object.write(struct.pack('<I', len(entry)))
+        proto_file_object.write(entry)
+        proto_offset += 4 + len(entry)
+
+      proto_file_object.close()
 
-    stream_name = u'plaso_index.{0:06d}'.format(self._file_number)
-    self._WriteStream(stream_name, b''.join(index_str))
+      # The store streams are only compressed if random access is not
+      # required.
+      compress = not self._random_access
 
-    stream_name = u'plaso_proto.{0:06d}'.format(self._file_number)
-    self._WriteStream(stream_name, b''.join(proto_str))
+      stream_name = u'plaso_index.{0:06d}'.format(self._file_number)
+      self._WriteStream(stream_name, bytes(index_data), compress=compress)
+      del index_data
 
-    stream_name = u'plaso_timestamps.{0:06d}'.format(self._file_number)
-    self._WriteStream(stream_name, b''.join(timestamp_str))
+      stream_name = u'plaso_proto.{0:06d}'.format(self._file_number)
+      self._WriteStreamFromFile(
+          stream_name, proto_file_object.name, compress=compress)
+
+      stream_name = u'plaso_timestamps.{0:06d}'.format(self._file_number)
+      self._WriteStream(stream_name, bytes(timestamp_data), compress=compress)
+      del timestamp_data
+
+      stream_name = u'plaso_string_table.{0:06d}'.format(self._file_number)
+      self._WriteStream(stream_name, self._string_table.WriteSerialized())
+
+    finally:
+      proto_file_object.close()
+      os.remove(proto_file_object.name)
 
     self._file_number += 1
     self._buffer_size = 0
     self._buffer = []
+    self._string_table = string_table.StringTable()
     self._buffer_first_timestamp = sys.maxint
     self._buffer_last_timestamp = 0
 
+  def _GetMergeEntry(self, store_number):
+    """Retrieves the next entry of a store that is being merged.
+
+    The timestamp of the entry is read from the timestamps stream, so that
+    the event object is only deserialized when it is returned by
+    GetSortedEntry. Entries that are rejected by the prefilter are skipped.
+
+    Args:
+      store_number: the number of the store.
+
+    Returns:
+      A tuple of the timestamp, the entry index and either the serialized
+      event object or the event object (instance of EventObject), or None
+      if no more entries are available.
+    """
+    if self._prefetch_number_of_processes:
+      prefetch_reader = self._prefetch_readers.get(store_number, None)
+      if not prefetch_reader:
+        prefetch_reader = self._StartPrefetchReader(store_number)
+
+      event_object = prefetch_reader.GetEventObject()
+      if not event_object:
+        return
+
+      return event_object.timestamp, event_object.store_index, event_object
+
+    timestamp_index = self._GetTimestampIndex(store_number)
+
+    while True:
+      event_object_data, entry_index = self._GetEventObjectProtobufString(
+          store_number)
+      if not event_object_data:
+        return
+
+      if not self._PrefilterEventObjectData(store_number, event_object_data):
+        continue
+
+      if timestamp_index is not None and entry_index < len(timestamp_index):
+        return timestamp_index[entry_index], entry_index, event_object_data
+
+      # Without a timestamps stream the event object needs to be
+      # deserialized to determine its timestamp.
+      event_object = self._ReadEventObject(
+          store_number, entry_index, event_object_data)
+      if event_object:
+        return event_object.timestamp, entry_index, event_object
+
   def _GetEventTagIndexValue(self, store_number, store_index, uuid):
     """Retrieves an event tag index value.
 
@@ -448,20 +1242,233 @@ class StorageFile(object):
       uuid: the UUID string.
 
     Returns:
-      An event tag index value (instance of _EventTagIndexValue).
+      An event tag index value (instance of _EventTagIndexValue) or None
+      if the event object is not tagged.
     """
     if self._event_tag_index is None:
       self._BuildTagIndex()
 
     # Try looking up event tag by numeric identifier.
-    tag_identifier = u'{0:d}:{1:d}'.format(store_number, store_index)
-    tag_index_value = self._event_tag_index.get(tag_identifier, None)
+    if store_number:
+      event_key = _EventTagSortedIndex.GetKey(store_number, store_index)
+      for tag_store_number, sorted_index in self._event_tag_index:
+        store_offset = sorted_index.GetOffset(event_key)
+        if store_offset is not None:
+          tag_identifier = u'{0:d}:{1:d}'.format(store_number, store_index)
+          return _EventTagIndexValue(
+              tag_identifier, event_key=event_key,
+              store_number=tag_store_number, store_offset=store_offset)
 
     # Try looking up event tag by UUID.
-    if tag_index_value is None:
-      tag_index_value = self._event_tag_index.get(uuid, None)
+    return self._event_tag_uuid_index.get(uuid, None)
+
+  def _GetEntryIndexRange(self, stream_number):
+    """Retrieves the range of entries of a store within the time range.
+
+    Args:
+      stream_number: the number of the stream.
+
+    Returns:
+      A tuple of the index of the first entry within the time range and
+      the index of the entry following the last entry within the time range
+      or None if the store has no timestamps stream.
+    """
+    bounds, entry_index_range = self._entry_index_ranges.get(
+        stream_number, (None, None))
+
+    if bounds != (self._bound_first, self._bound_last):
+      bounds = (self._bound_first, self._bound_last)
+
+      timestamp_index = self._GetTimestampIndex(stream_number)
+      if timestamp_index is None:
+        entry_index_range = None
+      else:
+        entry_index_range = timestamp_index.GetEntryIndexRange(*bounds)
+
+      self._entry_index_ranges[stream_number] = (bounds, entry_index_range)
+
+    return entry_index_range
+
+  def _GetTimestampIndex(self, stream_number):
+    """Retrieves the timestamp index of a store.
 
-    return tag_index_value
+    The timestamp index is read once per store and kept in memory. For
+    streams that are stored without compression the timestamp index
+    references the memory map of the storage file instead.
+
+    Args:
+      stream_number: the number of the stream.
+
+    Returns:
+      The timestamp index (instance of _TimestampIndex) or None if the store
+      has no timestamps stream.
+    """
+    if stream_number not in self._timestamp_indexes:
+      stream_name = u'plaso_timestamps.{0:06d}'.format(stream_number)
+
+      file_object = self._OpenSeekableStream(stream_name)
+      if file_object:
+        timestamp_index = _TimestampIndex(file_object.GetDataBuffer())
+
+      elif stream_name in self._GetStreamNames():
+        timestamp_index = _TimestampIndex(self._ReadStream(stream_name))
+
+      else:
+        timestamp_index = None
+
+      self._timestamp_indexes[stream_number] = timestamp_index
+
+    return self._timestamp_indexes[stream_number]
+
+  def _GetStoreIndex(self, stream_number):
+    """Retrieves the index of the entries in a proto stream.
+
+    The index stream is decoded once and kept in the store index cache.
+
+    Args:
+      stream_number: the number of the stream.
+
+    Returns:
+      The store index (instance of array.array) that contains the offsets
+      of the entries in the corresponding proto stream.
+
+    Raises:
+      IOError: if the stream cannot be opened.
+    """
+    store_index = self._store_index_cache.GetStoreIndex(stream_number)
+    if store_index is not None:
+      return store_index
+
+    stream_name = u'plaso_index.{0:06d}'.format(stream_number)
+    file_object = self._OpenSeekableStream(stream_name)
+    if file_object is None:
+      file_object = self._OpenStream(stream_name, u'r')
+    if file_object is None:
+      raise IOError(u'Unable to open stream: {0:s}'.format(stream_name))
+
+    index_data = file_object.read()
+    file_object.close()
+
+    # The index stream contains 32-bit little-endian integers.
+    store_index = array.array('I')
+    index_data_size = len(index_data) - (len(index_data) % store_index.itemsize)
+    store_index.fromstring(index_data[:index_data_size])
+    if sys.byteorder != u'little':
+      store_index.byteswap()
+
+    self._store_index_cache.SetStoreIndex(stream_number, store_index)
+    return store_index
+
+  def _GetPrefilterValues(self, constraints):
+    """Retrieves the values of the prefilter from the filter constraints.
+
+    Only values that are serialized as-is by both the protobuf and the JSON
+    serializer, namely printable ASCII strings without quotes or backslashes,
+    are used. Attributes with other values are not prefiltered.
+
+    Args:
+      constraints: a dictionary containing the attribute name as key and
+                   a set of allowed values as value, as returned by
+                   pfilter.GetAttributeConstraints().
+
+    Returns:
+      A dictionary containing the attribute name as key and a tuple of
+      the allowed values as byte strings as value.
+    """
+    prefilter_values = {}
+    for attribute_name, values in constraints.iteritems():
+      byte_values = []
+      for value in values:
+        try:
+          byte_value = value.encode(u'ascii')
+        except UnicodeError:
+          break
+
+        if (not byte_value or b'"' in byte_value or b'\\' in byte_value or
+            not all(b' ' <= byte <= b'~' for byte in byte_value)):
+          break
+
+        byte_values.append(byte_value)
+
+      else:
+        prefilter_values[attribute_name] = tuple(byte_values)
+
+    return prefilter_values
+
+  def _GetStorePrefilterValues(self, store_number):
+    """Retrieves the values of the prefilter of a store.
+
+    If the store has a string table, the serialized event objects refer to
+    the values by their index in the string table, hence the serialized form
+    of these references is allowed as well.
+
+    Args:
+      store_number: the number of the store.
+
+    Returns:
+      A list of tuples that contain the allowed serialized values of
+      an attribute as byte strings.
+    """
+    if store_number not in self._prefilter_store_values:
+      store_string_table = self._GetStringTable(store_number)
+
+      store_prefilter_values = []
+      for attribute_name, values in self._prefilter_values.iteritems():
+        if store_string_table is not None:
+          serialized_values = list(values)
+          for value in values:
+            string_index = store_string_table.GetIndex(value)
+            if string_index is not None:
+              serialized_values.append(
+                  self._event_object_serializer.GetSerializedStringIndex(
+                      attribute_name, string_index))
+          values = tuple(serialized_values)
+
+        store_prefilter_values.append(values)
+
+      self._prefilter_store_values[store_number] = store_prefilter_values
+
+    return self._prefilter_store_values[store_number]
+
+  def _GetStringTable(self, store_number):
+    """Retrieves the string table of a store.
+
+    The string table is read once per store and kept in memory.
+
+    Args:
+      store_number: the number of the store.
+
+    Returns:
+      The string table (instance of StringTable) or None if the store has
+      no string table.
+    """
+    if store_number not in self._string_tables:
+      string_table_data = self._GetStringTableData(store_number)
+      if string_table_data is None:
+        store_string_table = None
+      else:
+        store_string_table = string_table.StringTable.ReadSerialized(
+            string_table_data)
+
+      self._string_tables[store_number] = store_string_table
+
+    return self._string_tables[store_number]
+
+  def _GetStringTableData(self, store_number):
+    """Retrieves the serialized string table of a store.
+
+    Args:
+      store_number: the number of the store.
+
+    Returns:
+      A byte string containing the serialized string table or None if
+      the store has no string table.
+    """
+    stream_name = u'plaso_string_table.{0:06d}'.format(store_number)
+    if stream_name not in self._GetStreamNames():
+      return
+
+    return self._ReadStream(stream_name)
 
   def _GetStreamNames(self):
     """Retrieves a generator of the storage stream names."""
@@ -503,48 +1510,29 @@ class StorageFile(object):
       file_object, last_entry_index = self._GetProtoStreamSeekOffset(
           stream_number, entry_index, stream_offset)
 
-    if (not last_entry_index and entry_index == -1 and
-        self._bound_first is not None):
-      # We only get here if the following conditions are met:
-      #   1. last_entry_index is not set (so this is the first read
-      #      from this file).
-      #   2. There is a lower bound (so we have a date filter).
-      #   3. The lower bound is higher than zero (basically set to a value).
-      #   4. We are accessing this function using 'get me the next entry' as an
-      #      opposed to the 'get me entry X', where we just want to server entry
-      #      X.
+    elif self._bound_first is not None:
+      # We only get here if we are accessing this function using 'get me
+      # the next entry' as an opposed to the 'get me entry X', where we just
+      # want to serve entry X, and there is a time range (so we have a date
+      # filter).
       #
       # The purpose: speed seeking into the storage file based on time. Instead
       # of spending precious time reading through the storage file and
-      # deserializing protobufs just to compare timestamps we read a much
+      # deserializing protobufs just to compare timestamps we bisect a much
       # 'cheaper' file, one that only contains timestamps to find the proper
-      # entry into the storage file. That way we'll get to the right place in
-      # the file and can start reading protobufs from the right location.
-
-      stream_name = u'plaso_timestamps.{0:06d}'.format(stream_number)
-
-      if stream_name in self._GetStreamNames():
-        timestamp_file_object = self._OpenStream(stream_name, u'r')
-        if timestamp_file_object is None:
-          raise IOError(u'Unable to open stream: {0:s}'.format(stream_name))
-
-        index = 0
-        timestamp_compare = 0
-        encountered_error = False
-        while timestamp_compare < self._bound_first:
-          timestamp_raw = timestamp_file_object.read(8)
-          if len(timestamp_raw) != 8:
-            encountered_error = True
-            break
-
-          timestamp_compare = struct.unpack('<q', timestamp_raw)[0]
-          index += 1
-
-        if encountered_error:
+      # entries in the storage file. That way we'll get to the right place in
+      # the file, start reading protobufs from the right location and stop
+      # reading after the last entry within the time range.
+      entry_index_range = self._GetEntryIndexRange(stream_number)
+      if entry_index_range:
+        first_entry_index, end_entry_index = entry_index_range
+
+        if last_entry_index >= end_entry_index:
           return None, None
 
-        return self._GetEventObjectProtobufString(
-            stream_number, entry_index=index)
+        if last_entry_index < first_entry_index:
+          return self._GetEventObjectProtobufString(
+              stream_number, entry_index=first_entry_index)
 
     size_data = file_object.read(4)
 
@@ -597,7 +1585,9 @@ class StorageFile(object):
     if stream_number not in self._proto_streams:
       stream_name = u'plaso_proto.{0:06d}'.format(stream_number)
 
-      file_object = self._OpenStream(stream_name, u'r')
+      file_object = self._OpenSeekableStream(stream_name)
+      if file_object is None:
+        file_object = self._OpenStream(stream_name, u'r')
       if file_object is None:
         raise IOError(u'Unable to open stream: {0:s}'.format(stream_name))
 
@@ -623,22 +1613,26 @@ class StorageFile(object):
     Raises:
       IOError: if the stream cannot be opened.
     """
-    # Since zipfile.ZipExtFile is not seekable we need to close the stream
-    # and reopen it to fake a seek.
     if stream_number in self._proto_streams:
       previous_file_object, _ = self._proto_streams[stream_number]
+
+      # Streams that are stored without compression are seeked directly.
+      if isinstance(previous_file_object, _StoredStream):
+        previous_file_object.seek(stream_offset, os.SEEK_SET)
+        self._proto_streams[stream_number] = (
+            previous_file_object, entry_index)
+        return self._proto_streams[stream_number]
+
+      # Since zipfile.ZipExtFile is not seekable we need to close the stream
+      # and reopen it to fake a seek.
       del self._proto_streams[stream_number]
       previous_file_object.close()
 
     stream_name = u'plaso_proto.{0:06d}'.format(stream_number)
-    file_object = self._OpenStream(stream_name, u'r')
+    file_object = self._OpenStreamAtOffset(stream_name, stream_offset)
     if file_object is None:
       raise IOError(u'Unable to open stream: {0:s}'.format(stream_name))
 
-    # Since zipfile.ZipExtFile is not seekable we need to read upto
-    # the stream offset.
-    _ = file_object.read(stream_offset)
-
     self._proto_streams[stream_number] = (file_object, entry_index)
 
     return self._proto_streams[stream_number]
@@ -657,29 +1651,98 @@ class StorageFile(object):
     Raises:
       IOError: if the stream cannot be opened.
     """
-    # TODO: cache the index file object in the same way as the proto
-    # stream file objects.
+    store_index = self._GetStoreIndex(stream_number)
 
-    # TODO: once cached use the last entry index to determine if the stream
-    # file object should be re-opened.
+    if entry_index >= len(store_index):
+      return None
 
-    stream_name = u'plaso_index.{0:06d}'.format(stream_number)
-    index_file_object = self._OpenStream(stream_name, u'r')
-    if index_file_object is None:
-      raise IOError(u'Unable to open stream: {0:s}'.format(stream_name))
+    return store_index[entry_index]
 
-    # Since zipfile.ZipExtFile is not seekable we need to read upto
-    # the stream offset.
-    _ = index_file_object.read(entry_index * 4)
+  def _GetContainerMap(self, minimum_size):
+    """Retrieves a memory map of the storage file.
 
-    index_data = index_file_object.read(4)
+    Args:
+      minimum_size: the minimum size of the memory map. If the storage file
+                    has grown beyond the current memory map a new memory map
+                    is created.
 
-    index_file_object.close()
+    Returns:
+      The memory map (instance of mmap.mmap) or None if the storage file
+      cannot be memory mapped.
+    """
+    if self._container_map and len(self._container_map) >= minimum_size:
+      return self._container_map
 
-    if len(index_data) != 4:
-      return None
+    # Only storage files that are referenced by path can be memory mapped.
+    if not isinstance(self._output_file, basestring):
+      return
+
+    # Note that the previous memory map is not closed explicitly since
+    # it can still be referenced by open streams.
+    self._container_map = None
+
+    if not self._container_file_object:
+      self._container_file_object = open(self._output_file, 'rb')
+
+    try:
+      self._container_map = mmap.mmap(
+          self._container_file_object.fileno(), 0, access=mmap.ACCESS_READ)
+    except (EnvironmentError, ValueError) as exception:
+      logging.debug(
+          u'Unable to memory map storage file with error: {0:s}'.format(
+              exception))
+      return
+
+    if len(self._container_map) < minimum_size:
+      return
 
-    return struct.unpack('<I', index_data)[0]
+    return self._container_map
+
+  def _OpenSeekableStream(self, stream_name):
+    """Opens a stream that supports seeking.
+
+    Only streams that are stored without compression can be seeked.
+
+    Args:
+      stream_name: the name of the stream.
+
+    Returns:
+      The stream file-like object (instance of _StoredStream) or None if
+      the stream does not exist or is compressed.
+    """
+    try:
+      zip_info = self._zipfile.getinfo(stream_name)
+    except KeyError:
+      return
+
+    # Bit 0 of the flags indicates the data is encrypted.
+    if zip_info.compress_type != zipfile.ZIP_STORED or zip_info.flag_bits & 1:
+      return
+
+    header_offset = zip_info.header_offset
+    container_map = self._GetContainerMap(
+        header_offset + self._ZIP_LOCAL_FILE_HEADER_SIZE)
+    if not container_map:
+      return
+
+    local_file_header = self._ZIP_LOCAL_FILE_HEADER_STRUCT.parse(
+        container_map[
+            header_offset:header_offset + self._ZIP_LOCAL_FILE_HEADER_SIZE])
+    if local_file_header.signature != self._ZIP_LOCAL_FILE_HEADER_SIGNATURE:
+      logging.warning(
+          u'Unsupported local file header signature of stream: {0:s}'.format(
+              stream_name))
+      return
+
+    data_offset = (
+        header_offset + self._ZIP_LOCAL_FILE_HEADER_SIZE +
+        local_file_header.filename_size + local_file_header.extra_field_size)
+
+    container_map = self._GetContainerMap(data_offset + zip_info.file_size)
+    if not container_map:
+      return
+
+    return _StoredStream(container_map, data_offset, zip_info.file_size)
 
   def _OpenStream(self, stream_name, mode='r'):
     """Opens a stream.
@@ -696,11 +1759,125 @@ class StorageFile(object):
     except KeyError:
       return
 
+  def _OpenStreamAtOffset(self, stream_name, stream_offset):
+    """Opens a stream and positions it at a specific offset.
+
+    Args:
+      stream_name: the name of the stream.
+      stream_offset: the offset relative to the start of the stream.
+
+    Returns:
+      The stream file-like object (instance of _StoredStream or
+      zipfile.ZipExtFile) or None.
+    """
+    file_object = self._OpenSeekableStream(stream_name)
+    if file_object:
+      file_object.seek(stream_offset, os.SEEK_SET)
+      return file_object
+
+    file_object = self._OpenStream(stream_name, u'r')
+    if file_object:
+      # Since zipfile.ZipExtFile is not seekable we need to read upto
+      # the stream offset.
+      _ = file_object.read(stream_offset)
+
+    return file_object
+
   def _ProfilingStop(self):
     """Stops the profiling."""
     if self._serializers_profiler:
       self._serializers_profiler.Write()
 
+  def _PushMergeBufferEntry(self, store_number):
+    """Pushes the first entry within the time range of a store.
+
+    Args:
+      store_number: the number of the store.
+
+    Returns:
+      A boolean value indicating an entry was pushed onto the merge buffer.
+    """
+    merge_entry = self._GetMergeEntry(store_number)
+    while merge_entry and merge_entry[0] < self._bound_first:
+      merge_entry = self._GetMergeEntry(store_number)
+
+    # Stores without events within the time range are skipped.
+    if not merge_entry:
+      return False
+
+    timestamp, entry_index, entry = merge_entry
+    heapq.heappush(
+        self._merge_buffer, (timestamp, store_number, entry_index, entry))
+    return True
+
+  def _PrefilterEventObjectData(self, store_number, event_object_data):
+    """Determines if a serialized event object can match the prefilter.
+
+    The prefilter does not deserialize the event object, but checks if
+    the serialized data contains one of the allowed values of every
+    constrained attribute. Hence event objects that pass the prefilter
+    do not necessarily match the filter.
+
+    Args:
+      store_number: the number of the store.
+      event_object_data: the serialized event object.
+
+    Returns:
+      A boolean value indicating if the event object can match the filter.
+    """
+    if not self._prefilter_values:
+      return True
+
+    for values in self._GetStorePrefilterValues(store_number):
+      for value in values:
+        if value in event_object_data:
+          break
+      else:
+        self._number_of_prefiltered_events += 1
+        return False
+
+    return True
+
+  def _PushNextPendingStore(self):
+    """Pushes the first event object of the next pending store, if any."""
+    while self._merge_pending_store_numbers:
+      store_number = self._merge_pending_store_numbers.pop()
+      if self._PushMergeBufferEntry(store_number):
+        break
+
+    # Start reading the next store while the current one is merged.
+    if (self._prefetch_number_of_processes and
+        self._merge_pending_store_numbers):
+      store_number = self._merge_pending_store_numbers[-1]
+      if store_number not in self._prefetch_readers:
+        self._StartPrefetchReader(store_number)
+
+  def _ReadEventObject(self, stream_number, entry_index, event_object_data):
+    """Deserializes an event object read from the storage file.
+
+    Args:
+      stream_number: the proto stream number.
+      entry_index: the entry index of the event object.
+      event_object_data: the serialized event object.
+
+    Returns:
+      An event object (instance of EventObject) or None.
+    """
+    if self._serializers_profiler:
+      self._serializers_profiler.StartTiming(u'event_object')
+
+    event_object = self._event_object_serializer.ReadSerialized(
+        event_object_data, string_table=self._GetStringTable(stream_number))
+
+    if self._serializers_profiler:
+      self._serializers_profiler.StopTiming(u'event_object')
+
+    if event_object:
+      event_object.store_number = stream_number
+      event_object.store_index = entry_index
+
+    return event_object
+
   def _ReadEventTag(self, file_object):
     """Reads an event tag from the storage file.
 
@@ -750,15 +1927,39 @@ class StorageFile(object):
       return
 
     stream_name = u'plaso_tagging.{0:06d}'.format(tag_index_value.store_number)
-    tag_file_object = self._OpenStream(stream_name, u'r')
+    tag_file_object = self._OpenStreamAtOffset(
+        stream_name, tag_index_value.store_offset)
     if tag_file_object is None:
       raise IOError(u'Unable to open stream: {0:s}'.format(stream_name))
 
-    # Since zipfile.ZipExtFile is not seekable we need to read upto
-    # the store offset.
-    _ = tag_file_object.read(tag_index_value.store_offset)
     return self._ReadEventTag(tag_file_object)
 
+  def _ReadCatalogue(self):
+    """Reads the store metadata from the catalogue streams.
+
+    Stores that are not part of a catalogue, such as the stores of version 1
+    storage files, are read from their metadata stream when needed.
+    """
+    for stream_name in self._GetStreamNames():
+      if not stream_name.startswith(u'plaso_catalogue.'):
+        continue
+
+      try:
+        catalogue = json.loads(self._ReadStream(stream_name))
+      except ValueError as exception:
+        logging.warning(
+            u'Unable to read catalogue: {0:s} with error: {1:s}'.format(
+                stream_name, exception))
+        continue
+
+      for store_number, store_metadata in catalogue.iteritems():
+        try:
+          store_number = int(store_number, 10)
+        except ValueError:
+          continue
+
+        self._catalogue[store_number] = store_metadata
+
   def _ReadStream(self, stream_name):
     """Reads the data in a stream.
 
@@ -782,6 +1983,20 @@ class StorageFile(object):
 
     return b''.join(data_segments)
 
+  def _RewriteStream(self, storage_file, source_stream_name, stream_name):
+    """Copies a stream from another storage file by reading and writing it.
+
+    Args:
+      storage_file: the storage file (instance of StorageFile) that contains
+                    the stream.
+      source_stream_name: the name of the stream in the other storage file.
+      stream_name: the name of the stream in the storage file.
+    """
+    zip_info = storage_file._zipfile.getinfo(source_stream_name)
+    self._WriteStream(
+        stream_name, storage_file._ReadStream(source_stream_name),
+        compress=zip_info.compress_type != zipfile.ZIP_STORED)
+
   def _SetSerializerFormat(self, serializer_format):
     """Set the serializer format.
 
@@ -819,6 +2034,90 @@ class StorageFile(object):
       raise ValueError(
           u'Unsupported serializer format: {0:s}'.format(serializer_format))
 
+  def _StartPrefetchReader(self, store_number):
+    """Starts a prefetch reader for the entries of a store.
+
+    Args:
+      store_number: the number of the store.
+
+    Returns:
+      The prefetch reader (instance of _StorePrefetchReader).
+    """
+    if not self._prefetch_process_pool:
+      # The string tables are passed once to every worker process instead
+      # of with every batch of serialized entries.
+      string_table_data_per_store = {}
+      for proto_number in self.GetProtoNumbers():
+        string_table_data = self._GetStringTableData(proto_number)
+        if string_table_data is not None:
+          string_table_data_per_store[proto_number] = string_table_data
+
+      self._prefetch_process_pool = multiprocessing.Pool(
+          initializer=_InitializePrefetchProcess,
+          initargs=(string_table_data_per_store, ),
+          processes=self._prefetch_number_of_processes)
+
+    prefetch_reader = _StorePrefetchReader(
+        self, store_number, self._prefetch_process_pool)
+    prefetch_reader.QueueBatches()
+
+    self._prefetch_readers[store_number] = prefetch_reader
+
+    return prefetch_reader
+
+  def _StoreMatchesConstraints(self, store_metadata, constraints):
+    """Determines if a store can contain event objects matching constraints.
+
+    Args:
+      store_metadata: a dictionary containing the store metadata.
+      constraints: a dictionary containing the attribute name as key and
+                   a set of allowed values as value, as returned by
+                   pfilter.GetAttributeConstraints().
+
+    Returns:
+      A boolean value indicating if the store can contain matching event
+      objects. True is returned if the metadata does not contain the values
+      of a constrained attribute.
+    """
+    for attribute_name, values in constraints.iteritems():
+      metadata_key = self._METADATA_CONSTRAINT_KEYS.get(attribute_name, None)
+      store_values = store_metadata.get(metadata_key, None)
+      if store_values is None:
+        continue
+
+      if values.isdisjoint(store_values):
+        return False
+
+    return True
+
+  def _StoresAreSequential(self, store_numbers):
+    """Determines if stores are ordered in time and do not overlap.
+
+    The timestamp indexes are used rather than the store metadata, since
+    the range in the metadata does not include timestamps of 0 or less.
+
+    Args:
+      store_numbers: a list of store numbers.
+
+    Returns:
+      A boolean value indicating the stores are sequential.
+    """
+    last_timestamp = None
+    for store_number in store_numbers:
+      timestamp_index = self._GetTimestampIndex(store_number)
+      if timestamp_index is None:
+        return False
+
+      if not len(timestamp_index):
+        continue
+
+      if last_timestamp is not None and timestamp_index[0] < last_timestamp:
+        return False
+
+      last_timestamp = timestamp_index[-1]
+
+    return True
+
   def _WritePreprocessObject(self, pre_obj):
     """Writes a preprocess object to the storage file.
 
@@ -854,16 +2153,63 @@ class StorageFile(object):
 
     self._WriteStream(u'information.dump', stream_data)
 
-  def _WriteStream(self, stream_name, stream_data):
+  def _WriteCatalogue(self):
+    """Writes the metadata of the stores written in this session."""
+    if not self._session_catalogue:
+      return
+
+    catalogue = {}
+    for store_number, store_metadata in self._session_catalogue.iteritems():
+      catalogue[u'{0:d}'.format(store_number)] = store_metadata
+
+    stream_name = u'plaso_catalogue.{0:06d}'.format(
+        min(self._session_catalogue.iterkeys()))
+    self._WriteStream(stream_name, json.dumps(catalogue, sort_keys=True))
+
+    self._session_catalogue = {}
+
+  def _WriteStream(self, stream_name, stream_data, compress=True):
     """Write the data to a stream.
 
     Args:
       stream_name: the name of the stream.
       stream_data: the data of the steam.
+      compress: optional boolean to indicate the stream should be compressed.
+                Streams that are not compressed can be read with random
+                access. The default is True.
+    """
+    if compress:
+      compress_type = zipfile.ZIP_DEFLATED
+    else:
+      compress_type = zipfile.ZIP_STORED
+
+    # TODO: this can raise an IOError e.g. "Stale NFS file handle".
+    # Determine if this be handled more error resiliently.
+    self._zipfile.writestr(
+        stream_name, stream_data, compress_type=compress_type)
+
+  def _WriteStreamFromFile(self, stream_name, path, compress=True):
+    """Write the data of a file to a stream.
+
+    The data is read from the file in chunks, hence it is not required
+    to keep all the data of the stream in memory.
+
+    Args:
+      stream_name: the name of the stream.
+      path: the path of the file that contains the data of the stream.
+      compress: optional boolean to indicate the stream should be compressed.
+                Streams that are not compressed can be read with random
+                access. The default is True.
     """
+    if compress:
+      compress_type = zipfile.ZIP_DEFLATED
+    else:
+      compress_type = zipfile.ZIP_STORED
+
     # TODO: this can raise an IOError e.g. "Stale NFS file handle".
     # Determine if this be handled more error resiliently.
-    self._zipfile.writestr(stream_name, stream_data)
+    self._zipfile.write(
+        path, arcname=stream_name, compress_type=compress_type)
 
   def Close(self):
     """Closes the storage, flush the last buffer and closes the ZIP file."""
@@ -872,6 +2218,7 @@ class StorageFile(object):
         self._WritePreprocessObject(self._pre_obj)
 
       self._FlushBuffer()
+      self._WriteCatalogue()
       self._zipfile.close()
       self._file_open = False
       if not self._read_only:
@@ -879,8 +2226,244 @@ class StorageFile(object):
             u'[Storage] Closing the storage, number of events added: '
             u'{0:d}').format(self._write_counter))
 
+    self._prefetch_readers = {}
+    if self._prefetch_process_pool:
+      self._prefetch_process_pool.terminate()
+      self._prefetch_process_pool.join()
+      self._prefetch_process_pool = None
+
+    self._entry_index_ranges = {}
+    self._event_tag_index = None
+    self._event_tag_uuid_index = None
+    self._store_index_cache.Empty()
+    self._string_tables = {}
+    self._timestamp_indexes = {}
+
+    if self._container_map:
+      self._container_map.close()
+      self._container_map = None
+
+    if self._container_file_object:
+      self._container_file_object.close()
+      self._container_file_object = None
+
     self._ProfilingStop()
 
+  def Compact(self, output_file, buffer_size=0, random_access=False):
+    """Writes a compacted copy of the storage file.
+
+    The event objects of all stores are merged once and written into stores
+    that are sorted and do not overlap in time, so that they can be read
+    sequentially. The tagging and grouping information is renumbered to
+    the new stores and the tag index is rebuilt. The preprocessing
+    information and reports are copied. Time constraints are not applied.
+
+    Args:
+      output_file: the path of the compacted storage file.
+      buffer_size: optional maximum size of a single store. The default is 0,
+                   which indicates the default maximum buffer size.
+      random_access: optional boolean to indicate the store streams should
+                     be written for random access. The default is false.
+
+    Returns:
+      The number of event objects written.
+
+    Raises:
+      IOError: if the output file already exists.
+    """
+    if os.path.exists(output_file):
+      raise IOError(u'Output file: {0:s} already exists.'.format(output_file))
+
+    compacted_storage_file = StorageFile(
+        output_file, buffer_size=buffer_size, random_access=random_access,
+        serializer_format=self._serializer_format_string)
+
+    tagging = list(self.GetTagging())
+    grouping = list(self.GetGrouping())
+
+    # Only the event objects that are tagged or grouped need to be renumbered.
+    referenced_entries = set()
+    for event_tag in tagging:
+      if getattr(event_tag, u'store_number', 0):
+        referenced_entries.add(
+            (event_tag.store_number, event_tag.store_index))
+
+    for group_proto in grouping:
+      for group_event in group_proto.events:
+        referenced_entries.add(
+            (group_event.store_number, group_event.store_index))
+
+    # Maps the store number and index of a referenced event object to its
+    # new store number and index.
+    entry_mapping = {}
+    number_of_event_objects = 0
+
+    self._bound_first = None
+    self._bound_last = None
+
+    merge_buffer = []
+    for store_number in self.GetProtoNumbers():
+      event_object = self.GetEventObject(store_number, entry_index=0)
+      if event_object:
+        heapq.heappush(merge_buffer, (
+            event_object.timestamp, store_number, event_object.store_index,
+            event_object))
+
+    while merge_buffer:
+      _, store_number, store_index, event_object = heapq.heappop(merge_buffer)
+
+      next_event_object = self.GetEventObject(store_number)
+      if next_event_object:
+        heapq.heappush(merge_buffer, (
+            next_event_object.timestamp, store_number,
+            next_event_object.store_index, next_event_object))
+
+      # The event objects are added in order and event objects that cannot
+      # be stored are not buffered, hence the event object ends up in
+      # the current store at the end of the buffer.
+      new_entry = (
+          compacted_storage_file._file_number,
+          len(compacted_storage_file._buffer))
+
+      del event_object.store_number
+      del event_object.store_index
+
+      write_counter = compacted_storage_file._write_counter
+      compacted_storage_file.AddEventObject(event_object)
+      if compacted_storage_file._write_counter == write_counter:
+        continue
+
+      number_of_event_objects += 1
+      if (store_number, store_index) in referenced_entries:
+        entry_mapping[(store_number, store_index)] = new_entry
+
+    compacted_storage_file._FlushBuffer()
+
+    event_tags = collections.OrderedDict()
+    for event_tag in tagging:
+      if getattr(event_tag, u'store_number', 0):
+        new_entry = entry_mapping.get(
+            (event_tag.store_number, event_tag.store_index), None)
+        if not new_entry:
+          logging.warning(
+              u'Unable to renumber event tag: {0:s}'.format(
+                  event_tag.string_key))
+          continue
+
+        event_tag.store_number, event_tag.store_index = new_entry
+
+      # Tags of later tagging streams contain those of earlier streams.
+      event_tags[event_tag.string_key] = event_tag
+
+    if event_tags:
+      compacted_storage_file.StoreTagging(event_tags.values())
+
+    group_packed = []
+    for group_proto in grouping:
+      events = list(group_proto.events)
+      del group_proto.events[:]
+      for group_event in events:
+        new_entry = entry_mapping.get(
+            (group_event.store_number, group_event.store_index), None)
+        if not new_entry:
+          logging.warning(
+              u'Unable to renumber grouped event: {0:d}:{1:d}'.format(
+                  group_event.store_number, group_event.store_index))
+          continue
+
+        new_group_event = group_proto.events.add()
+        new_group_event.store_number, new_group_event.store_index = new_entry
+
+      group_string = group_proto.SerializeToString()
+      group_packed.append(struct.pack('<I', len(group_string)))
+      group_packed.append(group_string)
+
+    if group_packed:
+      compacted_storage_file._WriteStream(
+          u'plaso_grouping.000001', b''.join(group_packed))
+
+    for analysis_report in self.GetReports():
+      compacted_storage_file.StoreReport(analysis_report)
+
+    # The preprocessing information applies to all the compacted stores.
+    pre_obj_packed = []
+    store_range = (1, compacted_storage_file._file_number)
+    for pre_obj in self.GetStorageInformation():
+      if hasattr(pre_obj, u'stores'):
+        del pre_obj.stores
+      pre_obj.store_range = store_range
+
+      pre_obj_data = self._pre_obj_serializer.WriteSerialized(pre_obj)
+      pre_obj_packed.append(struct.pack('<I', len(pre_obj_data)))
+      pre_obj_packed.append(pre_obj_data)
+
+    if pre_obj_packed:
+      compacted_storage_file._WriteStream(
+          u'information.dump', b''.join(pre_obj_packed))
+
+    # Prevent the tagging preprocessing object from being added.
+    compacted_storage_file._pre_obj = None
+    compacted_storage_file.Close()
+
+    return number_of_event_objects
+
+  def MergeStorageFile(self, storage_file):
+    """Merges the stores of another storage file into the storage file.
+
+    The streams of the stores are copied without decompressing them and
+    the stores are renumbered to follow the stores of the storage file.
+    The counters of the preprocessing information are added to those of
+    the preprocessing object of the storage file. Tagging, grouping and
+    reports are not merged.
+
+    Args:
+      storage_file: the storage file (instance of StorageFile) to merge.
+
+    Returns:
+      The number of stores merged.
+
+    Raises:
+      IOError: if the storage file is closed or opened read-only.
+    """
+    if not self._file_open or self._read_only:
+      raise IOError(u'Unable to merge into a closed or read-only storage file.')
+
+    # Flush the buffer so that the merged stores follow the stores that
+    # were added before.
+    self._FlushBuffer()
+
+    source_stream_names = frozenset(storage_file._GetStreamNames())
+
+    number_of_stores = 0
+    for store_number in storage_file.GetProtoNumbers():
+      store_metadata = storage_file.ReadMeta(store_number)
+
+      for stream_name_prefix in self._STORE_STREAM_NAME_PREFIXES:
+        source_stream_name = u'{0:s}.{1:06d}'.format(
+            stream_name_prefix, store_number)
+        if source_stream_name not in source_stream_names:
+          continue
+
+        stream_name = u'{0:s}.{1:06d}'.format(
+            stream_name_prefix, self._file_number)
+        self._CopyStream(storage_file, source_stream_name, stream_name)
+
+      self._catalogue[self._file_number] = store_metadata
+      self._session_catalogue[self._file_number] = store_metadata
+
+      self._file_number += 1
+      number_of_stores += 1
+
+    if self._pre_obj and u'information.dump' in source_stream_names:
+      for pre_obj in storage_file.GetStorageInformation():
+        for key, value in getattr(pre_obj, u'counter', {}).iteritems():
+          self._pre_obj.counter[key] += value
+
+        for key, value in getattr(pre_obj, u'plugin_counter', {}).iteritems():
+          self._pre_obj.plugin_counter[key] += value
+
+    return number_of_stores
+
   def GetGrouping(self):
     """Return a generator that reads all grouping information from storage.
 
@@ -1038,31 +2621,56 @@ class StorageFile(object):
 
     return information
 
-  def SetStoreLimit(self, unused_my_filter=None):
-    """Set a limit to the stores used for returning data."""
+  def SetStoreLimit(self, my_filter=None, prefilter_events=False):
+    """Set a limit to the stores used for returning data.
+
+    Stores are skipped when their metadata shows that none of their event
+    objects are within the time range or can match the parser and data type
+    constraints of the filter.
+
+    Args:
+      my_filter: optional filter object (instance of FilterObject).
+                 The default is None.
+      prefilter_events: optional boolean to indicate GetSortedEntry should
+                        skip event objects that cannot match the parser and
+                        data type constraints of the filter, without
+                        deserializing them. The default is False.
+    """
     # Retrieve set first and last timestamps.
     self._bound_first, self._bound_last = pfilter.TimeRangeCache.GetTimeRange()
 
     self.store_range = []
 
-    # TODO: Fetch a filter object from the filter query.
+    constraints = {}
+    matcher = getattr(my_filter, u'matcher', None)
+    if matcher:
+      constraints = pfilter.GetAttributeConstraints(matcher)
+
+    if prefilter_events:
+      self._prefilter_values = self._GetPrefilterValues(constraints)
+    else:
+      self._prefilter_values = {}
+    self._prefilter_store_values = {}
 
     for number in self.GetProtoNumbers():
-      # TODO: Read more criteria from here.
-      first, last = self.ReadMeta(number).get(u'range', (0, limit.MAX_INT64))
+      store_metadata = self.ReadMeta(number)
+      first, last = store_metadata.get(u'range', (0, limit.MAX_INT64))
       if last < first:
         logging.error(
             u'last: {0:d} first: {1:d} container: {2:d} (last < first)'.format(
                 last, first, number))
 
-      if first <= self._bound_last and self._bound_first <= last:
-        # TODO: Check at least parser and data_type (stored in metadata).
-        # Check whether these attributes exist in filter, if so use the filter
-        # to determine whether the stores should be included.
-        self.store_range.append(number)
-
-      else:
+      if not (first <= self._bound_last and self._bound_first <= last):
         logging.debug(u'Store [{0:d}] not used'.format(number))
+        continue
+
+      if not self._StoreMatchesConstraints(store_metadata, constraints):
+        logging.debug(
+            u'Store [{0:d}] not used, no events match the filter'.format(
+                number))
+        continue
+
+      self.store_range.append(number)
 
   def GetSortedEntry(self):
     """Return a sorted entry from the storage file.
@@ -1076,38 +2684,46 @@ class StorageFile(object):
 
     if not hasattr(self, u'_merge_buffer'):
       self._merge_buffer = []
+      self._merge_pending_store_numbers = []
       number_range = getattr(self, u'store_range', list(self.GetProtoNumbers()))
-      for store_number in number_range:
-        event_object = self.GetEventObject(store_number)
-        if not event_object:
-          return
 
-        while event_object.timestamp < self._bound_first:
-          event_object = self.GetEventObject(store_number)
-          if not event_object:
-            return
+      if self._StoresAreSequential(number_range):
+        # Stores that do not overlap in time, such as those of a compacted
+        # storage file, are read one after the other instead of merged.
+        self._merge_pending_store_numbers = list(reversed(number_range))
+        self._PushNextPendingStore()
 
-        heapq.heappush(
-            self._merge_buffer,
-            (event_object.timestamp, store_number, event_object))
+      else:
+        for store_number in number_range:
+          self._PushMergeBufferEntry(store_number)
 
     if not self._merge_buffer:
       return
 
-    _, store_number, event_read = heapq.heappop(self._merge_buffer)
-    if not event_read:
-      return
+    timestamp, store_number, entry_index, entry = heapq.heappop(
+        self._merge_buffer)
 
     # Stop as soon as we hit the upper bound.
-    if event_read.timestamp > self._bound_last:
+    if timestamp > self._bound_last:
       return
 
-    new_event_object = self.GetEventObject(store_number)
-
-    if new_event_object:
+    merge_entry = self._GetMergeEntry(store_number)
+    if merge_entry:
+      next_timestamp, next_entry_index, next_entry = merge_entry
       heapq.heappush(
           self._merge_buffer,
-          (new_event_object.timestamp, store_number, new_event_object))
+          (next_timestamp, store_number, next_entry_index, next_entry))
+    else:
+      self._PushNextPendingStore()
+
+    # The event object is only deserialized when it is returned.
+    if isinstance(entry, basestring):
+      event_read = self._ReadEventObject(store_number, entry_index, entry)
+    else:
+      event_read = entry
+
+    if not event_read:
+      return
 
     event_read.tag = self._ReadEventTagByIdentifier(
         event_read.store_number, event_read.store_index, event_read.uuid)
@@ -1134,19 +2750,7 @@ class StorageFile(object):
     if not event_object_data:
       return
 
-    if self._serializers_profiler:
-      self._serializers_profiler.StartTiming(u'event_object')
-
-    event_object = self._event_object_serializer.ReadSerialized(
-        event_object_data)
-
-    if self._serializers_profiler:
-      self._serializers_profiler.StopTiming(u'event_object')
-
-    event_object.store_number = stream_number
-    event_object.store_index = entry_index
-
-    return event_object
+    return self._ReadEventObject(stream_number, entry_index, event_object_data)
 
   def GetEntries(self, number):
     """A generator to read all plaso_storage protobufs.
@@ -1219,11 +2823,23 @@ class StorageFile(object):
     Raises:
       IOError: if the stream cannot be opened.
     """
+    if number in self._catalogue:
+      return self._catalogue[number]
+
     stream_name = u'plaso_meta.{0:06d}'.format(number)
-    file_object = self._OpenStream(stream_name, 'r')
-    if file_object is None:
+    if stream_name not in self._GetStreamNames():
       raise IOError(u'Unable to open stream: {0:s}'.format(stream_name))
-    return yaml.safe_load(file_object)
+
+    stream_data = self._ReadStream(stream_name)
+
+    # Version 1 storage files use YAML to store the metadata.
+    if stream_data.startswith(b'{'):
+      store_metadata = json.loads(stream_data)
+    else:
+      store_metadata = yaml.safe_load(stream_data)
+
+    self._catalogue[number] = store_metadata
+    return store_metadata
 
   def GetBufferSize(self):
     """Return the size of the buffer."""
@@ -1233,44 +2849,77 @@ class StorageFile(object):
     """Return the current file number of the storage."""
     return self._file_number
 
-  def AddEventObject(self, event_object):
-    """Adds an event object to the storage.
+  def _AddEventObjectData(
+      self, timestamp, data_type, parser, plugin, event_object_data):
+    """Adds the serialized form of an event object to the buffer.
 
     Args:
-      event_object: an event object (instance of EventObject).
-
-    Raises:
-      IOError: When trying to write to a closed storage file.
+      timestamp: the timestamp of the event object.
+      data_type: the data type of the event object.
+      parser: the parser chain of the event object or None.
+      plugin: the name of the plugin of the event object or None.
+      event_object_data: a byte string containing the serialized form
+                         of the event object.
     """
-    if not self._file_open:
-      raise IOError(u'Trying to add an entry to a closed storage file.')
+    # The timestamp is checked before the event object is buffered, so that
+    # every buffered event object ends up in the store.
+    try:
+      struct.pack('<q', timestamp)
+    except struct.error as exception:
+      # TODO: Instead of just logging the error unserialize the event
+      # and print out information from the event, eg. parser and path spec
+      # location. That way we can find the root cause and fix that instead
+      # of just catching the exception.
+      logging.error((
+          u'Unable to store event, not able to index timestamp value with '
+          u'error: {0:s} [timestamp: {1:d}]').format(exception, timestamp))
+      return
 
-    if event_object.timestamp > self._buffer_last_timestamp:
-      self._buffer_last_timestamp = event_object.timestamp
+    if timestamp > self._buffer_last_timestamp:
+      self._buffer_last_timestamp = timestamp
 
     # TODO: support negative timestamps.
-    if (event_object.timestamp < self._buffer_first_timestamp and
-        event_object.timestamp > 0):
-      self._buffer_first_timestamp = event_object.timestamp
+    if timestamp < self._buffer_first_timestamp and timestamp > 0:
+      self._buffer_first_timestamp = timestamp
 
-    attributes = event_object.GetValues()
     # Add values to counters.
     if self._pre_obj:
       self._pre_obj.counter[u'total'] += 1
-      self._pre_obj.counter[attributes.get(u'parser', u'N/A')] += 1
-      if u'plugin' in attributes:
-        self._pre_obj.plugin_counter[attributes.get(u'plugin', u'N/A')] += 1
+      self._pre_obj.counter[parser or u'N/A'] += 1
+      if plugin:
+        self._pre_obj.plugin_counter[plugin] += 1
 
     # Add to temporary counter.
-    self._count_data_type[event_object.data_type] += 1
-    parser = attributes.get(u'parser', u'unknown_parser')
-    self._count_parser[parser] += 1
+    self._count_data_type[data_type] += 1
+    self._count_parser[parser or u'unknown_parser'] += 1
+
+    # The write counter is part of the key so that event objects with the
+    # same timestamp are stored in the order they were added.
+    heapq.heappush(
+        self._buffer, (timestamp, self._write_counter, event_object_data))
+    self._buffer_size += len(event_object_data)
+    self._write_counter += 1
+
+    if self._buffer_size > self._max_buffer_size:
+      self._FlushBuffer()
+
+  def AddEventObject(self, event_object):
+    """Adds an event object to the storage.
+
+    Args:
+      event_object: an event object (instance of EventObject).
+
+    Raises:
+      IOError: When trying to write to a closed storage file.
+    """
+    if not self._file_open:
+      raise IOError(u'Trying to add an entry to a closed storage file.')
 
     if self._serializers_profiler:
       self._serializers_profiler.StartTiming(u'event_object')
 
     event_object_data = self._event_object_serializer.WriteSerialized(
-        event_object)
+        event_object, string_table=self._string_table)
 
     if self._serializers_profiler:
       self._serializers_profiler.StopTiming(u'event_object')
@@ -1280,13 +2929,10 @@ class StorageFile(object):
     if event_object_data is None:
       return
 
-    heapq.heappush(
-        self._buffer, (event_object.timestamp, event_object_data))
-    self._buffer_size += len(event_object_data)
-    self._write_counter += 1
-
-    if self._buffer_size > self._max_buffer_size:
-      self._FlushBuffer()
+    self._AddEventObjectData(
+        event_object.timestamp, event_object.data_type,
+        getattr(event_object, u'parser', None),
+        getattr(event_object, u'plugin', None), event_object_data)
 
   def AddEventObjects(self, event_objects):
     """Adds event objects to the storage.
@@ -1298,6 +2944,29 @@ class StorageFile(object):
     for event_object in event_objects:
       self.AddEventObject(event_object)
 
+  def AddSerializedEventObject(self, serialized_event_object):
+    """Adds a serialized event object to the storage.
+
+    The event object is stored in the form it was serialized in by
+    the extraction worker, hence it is not deserialized and its attribute
+    values are not stored in the string table. Note that the event object
+    should be serialized in the serializer format of the storage file.
+
+    Args:
+      serialized_event_object: a serialized event object (instance of
+                               SerializedEventObject).
+
+    Raises:
+      IOError: When trying to write to a closed storage file.
+    """
+    if not self._file_open:
+      raise IOError(u'Trying to add an entry to a closed storage file.')
+
+    self._AddEventObjectData(
+        serialized_event_object.timestamp, serialized_event_object.data_type,
+        serialized_event_object.parser, serialized_event_object.plugin,
+        serialized_event_object.data)
+
   def HasTagging(self):
     """Return a bool indicating whether or not a Tag file is stored."""
     for name in self._GetStreamNames():
@@ -1384,6 +3053,33 @@ class StorageFile(object):
           not self._serializers_profiler):
         self._serializers_profiler = profiler.SerializersProfiler(u'Storage')
 
+  def SetEnablePrefetching(self, enable_prefetching, number_of_processes=0):
+    """Enables or disables prefetching of the stores that are merged.
+
+    When enabled GetSortedEntry reads the serialized entries of the stores
+    ahead of time and a pool of worker processes deserializes them, so that
+    the main process only reads and merges the event objects.
+
+    Args:
+      enable_prefetching: boolean value to indicate if prefetching should
+                          be enabled.
+      number_of_processes: optional number of worker processes. The default
+                           is 0, which represents the number of CPUs.
+    """
+    if enable_prefetching:
+      self._prefetch_number_of_processes = (
+          number_of_processes or multiprocessing.cpu_count())
+    else:
+      self._prefetch_number_of_processes = 0
+
+  def SetIndexCacheSize(self, maximum_size):
+    """Sets the maximum size of the store index cache.
+
+    Args:
+      maximum_size: the maximum size of the cached store indexes in bytes.
+    """
+    self._store_index_cache.SetMaximumSize(maximum_size)
+
   def StoreGrouping(self, rows):
     """Store group information into the storage file.
 
@@ -1503,11 +3199,11 @@ class StorageFile(object):
 
       if number >= tag_number:
         tag_number = number + 1
-      if self._event_tag_index is None:
-        self._BuildTagIndex()
 
     tag_packed = []
     tag_index = []
+    sorted_index_entries = []
+    uuid_index = {}
     size = 0
     for tag in tags:
       self._pre_obj.counter[u'Total Tags'] += 1
@@ -1515,8 +3211,13 @@ class StorageFile(object):
         for tag_entry in tag.tags:
           self._pre_obj.counter[tag_entry] += 1
 
-      if self._event_tag_index is not None:
-        tag_index_value = self._event_tag_index.get(tag.string_key, None)
+      tag_store_number = getattr(tag, u'store_number', 0)
+      tag_store_index = getattr(tag, u'store_index', 0)
+      tag_uuid = getattr(tag, u'event_uuid', None)
+
+      if tag_number > 1:
+        tag_index_value = self._GetEventTagIndexValue(
+            tag_store_number, tag_store_index, tag_uuid)
       else:
         tag_index_value = None
 
@@ -1526,14 +3227,11 @@ class StorageFile(object):
         stream_name = u'plaso_tagging.{0:06d}'.format(
             tag_index_value.store_number)
 
-        tag_file_object = self._OpenStream(stream_name, u'r')
+        tag_file_object = self._OpenStreamAtOffset(
+            stream_name, tag_index_value.store_offset)
         if tag_file_object is None:
           raise IOError(u'Unable to open stream: {0:s}'.format(stream_name))
 
-        # Since zipfile.ZipExtFile is not seekable we need to read up to
-        # the store offset.
-        _ = tag_file_object.read(tag_index_value.store_offset)
-
         old_tag = self._ReadEventTag(tag_file_object)
 
         # TODO: move the append functionality into EventTag.
@@ -1562,14 +3260,18 @@ class StorageFile(object):
       packed = (
           struct.pack('<I', len(serialized_event_tag)) + serialized_event_tag)
       ofs = struct.pack('<I', size)
-      if getattr(tag, u'store_number', 0):
+      if tag_store_number:
         struct_string = (
             construct.Byte(u'type').build(1) + ofs +
             _EventTagIndexValue.TAG_STORE_STRUCT.build(tag))
+        sorted_index_entries.append((
+            _EventTagSortedIndex.GetKey(tag_store_number, tag_store_index),
+            size))
       else:
         struct_string = (
             construct.Byte(u'type').build(2) + ofs +
             _EventTagIndexValue.TAG_UUID_STRUCT.build(tag))
+        uuid_index[tag_uuid] = size
 
       tag_index.append(struct_string)
       size += len(packed)
@@ -1578,16 +3280,28 @@ class StorageFile(object):
     stream_name = u'plaso_tag_index.{0:06d}'.format(tag_number)
     self._WriteStream(stream_name, b''.join(tag_index))
 
+    # The sorted index is stored without compression so that it can be
+    # read from the memory map of the storage file.
+    stream_name = u'plaso_tag_sorted_index.{0:06d}'.format(tag_number)
+    self._WriteStream(
+        stream_name, _EventTagSortedIndex.GetIndexData(sorted_index_entries),
+        compress=False)
+
+    if uuid_index:
+      stream_name = u'plaso_tag_uuid_index.{0:06d}'.format(tag_number)
+      self._WriteStream(stream_name, json.dumps(uuid_index, sort_keys=True))
+
     stream_name = u'plaso_tagging.{0:06d}'.format(tag_number)
-    self._WriteStream(stream_name, b''.join(tag_packed))
+    self._WriteStream(
+        stream_name, b''.join(tag_packed), compress=not self._random_access)
 
     # TODO: Update the tags that have changed in the index instead
     # of flushing the index.
 
     # If we already built a list of tag in memory we need to clear that
     # since the tags have changed.
-    if self._event_tag_index is not None:
-      del self._event_tag_index
+    self._event_tag_index = None
+    self._event_tag_uuid_index = None
 
 
 class StorageWriter(queue.ItemQueueConsumer):
@@ -1603,6 +3317,10 @@ class StorageWriter(queue.ItemQueueConsumer):
     """
     super(StorageWriter, self).__init__(event_object_queue)
 
+    # The slow file records that were pushed onto the event object queue
+    # by the extraction workers.
+    self._slow_file_records = []
+
     # Attributes that contain the current status of the storage writer.
     self._status = definitions.PROCESSING_STATUS_INITIALIZED
 
@@ -1618,10 +3336,24 @@ class StorageWriter(queue.ItemQueueConsumer):
     """Opens the storage writer."""
     return
 
+  def GetPartStorageWriter(self, unused_part_number):
+    """Retrieves a storage writer that writes a part of the storage.
+
+    Args:
+      part_number: the number of the part.
+
+    Returns:
+      A storage writer object (instance of StorageWriter) or None if
+      the storage writer does not support writing in parts.
+    """
+    return
+
   def GetStatus(self):
     """Returns a dictionary containing the status."""
+    number_of_events = (
+        self.number_of_consumed_items - len(self._slow_file_records))
     return {
-        u'number_of_events': self.number_of_consumed_items,
+        u'number_of_events': number_of_events,
         u'processing_status': self._status,
         u'type': definitions.PROCESS_TYPE_STORAGE_WRITER}
 
@@ -1652,7 +3384,7 @@ class FileStorageWriter(StorageWriter):
 
   def __init__(
       self, event_object_queue, output_file, buffer_size=0, pre_obj=None,
-      serializer_format=u'proto'):
+      random_access=False, serializer_format=u'proto'):
     """Initializes the storage file writer.
 
     Args:
@@ -1660,6 +3392,9 @@ class FileStorageWriter(StorageWriter):
       output_file: The path to the output file.
       buffer_size: The estimated size of a protobuf file.
       pre_obj: A preprocessing object (instance of PreprocessObject).
+      random_access: Optional boolean to indicate the store streams should
+                     be written without compression so that they can be
+                     read with random access. The default is false.
       serializer_format: A string containing either "proto" or "json". Defaults
                          to proto.
     """
@@ -1667,26 +3402,182 @@ class FileStorageWriter(StorageWriter):
     self._buffer_size = buffer_size
     self._output_file = output_file
     self._pre_obj = pre_obj
+    self._random_access = random_access
+    self._part_paths = []
     self._serializer_format = serializer_format
     self._storage_file = None
 
   def _Close(self):
     """Closes the storage writer."""
+    if self._slow_file_records:
+      self._storage_file.StoreReport(self._GetSlowFilesReport())
+
     self._storage_file.Close()
 
   def _ConsumeItem(self, event_object, **unused_kwargs):
     """Consumes an item callback for ConsumeItems."""
-    self._storage_file.AddEventObject(event_object)
+    if isinstance(event_object, event.SerializedEventObject):
+      self._storage_file.AddSerializedEventObject(event_object)
+    elif isinstance(event_object, event.SlowFileRecord):
+      self._slow_file_records.append(event_object)
+    else:
+      self._storage_file.AddEventObject(event_object)
+
+  def _GetSlowFileRecords(self, analysis_report):
+    """Retrieves the slow file records from a slow files report.
+
+    Args:
+      analysis_report: the slow files report (instance of AnalysisReport).
+
+    Returns:
+      A list of slow file records (instances of SlowFileRecord).
+    """
+    slow_file_records = []
+    for report_entry in getattr(analysis_report, u'report_array', None) or []:
+      slow_file_records.append(event.SlowFileRecord(
+          report_entry[u'parser'], report_entry[u'display_name'],
+          report_entry[u'size'], report_entry[u'elapsed_time'],
+          report_entry[u'aborted']))
+
+    return slow_file_records
+
+  def _GetSlowFilesReport(self):
+    """Retrieves a report of the slow file records.
+
+    Returns:
+      An analysis report (instance of AnalysisReport).
+    """
+    lines_of_text = [u'Files that were slow to parse or of which the parsing '
+                     u'was aborted:']
+
+    report_array = []
+    for slow_file_record in sorted(
+        self._slow_file_records, key=lambda record: record.elapsed_time,
+        reverse=True):
+      if slow_file_record.aborted:
+        status = u'aborted'
+      else:
+        status = u'slow'
+
+      lines_of_text.append((
+          u'{0:s}\t{1:s}\t{2:d} bytes\t{3:.1f} seconds\t{4:s}').format(
+              status, slow_file_record.parser, slow_file_record.size,
+              slow_file_record.elapsed_time, slow_file_record.display_name))
+
+      report_array.append({
+          u'aborted': slow_file_record.aborted,
+          u'display_name': slow_file_record.display_name,
+          u'elapsed_time': slow_file_record.elapsed_time,
+          u'parser': slow_file_record.parser,
+          u'size': slow_file_record.size})
+
+    analysis_report = event.AnalysisReport(u'slow_files')
+    analysis_report.report_array = report_array
+    analysis_report.time_compiled = timelib.Timestamp.GetNow()
+    analysis_report.SetText(lines_of_text)
+    return analysis_report
 
   def _Open(self):
     """Opens the storage writer."""
     self._storage_file = StorageFile(
         self._output_file, buffer_size=self._buffer_size, pre_obj=self._pre_obj,
+        random_access=self._random_access,
         serializer_format=self._serializer_format)
 
     self._storage_file.SetEnableProfiling(
         self._enable_profiling, profiling_type=self._profiling_type)
 
+  def GetPartStorageWriter(self, part_number):
+    """Retrieves a storage writer that writes a part of the storage file.
+
+    The part storage writer consumes the event objects from the same queue
+    as the storage writer and writes its stores to a separate part storage
+    file. This allows multiple processes to serialize and compress event
+    objects. The part storage files are merged into the storage file by
+    MergePartStorageFiles.
+
+    Args:
+      part_number: the number of the part.
+
+    Returns:
+      A storage writer object (instance of FileStorageWriter).
+
+    Raises:
+      IOError: if the part storage file already exists.
+    """
+    part_path = u'{0:s}.part{1:d}'.format(self._output_file, part_number)
+    if os.path.exists(part_path):
+      raise IOError(u'Part storage file: {0:s} already exists.'.format(
+          part_path))
+
+    # Every part storage file has its own copy of the preprocessing object
+    # so that the counters of its events are stored with the part.
+    part_storage_writer = FileStorageWriter(
+        self._queue, part_path, buffer_size=self._buffer_size,
+        pre_obj=copy.deepcopy(self._pre_obj),
+        random_access=self._random_access,
+        serializer_format=self._serializer_format)
+
+    part_storage_writer.SetEnableProfiling(
+        self._enable_profiling, profiling_type=self._profiling_type)
+
+    self._part_paths.append(part_path)
+    return part_storage_writer
+
+  def MergePartStorageFiles(self):
+    """Merges the part storage files into the storage file.
+
+    Part storage files that were merged are removed. Part storage files that
+    cannot be read are left in place.
+
+    Returns:
+      The number of stores merged.
+    """
+    number_of_stores = 0
+    if not self._part_paths:
+      return number_of_stores
+
+    self._Open()
+
+    try:
+      for part_path in self._part_paths:
+        if not os.path.exists(part_path):
+          continue
+
+        try:
+          part_storage_file = StorageFile(part_path, read_only=True)
+        except IOError as exception:
+          logging.warning((
+              u'Unable to open part storage file: {0:s} with error: '
+              u'{1:s}').format(part_path, exception))
+          continue
+
+        try:
+          number_of_stores += self._storage_file.MergeStorageFile(
+              part_storage_file)
+
+          # The reports of the part storage files are not merged by
+          # MergeStorageFile. The slow file records of the parts are combined
+          # into a single slow files report when the storage file is closed.
+          if part_storage_file.HasReports():
+            for analysis_report in part_storage_file.GetReports():
+              if analysis_report.plugin_name == u'slow_files':
+                self._slow_file_records.extend(
+                    self._GetSlowFileRecords(analysis_report))
+              else:
+                self._storage_file.StoreReport(analysis_report)
+
+        finally:
+          part_storage_file.Close()
+
+        os.remove(part_path)
+
+    finally:
+      self._Close()
+
+    self._part_paths = []
+    return number_of_stores
+
 
 class BypassStorageWriter(StorageWriter):
   """Class that implements a bypass storage writer object.
@@ -1724,6 +3615,11 @@ class BypassStorageWriter(StorageWriter):
 
   def _ConsumeItem(self, event_object, **unused_kwargs):
     """Consumes an item callback for ConsumeItems."""
+    # The slow file records are not written by the output module.
+    if isinstance(event_object, event.SlowFileRecord):
+      self._slow_file_records.append(event_object)
+      return
+
     # Set the store number and index to default values since they are not used.
     event_object.store_number = 1
     event_object.store_index = -1
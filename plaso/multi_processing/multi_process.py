@@ -2,6 +2,7 @@
 """The multi-process processing engine."""
 
 import abc
+import cPickle
 import ctypes
 import logging
 import multiprocessing
@@ -21,8 +22,13 @@ from plaso.engine import worker
 from plaso.lib import definitions
 from plaso.lib import errors
 from plaso.multi_processing import process_info
+from plaso.multi_processing import shared_memory_queue
+from plaso.multi_processing import shared_memory_status
 from plaso.multi_processing import xmlrpc
+from plaso.parsers import manager as parsers_manager
 from plaso.parsers import mediator as parsers_mediator
+from plaso.serializer import json_serializer
+from plaso.serializer import protobuf_serializer
 
 
 class MultiProcessBaseProcess(multiprocessing.Process):
@@ -30,18 +36,29 @@ class MultiProcessBaseProcess(multiprocessing.Process):
 
   Attributes:
     rpc_port: the port number of the process status RPC server.
+    status_table_index: the index of the slot of the process in the status
+                        table or None if the process status is retrieved
+                        via RPC.
   """
 
   _NUMBER_OF_RPC_SERVER_START_ATTEMPTS = 14
   _PROCESS_JOIN_TIMEOUT = 5.0
 
-  def __init__(self, process_type, enable_sigsegv_handler=False, **kwargs):
+  def __init__(
+      self, process_type, enable_sigsegv_handler=False, status_table=None,
+      status_table_index=None, **kwargs):
     """Initializes the process object.
 
     Args:
       process_type: the process type.
       enable_sigsegv_handler: optional boolean value to indicate the SIGSEGV
                               handler should be enabled. The default is False.
+      status_table: optional status table (instance of
+                    SharedMemoryStatusTable) the process writes its status
+                    into. The default is None, which means the process
+                    status is retrieved via RPC.
+      status_table_index: optional index of the slot of the process in
+                          the status table. The default is None.
       kwargs: keyword arguments to pass to multiprocessing.Process.
     """
     super(MultiProcessBaseProcess, self).__init__(**kwargs)
@@ -52,11 +69,18 @@ class MultiProcessBaseProcess(multiprocessing.Process):
     self._pid = None
     self._rpc_server = None
     self._status_is_running = False
+    self._status_table = None
+    self._status_writer = None
     self._type = process_type
 
     # We need to share the RPC port number with the engine process.
     self.rpc_port = multiprocessing.Value('I', 0)
 
+    self.status_table_index = None
+    if status_table and status_table_index is not None:
+      self._status_table = status_table
+      self.status_table_index = status_table_index
+
   @abc.abstractmethod
   def _GetStatus(self):
     """Returns a status dictionary."""
@@ -143,6 +167,19 @@ class MultiProcessBaseProcess(multiprocessing.Process):
     logging.debug(
         u'Process: {0!s} process status RPC server started'.format(self._name))
 
+  def _StartProcessStatusWriter(self):
+    """Starts writing the process status into the status table."""
+    if self._status_writer:
+      return
+
+    self._status_writer = shared_memory_status.SharedMemoryStatusWriter(
+        self._status_table, self.status_table_index, self._type,
+        self._GetStatus)
+    self._status_writer.Start()
+
+    logging.debug(
+        u'Process: {0!s} process status writer started'.format(self._name))
+
   def _StopProcessStatusRPCServer(self):
     """Stops the process status RPC server."""
     if not self._rpc_server:
@@ -159,6 +196,19 @@ class MultiProcessBaseProcess(multiprocessing.Process):
     logging.debug(
         u'Process: {0!s} process status RPC server stopped'.format(self._name))
 
+  def _StopProcessStatusWriter(self):
+    """Stops writing the process status into the status table."""
+    if not self._status_writer:
+      return
+
+    # The status writer writes the final status when it is stopped, hence
+    # there is no need to wait for the engine to retrieve the status.
+    self._status_writer.Stop()
+    self._status_writer = None
+
+    logging.debug(
+        u'Process: {0!s} process status writer stopped'.format(self._name))
+
   def _WaitForStatusNotRunning(self):
     """Waits for the status is running to change to false."""
     # We wait slightly longer than the status check sleep time.
@@ -209,11 +259,17 @@ class MultiProcessBaseProcess(multiprocessing.Process):
     logging.debug(
         u'Process: {0!s} (PID: {1:d}) started'.format(self._name, self._pid))
 
-    self._StartProcessStatusRPCServer()
+    if self._status_table:
+      self._StartProcessStatusWriter()
+    else:
+      self._StartProcessStatusRPCServer()
 
     self._Main()
 
-    self._StopProcessStatusRPCServer()
+    if self._status_table:
+      self._StopProcessStatusWriter()
+    else:
+      self._StopProcessStatusRPCServer()
 
     logging.debug(
         u'Process: {0!s} (PID: {1:d}) stopped'.format(self._name, self._pid))
@@ -230,7 +286,8 @@ class MultiProcessCollectorProcess(MultiProcessBaseProcess):
 
   def __init__(
       self, stop_collector_event, source_path_specs, path_spec_queue,
-      filter_find_specs=None, include_directory_stat=True, **kwargs):
+      file_range_size=0, filter_find_specs=None, include_directory_stat=True,
+      schedule_largest_first=False, **kwargs):
     """Initializes the process object.
 
     Args:
@@ -241,11 +298,18 @@ class MultiProcessCollectorProcess(MultiProcessBaseProcess):
                          dfvfs.PathSpec) to process.
       path_spec_queue: the path specification queue object (instance of
                        MultiProcessingQueue).
+      file_range_size: Optional size of the ranges that files which are larger
+                       are split into, if a parser supports splitting.
+                       The default is 0, which represents files are not split.
       filter_find_specs: Optional list of filter find specifications (instances
                          of dfvfs.FindSpec). The default is None.
       include_directory_stat: Optional boolean value to indicate whether
                               directory stat information should be collected.
                               The default is True.
+      schedule_largest_first: Optional boolean value to indicate the path
+                              specifications of the files with the largest
+                              estimated processing cost should be produced
+                              first. The default is False.
       kwargs: keyword arguments to pass to multiprocessing.Process.
     """
     super(MultiProcessCollectorProcess, self).__init__(
@@ -259,6 +323,8 @@ class MultiProcessCollectorProcess(MultiProcessBaseProcess):
     self._stop_collector_event = stop_collector_event
 
     self._collector.SetCollectDirectoryMetadata(include_directory_stat)
+    self._collector.SetFileRangeSize(file_range_size)
+    self._collector.SetScheduleLargestFirst(schedule_largest_first)
 
     if filter_find_specs:
       self._collector.SetFilter(filter_find_specs)
@@ -323,45 +389,142 @@ class MultiProcessEngine(engine.BaseEngine):
 
   _STATUS_CHECK_SLEEP = 1.5
 
+  # The number of seconds after which a process that did not write its
+  # status into the status table is reported as not responding.
+  _STATUS_HEARTBEAT_TIMEOUT = 60.0
+
   _WORKER_PROCESSES_MINIMUM = 2
   _WORKER_PROCESSES_MAXIMUM = 15
 
-  def __init__(self, maximum_number_of_queued_items=0):
+  # The number of seconds after which an extraction worker that did not
+  # consume or produce anything is considered idle.
+  _WORKER_IDLE_TIME = 30.0
+
+  # The minimum number of seconds between adjustments of the number of
+  # extraction workers.
+  _WORKER_POOL_ADJUSTMENT_INTERVAL = 15.0
+
+  # The number of pending event objects above which no extraction workers
+  # are added, since the storage writer is not keeping up.
+  _WORKER_POOL_MAXIMUM_PENDING_EVENTS = 100000
+
+  # The number of pending path specifications per extraction worker above
+  # which an extraction worker is added.
+  _WORKER_POOL_PENDING_PATH_SPECS_PER_WORKER = 4
+
+  # The default maximum number of event objects a worker pushes onto
+  # the event object queue at once.
+  _DEFAULT_EVENT_OBJECT_BATCH_SIZE = 100
+
+  # The default number of seconds after which a worker pushes a partial
+  # batch of event objects onto the event object queue.
+  _DEFAULT_EVENT_OBJECT_BATCH_FLUSH_INTERVAL = 1.0
+
+  def __init__(
+      self, maximum_number_of_queued_items=0, maximum_queued_size=0,
+      maximum_total_queued_size=0, use_shared_memory_queue=False):
     """Initialize the multi-process engine object.
 
     Args:
       maximum_number_of_queued_items: The maximum number of queued items.
                                       The default is 0, which represents
                                       no limit.
+      maximum_queued_size: optional maximum size of the serialized form of
+                           the items queued per queue in bytes. The default
+                           is 0, which represents no limit.
+      maximum_total_queued_size: optional maximum size of the serialized form
+                                 of the items queued on all the queues of
+                                 the engine in bytes. The default is 0, which
+                                 represents no limit.
+      use_shared_memory_queue: optional boolean value to indicate the queues
+                               should use a shared memory ring buffer instead
+                               of a multiprocessing.Queue. The shared memory
+                               queue is not supported on all platforms.
+
+    Raises:
+      ValueError: if the shared memory queue is used together with
+                  a maximum total queued size.
     """
-    path_spec_queue = MultiProcessingQueue(
-        maximum_number_of_queued_items=maximum_number_of_queued_items)
-    event_object_queue = MultiProcessingQueue(
-        maximum_number_of_queued_items=maximum_number_of_queued_items)
-    parse_error_queue = MultiProcessingQueue(
-        maximum_number_of_queued_items=maximum_number_of_queued_items)
+    if use_shared_memory_queue and maximum_total_queued_size:
+      raise ValueError(
+          u'Maximum total queued size not supported by the shared memory '
+          u'queue.')
+
+    if use_shared_memory_queue and (
+        not shared_memory_queue.SharedMemoryQueue.IsSupported()):
+      logging.warning(
+          u'Shared memory queue not supported on this platform, defaulting '
+          u'to multi-processing queue.')
+      use_shared_memory_queue = False
+
+    if use_shared_memory_queue:
+      # The size of the shared memory queue is bounded by its ring buffer,
+      # hence it does not use the size budget of the engine.
+      queue_class = shared_memory_queue.SharedMemoryQueue
+      queue_kwargs = {}
+      if maximum_queued_size:
+        queue_kwargs[u'buffer_size'] = maximum_queued_size
+
+    else:
+      queue_class = MultiProcessingQueue
+      queue_kwargs = {u'maximum_queued_size': maximum_queued_size}
+      if maximum_total_queued_size:
+        queue_kwargs[u'size_budget'] = MultiProcessingQueueSizeBudget(
+            maximum_size=maximum_total_queued_size)
+
+    path_spec_queue = queue_class(
+        maximum_number_of_queued_items=maximum_number_of_queued_items,
+        **queue_kwargs)
+    event_object_queue = queue_class(
+        maximum_number_of_queued_items=maximum_number_of_queued_items,
+        **queue_kwargs)
+    parse_error_queue = queue_class(
+        maximum_number_of_queued_items=maximum_number_of_queued_items,
+        **queue_kwargs)
 
     super(MultiProcessEngine, self).__init__(
         path_spec_queue, event_object_queue, parse_error_queue)
 
+    self._adjust_worker_pool = False
     self._enable_sigsegv_handler = False
+    self._event_object_batch_flush_interval = (
+        self._DEFAULT_EVENT_OBJECT_BATCH_FLUSH_INTERVAL)
+    self._event_object_batch_size = self._DEFAULT_EVENT_OBJECT_BATCH_SIZE
     self._filter_find_specs = None
     self._filter_object = None
+    self._hasher_file_size_limit = 0
     self._hasher_names_string = None
+    self._hasher_read_size = 0
     self._include_directory_stat = True
     self._last_worker_number = 0
+    self._last_worker_pool_adjustment_time = 0
+    self._maximum_memory_usage = 0
+    self._maximum_number_of_extraction_workers = 0
+    self._maximum_queued_size = maximum_queued_size
+    self._maximum_worker_memory_usage = 0
+    self._maximum_worker_number_of_path_specs = 0
+    self._maximum_worker_runtime = 0
+    self._minimum_number_of_extraction_workers = 0
     self._mount_path = None
     self._number_of_extraction_workers = 0
+    self._number_of_storage_writers = 0
     self._parser_filter_string = None
+    self._parser_timeout = 0
     self._process_archive_files = False
     self._process_information_per_pid = {}
     self._processes_per_pid = {}
+    self._recycled_worker_pids = set()
     self._rpc_clients_per_pid = {}
     self._rpc_errors_per_pid = {}
+    self._serializer_format = None
     self._storage_writer_completed = False
     self._show_memory_usage = False
     self._stop_collector_event = None
+    self._status_table = None
+    self._status_table_indexes_per_pid = {}
+    self._stop_worker_events_per_pid = {}
     self._text_prepend = None
+    self._worker_start_time_per_pid = {}
 
   def _AbortJoin(self, timeout=None):
     """Aborts all registered processes by joining with the parent process.
@@ -397,6 +560,108 @@ class MultiProcessEngine(engine.BaseEngine):
           process.name, pid))
       process.terminate()
 
+  def _AdjustExtractionWorkerPool(self):
+    """Adds or removes an extraction worker process when necessary.
+
+    At most one extraction worker process is added or removed per adjustment
+    interval, so that the effect of an adjustment can be observed before
+    the next one.
+    """
+    timestamp = time.time()
+    if (timestamp - self._last_worker_pool_adjustment_time <
+        self._WORKER_POOL_ADJUSTMENT_INTERVAL):
+      return
+
+    memory_usage_per_pid = self._GetMemoryUsagePerPID()
+    adjustment = self._GetExtractionWorkerPoolAdjustment(
+        memory_usage_per_pid, timestamp)
+
+    if adjustment > 0:
+      worker_process = self._StartExtractionWorkerProcess()
+      self._StartMonitoringProcess(worker_process.pid)
+      self._number_of_extraction_workers += 1
+
+    elif adjustment < 0:
+      if not self._StopExtractionWorkerProcess(memory_usage_per_pid):
+        return
+      self._number_of_extraction_workers -= 1
+
+    if adjustment:
+      logging.debug(u'Number of extraction workers adjusted to: {0:d}'.format(
+          self._number_of_extraction_workers))
+      self._last_worker_pool_adjustment_time = timestamp
+
+  def _AllocateStatusTableIndex(self):
+    """Allocates a slot in the status table for a process.
+
+    Returns:
+      The index of the slot or None if the status table is not used or
+      no slot is available, in which case the process status is retrieved
+      via RPC.
+    """
+    if not self._status_table:
+      return
+
+    status_table_index = self._status_table.AllocateSlot()
+    if status_table_index is None:
+      # Reclaim the slots of the processes that have stopped.
+      for pid, process_status_table_index in list(
+          self._status_table_indexes_per_pid.items()):
+        process = self._processes_per_pid[pid]
+        if (pid not in self._process_information_per_pid and
+            not process.is_alive()):
+          self._status_table.FreeSlot(process_status_table_index)
+          del self._status_table_indexes_per_pid[pid]
+
+      status_table_index = self._status_table.AllocateSlot()
+
+    return status_table_index
+
+  def _CheckExtractionWorkerLimits(self, pid, process_status):
+    """Checks if an extraction worker process exceeds one of its limits.
+
+    An extraction worker process that exceeds one of its limits is signaled
+    to stop after it has processed its current path specification and
+    is replaced by a new extraction worker process when it has completed.
+    This limits the effect of memory leaks, for example in native parser
+    bindings, on long running extractions.
+
+    Args:
+      pid: the process identifier (PID).
+      process_status: the process status dictionary.
+    """
+    if pid in self._recycled_worker_pids:
+      return
+
+    stop_worker_event = self._stop_worker_events_per_pid.get(pid, None)
+    if not stop_worker_event or stop_worker_event.is_set():
+      return
+
+    memory_usage = 0
+    if self._maximum_worker_memory_usage:
+      memory_usage = process_status.get(u'memory_usage', None)
+      if memory_usage is None:
+        process_information = self._process_information_per_pid[pid]
+        memory_information = process_information.GetMemoryInformation()
+        memory_usage = getattr(memory_information, u'rss', 0)
+
+    number_of_path_specs = process_status.get(
+        u'consumed_number_of_path_specs', 0)
+    runtime = time.time() - self._worker_start_time_per_pid[pid]
+
+    exceeded_limit = self._GetExceededExtractionWorkerLimit(
+        memory_usage, number_of_path_specs, runtime)
+    if not exceeded_limit:
+      return
+
+    process = self._processes_per_pid[pid]
+    logging.info((
+        u'Extraction worker: {0:s} (PID: {1:d}) exceeded its {2:s} and '
+        u'will be replaced.').format(process.name, pid, exceeded_limit))
+
+    self._recycled_worker_pids.add(pid)
+    stop_worker_event.set()
+
   def _CheckStatus(self):
     """Checks status of the monitored processes.
 
@@ -409,6 +674,11 @@ class MultiProcessEngine(engine.BaseEngine):
     for pid in iter(self._process_information_per_pid.keys()):
       self._CheckProcessStatus(pid)
 
+    self._UpdateQueueStatus()
+
+    if self._adjust_worker_pool:
+      self._AdjustExtractionWorkerPool()
+
     processing_completed = self._processing_status.GetProcessingCompleted()
     if processing_completed and not self._processing_status.error_detected:
       logging.debug(u'Processing completed.')
@@ -437,11 +707,41 @@ class MultiProcessEngine(engine.BaseEngine):
     process = self._processes_per_pid[pid]
 
     process_is_alive = process.is_alive()
-    if process_is_alive:
+    if pid in self._status_table_indexes_per_pid:
+      # The status is read before determining if the process was killed,
+      # since a process writes its final status before it stops, for example
+      # an extraction worker that was stopped by the engine.
+      process_status = self._status_table.ReadStatus(
+          self._status_table_indexes_per_pid[pid])
+
+      if not process_is_alive:
+        status_indicator = None
+        if process_status:
+          status_indicator = process_status.get(u'processing_status', None)
+
+        if status_indicator != definitions.PROCESSING_STATUS_COMPLETED:
+          process_status = None
+
+      # The process has not written its status yet.
+      elif process_status is None:
+        return
+
+      else:
+        # Unlike a RPC call a missed status update does not indicate
+        # the process is not functioning, for example a parser can hold on
+        # to the GIL for a while, hence it is only reported.
+        heartbeat_age = time.time() - process_status[u'heartbeat']
+        if heartbeat_age >= self._STATUS_HEARTBEAT_TIMEOUT:
+          logging.warning((
+              u'Process: {0:s} (PID: {1:d}) did not update its status for '
+              u'{2:.0f} seconds.').format(process.name, pid, heartbeat_age))
+
+    elif not process_is_alive:
+      process_status = None
+
+    else:
       rpc_client = self._rpc_clients_per_pid.get(pid, None)
       process_status = rpc_client.CallFunction()
-    else:
-      process_status = None
 
     if isinstance(process_status, dict):
       self._rpc_errors_per_pid[pid] = 0
@@ -468,6 +768,11 @@ class MultiProcessEngine(engine.BaseEngine):
         processing_status_string = u'killed'
         status_indicator = definitions.PROCESSING_STATUS_KILLED
 
+        # The file entry the extraction worker was processing, according
+        # to its last status, was not completely processed.
+        if process.type == definitions.PROCESS_TYPE_WORKER:
+          self._processing_status.AddLostPathSpec(process.name)
+
       process_status = {
           u'processing_status': processing_status_string,
           u'type': process.type,
@@ -498,6 +803,9 @@ class MultiProcessEngine(engine.BaseEngine):
         raise errors.EngineAbort(u'Storage writer unexpectedly terminated')
 
       self._TerminateProcess(pid)
+      self._recycled_worker_pids.discard(pid)
+      self._stop_worker_events_per_pid.pop(pid, None)
+      self._worker_start_time_per_pid.pop(pid, None)
 
       worker_process = self._StartExtractionWorkerProcess()
       self._StartMonitoringProcess(worker_process.pid)
@@ -509,9 +817,190 @@ class MultiProcessEngine(engine.BaseEngine):
               process.name, pid, process_status.get(u'number_of_events', 0)))
 
       self._StopMonitoringProcess(pid)
+      self._stop_worker_events_per_pid.pop(pid, None)
+      self._worker_start_time_per_pid.pop(pid, None)
+
+      # An extraction worker that was stopped because it exceeded one of
+      # its limits is replaced by a new extraction worker.
+      if pid in self._recycled_worker_pids:
+        self._recycled_worker_pids.remove(pid)
+
+        worker_process = self._StartExtractionWorkerProcess()
+        self._StartMonitoringProcess(worker_process.pid)
+
+    else:
+      if process.type == definitions.PROCESS_TYPE_WORKER:
+        self._CheckExtractionWorkerLimits(pid, process_status)
+
+      if self._show_memory_usage:
+        self._LogMemoryUsage(pid)
+
+  def _GetExceededExtractionWorkerLimit(
+      self, memory_usage, number_of_path_specs, runtime):
+    """Determines the limit of an extraction worker process that is exceeded.
+
+    Args:
+      memory_usage: the resident set size (RSS) of the extraction worker
+                    process in bytes.
+      number_of_path_specs: the number of path specifications consumed
+                            by the extraction worker process.
+      runtime: the number of seconds the extraction worker process has been
+               running.
+
+    Returns:
+      A string containing a description of the exceeded limit or None
+      if no limit is exceeded.
+    """
+    if (self._maximum_worker_memory_usage and
+        memory_usage > self._maximum_worker_memory_usage):
+      return u'maximum memory usage'
+
+    if (self._maximum_worker_number_of_path_specs and
+        number_of_path_specs >= self._maximum_worker_number_of_path_specs):
+      return u'maximum number of path specifications'
+
+    if self._maximum_worker_runtime and runtime > self._maximum_worker_runtime:
+      return u'maximum runtime'
+
+  def _GetExtractionWorkerPoolAdjustment(self, memory_usage_per_pid, timestamp):
+    """Determines if an extraction worker should be added or removed.
+
+    An extraction worker is removed when the total memory usage exceeds
+    the maximum, or when there are no pending path specifications while
+    an extraction worker is idle. An extraction worker is added when
+    the number of pending path specifications exceeds the number the current
+    extraction workers can keep busy, none of the extraction workers is idle,
+    the storage writers keep up with the extracted event objects and
+    the memory usage allows for another extraction worker.
+
+    Args:
+      memory_usage_per_pid: a dictionary containing the memory usage, in bytes,
+                            of the monitored processes per process identifier.
+      timestamp: the current POSIX timestamp.
+
+    Returns:
+      An integer containing 1 if an extraction worker should be added, -1 if
+      an extraction worker should be removed or 0 otherwise.
+    """
+    if not self._processing_status.collector:
+      return 0
+
+    number_of_workers = self._number_of_extraction_workers
+
+    memory_usage = sum(memory_usage_per_pid.values())
+    if self._maximum_memory_usage and memory_usage > self._maximum_memory_usage:
+      if number_of_workers > self._minimum_number_of_extraction_workers:
+        return -1
+      return 0
+
+    number_of_idle_workers = 0
+    worker_memory_usage = []
+    for extraction_worker_status in self._processing_status.extraction_workers:
+      if extraction_worker_status.status != (
+          definitions.PROCESSING_STATUS_RUNNING):
+        continue
+
+      idle_time = timestamp - extraction_worker_status.last_running_time
+      if idle_time >= self._WORKER_IDLE_TIME:
+        number_of_idle_workers += 1
+
+      if extraction_worker_status.pid in memory_usage_per_pid:
+        worker_memory_usage.append(
+            memory_usage_per_pid[extraction_worker_status.pid])
+
+    number_of_pending_path_specs = (
+        self._processing_status.GetProducedNumberOfPathSpecs() -
+        self._processing_status.GetConsumedNumberOfPathSpecs())
+
+    if number_of_pending_path_specs <= 0:
+      if (number_of_idle_workers and
+          number_of_workers > self._minimum_number_of_extraction_workers):
+        return -1
+      return 0
+
+    if (number_of_idle_workers or
+        number_of_workers >= self._maximum_number_of_extraction_workers):
+      return 0
+
+    if number_of_pending_path_specs <= (
+        number_of_workers * self._WORKER_POOL_PENDING_PATH_SPECS_PER_WORKER):
+      return 0
+
+    number_of_pending_events = (
+        self._processing_status.GetNumberOfExtractedEvents() -
+        self._processing_status.GetNumberOfStoredEvents())
+    if number_of_pending_events > self._WORKER_POOL_MAXIMUM_PENDING_EVENTS:
+      return 0
+
+    # The memory usage of an additional extraction worker is estimated
+    # as the average memory usage of the current extraction workers.
+    if self._maximum_memory_usage and worker_memory_usage:
+      average_worker_memory_usage = (
+          sum(worker_memory_usage) // len(worker_memory_usage))
+      if (memory_usage + average_worker_memory_usage >
+          self._maximum_memory_usage):
+        return 0
+
+    return 1
+
+  def _GetFileRangeSize(
+      self, file_range_size, hasher_names_string, parser_filter_string):
+    """Determines the size of the ranges that files are split into.
+
+    Files are only split if one of the enabled parsers supports splitting.
+    Only the range that contains the start of a file is hashed, hence files
+    are not split when hashers are enabled.
+
+    Args:
+      file_range_size: the requested size of the ranges. A value of 0
+                       represents files are not split.
+      hasher_names_string: comma separated string of names of hashers
+                           to enable or None.
+      parser_filter_string: the parser filter string or None.
+
+    Returns:
+      The size of the ranges, where 0 represents files are not split.
+    """
+    if not file_range_size:
+      return 0
+
+    if hasher_names_string:
+      logging.warning(
+          u'Files are not split into ranges when hashers are enabled.')
+      return 0
+
+    for _, parser_class in parsers_manager.ParsersManager.GetParsers(
+        parser_filter_string=parser_filter_string):
+      if parser_class.SupportsSplitting():
+        return file_range_size
+
+    logging.info(
+        u'Files are not split into ranges since none of the enabled parsers '
+        u'supports splitting.')
+    return 0
+
+  def _GetMemoryUsagePerPID(self):
+    """Retrieves the memory usage of the monitored processes.
+
+    Returns:
+      A dictionary containing the resident set size (RSS), in bytes,
+      of the monitored processes per process identifier.
+    """
+    memory_usage_per_pid = {}
+    for pid, process_information in iter(
+        self._process_information_per_pid.items()):
+      status_table_index = self._status_table_indexes_per_pid.get(pid, None)
+      if status_table_index is not None:
+        process_status = self._status_table.ReadStatus(status_table_index)
+        if process_status:
+          memory_usage_per_pid[pid] = process_status[u'memory_usage']
+        continue
+
+      memory_information = process_information.GetMemoryInformation()
+      if memory_information:
+        memory_usage_per_pid[pid] = memory_information.rss
 
-    elif self._show_memory_usage:
-      self._LogMemoryUsage(pid)
+    return memory_usage_per_pid
 
   def _KillProcess(self, pid):
     """Issues a SIGKILL or equivalent to the process.
@@ -563,24 +1052,37 @@ class MultiProcessEngine(engine.BaseEngine):
       MultiProcessEventExtractionWorkerProcess).
     """
     process_name = u'Worker_{0:02d}'.format(self._last_worker_number)
+    stop_worker_event = multiprocessing.Event()
     worker_process = MultiProcessEventExtractionWorkerProcess(
         self._path_spec_queue, self.event_object_queue,
         self._parse_error_queue, self.knowledge_base, self._last_worker_number,
         enable_debug_output=self._enable_debug_output,
         enable_profiling=self._enable_profiling,
         enable_sigsegv_handler=self._enable_sigsegv_handler,
+        event_object_batch_flush_interval=(
+            self._event_object_batch_flush_interval),
+        event_object_batch_size=self._event_object_batch_size,
         filter_object=self._filter_object,
+        hasher_file_size_limit=self._hasher_file_size_limit,
         hasher_names_string=self._hasher_names_string,
+        hasher_read_size=self._hasher_read_size,
         mount_path=self._mount_path, name=process_name,
         parser_filter_string=self._parser_filter_string,
+        parser_timeout=self._parser_timeout,
         process_archive_files=self._process_archive_files,
         profiling_sample_rate=self._profiling_sample_rate,
-        profiling_type=self._profiling_type, text_prepend=self._text_prepend)
+        profiling_type=self._profiling_type,
+        serializer_format=self._serializer_format,
+        status_table=self._status_table,
+        status_table_index=self._AllocateStatusTableIndex(),
+        stop_worker_event=stop_worker_event, text_prepend=self._text_prepend)
 
     worker_process.start()
     self._last_worker_number += 1
 
     self._RegisterProcess(worker_process)
+    self._stop_worker_events_per_pid[worker_process.pid] = stop_worker_event
+    self._worker_start_time_per_pid[worker_process.pid] = time.time()
 
     return worker_process
 
@@ -610,11 +1112,19 @@ class MultiProcessEngine(engine.BaseEngine):
     self._stop_collector_event.set()
 
     # Wake the processes to make sure that they are not blocking
-    # waiting for new items.
-    for _ in range(self._number_of_extraction_workers):
+    # waiting for new items. Note that an extraction worker that was
+    # signaled to stop can still be waiting for a new item.
+    number_of_extraction_workers = 0
+    for process in iter(self._processes_per_pid.values()):
+      if process.type == definitions.PROCESS_TYPE_WORKER and process.is_alive():
+        number_of_extraction_workers += 1
+
+    for _ in range(number_of_extraction_workers):
       self._path_spec_queue.PushItem(queue.QueueAbort(), block=False)
 
-    self.event_object_queue.PushItem(queue.QueueAbort(), block=False)
+    for _ in range(self._number_of_storage_writers):
+      self.event_object_queue.PushItem(queue.QueueAbort(), block=False)
+
     # TODO: enable this when the parse error queue consumer is operational.
     # self._parse_error_queue.PushItem(queue.QueueAbort(), block=False)
 
@@ -636,6 +1146,47 @@ class MultiProcessEngine(engine.BaseEngine):
       # the collector dies.
       self._AbortKill()
 
+  def _StopExtractionWorkerProcess(self, memory_usage_per_pid):
+    """Signals an extraction worker process to stop.
+
+    If there are no pending path specifications a queue abort is pushed
+    onto the path specification queue, which is consumed by an idle
+    extraction worker. Otherwise the extraction worker with the largest
+    memory usage is signaled to stop after it has processed its current
+    path specification.
+
+    Args:
+      memory_usage_per_pid: a dictionary containing the memory usage, in bytes,
+                            of the monitored processes per process identifier.
+
+    Returns:
+      A boolean value indicating an extraction worker was signaled to stop.
+    """
+    number_of_pending_path_specs = (
+        self._processing_status.GetProducedNumberOfPathSpecs() -
+        self._processing_status.GetConsumedNumberOfPathSpecs())
+
+    if number_of_pending_path_specs <= 0:
+      self._path_spec_queue.PushItem(queue.QueueAbort(), block=False)
+      return True
+
+    stop_pid = None
+    for pid, stop_worker_event in iter(
+        self._stop_worker_events_per_pid.items()):
+      if stop_worker_event.is_set():
+        continue
+
+      if stop_pid is None or (
+          memory_usage_per_pid.get(pid, 0) >
+          memory_usage_per_pid.get(stop_pid, 0)):
+        stop_pid = pid
+
+    if stop_pid is None:
+      return False
+
+    self._stop_worker_events_per_pid[stop_pid].set()
+    return True
+
   def _StartMonitoringProcess(self, pid):
     """Starts monitoring a process.
 
@@ -653,6 +1204,12 @@ class MultiProcessEngine(engine.BaseEngine):
       raise KeyError(
           u'Process (PID: {0:d}) already in monitoring list.'.format(pid))
 
+    # A process that writes its status into the status table does not
+    # need a RPC client.
+    if pid in self._status_table_indexes_per_pid:
+      self._process_information_per_pid[pid] = process_info.ProcessInfo(pid)
+      return
+
     if pid in self._rpc_clients_per_pid:
       raise KeyError(
           u'RPC client (PID: {0:d}) already exists'.format(pid))
@@ -730,6 +1287,10 @@ class MultiProcessEngine(engine.BaseEngine):
 
     self._processes_per_pid[process.pid] = process
 
+    if process.status_table_index is not None:
+      self._status_table_indexes_per_pid[process.pid] = (
+          process.status_table_index)
+
   def _StartProcessMonitoring(self):
     """Starts monitoring the registered processes."""
     for pid in iter(self._processes_per_pid.keys()):
@@ -759,6 +1320,9 @@ class MultiProcessEngine(engine.BaseEngine):
     if pid in self._rpc_errors_per_pid:
       del self._rpc_errors_per_pid[pid]
 
+    if pid in self._stop_worker_events_per_pid:
+      del self._stop_worker_events_per_pid[pid]
+
     logging.debug((
         u'Process: {0:s} (PID: {1:d}) has been removed from the monitoring '
         u'list.').format(process.name, pid))
@@ -841,13 +1405,34 @@ class MultiProcessEngine(engine.BaseEngine):
           consumed_number_of_path_specs, produced_number_of_path_specs,
           status_indicator, process_information.status)
 
+  def _UpdateQueueStatus(self):
+    """Updates the queue status of the processing status."""
+    queues = [
+        (u'PathSpecQueue', self._path_spec_queue),
+        (u'EventObjectQueue', self.event_object_queue),
+        (u'ParseErrorQueue', self._parse_error_queue)]
+
+    for identifier, queue_object in queues:
+      queued_size = queue_object.GetQueuedSize()
+      if queued_size is not None:
+        self._processing_status.UpdateQueueStatus(
+            identifier, queued_size,
+            maximum_queued_size=self._maximum_queued_size)
+
   def ProcessSources(
       self, source_path_specs, storage_writer, enable_sigsegv_handler=False,
-      filter_find_specs=None, filter_object=None, hasher_names_string=None,
-      include_directory_stat=True, mount_path=None,
-      number_of_extraction_workers=0, parser_filter_string=None,
-      process_archive_files=False, status_update_callback=None,
-      show_memory_usage=False, text_prepend=None):
+      event_object_batch_flush_interval=None, event_object_batch_size=None,
+      file_range_size=0, filter_find_specs=None, filter_object=None,
+      hasher_file_size_limit=0, hasher_names_string=None, hasher_read_size=0,
+      include_directory_stat=True, maximum_memory_usage=0,
+      maximum_number_of_extraction_workers=0, maximum_worker_memory_usage=0,
+      maximum_worker_number_of_path_specs=0, maximum_worker_runtime=0,
+      minimum_number_of_extraction_workers=0, mount_path=None,
+      number_of_extraction_workers=0, number_of_storage_writers=1,
+      parser_filter_string=None, parser_timeout=0, process_archive_files=False,
+      schedule_largest_first=False, serializer_format=None,
+      status_update_callback=None, show_memory_usage=False,
+      text_prepend=None):
     """Processes the sources and extract event objects.
 
     Args:
@@ -856,25 +1441,105 @@ class MultiProcessEngine(engine.BaseEngine):
       storage_writer: A storage writer object (instance of BaseStorageWriter).
       enable_sigsegv_handler: optional boolean value to indicate the SIGSEGV
                               handler should be enabled. The default is False.
+      event_object_batch_flush_interval: Optional number of seconds after
+                                         which an extraction worker pushes
+                                         a partial batch of event objects
+                                         onto the event object queue.
+                                         The default is None, which means
+                                         the default flush interval is used.
+      event_object_batch_size: Optional maximum number of event objects
+                               an extraction worker pushes onto the event
+                               object queue at once. A value of 1 disables
+                               batching. The default is None, which means
+                               the default batch size is used.
+      file_range_size: Optional size of the ranges that files which are larger
+                       are split into, so that the extraction workers can
+                       parse the ranges of a file in parallel if a parser
+                       supports splitting. The default is 0, which represents
+                       files are not split.
       filter_find_specs: Optional list of filter find specifications (instances
                          of dfvfs.FindSpec). The default is None.
       filter_object: Optional filter object (instance of objectfilter.Filter).
                      The default is None.
+      hasher_file_size_limit: Optional maximum size of a file in bytes that
+                              is hashed. The default is 0, which represents
+                              no limit.
       hasher_names_string: Optional comma separated string of names of
                            hashers to enable enable. The default is None.
+      hasher_read_size: Optional number of bytes read per read operation
+                        when hashing a file. The default is 0, which
+                        represents the default read size.
       include_directory_stat: Optional boolean value to indicate whether
                               directory stat information should be collected.
                               The default is True.
+      maximum_memory_usage: Optional maximum total memory usage, in bytes,
+                            of the processes. If exceeded extraction workers
+                            are stopped, down to the minimum number of
+                            extraction workers. The default is 0, which
+                            represents no limit.
+      maximum_number_of_extraction_workers: Optional maximum number of
+                                            extraction worker processes
+                                            the engine adds at runtime.
+                                            The default is 0, which represents
+                                            the engine maximum.
+      maximum_worker_memory_usage: Optional maximum memory usage, in bytes,
+                                   of an extraction worker process. If
+                                   exceeded the extraction worker process
+                                   is replaced after it has processed its
+                                   current path specification. The default
+                                   is 0, which represents no limit.
+      maximum_worker_number_of_path_specs: Optional maximum number of path
+                                           specifications an extraction
+                                           worker process consumes before
+                                           it is replaced. The default is 0,
+                                           which represents no limit.
+      maximum_worker_runtime: Optional maximum number of seconds an extraction
+                              worker process runs before it is replaced
+                              after it has processed its current path
+                              specification. The default is 0, which
+                              represents no limit.
+      minimum_number_of_extraction_workers: Optional minimum number of
+                                            extraction worker processes
+                                            the engine keeps at runtime.
+                                            The default is 0, which represents
+                                            1 extraction worker.
       mount_path: Optional string containing the mount path. The default
                   is None.
       number_of_extraction_workers: Optional number of extraction worker
                                     processes. The default is 0 which means
                                     the function will determine the suitable
-                                    number.
+                                    number. If a maximum memory usage,
+                                    a maximum or a minimum number of extraction
+                                    workers is set, the number of extraction
+                                    workers is adjusted at runtime based on
+                                    the pending path specifications and event
+                                    objects, the idle time of the extraction
+                                    workers and the memory usage.
+      number_of_storage_writers: Optional number of storage writer processes.
+                                 If more than 1 and supported by the storage
+                                 writer every storage writer process writes
+                                 a part of the storage, which are merged
+                                 when processing has stopped. The default
+                                 is 1.
       parser_filter_string: Optional parser filter string. The default is None.
+      parser_timeout: Optional maximum number of seconds a parser is allowed
+                      to parse a file entry, after which the parsing of
+                      the file entry is aborted. The default is 0, which
+                      represents no limit.
       process_archive_files: Optional boolean value to indicate if the worker
                              should scan for file entries inside files.
                              The default is False.
+      schedule_largest_first: Optional boolean value to indicate the collector
+                              should produce the path specifications of
+                              the files with the largest estimated processing
+                              cost first, so that large files do not delay
+                              the end of the processing. The default is False.
+      serializer_format: Optional serializer format of the storage. If set
+                         the event objects are serialized by the extraction
+                         workers, so that the storage writer can store them
+                         without serializing them again. The default is None,
+                         which means the event objects are passed to
+                         the storage writer unserialized.
       status_update_callback: Optional callback function for status updates.
                               The default is None.
       show_memory_usage: Optional boolean value to indicate memory information
@@ -904,28 +1569,92 @@ class MultiProcessEngine(engine.BaseEngine):
 
       number_of_extraction_workers = cpu_count
 
+    self._adjust_worker_pool = bool(
+        maximum_memory_usage or maximum_number_of_extraction_workers or
+        minimum_number_of_extraction_workers)
+
+    if self._adjust_worker_pool:
+      self._maximum_memory_usage = maximum_memory_usage
+      self._maximum_number_of_extraction_workers = (
+          maximum_number_of_extraction_workers or
+          self._WORKER_PROCESSES_MAXIMUM)
+      self._minimum_number_of_extraction_workers = (
+          minimum_number_of_extraction_workers or 1)
+
+      number_of_extraction_workers = max(
+          self._minimum_number_of_extraction_workers, min(
+              number_of_extraction_workers,
+              self._maximum_number_of_extraction_workers))
+
+    self._maximum_worker_memory_usage = maximum_worker_memory_usage
+    self._maximum_worker_number_of_path_specs = (
+        maximum_worker_number_of_path_specs)
+    self._maximum_worker_runtime = maximum_worker_runtime
+
     self._enable_sigsegv_handler = enable_sigsegv_handler
+    if event_object_batch_flush_interval is not None:
+      self._event_object_batch_flush_interval = (
+          event_object_batch_flush_interval)
+    if event_object_batch_size is not None:
+      self._event_object_batch_size = event_object_batch_size
     self._number_of_extraction_workers = number_of_extraction_workers
     self._show_memory_usage = show_memory_usage
 
+    # The processes write their status into a shared memory status table,
+    # if supported, instead of the engine retrieving the status via RPC.
+    if shared_memory_status.SharedMemoryStatusTable.IsSupported():
+      self._status_table = shared_memory_status.SharedMemoryStatusTable()
+
     # Keep track of certain values so we can spawn new extraction workers.
     self._filter_find_specs = filter_find_specs
     self._filter_object = filter_object
+    self._hasher_file_size_limit = hasher_file_size_limit
     self._hasher_names_string = hasher_names_string
+    self._hasher_read_size = hasher_read_size
     self._include_directory_stat = include_directory_stat
     self._mount_path = mount_path
     self._parser_filter_string = parser_filter_string
+    self._parser_timeout = parser_timeout
     self._process_archive_files = process_archive_files
+    self._serializer_format = serializer_format
     self._text_prepend = text_prepend
 
     logging.debug(u'Starting processes.')
 
-    storage_writer_process = MultiProcessStorageWriterProcess(
-        self.event_object_queue, self._parse_error_queue, storage_writer,
-        enable_sigsegv_handler=self._enable_sigsegv_handler,
-        name=u'StorageWriter')
-    storage_writer_process.start()
-    self._RegisterProcess(storage_writer_process)
+    part_storage_writers = []
+    if number_of_storage_writers > 1:
+      for part_number in range(1, number_of_storage_writers + 1):
+        part_storage_writer = storage_writer.GetPartStorageWriter(part_number)
+        if not part_storage_writer:
+          logging.warning(
+              u'Storage writer does not support writing in parts.')
+          part_storage_writers = []
+          break
+
+        part_storage_writers.append(part_storage_writer)
+
+    if part_storage_writers:
+      self._number_of_storage_writers = len(part_storage_writers)
+      for part_number, part_storage_writer in enumerate(part_storage_writers):
+        storage_writer_process = MultiProcessStorageWriterProcess(
+            self.event_object_queue, self._parse_error_queue,
+            part_storage_writer,
+            enable_sigsegv_handler=self._enable_sigsegv_handler,
+            name=u'StorageWriter{0:d}'.format(part_number + 1),
+            status_table=self._status_table,
+            status_table_index=self._AllocateStatusTableIndex())
+        storage_writer_process.start()
+        self._RegisterProcess(storage_writer_process)
+
+    else:
+      self._number_of_storage_writers = 1
+      storage_writer_process = MultiProcessStorageWriterProcess(
+          self.event_object_queue, self._parse_error_queue, storage_writer,
+          enable_sigsegv_handler=self._enable_sigsegv_handler,
+          name=u'StorageWriter', status_table=self._status_table,
+          status_table_index=self._AllocateStatusTableIndex())
+      storage_writer_process.start()
+      self._RegisterProcess(storage_writer_process)
 
     for _ in range(number_of_extraction_workers):
       _ = self._StartExtractionWorkerProcess()
@@ -934,12 +1663,18 @@ class MultiProcessEngine(engine.BaseEngine):
     collector_process = MultiProcessCollectorProcess(
         self._stop_collector_event, source_path_specs, self._path_spec_queue,
         enable_sigsegv_handler=self._enable_sigsegv_handler,
+        file_range_size=self._GetFileRangeSize(
+            file_range_size, hasher_names_string, parser_filter_string),
         filter_find_specs=self._filter_find_specs,
-        include_directory_stat=self._include_directory_stat, name=u'Collector')
+        include_directory_stat=self._include_directory_stat,
+        schedule_largest_first=schedule_largest_first, name=u'Collector',
+        status_table=self._status_table,
+        status_table_index=self._AllocateStatusTableIndex())
     collector_process.start()
     self._RegisterProcess(collector_process)
 
     self._StartProcessMonitoring()
+    self._last_worker_pool_adjustment_time = time.time()
 
     try:
       logging.debug(u'Processing started.')
@@ -963,6 +1698,24 @@ class MultiProcessEngine(engine.BaseEngine):
 
     self._StopExtractionProcesses(abort=self._processing_status.error_detected)
 
+    number_of_lost_path_specs = (
+        self._processing_status.GetNumberOfLostPathSpecs())
+    if number_of_lost_path_specs:
+      logging.warning(u'Path specifications not processed: {0:d}'.format(
+          number_of_lost_path_specs))
+
+    number_of_duplicated_path_specs = (
+        self._processing_status.GetNumberOfDuplicatedPathSpecs())
+    if number_of_duplicated_path_specs:
+      logging.warning(
+          u'Path specifications processed more than once: {0:d}'.format(
+              number_of_duplicated_path_specs))
+
+    if part_storage_writers:
+      logging.debug(u'Merging part storage files.')
+      number_of_stores = storage_writer.MergePartStorageFiles()
+      logging.debug(u'Merged: {0:d} stores.'.format(number_of_stores))
+
     return self._processing_status
 
   def SignalAbort(self):
@@ -984,9 +1737,12 @@ class MultiProcessEventExtractionWorkerProcess(MultiProcessBaseProcess):
   def __init__(
       self, path_spec_queue, event_object_queue, parse_error_queue,
       knowledge_base, worker_number, enable_debug_output=False,
-      enable_profiling=False, filter_object=None, hasher_names_string=None,
-      mount_path=None, parser_filter_string=None, process_archive_files=False,
-      profiling_sample_rate=1000, profiling_type=u'all', text_prepend=None,
+      enable_profiling=False, event_object_batch_flush_interval=1.0,
+      event_object_batch_size=1, filter_object=None, hasher_file_size_limit=0,
+      hasher_names_string=None, hasher_read_size=0, mount_path=None,
+      parser_filter_string=None, parser_timeout=0, process_archive_files=False,
+      profiling_sample_rate=1000, profiling_type=u'all',
+      serializer_format=None, stop_worker_event=None, text_prepend=None,
       **kwargs):
     """Initializes the process object.
 
@@ -1005,13 +1761,31 @@ class MultiProcessEventExtractionWorkerProcess(MultiProcessBaseProcess):
                            output should be enabled. The default is False.
       enable_profiling: Optional boolean value to indicate if profiling should
                         be enabled. The default is False.
+      event_object_batch_flush_interval: Optional number of seconds after
+                                         which a partial batch of event
+                                         objects is pushed onto the event
+                                         object queue. The default is 1.0.
+      event_object_batch_size: Optional maximum number of event objects
+                               pushed onto the event object queue at once.
+                               The default is 1, which means the event
+                               objects are pushed individually.
       filter_object: Optional filter object (instance of objectfilter.Filter).
                      The default is None.
+      hasher_file_size_limit: Optional maximum size of a file in bytes that
+                              is hashed. The default is 0, which represents
+                              no limit.
       hasher_names_string: Optional comma separated string of names of
                            hashers to enable enable. The default is None.
+      hasher_read_size: Optional number of bytes read per read operation
+                        when hashing a file. The default is 0, which
+                        represents the default read size.
       mount_path: Optional string containing the mount path. The default
                   is None.
       parser_filter_string: Optional parser filter string. The default is None.
+      parser_timeout: Optional maximum number of seconds a parser is allowed
+                      to parse a file entry, after which the parsing of
+                      the file entry is aborted. The default is 0, which
+                      represents no limit.
       process_archive_files: Optional boolean value to indicate if the worker
                              should scan for file entries inside files.
                              The default is False.
@@ -1019,21 +1793,36 @@ class MultiProcessEventExtractionWorkerProcess(MultiProcessBaseProcess):
                              rate. The value contains the number of files
                              processed. The default value is 1000.
       profiling_type: optional profiling type. The default is 'all'.
+      serializer_format: Optional serializer format to serialize the event
+                         objects with before they are pushed onto the event
+                         object queue. The default is None, which means
+                         the event objects are not serialized.
+      stop_worker_event: Optional stop worker event (instance of
+                         multiprocessing.Event). The worker stops after
+                         the current path specification has been processed
+                         when this event is set. The default is None.
       text_prepend: Optional string that contains the text to prepend to every
                     event object. The default is None.
       kwargs: keyword arguments to pass to multiprocessing.Process.
     """
     super(MultiProcessEventExtractionWorkerProcess, self).__init__(
         definitions.PROCESS_TYPE_WORKER, **kwargs)
+    self._abort = False
     self._critical_error = False
     self._enable_debug_output = enable_debug_output
+    self._event_object_batch_flush_interval = (
+        event_object_batch_flush_interval)
+    self._event_object_batch_size = event_object_batch_size
     self._event_object_queue = event_object_queue
     self._event_queue_producer = None
     self._extraction_worker = None
+    self._hashed_path_spec = None
     self._knowledge_base = knowledge_base
     self._parse_error_queue = parse_error_queue
     self._path_spec_queue = path_spec_queue
     self._parse_error_queue_producer = None
+    self._path_spec_hash = 0
+    self._stop_worker_event = stop_worker_event
     self._worker_number = worker_number
 
     # Attributes for profiling.
@@ -1044,10 +1833,14 @@ class MultiProcessEventExtractionWorkerProcess(MultiProcessBaseProcess):
     # TODO: clean this up with the implementation of a task based
     # multi-processing approach.
     self._filter_object = filter_object
+    self._hasher_file_size_limit = hasher_file_size_limit
     self._hasher_names_string = hasher_names_string
+    self._hasher_read_size = hasher_read_size
     self._mount_path = mount_path
     self._process_archive_files = process_archive_files
     self._parser_filter_string = parser_filter_string
+    self._parser_timeout = parser_timeout
+    self._serializer_format = serializer_format
     self._text_prepend = text_prepend
 
   def _GetStatus(self):
@@ -1057,6 +1850,19 @@ class MultiProcessEventExtractionWorkerProcess(MultiProcessBaseProcess):
     else:
       status = self._extraction_worker.GetStatus()
 
+    if self._status_table and self._extraction_worker:
+      # The hash is only determined when the current path specification
+      # changes, since the status is written frequently.
+      current_path_spec = self._extraction_worker.current_path_spec
+      if current_path_spec is not self._hashed_path_spec:
+        self._hashed_path_spec = current_path_spec
+        self._path_spec_hash = 0
+        if current_path_spec:
+          self._path_spec_hash = (
+              hash(current_path_spec.comparable) & 0xffffffffffffffff)
+
+      status[u'path_spec_hash'] = self._path_spec_hash
+
     if self._critical_error:
       # Note seem unable to pass objects here.
       current_path_spec = self._extraction_worker.current_path_spec
@@ -1070,6 +1876,9 @@ class MultiProcessEventExtractionWorkerProcess(MultiProcessBaseProcess):
     """The main loop."""
     self._event_queue_producer = queue.ItemQueueProducer(
         self._event_object_queue)
+    self._event_queue_producer.SetBatchSize(
+        self._event_object_batch_size,
+        flush_interval=self._event_object_batch_flush_interval)
     self._parse_error_queue_producer = queue.ItemQueueProducer(
         self._parse_error_queue)
 
@@ -1077,6 +1886,14 @@ class MultiProcessEventExtractionWorkerProcess(MultiProcessBaseProcess):
         self._event_queue_producer, self._parse_error_queue_producer,
         self._knowledge_base)
 
+    if self._serializer_format == definitions.SERIALIZER_FORMAT_JSON:
+      parser_mediator.SetEventObjectSerializer(
+          json_serializer.JSONEventObjectSerializer)
+
+    elif self._serializer_format == definitions.SERIALIZER_FORMAT_PROTOBUF:
+      parser_mediator.SetEventObjectSerializer(
+          protobuf_serializer.ProtobufEventObjectSerializer)
+
     # We need a resolver context per process to prevent multi processing
     # issues with file objects stored in images.
     resolver_context = context.Context()
@@ -1093,7 +1910,9 @@ class MultiProcessEventExtractionWorkerProcess(MultiProcessBaseProcess):
         profiling_sample_rate=self._profiling_sample_rate,
         profiling_type=self._profiling_type)
 
+    self._extraction_worker.SetParserTimeout(self._parser_timeout)
     self._extraction_worker.SetProcessArchiveFiles(self._process_archive_files)
+    self._extraction_worker.SetStopEvent(self._stop_worker_event)
 
     if self._filter_object:
       self._extraction_worker.SetFilterObject(self._filter_object)
@@ -1111,7 +1930,10 @@ class MultiProcessEventExtractionWorkerProcess(MultiProcessBaseProcess):
         parser_filter_string=self._parser_filter_string)
 
     if self._hasher_names_string:
-      self._extraction_worker.SetHashers(self._hasher_names_string)
+      self._extraction_worker.SetHashers(
+          self._hasher_names_string,
+          hasher_file_size_limit=self._hasher_file_size_limit,
+          hasher_read_size=self._hasher_read_size)
 
     logging.debug(u'Extraction worker: {0!s} (PID: {1:d}) started'.format(
         self._name, self._pid))
@@ -1124,13 +1946,17 @@ class MultiProcessEventExtractionWorkerProcess(MultiProcessBaseProcess):
           u'Unhandled exception in extraction worker {0!s} '
           u'(PID: {1:d}).').format(self._name, self._pid))
       logging.exception(exception)
+      self._abort = True
 
     logging.debug(u'Extraction worker: {0!s} (PID: {1:d}) stopped'.format(
         self._name, self._pid))
 
-    self._path_spec_queue.Close(abort=True)
-    self._event_object_queue.Close(abort=True)
-    self._parse_error_queue.Close(abort=True)
+    # A worker that stopped without an abort, for example when it was
+    # stopped by the engine while the other processes continue, waits
+    # for the items it pushed to be written to the queues.
+    self._path_spec_queue.Close(abort=self._abort)
+    self._event_object_queue.Close(abort=self._abort)
+    self._parse_error_queue.Close(abort=self._abort)
 
   def _OnCriticalError(self):
     """The process on critical error handler."""
@@ -1139,6 +1965,8 @@ class MultiProcessEventExtractionWorkerProcess(MultiProcessBaseProcess):
 
   def SignalAbort(self):
     """Signals the process to abort."""
+    self._abort = True
+
     if self._event_queue_producer:
       self._event_queue_producer.SignalAbort()
 
@@ -1194,23 +2022,142 @@ class MultiProcessStorageWriterProcess(MultiProcessBaseProcess):
     self._storage_writer.SignalAbort()
 
 
+class MultiProcessingQueueSizeBudget(queue.QueueSizeBudget):
+  """Class that defines the multi-processing queue size budget.
+
+  The size of the queued items is stored in shared memory, so that
+  it is shared by all the processes that use the queues. Allocating size
+  blocks while the budget is exhausted.
+
+  A budget without a maximum size does not need to synchronize
+  the processes. Its size is only used for status information and is
+  updated without a lock, hence it is an approximation.
+  """
+
+  # The number of seconds a blocked process waits before it rechecks
+  # the budget.
+  _WAIT_INTERVAL = 1.0
+
+  def __init__(self, maximum_size=0):
+    """Initializes the queue size budget.
+
+    Args:
+      maximum_size: optional maximum size of the queued items in bytes.
+                    The default is 0, which represents no limit.
+    """
+    super(MultiProcessingQueueSizeBudget, self).__init__(
+        maximum_size=maximum_size)
+    if maximum_size:
+      self._condition = multiprocessing.Condition()
+    else:
+      self._condition = None
+
+    # The size of the queued items and the number of waiting processes.
+    # The size is signed since unsynchronized updates can make it drop
+    # below zero.
+    self._values = multiprocessing.RawArray(ctypes.c_int64, 2)
+
+  @property
+  def size(self):
+    """The size of the queued items in bytes."""
+    return max(self._values[0], 0)
+
+  def Allocate(self, size, block=True):
+    """Allocates size for an item from the budget.
+
+    A single item that exceeds the maximum size is allocated when no other
+    items are queued, otherwise the item could never be queued.
+
+    Args:
+      size: the size of the item in bytes.
+      block: optional boolean value to indicate the allocation should block
+             until the size is available.
+
+    Returns:
+      A boolean value indicating the size was allocated.
+    """
+    if not self._condition:
+      self._values[0] += size
+      return True
+
+    with self._condition:
+      while (self._values[0] > 0 and
+             self._values[0] + size > self._maximum_size):
+        if not block:
+          return False
+
+        self._values[1] += 1
+        try:
+          self._condition.wait(self._WAIT_INTERVAL)
+        finally:
+          self._values[1] -= 1
+
+      self._values[0] += size
+
+    return True
+
+  def Free(self, size):
+    """Frees size of an item from the budget.
+
+    Args:
+      size: the size of the item in bytes.
+    """
+    if not self._condition:
+      self._values[0] -= size
+      return
+
+    with self._condition:
+      self._values[0] -= min(size, self._values[0])
+      if self._values[1]:
+        self._condition.notify_all()
+
+  def IsExhausted(self):
+    """Determines if the budget is exhausted.
+
+    Returns:
+      A boolean value indicating the size of the queued items reached
+      the maximum size.
+    """
+    return bool(self._maximum_size) and self.size >= self._maximum_size
+
+
 class MultiProcessingQueue(queue.Queue):
-  """Class that defines the multi-processing queue."""
+  """Class that defines the multi-processing queue.
+
+  If the queue is limited by size, the items are serialized when they are
+  pushed onto the queue, so that the size of the queued items can be
+  tracked by a queue size budget.
+  """
 
-  def __init__(self, maximum_number_of_queued_items=0, timeout=None):
+  def __init__(
+      self, maximum_number_of_queued_items=0, maximum_queued_size=0,
+      size_budget=None, timeout=None):
     """Initializes the multi-processing queue object.
 
     Args:
       maximum_number_of_queued_items: The maximum number of queued items.
                                       The default is 0, which represents
                                       no limit.
+      maximum_queued_size: optional maximum size of the serialized form of
+                           the queued items in bytes. The default is 0,
+                           which represents no limit.
+      size_budget: optional queue size budget (instance of
+                   MultiProcessingQueueSizeBudget) that is shared with
+                   other queues. The default is None.
       timeout: Optional floating point number of seconds for the get to
                time out. The default is None, which means the get will
                block until a new item is put onto the queue.
     """
     super(MultiProcessingQueue, self).__init__()
+    self._queue_size_budget = MultiProcessingQueueSizeBudget(
+        maximum_size=maximum_queued_size)
+    self._size_budget = size_budget
     self._timeout = timeout
 
+    # The size of the items is only determined if there is a limit, since
+    # it requires the items to be serialized twice.
+    self._track_size = bool(maximum_queued_size or size_budget)
+
     # maxsize contains the maximum number of items allowed to be queued,
     # where 0 represents unlimited.
 
@@ -1247,14 +2194,37 @@ class MultiProcessingQueue(queue.Queue):
     self._queue.close()
     self._queue.join_thread()
 
+  def _FreeSize(self, size):
+    """Frees size of an item from the queue size budgets.
+
+    Args:
+      size: the size of the item in bytes.
+    """
+    self._queue_size_budget.Free(size)
+    if self._size_budget:
+      self._size_budget.Free(size)
+
   def Empty(self):
     """Empties the queue."""
     try:
       while True:
-        self._queue.get(False)
+        data = self._queue.get(False)
+        if self._track_size:
+          self._FreeSize(len(data))
     except Queue.Empty:
       pass
 
+  def GetQueuedSize(self):
+    """Retrieves the size of the queued items.
+
+    Returns:
+      The size of the serialized form of the queued items in bytes or None
+      if the queue does not track the size.
+    """
+    if not self._track_size:
+      return
+    return self._queue_size_budget.size
+
   def IsEmpty(self):
     """Determines if the queue is empty."""
     return self._queue.empty()
@@ -1266,14 +2236,32 @@ class MultiProcessingQueue(queue.Queue):
       block: boolean value to indicate put should block
              if the queue is full.
     """
+    if not self._track_size:
+      data = item
+
+    else:
+      data = cPickle.dumps(item, cPickle.HIGHEST_PROTOCOL)
+      data_size = len(data)
+
+      # Items that do not fit in the budget when block is False are
+      # discarded like items that do not fit in a full queue.
+      if not self._queue_size_budget.Allocate(data_size, block=block):
+        return
+
+      if self._size_budget and not self._size_budget.Allocate(
+          data_size, block=block):
+        self._queue_size_budget.Free(data_size)
+        return
+
     try:
-      self._queue.put(item, block=block)
+      self._queue.put(data, block=block)
 
     # Queue.Full can be raised if block is False.
     # Since this should only be used in the abort code path
     # the exception is ignored.
     except Queue.Full:
-      pass
+      if self._track_size:
+        self._FreeSize(data_size)
 
   def PopItem(self):
     """Pops an item off the queue or None on timeout.
@@ -1284,7 +2272,7 @@ class MultiProcessingQueue(queue.Queue):
     try:
       # If no timeout is specified the queue will block if empty otherwise
       # a Queue.Empty exception is raised.
-      return self._queue.get(timeout=self._timeout)
+      data = self._queue.get(timeout=self._timeout)
     except KeyboardInterrupt:
       raise errors.QueueClose
     # If close() is called on the multiprocessing.Queue while it is blocking
@@ -1293,3 +2281,9 @@ class MultiProcessingQueue(queue.Queue):
       raise errors.QueueClose
     except Queue.Empty:
       raise errors.QueueEmpty
+
+    if not self._track_size:
+      return data
+
+    self._FreeSize(len(data))
+    return cPickle.loads(data)
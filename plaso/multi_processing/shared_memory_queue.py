@@ -0,0 +1,472 @@
+# -*- coding: utf-8 -*-
+"""The shared memory ring buffer queue.
+
+The queue stores its items in an anonymous shared memory mapping that
+is inherited by the processes that are forked after the queue has been
+created. Items are pickled by the process that pushes them and are stored
+in the ring buffer as records that consist of the size of the pickled data,
+as a 32-bit little-endian integer, followed by the pickled data.
+
+Unlike the multiprocessing.Queue the items are copied directly into and
+out of the shared memory, without a feeder thread and pipe. The lock that
+protects the ring buffer is only held while copying a record, pickling and
+unpickling is done outside of the lock.
+
+An item that is too large to fit in the ring buffer is spilled to a temporary
+file. The record of a spilled item contains the path of the file and its size
+is flagged by the most significant bit.
+"""
+
+import cPickle
+import mmap
+import multiprocessing
+import os
+import struct
+import sys
+import tempfile
+import time
+
+from plaso.engine import queue
+from plaso.lib import errors
+
+
+class SharedMemoryQueue(queue.Queue):
+  """Class that defines the shared memory ring buffer queue.
+
+  The header of the ring buffer contains:
+    read_position: the total number of bytes read from the ring buffer.
+    write_position: the total number of bytes written to the ring buffer.
+    number_of_items: the number of items in the ring buffer.
+    number_of_waiting_readers: the number of processes waiting for an item.
+    number_of_waiting_writers: the number of processes waiting for space.
+    aborted: value to indicate the queue was aborted.
+
+  The read and write positions only increase, the offset of a position
+  in the ring buffer is the position modulus the ring buffer size.
+
+  A process that needs to wait registers itself in the header and blocks
+  on a semaphore. The semaphores are only signaled when a process is
+  registered as waiting, hence an uncontended push or pop only acquires
+  and releases the lock.
+  """
+
+  # The default size of the ring buffer in bytes, 64 MiB.
+  DEFAULT_BUFFER_SIZE = 64 * 1024 * 1024
+
+  _HEADER = struct.Struct('<QQQIII')
+
+  # The size of the header is rounded up to 64 bytes, which is a common
+  # cache line size, so that the header and the data do not share a line.
+  _HEADER_SIZE = 64
+
+  _RECORD_SIZE = struct.Struct('<I')
+
+  # The flag in the record size that indicates the item was spilled.
+  _RECORD_SPILLED_FLAG = 0x80000000
+
+  # The number of seconds a blocked process waits before it rechecks
+  # the ring buffer.
+  _WAIT_INTERVAL = 1.0
+
+  def __init__(
+      self, buffer_size=DEFAULT_BUFFER_SIZE, maximum_number_of_queued_items=0,
+      timeout=None):
+    """Initializes the shared memory queue object.
+
+    Args:
+      buffer_size: optional size of the ring buffer in bytes.
+      maximum_number_of_queued_items: optional maximum number of queued items.
+                                      The default is 0, which represents
+                                      no limit other than the ring buffer size.
+      timeout: optional floating point number of seconds for the get to
+               time out. The default is None, which means the get will
+               block until a new item is put onto the queue.
+    """
+    super(SharedMemoryQueue, self).__init__()
+    self._buffer_size = buffer_size
+    self._items_available = multiprocessing.Semaphore(0)
+    self._lock = multiprocessing.Lock()
+    self._maximum_number_of_queued_items = maximum_number_of_queued_items
+    self._owner_pid = os.getpid()
+    self._shared_memory = mmap.mmap(-1, self._HEADER_SIZE + buffer_size)
+    self._space_available = multiprocessing.Semaphore(0)
+    self._timeout = timeout
+
+    self._WriteHeader([0, 0, 0, 0, 0, 0])
+
+  @classmethod
+  def IsSupported(cls):
+    """Determines if the queue is supported on the current platform.
+
+    The shared memory is passed to the other processes by forking, which
+    is not available on Windows.
+
+    Returns:
+      A boolean value indicating the queue is supported.
+    """
+    return not sys.platform.startswith(u'win')
+
+  def _ReadBytes(self, position, size):
+    """Reads bytes from the ring buffer.
+
+    Args:
+      position: the position of the bytes.
+      size: the number of bytes to read.
+
+    Returns:
+      A byte string containing the data.
+    """
+    offset = self._HEADER_SIZE + (position % self._buffer_size)
+    end_offset = offset + size
+    buffer_end_offset = self._HEADER_SIZE + self._buffer_size
+    if end_offset <= buffer_end_offset:
+      return self._shared_memory[offset:end_offset]
+
+    # The bytes wrap around the end of the ring buffer.
+    remaining_size = end_offset - buffer_end_offset
+    return b''.join([
+        self._shared_memory[offset:buffer_end_offset],
+        self._shared_memory[
+            self._HEADER_SIZE:self._HEADER_SIZE + remaining_size]])
+
+  def _ReadHeader(self):
+    """Reads the header of the ring buffer.
+
+    Returns:
+      A list of the read position, write position, number of items, number
+      of waiting readers, number of waiting writers and aborted value.
+    """
+    return list(self._HEADER.unpack_from(self._shared_memory, 0))
+
+  def _ReadSpilledData(self, data):
+    """Reads the data of a spilled item and removes the temporary file.
+
+    Args:
+      data: a byte string containing the UTF-8 encoded path of the file.
+
+    Returns:
+      A byte string containing the pickled item.
+    """
+    path = data.decode(u'utf-8')
+    try:
+      with open(path, 'rb') as file_object:
+        return file_object.read()
+    finally:
+      os.remove(path)
+
+  def _SignalWaiters(self, header, header_index, semaphore, signal_all=False):
+    """Signals processes that are waiting.
+
+    This function should be called with the lock acquired.
+
+    Args:
+      header: a list of the header values.
+      header_index: the index of the number of waiting processes in
+                    the header.
+      semaphore: the semaphore the processes are waiting on.
+      signal_all: optional boolean value to indicate all waiting processes
+                  should be signaled instead of one.
+    """
+    while header[header_index] > 0:
+      header[header_index] -= 1
+      semaphore.release()
+
+      if not signal_all:
+        break
+
+  def _SpillData(self, data):
+    """Spills the data of an item to a temporary file.
+
+    Args:
+      data: a byte string containing the pickled item.
+
+    Returns:
+      A byte string containing the UTF-8 encoded path of the file.
+    """
+    file_descriptor, path = tempfile.mkstemp(prefix=u'plaso-queue-')
+    with os.fdopen(file_descriptor, 'wb') as file_object:
+      file_object.write(data)
+
+    return path.encode(u'utf-8')
+
+  def _WaitForSignal(self, header_index, semaphore, timeout):
+    """Waits for a signal from another process.
+
+    This function should be called with the lock acquired, which is released
+    while waiting and acquired again before the function returns.
+
+    Args:
+      header_index: the index of the number of waiting processes in
+                    the header.
+      semaphore: the semaphore to wait on.
+      timeout: the number of seconds to wait.
+    """
+    header = self._ReadHeader()
+    header[header_index] += 1
+    self._WriteHeader(header)
+
+    self._lock.release()
+    try:
+      signaled = semaphore.acquire(True, timeout)
+    finally:
+      self._lock.acquire()
+
+    # If the wait timed out the process is still registered as waiting,
+    # unless it was signaled after the time out.
+    if not signaled and not semaphore.acquire(False):
+      header = self._ReadHeader()
+      header[header_index] -= 1
+      self._WriteHeader(header)
+
+  def _WriteBytes(self, position, data):
+    """Writes bytes to the ring buffer.
+
+    Args:
+      position: the position of the bytes.
+      data: a byte string containing the data.
+    """
+    offset = self._HEADER_SIZE + (position % self._buffer_size)
+    end_offset = offset + len(data)
+    buffer_end_offset = self._HEADER_SIZE + self._buffer_size
+    if end_offset <= buffer_end_offset:
+      self._shared_memory[offset:end_offset] = data
+      return
+
+    # The bytes wrap around the end of the ring buffer.
+    split_size = buffer_end_offset - offset
+    self._shared_memory[offset:buffer_end_offset] = data[:split_size]
+    self._shared_memory[
+        self._HEADER_SIZE:self._HEADER_SIZE + len(data) - split_size] = (
+            data[split_size:])
+
+  def _WriteHeader(self, header):
+    """Writes the header of the ring buffer.
+
+    Args:
+      header: a list of the header values.
+    """
+    self._HEADER.pack_into(self._shared_memory, 0, *header)
+
+  # pylint: disable=arguments-differ
+  def Close(self, abort=False):
+    """Closes the queue.
+
+    The shared memory is used by all the processes, hence a close only
+    signals the other processes when it is issued on abort by the process
+    that created the queue. A close on abort by another process, such as
+    a worker that stops while the other processes continue, is ignored.
+
+    Args:
+      abort: optional boolean to indicate the close is issued on abort.
+    """
+    if not abort or os.getpid() != self._owner_pid:
+      return
+
+    with self._lock:
+      header = self._ReadHeader()
+      header[5] = 1
+      self._SignalWaiters(header, 3, self._items_available, signal_all=True)
+      self._SignalWaiters(header, 4, self._space_available, signal_all=True)
+      self._WriteHeader(header)
+
+  def Empty(self):
+    """Empties the queue.
+
+    The temporary files of the spilled items are removed.
+    """
+    with self._lock:
+      header = self._ReadHeader()
+
+      read_position = header[0]
+      while read_position < header[1]:
+        data_size = self._RECORD_SIZE.unpack(
+            self._ReadBytes(read_position, self._RECORD_SIZE.size))[0]
+        read_position += self._RECORD_SIZE.size
+
+        if data_size & self._RECORD_SPILLED_FLAG:
+          data_size &= ~self._RECORD_SPILLED_FLAG
+          path = self._ReadBytes(read_position, data_size).decode(u'utf-8')
+          try:
+            os.remove(path)
+          except OSError:
+            pass
+
+        read_position += data_size
+
+      header[0] = header[1]
+      header[2] = 0
+      self._SignalWaiters(header, 4, self._space_available, signal_all=True)
+      self._WriteHeader(header)
+
+  def GetQueuedSize(self):
+    """Retrieves the size of the queued items.
+
+    Returns:
+      The size of the serialized form of the queued items in bytes,
+      including the size of the records.
+    """
+    with self._lock:
+      header = self._ReadHeader()
+    return header[1] - header[0]
+
+  def IsEmpty(self):
+    """Determines if the queue is empty."""
+    with self._lock:
+      header = self._ReadHeader()
+    return header[2] == 0
+
+  def PushItem(self, item, block=True):
+    """Pushes an item onto the queue.
+
+    An item that is larger than the ring buffer is spilled to a temporary
+    file, otherwise the item could never be queued.
+
+    Args:
+      item: the item object.
+      block: boolean value to indicate put should block
+             if the queue is full.
+
+    Raises:
+      QueueFull: if the size of the record of a spilled item exceeds
+                 the ring buffer size.
+    """
+    data = cPickle.dumps(item, cPickle.HIGHEST_PROTOCOL)
+    data_size = len(data)
+    record_size = self._RECORD_SIZE.size + data_size
+    record_size_value = data_size
+
+    if (record_size > self._buffer_size or
+        data_size & self._RECORD_SPILLED_FLAG):
+      data = self._SpillData(data)
+      data_size = len(data)
+      record_size = self._RECORD_SIZE.size + data_size
+      record_size_value = data_size | self._RECORD_SPILLED_FLAG
+
+      if record_size > self._buffer_size:
+        os.remove(data.decode(u'utf-8'))
+        raise errors.QueueFull(
+            u'Spilled item size: {0:d} exceeds ring buffer size: {1:d}.'.format(
+                record_size, self._buffer_size))
+
+    with self._lock:
+      while True:
+        (read_position, write_position, number_of_items,
+         number_of_waiting_readers, number_of_waiting_writers,
+         aborted) = self._HEADER.unpack_from(self._shared_memory, 0)
+
+        # Items pushed after an abort are discarded, like a put with block
+        # set to False on a full queue, since this should only happen
+        # in the abort code path.
+        if aborted:
+          return
+
+        free_size = self._buffer_size - (write_position - read_position)
+        if record_size <= free_size and (
+            not self._maximum_number_of_queued_items or
+            number_of_items < self._maximum_number_of_queued_items):
+          break
+
+        if not block:
+          return
+
+        self._WaitForSignal(4, self._space_available, self._WAIT_INTERVAL)
+
+      offset = write_position % self._buffer_size
+      if offset + record_size <= self._buffer_size:
+        offset += self._HEADER_SIZE
+        self._RECORD_SIZE.pack_into(
+            self._shared_memory, offset, record_size_value)
+        offset += self._RECORD_SIZE.size
+        self._shared_memory[offset:offset + data_size] = data
+      else:
+        self._WriteBytes(
+            write_position,
+            b''.join([self._RECORD_SIZE.pack(record_size_value), data]))
+
+      signal_reader = number_of_waiting_readers > 0
+      if signal_reader:
+        number_of_waiting_readers -= 1
+
+      self._HEADER.pack_into(
+          self._shared_memory, 0, read_position, write_position + record_size,
+          number_of_items + 1, number_of_waiting_readers,
+          number_of_waiting_writers, aborted)
+
+    # The waiting process is signaled after the lock is released so that it
+    # does not immediately block on the lock again.
+    if signal_reader:
+      self._items_available.release()
+
+  def PopItem(self):
+    """Pops an item off the queue.
+
+    Returns:
+      The item object.
+
+    Raises:
+      QueueClose: when the queue was aborted or on a keyboard interrupt.
+      QueueEmpty: when the queue is empty.
+    """
+    if self._timeout is not None:
+      deadline = time.time() + self._timeout
+
+    try:
+      with self._lock:
+        while True:
+          (read_position, write_position, number_of_items,
+           number_of_waiting_readers, number_of_waiting_writers,
+           aborted) = self._HEADER.unpack_from(self._shared_memory, 0)
+          if number_of_items:
+            break
+
+          if aborted:
+            raise errors.QueueClose
+
+          wait_interval = self._WAIT_INTERVAL
+          if self._timeout is not None:
+            remaining_time = deadline - time.time()
+            if remaining_time <= 0.0:
+              raise errors.QueueEmpty
+            wait_interval = min(wait_interval, remaining_time)
+
+          self._WaitForSignal(3, self._items_available, wait_interval)
+
+        offset = read_position % self._buffer_size
+        if offset + self._RECORD_SIZE.size <= self._buffer_size:
+          data_size = self._RECORD_SIZE.unpack_from(
+              self._shared_memory, self._HEADER_SIZE + offset)[0]
+        else:
+          data_size = self._RECORD_SIZE.unpack(
+              self._ReadBytes(read_position, self._RECORD_SIZE.size))[0]
+
+        is_spilled = bool(data_size & self._RECORD_SPILLED_FLAG)
+        if is_spilled:
+          data_size &= ~self._RECORD_SPILLED_FLAG
+
+        record_size = self._RECORD_SIZE.size + data_size
+        if offset + record_size <= self._buffer_size:
+          offset += self._HEADER_SIZE + self._RECORD_SIZE.size
+          data = self._shared_memory[offset:offset + data_size]
+        else:
+          data = self._ReadBytes(
+              read_position + self._RECORD_SIZE.size, data_size)
+
+        signal_writer = number_of_waiting_writers > 0
+        if signal_writer:
+          number_of_waiting_writers -= 1
+
+        self._HEADER.pack_into(
+            self._shared_memory, 0, read_position + record_size,
+            write_position, number_of_items - 1, number_of_waiting_readers,
+            number_of_waiting_writers, aborted)
+
+    except KeyboardInterrupt:
+      raise errors.QueueClose
+
+    if signal_writer:
+      self._space_available.release()
+
+    if is_spilled:
+      data = self._ReadSpilledData(data)
+
+    return cPickle.loads(data)
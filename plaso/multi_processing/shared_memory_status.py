@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+"""The shared memory process status table.
+
+The status table stores the status of the processes in an anonymous shared
+memory mapping that is inherited by the processes that are forked after
+the table has been created. Every process writes its status into its own
+fixed size slot, hence the engine can read the status of the processes
+without a RPC round trip.
+
+A slot is protected by a sequence number, which the process increments
+before and after writing the slot. The engine retries reading a slot when
+the sequence number is odd or has changed while reading, hence no lock is
+needed, since every slot has a single writer.
+"""
+
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+
+from plaso.lib import definitions
+from plaso.multi_processing import process_info
+
+
+class SharedMemoryStatusTable(object):
+  """Class that defines the shared memory process status table.
+
+  A slot contains:
+    sequence_number: the number of times the slot was written, times 2,
+                     which is odd while the slot is being written.
+    heartbeat: the POSIX timestamp of the last time the slot was written.
+    consumed_number_of_path_specs: the number of consumed path
+                                   specifications.
+    produced_number_of_path_specs: the number of produced path
+                                   specifications.
+    number_of_events: the number of extracted or stored events.
+    memory_usage: the resident set size (RSS) of the process in bytes.
+    path_spec_hash: the hash of the path specification that is currently
+                    being processed or 0 if not available.
+    pid: the process identifier (PID).
+    process_type: the index of the process type.
+    processing_status: the index of the processing status.
+    display_name: the UTF-8 encoded display name of the file entry that is
+                  currently being processed.
+    path_spec: the UTF-8 encoded comparable of the path specification that
+               caused a critical error.
+  """
+
+  # The default number of slots, where every process started by the engine
+  # uses a slot until it has stopped.
+  DEFAULT_NUMBER_OF_SLOTS = 256
+
+  _MAXIMUM_NUMBER_OF_READ_ATTEMPTS = 100
+
+  _PROCESS_TYPES = [
+      None,
+      definitions.PROCESS_TYPE_COLLECTOR,
+      definitions.PROCESS_TYPE_STORAGE_WRITER,
+      definitions.PROCESS_TYPE_WORKER]
+
+  # Note that a slot that has not been written yet contains the processing
+  # status with index 0.
+  _PROCESSING_STATUSES = [
+      definitions.PROCESSING_STATUS_INITIALIZED,
+      definitions.PROCESSING_STATUS_COMPLETED,
+      definitions.PROCESSING_STATUS_ERROR,
+      definitions.PROCESSING_STATUS_KILLED,
+      definitions.PROCESSING_STATUS_RUNNING]
+
+  _SEQUENCE_NUMBER = struct.Struct('<Q')
+
+  _SLOT_VALUES = struct.Struct('<dQQQQQIBB256s1024s')
+
+  # The size of a slot is rounded up to a multiple of 64 bytes, which is
+  # a common cache line size, so that slots do not share a line.
+  _SLOT_SIZE = (
+      (_SEQUENCE_NUMBER.size + _SLOT_VALUES.size + 63) // 64) * 64
+
+  def __init__(self, number_of_slots=DEFAULT_NUMBER_OF_SLOTS):
+    """Initializes the shared memory status table object.
+
+    Args:
+      number_of_slots: optional number of slots.
+    """
+    super(SharedMemoryStatusTable, self).__init__()
+    self._free_slots = list(range(number_of_slots - 1, -1, -1))
+    self._number_of_slots = number_of_slots
+    self._shared_memory = mmap.mmap(-1, number_of_slots * self._SLOT_SIZE)
+
+  @classmethod
+  def IsSupported(cls):
+    """Determines if the status table is supported on the current platform.
+
+    The shared memory is passed to the other processes by forking, which
+    is not available on Windows.
+
+    Returns:
+      A boolean value indicating the status table is supported.
+    """
+    return not sys.platform.startswith(u'win')
+
+  def _DecodeString(self, byte_string):
+    """Decodes a NUL padded UTF-8 encoded string.
+
+    Args:
+      byte_string: the byte string.
+
+    Returns:
+      The Unicode string.
+    """
+    # Note that a truncated string can end with a partial UTF-8 sequence.
+    return byte_string.rstrip(b'\x00').decode(u'utf-8', u'ignore')
+
+  def _EncodeString(self, string):
+    """Encodes a string as UTF-8.
+
+    Args:
+      string: the Unicode string or None.
+
+    Returns:
+      The UTF-8 encoded byte string.
+    """
+    if not string:
+      return b''
+    if isinstance(string, bytes):
+      return string
+    return string.encode(u'utf-8')
+
+  def AllocateSlot(self):
+    """Allocates a slot.
+
+    This function should only be called by the process that created
+    the status table.
+
+    Returns:
+      The index of the slot or None if no slot is available.
+    """
+    if not self._free_slots:
+      return
+
+    index = self._free_slots.pop()
+    offset = index * self._SLOT_SIZE
+    self._shared_memory[offset:offset + self._SLOT_SIZE] = (
+        b'\x00' * self._SLOT_SIZE)
+    return index
+
+  def FreeSlot(self, index):
+    """Frees a slot.
+
+    This function should only be called by the process that created
+    the status table, after the process that used the slot has stopped.
+
+    Args:
+      index: the index of the slot.
+    """
+    self._free_slots.append(index)
+
+  def ReadStatus(self, index):
+    """Reads the status from a slot.
+
+    Args:
+      index: the index of the slot.
+
+    Returns:
+      A status dictionary, that contains the same values as the status
+      dictionary of the process, the heartbeat, memory usage and path
+      specification hash or None if the slot has not been written yet or
+      was being written while reading.
+    """
+    offset = index * self._SLOT_SIZE
+    values_offset = offset + self._SEQUENCE_NUMBER.size
+
+    for _ in range(self._MAXIMUM_NUMBER_OF_READ_ATTEMPTS):
+      sequence_number = self._SEQUENCE_NUMBER.unpack_from(
+          self._shared_memory, offset)[0]
+      if sequence_number % 2:
+        continue
+
+      values = self._SLOT_VALUES.unpack_from(
+          self._shared_memory, values_offset)
+
+      if sequence_number == self._SEQUENCE_NUMBER.unpack_from(
+          self._shared_memory, offset)[0]:
+        break
+
+    else:
+      return
+
+    if not sequence_number:
+      return
+
+    (heartbeat, consumed_number_of_path_specs, produced_number_of_path_specs,
+     number_of_events, memory_usage, path_spec_hash, pid, process_type,
+     processing_status, display_name, path_spec) = values
+
+    status = {
+        u'consumed_number_of_path_specs': consumed_number_of_path_specs,
+        u'display_name': self._DecodeString(display_name),
+        u'heartbeat': heartbeat,
+        u'memory_usage': memory_usage,
+        u'number_of_events': number_of_events,
+        u'path_spec_hash': path_spec_hash,
+        u'pid': pid,
+        u'processing_status': self._PROCESSING_STATUSES[processing_status],
+        u'produced_number_of_path_specs': produced_number_of_path_specs,
+        u'type': self._PROCESS_TYPES[process_type]}
+
+    path_spec = self._DecodeString(path_spec)
+    if path_spec:
+      status[u'path_spec'] = path_spec
+
+    return status
+
+  def WriteStatus(self, index, pid, process_type, status, memory_usage=0):
+    """Writes the status into a slot.
+
+    Every slot should only be written by a single process.
+
+    Args:
+      index: the index of the slot.
+      pid: the process identifier (PID).
+      process_type: the process type.
+      status: the status dictionary of the process.
+      memory_usage: optional resident set size (RSS) of the process in bytes.
+    """
+    processing_status = status.get(
+        u'processing_status', definitions.PROCESSING_STATUS_INITIALIZED)
+    if processing_status in self._PROCESSING_STATUSES:
+      processing_status_index = self._PROCESSING_STATUSES.index(
+          processing_status)
+    else:
+      processing_status_index = 0
+
+    offset = index * self._SLOT_SIZE
+    sequence_number = self._SEQUENCE_NUMBER.unpack_from(
+        self._shared_memory, offset)[0]
+
+    self._SEQUENCE_NUMBER.pack_into(
+        self._shared_memory, offset, sequence_number + 1)
+
+    # Note that the struct module truncates the strings to the size
+    # of the field.
+    self._SLOT_VALUES.pack_into(
+        self._shared_memory, offset + self._SEQUENCE_NUMBER.size, time.time(),
+        status.get(u'consumed_number_of_path_specs', None) or 0,
+        status.get(u'produced_number_of_path_specs', None) or 0,
+        status.get(u'number_of_events', None) or 0, memory_usage,
+        status.get(u'path_spec_hash', None) or 0, pid,
+        self._PROCESS_TYPES.index(process_type), processing_status_index,
+        self._EncodeString(status.get(u'display_name', None)),
+        self._EncodeString(status.get(u'path_spec', None)))
+
+    self._SEQUENCE_NUMBER.pack_into(
+        self._shared_memory, offset, sequence_number + 2)
+
+
+class SharedMemoryStatusWriter(object):
+  """Class that periodically writes the status of a process into a slot."""
+
+  # The default number of seconds between status updates.
+  DEFAULT_UPDATE_INTERVAL = 0.1
+
+  def __init__(
+      self, status_table, index, process_type, callback,
+      update_interval=DEFAULT_UPDATE_INTERVAL):
+    """Initializes the status writer object.
+
+    Args:
+      status_table: the status table (instance of SharedMemoryStatusTable).
+      index: the index of the slot.
+      process_type: the process type.
+      callback: the callback function that returns the status dictionary
+                of the process.
+      update_interval: optional number of seconds between status updates.
+    """
+    super(SharedMemoryStatusWriter, self).__init__()
+    self._callback = callback
+    self._index = index
+    self._pid = None
+    self._process_information = None
+    self._process_type = process_type
+    self._status_table = status_table
+    self._stop_event = threading.Event()
+    self._update_interval = update_interval
+    self._update_thread = None
+
+  def _UpdateStatus(self):
+    """Updates the status until the writer is stopped."""
+    while not self._stop_event.wait(self._update_interval):
+      self._WriteStatus()
+
+  def _WriteStatus(self):
+    """Writes the status into the slot."""
+    memory_information = self._process_information.GetMemoryInformation()
+    if memory_information:
+      memory_usage = memory_information.rss
+    else:
+      memory_usage = 0
+
+    try:
+      status = self._callback()
+    except Exception as exception:  # pylint: disable=broad-except
+      logging.warning(
+          u'Unable to retrieve process status with error: {0!s}'.format(
+              exception))
+      return
+
+    self._status_table.WriteStatus(
+        self._index, self._pid, self._process_type, status,
+        memory_usage=memory_usage)
+
+  def Start(self):
+    """Starts writing the status.
+
+    This function should be called by the process that writes the status.
+    """
+    self._pid = os.getpid()
+    self._process_information = process_info.ProcessInfo(self._pid)
+
+    self._WriteStatus()
+
+    self._update_thread = threading.Thread(
+        name=u'SharedMemoryStatusWriter', target=self._UpdateStatus)
+    self._update_thread.daemon = True
+    self._update_thread.start()
+
+  def Stop(self):
+    """Stops writing the status and writes the final status."""
+    self._stop_event.set()
+
+    if self._update_thread and self._update_thread.isAlive():
+      self._update_thread.join()
+    self._update_thread = None
+
+    self._WriteStatus()
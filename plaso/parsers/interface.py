@@ -59,6 +59,16 @@ class BaseParser(object):
     """
     return False
 
+  @classmethod
+  def SupportsSplitting(cls):
+    """Determines if a parser supports splitting a file into ranges.
+
+    Returns:
+      A boolean value indicating whether the parser supports parsing
+      a range of a file independently of the rest of the file.
+    """
+    return False
+
   def UpdateChainAndParse(self, parser_mediator, **kwargs):
     """Wrapper for Parse() to synchronize the parser chain.
 
@@ -238,22 +248,42 @@ class BasePluginsParser(BaseParser):
 
 
 class SingleFileBaseParser(BaseParser):
-  """Class that implements the single file parser base."""
+  """Class that implements the single file parser base.
+
+  A parser that sets SPLITTABLE can parse a range of a file independently
+  of the rest of the file, which allows the ranges of a large file to be
+  parsed in parallel. The ranges are not aligned on record boundaries,
+  hence the parser should only parse the records that start within
+  the range, so that every record is parsed exactly once.
+  """
 
   # The initial file offset set to None if not set.
   _INITIAL_FILE_OFFSET = 0
 
-  def Parse(self, parser_mediator, **kwargs):
+  # Value to indicate the parser supports splitting a file into ranges,
+  # which requires ParseFileObjectRange to be implemented.
+  SPLITTABLE = False
+
+  # pylint: disable=arguments-differ
+  def Parse(self, parser_mediator, file_range=None, **kwargs):
     """Parses a single file.
 
     Args:
       parser_mediator: A parser mediator object (instance of ParserMediator).
+      file_range: Optional tuple of the offset and size of the range of
+                  the file to parse. The default is None, which represents
+                  the entire file.
     """
     # TODO: Merge with UpdateChainAndParse for less overhead.
     file_object = parser_mediator.GetFileObject(
         offset=self._INITIAL_FILE_OFFSET)
     try:
-      self.ParseFileObject(parser_mediator, file_object, **kwargs)
+      if file_range:
+        range_offset, range_size = file_range
+        self.ParseFileObjectRange(
+            parser_mediator, file_object, range_offset, range_size, **kwargs)
+      else:
+        self.ParseFileObject(parser_mediator, file_object, **kwargs)
     finally:
       file_object.close()
 
@@ -269,6 +299,36 @@ class SingleFileBaseParser(BaseParser):
       UnableToParseFile: when the file cannot be parsed.
     """
 
+  def ParseFileObjectRange(
+      self, parser_mediator, file_object, range_offset, range_size,
+      **kwargs):
+    """Parses the records that start within a range of a file-like object.
+
+    The format of the file is verified for every range, since a range can be
+    parsed before the range that contains the start of the file.
+
+    Args:
+      parser_mediator: A parser mediator object (instance of ParserMediator).
+      file_object: A file-like object.
+      range_offset: The offset of the range relative to the start of the file.
+      range_size: The size of the range.
+
+    Raises:
+      NotImplementedError: if the parser does not support splitting.
+      UnableToParseFile: when the file cannot be parsed.
+    """
+    raise NotImplementedError
+
+  @classmethod
+  def SupportsSplitting(cls):
+    """Determines if a parser supports splitting a file into ranges.
+
+    Returns:
+      A boolean value indicating whether the parser supports parsing
+      a range of a file independently of the rest of the file.
+    """
+    return cls.SPLITTABLE
+
 
 class SingleFileBasePluginsParser(BasePluginsParser):
   """Class that implements the single file parser with plugins base."""
@@ -3,11 +3,12 @@
 
 import logging
 import os
+import time
 
 from dfvfs.lib import definitions as dfvfs_definitions
 
-# TODO: disabled as long nothing is listening on the parse error queue.
-# from plaso.lib import event
+from plaso.lib import errors
+from plaso.lib import event
 from plaso.lib import utils
 
 
@@ -29,6 +30,7 @@ class ParserMediator(object):
     """
     super(ParserMediator, self).__init__()
     self._abort = False
+    self._event_object_serializer = None
     self._event_queue_producer = event_queue_producer
     self._extra_event_attributes = {}
     self._file_entry = None
@@ -37,6 +39,9 @@ class ParserMediator(object):
     self._mount_path = None
     self._parse_error_queue_producer = parse_error_queue_producer
     self._parser_chain_components = []
+    self._parser_deadline = None
+    self._parser_timeout_pending = False
+    self._producing_event = False
     self._text_prepend = None
 
     self.number_of_events = 0
@@ -44,8 +49,14 @@ class ParserMediator(object):
 
   @property
   def abort(self):
-    """Read-only value to indicate the parsing should be aborted."""
-    return self._abort
+    """Read-only value to indicate the parsing should be aborted.
+
+    The parsing should be aborted when the parsers were signaled to abort
+    or when the parser exceeded its time budget.
+    """
+    if self._abort:
+      return True
+    return bool(self._parser_deadline and time.time() > self._parser_deadline)
 
   @property
   def codepage(self):
@@ -302,8 +313,33 @@ class ParserMediator(object):
     if self.MatchesFilter(event_object):
       return
 
-    self._event_queue_producer.ProduceItem(event_object)
-    self.number_of_events += 1
+    if self._event_object_serializer:
+      event_object_data = self._event_object_serializer.WriteSerialized(
+          event_object)
+
+      # Check if the event object failed to serialize (none is returned).
+      if event_object_data is None:
+        return
+
+      event_object = event.SerializedEventObject(
+          event_object.timestamp, event_object.data_type,
+          getattr(event_object, u'parser', None),
+          getattr(event_object, u'plugin', None), event_object_data)
+
+    # The parser timeout is not raised while the event object is produced,
+    # since that could lose the event objects of a batch or leave the queue
+    # in an inconsistent state. Instead it is raised once the event object
+    # has been produced.
+    self._producing_event = True
+    try:
+      self._event_queue_producer.ProduceItem(event_object)
+      self.number_of_events += 1
+    finally:
+      self._producing_event = False
+
+    if self._parser_timeout_pending:
+      self._parser_timeout_pending = False
+      raise errors.ParserTimeout(u'Parser exceeded its time budget.')
 
   def ProduceEvents(self, event_objects, query=None):
     """Produces events onto the queue.
@@ -346,6 +382,20 @@ class ParserMediator(object):
     """Resets the file entry."""
     self._file_entry = None
 
+  def SetEventObjectSerializer(self, event_object_serializer):
+    """Sets the event object serializer.
+
+    If set the event objects are serialized before they are produced onto
+    the queue, as serialized event objects (instances of
+    SerializedEventObject).
+
+    Args:
+      event_object_serializer: the event object serializer (subclass of
+                               EventObjectSerializer) or None to produce
+                               the event objects unserialized.
+    """
+    self._event_object_serializer = event_object_serializer
+
   def SetFileEntry(self, file_entry):
     """Sets the current file entry and clears the parser chain.
 
@@ -375,6 +425,16 @@ class ParserMediator(object):
 
     self._mount_path = mount_path
 
+  def SetParserDeadline(self, deadline):
+    """Sets the deadline of the parser that is currently parsing.
+
+    Args:
+      deadline: the POSIX timestamp after which the parser should abort
+                or None if the parser has no time budget.
+    """
+    self._parser_deadline = deadline
+    self._parser_timeout_pending = False
+
   def SetTextPrepend(self, text_prepend):
     """Sets the text prepend.
 
@@ -386,3 +446,18 @@ class ParserMediator(object):
   def SignalAbort(self):
     """Signals the parsers to abort."""
     self._abort = True
+
+  def SignalParserTimeout(self):
+    """Signals that the parser exceeded its time budget.
+
+    This function is intended to be called from a signal handler, hence
+    the parser timeout is deferred while an event object is being produced.
+
+    Raises:
+      ParserTimeout: if no event object is being produced.
+    """
+    if self._producing_event:
+      self._parser_timeout_pending = True
+      return
+
+    raise errors.ParserTimeout(u'Parser exceeded its time budget.')
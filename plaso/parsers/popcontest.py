@@ -147,6 +147,9 @@ class PopularityContestParser(text_parser.PyparsingSingleLineTextParser):
   NAME = u'popularity_contest'
   DESCRIPTION = u'Parser for popularity contest log files.'
 
+  # Every line is parsed independently of the other lines.
+  SPLITTABLE = True
+
   EPOCH = text_parser.PyparsingConstants.INTEGER.setResultsName(u'epoch')
   PACKAGE = pyparsing.Word(pyparsing.printables).setResultsName(u'package')
   MRU = pyparsing.Word(pyparsing.printables).setResultsName(u'mru')
@@ -665,6 +665,9 @@ class PyparsingSingleLineTextParser(interface.SingleFileBaseParser):
   # attribute.
   ENCODING = u''
 
+  # The number of bytes read at once when parsing a range of the file.
+  _RANGE_READ_SIZE = 64 * 1024
+
   def __init__(self):
     """Initializes the pyparsing single-line text parser object."""
     super(PyparsingSingleLineTextParser, self).__init__()
@@ -674,6 +677,77 @@ class PyparsingSingleLineTextParser(interface.SingleFileBaseParser):
     # a structural fix.
     self._line_structures = self.LINE_STRUCTURES
 
+  def _ParseTextLine(self, parser_mediator, line):
+    """Parses a line using the line structures.
+
+    Args:
+      parser_mediator: a parser mediator object (instance of ParserMediator).
+      line: a single line from the text file.
+    """
+    parsed_structure = None
+    use_key = None
+    # Try to parse the line using all the line structures.
+    for key, structure in self.LINE_STRUCTURES:
+      try:
+        parsed_structure = structure.parseString(line)
+      except pyparsing.ParseException:
+        pass
+      if parsed_structure:
+        use_key = key
+        break
+
+    if parsed_structure:
+      parsed_event = self.ParseRecord(
+          parser_mediator, use_key, parsed_structure)
+      if parsed_event:
+        parsed_event.offset = self._current_offset
+        parser_mediator.ProduceEvent(parsed_event)
+    else:
+      logging.warning(u'Unable to parse log line: {0:s}'.format(line))
+
+  def _ReadAndVerifyFirstLine(
+      self, parser_mediator, file_entry, text_file_object):
+    """Reads the first line and verifies the structure of the file.
+
+    Args:
+      parser_mediator: a parser mediator object (instance of ParserMediator).
+      file_entry: a file entry object (instance of dfvfs.FileEntry).
+      text_file_object: a text file object (instance of dfvfs.TextFile).
+
+    Returns:
+      The first line read from the text file.
+
+    Raises:
+      UnableToParseFile: when the file cannot be parsed.
+    """
+    # TODO: self._line_structures is a work-around and this needs
+    # a structural fix.
+    if not self._line_structures:
+      raise errors.UnableToParseFile(
+          u'Line structure undeclared, unable to proceed.')
+
+    line = self._ReadLine(
+        parser_mediator, file_entry, text_file_object,
+        max_len=self.MAX_LINE_LENGTH, quiet=True)
+    if not line:
+      raise errors.UnableToParseFile(u'Not a text file.')
+
+    if len(line) == self.MAX_LINE_LENGTH or len(
+        line) == self.MAX_LINE_LENGTH - 1:
+      logging.debug((
+          u'Trying to read a line and reached the maximum allowed length of '
+          u'{0:d}. The last few bytes of the line are: {1:s} [parser '
+          u'{2:s}]').format(
+              self.MAX_LINE_LENGTH, repr(line[-10:]), self.NAME))
+
+    if not utils.IsText(line):
+      raise errors.UnableToParseFile(u'Not a text file, unable to proceed.')
+
+    if not self.VerifyStructure(parser_mediator, line):
+      raise errors.UnableToParseFile(u'Wrong file structure.')
+
+    return line
+
   def _ReadLine(
       self, parser_mediator, file_entry, text_file_object, max_len=0,
       quiet=False, depth=0):
@@ -726,6 +800,88 @@ class PyparsingSingleLineTextParser(interface.SingleFileBaseParser):
                 parser_mediator.GetDisplayName(file_entry)))
       return line.strip()
 
+  def _ReadLinesInRange(self, file_object, range_offset, range_size):
+    """Reads the lines that start within a range.
+
+    Lines longer than MAX_LINE_LENGTH are truncated, the remainder of
+    the line up to the next end-of-line character is skipped.
+
+    Args:
+      file_object: a file-like object.
+      range_offset: the offset of the range relative to the start of the file.
+      range_size: the size of the range.
+
+    Yields:
+      A tuple of the offset of the line and a byte string containing the line,
+      including the end-of-line characters if the line was not truncated.
+    """
+    end_offset = range_offset + range_size
+
+    # Reading starts at the last byte before the range, so that the first
+    # line read is either the end-of-line character of the previous line or
+    # the remainder of a line that started before the range. In both cases
+    # the line is part of the previous range and skipped.
+    line_offset = max(range_offset - 1, 0)
+    skip_line = range_offset > 0
+
+    file_object.seek(line_offset, os.SEEK_SET)
+
+    lines_buffer = b''
+    line_start_index = 0
+    # The index from where to search for the end-of-line character, so that
+    # the data in the buffer is only searched once.
+    search_index = 0
+    # The size of the data of a truncated line that was no longer buffered.
+    skipped_size = 0
+    line_truncated = False
+
+    while line_offset < end_offset:
+      line_end_index = lines_buffer.find(b'\n', search_index)
+      if line_end_index < 0:
+        if (not line_truncated and
+            len(lines_buffer) - line_start_index >= self.MAX_LINE_LENGTH):
+          line_truncated = True
+          if skip_line:
+            skip_line = False
+          else:
+            yield line_offset, lines_buffer[
+                line_start_index:line_start_index + self.MAX_LINE_LENGTH]
+
+        # The remainder of a truncated line is not buffered.
+        if line_truncated:
+          skipped_size += len(lines_buffer) - line_start_index
+          lines_buffer = b''
+          line_start_index = 0
+
+        search_index = len(lines_buffer) - line_start_index
+
+        read_buffer = file_object.read(self._RANGE_READ_SIZE)
+        if read_buffer:
+          lines_buffer = b''.join([
+              lines_buffer[line_start_index:], read_buffer])
+          line_start_index = 0
+          continue
+
+        # The last line of the file is not terminated by an end-of-line.
+        line_end_index = len(lines_buffer) - 1
+        if line_end_index < line_start_index:
+          break
+
+      line_size = skipped_size + line_end_index + 1 - line_start_index
+
+      if skip_line:
+        skip_line = False
+      elif not line_truncated:
+        yield line_offset, lines_buffer[
+            line_start_index:min(
+                line_end_index + 1, line_start_index + self.MAX_LINE_LENGTH)]
+
+      line_offset += line_size
+      line_start_index = line_end_index + 1
+      search_index = line_start_index
+      skipped_size = 0
+      line_truncated = False
+
   def ParseFileObject(self, parser_mediator, file_object, **kwargs):
     """Parses a text file-like object using a pyparsing definition.
 
@@ -742,62 +898,61 @@ class PyparsingSingleLineTextParser(interface.SingleFileBaseParser):
     # syslog parser seem to rely on this member.
     self.file_entry = file_entry
 
-    # TODO: self._line_structures is a work-around and this needs
-    # a structural fix.
-    if not self._line_structures:
-      raise errors.UnableToParseFile(
-          u'Line structure undeclared, unable to proceed.')
-
     text_file_object = text_file.TextFile(file_object)
 
-    line = self._ReadLine(
-        parser_mediator, file_entry, text_file_object,
-        max_len=self.MAX_LINE_LENGTH, quiet=True)
-    if not line:
-      raise errors.UnableToParseFile(u'Not a text file.')
-
-    if len(line) == self.MAX_LINE_LENGTH or len(
-        line) == self.MAX_LINE_LENGTH - 1:
-      logging.debug((
-          u'Trying to read a line and reached the maximum allowed length of '
-          u'{0:d}. The last few bytes of the line are: {1:s} [parser '
-          u'{2:s}]').format(
-              self.MAX_LINE_LENGTH, repr(line[-10:]), self.NAME))
-
-    if not utils.IsText(line):
-      raise errors.UnableToParseFile(u'Not a text file, unable to proceed.')
-
-    if not self.VerifyStructure(parser_mediator, line):
-      raise errors.UnableToParseFile(u'Wrong file structure.')
+    line = self._ReadAndVerifyFirstLine(
+        parser_mediator, file_entry, text_file_object)
 
     # Set the offset to the beginning of the file.
     self._current_offset = 0
     # Read every line in the text file.
     while line:
-      parsed_structure = None
-      use_key = None
-      # Try to parse the line using all the line structures.
-      for key, structure in self.LINE_STRUCTURES:
-        try:
-          parsed_structure = structure.parseString(line)
-        except pyparsing.ParseException:
-          pass
-        if parsed_structure:
-          use_key = key
-          break
-
-      if parsed_structure:
-        parsed_event = self.ParseRecord(
-            parser_mediator, use_key, parsed_structure)
-        if parsed_event:
-          parsed_event.offset = self._current_offset
-          parser_mediator.ProduceEvent(parsed_event)
-      else:
-        logging.warning(u'Unable to parse log line: {0:s}'.format(line))
+      self._ParseTextLine(parser_mediator, line)
 
       self._current_offset = text_file_object.get_offset()
       line = self._ReadLine(parser_mediator, file_entry, text_file_object)
 
+  def ParseFileObjectRange(
+      self, parser_mediator, file_object, range_offset, range_size,
+      **kwargs):
+    """Parses the lines that start within a range of a text file-like object.
+
+    Args:
+      parser_mediator: a parser mediator object (instance of ParserMediator).
+      file_object: a file-like object.
+      range_offset: the offset of the range relative to the start of the file.
+      range_size: the size of the range.
+
+    Raises:
+      UnableToParseFile: when the file cannot be parsed.
+    """
+    file_entry = parser_mediator.GetFileEntry()
+    self.file_entry = file_entry
+
+    file_object.seek(0, os.SEEK_SET)
+    text_file_object = text_file.TextFile(file_object)
+
+    self._ReadAndVerifyFirstLine(parser_mediator, file_entry, text_file_object)
+
+    for line_offset, line in self._ReadLinesInRange(
+        file_object, range_offset, range_size):
+      line = line.strip()
+      if not line:
+        continue
+
+      if self.encoding:
+        try:
+          line = line.decode(self.encoding)
+        except UnicodeDecodeError:
+          logging.warning((
+              u'Unable to decode line [{0:s}...] with encoding: {1:s} in '
+              u'file: {2:s}').format(
+                  repr(line[1:30]), self.encoding,
+                  parser_mediator.GetDisplayName(file_entry)))
+
+      self._current_offset = line_offset
+      self._ParseTextLine(parser_mediator, line)
+
   @abc.abstractmethod
   def ParseRecord(self, parser_mediator, key, structure):
     """Parse a single extracted pyparsing structure.
@@ -76,6 +76,9 @@ class XChatScrollbackParser(text_parser.PyparsingSingleLineTextParser):
 
   ENCODING = u'UTF-8'
 
+  # Every line is parsed independently of the other lines.
+  SPLITTABLE = True
+
   # Define how a log line should look like.
   LOG_LINE = (
       pyparsing.Literal(u'T').suppress() +
@@ -4,6 +4,7 @@
 import binascii
 import collections
 import json
+import logging
 import sys
 
 from dfvfs.path import path_spec as dfvfs_path_spec
@@ -18,8 +19,14 @@ import pytz
 
 if sys.version_info[0] < 3:
   BYTES_TYPE = str
+  TEXT_TYPE = unicode
 else:
   BYTES_TYPE = bytes
+  TEXT_TYPE = str
+
+# The key of the JSON dictionary of an event object that contains the indexes
+# of the attribute values that are stored in the string table.
+STRING_INDEXES_KEY = u'__string_indexes__'
 
 
 class _AnalysisReportJSONDecoder(json.JSONDecoder):
@@ -130,7 +137,14 @@ class _EventObjectJSONDecoder(json.JSONDecoder):
       u'bytes', u'EventObject', u'EventTag', u'PathSpec'])
 
   def __init__(self, *args, **kargs):
-    """Initializes the JSON decoder object."""
+    """Initializes the JSON decoder object.
+
+    Args:
+      string_table: optional string table (instance of StringTable) that
+                    contains the values the JSON refers to.
+                    The default is None.
+    """
+    self._string_table = kargs.pop(u'string_table', None)
     super(_EventObjectJSONDecoder, self).__init__(
         *args, object_hook=self._ConvertDictToObject, **kargs)
 
@@ -157,6 +171,23 @@ class _EventObjectJSONDecoder(json.JSONDecoder):
     """
     event_object = event.EventObject()
 
+    string_indexes = json_dict.pop(STRING_INDEXES_KEY, None)
+    if string_indexes:
+      if self._string_table is None:
+        logging.error(
+            u'Unable to read attributes: {0:s} missing string table.'.format(
+                u', '.join(sorted(string_indexes.keys()))))
+
+      else:
+        for attribute_name, string_index in iter(string_indexes.items()):
+          if attribute_name == u'pathspec':
+            attribute_value = self._string_table.GetObject(
+                string_index, self._ReadSerializedPathSpec)
+          else:
+            attribute_value = self._string_table.GetString(string_index)
+
+          json_dict[attribute_name] = attribute_value
+
     for key, value in iter(json_dict.items()):
       setattr(event_object, key, value)
 
@@ -216,6 +247,18 @@ class _EventObjectJSONDecoder(json.JSONDecoder):
     return dfvfs_path_spec_factory.Factory.NewPathSpec(
         type_indicator, **json_dict)
 
+  def _ReadSerializedPathSpec(self, json_string):
+    """Reads a path specification from the string table value.
+
+    Args:
+      json_string: a byte string containing the UTF-8 encoded JSON
+                   serialized form.
+
+    Returns:
+      A path specification (instance of path.PathSpec).
+    """
+    return self.decode(json_string.decode(u'utf-8'))
+
   def _ConvertDictToObject(self, json_dict):
     """Converts a JSON dict into an object.
 
@@ -471,6 +514,22 @@ class _AnalysisReportJSONEncoder(json.JSONEncoder):
 class _EventObjectJSONEncoder(json.JSONEncoder):
   """A class that implements an event object JSON encoder."""
 
+  # The attributes that are stored in the string table, if available.
+  _STRING_TABLE_ATTRIBUTES = frozenset([
+      u'data_type', u'display_name', u'filename', u'hostname', u'parser',
+      u'pathspec', u'timestamp_desc'])
+
+  def __init__(self, *args, **kargs):
+    """Initializes the JSON encoder object.
+
+    Args:
+      string_table: optional string table (instance of StringTable) to
+                    which frequently repeated attribute values are written.
+                    The default is None.
+    """
+    self._string_table = kargs.pop(u'string_table', None)
+    super(_EventObjectJSONEncoder, self).__init__(*args, **kargs)
+
   def _ConvertEventTagToDict(self, event_tag):
     """Converts an event tag object into a JSON dictionary.
 
@@ -511,6 +570,18 @@ class _EventObjectJSONEncoder(json.JSONEncoder):
 
     return json_dict
 
+  def _WriteSerializedPathSpec(self, path_spec_object):
+    """Writes a path specification to a string table value.
+
+    Args:
+      path_spec_object: a path specification (instance of dfvfs.PathSpec).
+
+    Returns:
+      A byte string containing the UTF-8 encoded JSON serialized form.
+    """
+    json_string = self.encode(self._ConvertPathSpecToDict(path_spec_object))
+    return json_string.encode(u'utf-8')
+
   def _ConvertPathSpecToDict(self, path_spec_object):
     """Converts a path specification object into a JSON dictionary.
 
@@ -590,11 +661,26 @@ class _EventObjectJSONEncoder(json.JSONEncoder):
       raise TypeError
 
     json_dict = {u'__type__': u'EventObject'}
+    string_indexes = {}
     for attribute_name in event_object.GetAttributes():
       attribute_value = getattr(event_object, attribute_name, None)
       if attribute_value is None:
         continue
 
+      if (self._string_table is not None and attribute_value and
+          attribute_name in self._STRING_TABLE_ATTRIBUTES):
+        if attribute_name == u'pathspec':
+          string_indexes[attribute_name] = self._string_table.AddObject(
+              attribute_value, self._WriteSerializedPathSpec)
+          continue
+
+        # Byte strings are not stored in the string table since they are
+        # serialized as a bytes type.
+        if isinstance(attribute_value, TEXT_TYPE):
+          string_indexes[attribute_name] = self._string_table.AddString(
+              attribute_value)
+          continue
+
       if attribute_name == u'pathspec':
         attribute_value = self._ConvertPathSpecToDict(attribute_value)
 
@@ -609,6 +695,9 @@ class _EventObjectJSONEncoder(json.JSONEncoder):
 
       json_dict[attribute_name] = attribute_value
 
+    if string_indexes:
+      json_dict[STRING_INDEXES_KEY] = string_indexes
+
     return json_dict
 
 
@@ -792,30 +881,56 @@ class JSONEventObjectSerializer(interface.EventObjectSerializer):
   """Class that implements the json event object serializer."""
 
   @classmethod
-  def ReadSerialized(cls, json_string):
+  def GetSerializedStringIndex(cls, attribute_name, string_index):
+    """Retrieves the serialized form of a reference into the string table.
+
+    An event object of which the attribute value is stored in the string
+    table contains the returned byte string in its serialized form, which
+    allows to filter serialized event objects without deserializing them.
+
+    Args:
+      attribute_name: the name of the attribute.
+      string_index: the index of the value in the string table.
+
+    Returns:
+      A byte string containing the serialized form.
+    """
+    # Strip the closing brace to also match references that are followed
+    # by another reference.
+    return json.dumps({attribute_name: string_index})[1:-1]
+
+  @classmethod
+  def ReadSerialized(cls, json_string, string_table=None):
     """Reads an event object from serialized form.
 
     Args:
       json_string: an object containing the serialized form.
+      string_table: optional string table (instance of StringTable) that
+                    contains the values the JSON refers to.
+                    The default is None.
 
     Returns:
       An event object (instance of EventObject).
     """
-    json_decoder = _EventObjectJSONDecoder()
+    json_decoder = _EventObjectJSONDecoder(string_table=string_table)
     return json_decoder.decode(json_string)
 
   @classmethod
-  def WriteSerialized(cls, event_object):
+  def WriteSerialized(cls, event_object, string_table=None):
     """Writes an event object to serialized form.
 
     Args:
       event_object: an event object (instance of EventObject).
+      string_table: optional string table (instance of StringTable) to
+                    which frequently repeated attribute values are written.
+                    The default is None.
 
     Returns:
       An object containing the serialized form or None if the event
       cannot be serialized.
     """
-    return json.dumps(event_object, cls=_EventObjectJSONEncoder)
+    return json.dumps(
+        event_object, cls=_EventObjectJSONEncoder, string_table=string_table)
 
 
 class JSONEventTagSerializer(interface.EventTagSerializer):
@@ -333,13 +333,94 @@ class ProtobufEventObjectSerializer(interface.EventObjectSerializer):
 
   _path_spec_serializer = dfvfs_protobuf_serializer.ProtobufPathSpecSerializer
 
+  # The attributes that are stored in the string table, if available.
+  _STRING_TABLE_ATTRIBUTES = frozenset([
+      u'data_type', u'display_name', u'filename', u'hostname', u'parser',
+      u'pathspec', u'timestamp_desc'])
+
+  _STRING_INDEX_SUFFIX = u'_string_index'
+
   @classmethod
-  def ReadSerializedObject(cls, proto):
+  def _ReadStringTableValue(cls, attribute_name, string_index, string_table):
+    """Reads an attribute value from the string table.
+
+    Args:
+      attribute_name: the name of the attribute.
+      string_index: the index of the value in the string table.
+      string_table: the string table (instance of StringTable).
+
+    Returns:
+      The attribute value.
+    """
+    if attribute_name == u'pathspec':
+      return string_table.GetObject(
+          string_index, cls._path_spec_serializer.ReadSerialized)
+
+    return string_table.GetString(string_index)
+
+  @classmethod
+  def _WriteStringTableValue(
+      cls, proto, attribute_name, attribute_value, string_table):
+    """Writes an attribute value to the string table.
+
+    Args:
+      proto: a protobuf object containing the serialized form (instance of
+             plaso_storage_pb2.EventObject).
+      attribute_name: the name of the attribute.
+      attribute_value: the attribute value.
+      string_table: the string table (instance of StringTable).
+
+    Returns:
+      A boolean value indicating the attribute value was written to the string
+      table. Values that are empty or not a string are not written.
+    """
+    if not attribute_value:
+      return False
+
+    if attribute_name == u'pathspec':
+      string_index = string_table.AddObject(
+          attribute_value, cls._path_spec_serializer.WriteSerialized)
+
+    elif isinstance(attribute_value, basestring):
+      attribute_value = utils.GetUnicodeString(attribute_value)
+      string_index = string_table.AddString(attribute_value)
+
+    else:
+      return False
+
+    setattr(proto, attribute_name + cls._STRING_INDEX_SUFFIX, string_index)
+    return True
+
+  @classmethod
+  def GetSerializedStringIndex(cls, attribute_name, string_index):
+    """Retrieves the serialized form of a reference into the string table.
+
+    An event object of which the attribute value is stored in the string
+    table contains the returned byte string in its serialized form, which
+    allows to filter serialized event objects without deserializing them.
+
+    Args:
+      attribute_name: the name of the attribute.
+      string_index: the index of the value in the string table.
+
+    Returns:
+      A byte string containing the serialized form.
+    """
+    proto = plaso_storage_pb2.EventObject()
+    setattr(proto, attribute_name + cls._STRING_INDEX_SUFFIX, string_index)
+    # Serializing a partial protobuf does not require the data type to be set.
+    return proto.SerializePartialToString()
+
+  @classmethod
+  def ReadSerializedObject(cls, proto, string_table=None):
     """Reads an event object from serialized form.
 
     Args:
       proto: a protobuf object containing the serialized form (instance of
              plaso_storage_pb2.EventObject).
+      string_table: optional string table (instance of StringTable) that
+                    contains the values the protobuf refers to.
+                    The default is None.
 
     Returns:
       An event object (instance of EventObject).
@@ -348,7 +429,19 @@ class ProtobufEventObjectSerializer(interface.EventObjectSerializer):
     event_object.data_type = proto.data_type
 
     for proto_attribute, value in proto.ListFields():
-      if proto_attribute.name == u'source_short':
+      if proto_attribute.name.endswith(cls._STRING_INDEX_SUFFIX):
+        attribute_name = proto_attribute.name[
+            :-len(cls._STRING_INDEX_SUFFIX)]
+        if string_table is None:
+          logging.error(
+              u'Unable to read attribute: {0:s} missing string table.'.format(
+                  attribute_name))
+          continue
+
+        setattr(event_object, attribute_name, cls._ReadStringTableValue(
+            attribute_name, value, string_table))
+
+      elif proto_attribute.name == u'source_short':
         event_object.source_short = cls._SOURCE_SHORT_FROM_PROTO_MAP[value]
 
       elif proto_attribute.name == u'pathspec':
@@ -389,11 +482,14 @@ class ProtobufEventObjectSerializer(interface.EventObjectSerializer):
     return event_object
 
   @classmethod
-  def ReadSerialized(cls, proto_string):
+  def ReadSerialized(cls, proto_string, string_table=None):
     """Reads an event object from serialized form.
 
     Args:
       proto_string: a protobuf string containing the serialized form.
+      string_table: optional string table (instance of StringTable) that
+                    contains the values the protobuf refers to.
+                    The default is None.
 
     Returns:
       An event object (instance of EventObject).
@@ -401,14 +497,17 @@ class ProtobufEventObjectSerializer(interface.EventObjectSerializer):
     proto = plaso_storage_pb2.EventObject()
     proto.ParseFromString(proto_string)
 
-    return cls.ReadSerializedObject(proto)
+    return cls.ReadSerializedObject(proto, string_table=string_table)
 
   @classmethod
-  def WriteSerializedObject(cls, event_object):
+  def WriteSerializedObject(cls, event_object, string_table=None):
     """Writes an event object to serialized form.
 
     Args:
       event_object: an event object (instance of EventObject).
+      string_table: optional string table (instance of StringTable) to
+                    which frequently repeated attribute values are written.
+                    The default is None.
 
     Returns:
       A protobuf object containing the serialized form (instance of
@@ -419,7 +518,16 @@ class ProtobufEventObjectSerializer(interface.EventObjectSerializer):
     proto.data_type = getattr(event_object, u'data_type', u'event')
 
     for attribute_name in event_object.GetAttributes():
-      if attribute_name == u'source_short':
+      if (string_table is not None and
+          attribute_name in cls._STRING_TABLE_ATTRIBUTES and
+          cls._WriteStringTableValue(
+              proto, attribute_name, getattr(event_object, attribute_name),
+              string_table)):
+        if attribute_name == u'data_type':
+          # The data type is a required field.
+          proto.data_type = u''
+
+      elif attribute_name == u'source_short':
         proto.source_short = cls._SOURCE_SHORT_TO_PROTO_MAP[
             event_object.source_short]
 
@@ -486,17 +594,20 @@ class ProtobufEventObjectSerializer(interface.EventObjectSerializer):
     return proto
 
   @classmethod
-  def WriteSerialized(cls, event_object):
+  def WriteSerialized(cls, event_object, string_table=None):
     """Writes an event object to serialized form.
 
     Args:
       event_object: an event object (instance of EventObject).
+      string_table: optional string table (instance of StringTable) to
+                    which frequently repeated attribute values are written.
+                    The default is None.
 
     Returns:
       A protobuf string containing the serialized form or None if
       there is an error encoding the protobuf.
     """
-    proto = cls.WriteSerializedObject(event_object)
+    proto = cls.WriteSerializedObject(event_object, string_table=string_table)
     try:
       return proto.SerializeToString()
     except message.EncodeError:
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""The string table object implementation."""
+
+import struct
+
+from plaso.lib import errors
+
+
+class StringTable(object):
+  """Class that implements a string table.
+
+  A string table stores frequently repeated values once, so that serialized
+  objects can refer to a value by its index in the string table. The values
+  are stored as byte strings, strings are stored UTF-8 encoded.
+
+  Values can also be the serialized form of an object, such as a path
+  specification. These objects are stored once per string table when
+  written and deserialized once, on first use, when read. Hence all the
+  event objects that refer to the same index share the same object.
+
+  The serialized form of the string table consists of the values preceded
+  by their size as a 32-bit little-endian integer.
+  """
+
+  # Set the maximum size of a single value to 40 MiB
+  _MAXIMUM_VALUE_SIZE = 40 * 1024 * 1024
+
+  def __init__(self):
+    """Initializes the string table."""
+    super(StringTable, self).__init__()
+    self._objects = {}
+    self._strings = {}
+    self._value_indexes = {}
+    self._values = []
+
+  def __len__(self):
+    """Retrieves the number of values."""
+    return len(self._values)
+
+  def AddObject(self, value_object, write_function):
+    """Adds an object to the string table.
+
+    The object is identified by its serialized form, like any other value,
+    hence equal objects share the same index and no reference to the object
+    is kept by the string table.
+
+    Args:
+      value_object: the object.
+      write_function: the function to serialize the object, which should
+                      return a byte string.
+
+    Returns:
+      The index of the serialized object in the string table.
+    """
+    return self.AddValue(write_function(value_object))
+
+  def AddString(self, string):
+    """Adds a string to the string table.
+
+    Args:
+      string: the Unicode string.
+
+    Returns:
+      The index of the string in the string table.
+    """
+    return self.AddValue(string.encode(u'utf-8'))
+
+  def AddValue(self, value):
+    """Adds a value to the string table.
+
+    Args:
+      value: the byte string.
+
+    Returns:
+      The index of the value in the string table.
+    """
+    index = self._value_indexes.get(value, None)
+    if index is None:
+      index = len(self._values)
+      self._values.append(value)
+      self._value_indexes[value] = index
+
+    return index
+
+  def GetIndex(self, value):
+    """Retrieves the index of a value.
+
+    Args:
+      value: the byte string.
+
+    Returns:
+      The index of the value in the string table or None if the string
+      table does not contain the value.
+    """
+    return self._value_indexes.get(value, None)
+
+  def GetObject(self, index, read_function):
+    """Retrieves an object.
+
+    The object is deserialized once, hence all the objects that refer to
+    the same index share the same object.
+
+    Args:
+      index: the index of the serialized object in the string table.
+      read_function: the function to deserialize the object, which is
+                     passed the byte string.
+
+    Returns:
+      The object.
+
+    Raises:
+      IndexError: if the index is out of bounds.
+    """
+    value_object = self._objects.get(index, None)
+    if value_object is None:
+      value_object = read_function(self.GetValue(index))
+      self._objects[index] = value_object
+
+    return value_object
+
+  def GetString(self, index):
+    """Retrieves a string.
+
+    The string is decoded once, hence all the objects that refer to
+    the same index share the same string object.
+
+    Args:
+      index: the index of the string in the string table.
+
+    Returns:
+      The Unicode string.
+
+    Raises:
+      IndexError: if the index is out of bounds.
+    """
+    string = self._strings.get(index, None)
+    if string is None:
+      string = self.GetValue(index).decode(u'utf-8')
+      self._strings[index] = string
+
+    return string
+
+  def GetValue(self, index):
+    """Retrieves a value.
+
+    Args:
+      index: the index of the value in the string table.
+
+    Returns:
+      The byte string.
+
+    Raises:
+      IndexError: if the index is out of bounds.
+    """
+    if index < 0:
+      raise IndexError(u'String table index out of bounds.')
+
+    return self._values[index]
+
+  @classmethod
+  def ReadSerialized(cls, serialized):
+    """Reads a string table from serialized form.
+
+    Args:
+      serialized: a byte string containing the serialized form.
+
+    Returns:
+      A string table (instance of StringTable).
+
+    Raises:
+      WrongProtobufEntry: if the size of a value exceeds the maximum.
+    """
+    string_table = cls()
+
+    offset = 0
+    serialized_size = len(serialized)
+    while offset + 4 <= serialized_size:
+      value_size = struct.unpack_from('<I', serialized, offset)[0]
+      if value_size > cls._MAXIMUM_VALUE_SIZE:
+        raise errors.WrongProtobufEntry(
+            u'String table value size exceeds maximum: {0:d}'.format(
+                value_size))
+
+      offset += 4
+      value = serialized[offset:offset + value_size]
+      offset += value_size
+
+      # The index of a value is its position, even if the value is stored
+      # more than once.
+      string_table._value_indexes.setdefault(value, len(string_table._values))
+      string_table._values.append(value)
+
+    return string_table
+
+  def WriteSerialized(self):
+    """Writes the string table to serialized form.
+
+    Returns:
+      A byte string containing the serialized form.
+    """
+    serialized = []
+    for value in self._values:
+      serialized.append(struct.pack('<I', len(value)))
+      serialized.append(value)
+
+    return b''.join(serialized)
@@ -80,7 +80,17 @@ class ExtractionToolTest(test_lib.CLIToolTestCase):
 
   _EXPECTED_PERFOMANCE_OPTIONS = u'\n'.join([
       u'usage: extraction_tool_test.py [--buffer_size BUFFER_SIZE]',
+      u'                               [--event_batch_flush_interval SECONDS]',
+      u'                               [--event_batch_size NUMBER]',
+      u'                               [--file_range_size SIZE]',
+      u'                               [--hasher_file_size_limit SIZE]',
+      u'                               [--hasher_read_size SIZE]',
+      u'                               [--parser_timeout SECONDS]',
       u'                               [--queue_size QUEUE_SIZE]',
+      u'                               [--queue_memory_budget SIZE]',
+      u'                               [--queues_memory_budget SIZE]',
+      u'                               [--schedule_largest_first]',
+      u'                               [--shared_memory_queue]',
       u'',
       u'Test argument parser.',
       u'',
@@ -89,9 +99,86 @@ class ExtractionToolTest(test_lib.CLIToolTestCase):
        u'--bs BUFFER_SIZE'),
       (u'                        The buffer size for the output (defaults to '
        u'196MiB).'),
+      (u'  --event_batch_flush_interval SECONDS, '
+       u'--event-batch-flush-interval SECONDS'),
+      (u'                        The number of seconds after which a worker '
+       u'pushes a'),
+      (u'                        partial batch of events onto the event '
+       u'queue. Only'),
+      (u'                        applies to multi process mode (defaults to 1 '
+       u'second).'),
+      u'  --event_batch_size NUMBER, --event-batch-size NUMBER',
+      (u'                        The maximum number of events a worker pushes '
+       u'onto the'),
+      (u'                        event queue at once, where 1 disables '
+       u'batching. Only'),
+      (u'                        applies to multi process mode (defaults to '
+       u'100).'),
+      u'  --file_range_size SIZE, --file-range-size SIZE',
+      (u'                        Split files that are larger than SIZE, in '
+       u'bytes or in'),
+      (u'                        MiB with a "m" suffix, into ranges that are '
+       u'parsed in'),
+      (u'                        parallel, if the parser supports splitting. '
+       u'Only'),
+      (u'                        applies to multi process mode (defaults to '
+       u'not'),
+      u'                        splitting files).',
+      u'  --hasher_file_size_limit SIZE, --hasher-file-size-limit SIZE',
+      (u'                        The maximum size of a file that is hashed in '
+       u'bytes or'),
+      (u'                        in MiB with a "m" suffix. Larger files are '
+       u'not hashed'),
+      u'                        (defaults to no limit).',
+      u'  --hasher_read_size SIZE, --hasher-read-size SIZE',
+      (u'                        The number of bytes read per read operation '
+       u'when'),
+      (u'                        hashing a file in bytes or in MiB with a "m" '
+       u'suffix.'),
+      (u'                        The hashers are updated in parallel threads '
+       u'per block'),
+      u'                        of data (defaults to 1MiB).',
+      u'  --parser_timeout SECONDS, --parser-timeout SECONDS',
+      (u'                        The maximum number of seconds a parser is '
+       u'allowed to'),
+      (u'                        parse a file, after which the parsing of the '
+       u'file is'),
+      (u'                        aborted. The aborted and slow files are '
+       u'reported in'),
+      u'                        the storage file (defaults to no limit).',
       u'  --queue_size QUEUE_SIZE, --queue-size QUEUE_SIZE',
       u'                        The maximum number of queued items per worker',
       u'                        (defaults to 125000)',
+      u'  --queue_memory_budget SIZE, --queue-memory-budget SIZE',
+      (u'                        The maximum size of the items queued per '
+       u'queue in'),
+      (u'                        bytes or in MiB with a "m" suffix. Processes '
+       u'that'),
+      (u'                        produce items wait while a queue exceeds its '
+       u'budget'),
+      u'                        (defaults to no limit).',
+      u'  --queues_memory_budget SIZE, --queues-memory-budget SIZE',
+      (u'                        The maximum size of the items queued on all '
+       u'the queues'),
+      (u'                        in bytes or in MiB with a "m" suffix '
+       u'(defaults to no'),
+      u'                        limit).',
+      u'  --schedule_largest_first, --schedule-largest-first',
+      (u'                        Process the files with the largest '
+       u'estimated'),
+      (u'                        processing cost first, where the cost is '
+       u'based on the'),
+      (u'                        size and type of the file. Only applies to '
+       u'multi'),
+      u'                        process mode.',
+      u'  --shared_memory_queue, --shared-memory-queue',
+      (u'                        Pass the path specifications and events '
+       u'between'),
+      (u'                        processes using a shared memory ring buffer '
+       u'instead of'),
+      (u'                        a pipe. Only applies to multi process mode '
+       u'and is not'),
+      u'                        supported on Windows.',
       u''])
 
   _EXPECTED_PROFILING_OPTIONS = u'\n'.join([
@@ -117,7 +204,10 @@ class ExtractionToolTest(test_lib.CLIToolTestCase):
       u''])
 
   _EXPECTED_STORAGE_OPTIONS = u'\n'.join([
-      u'usage: extraction_tool_test.py [--serializer-format FORMAT]',
+      (u'usage: extraction_tool_test.py [--serializer-format FORMAT] '
+       u'[--random_access]'),
+      u'                               [--storage_writers NUMBER]',
+      u'                               [--worker_serialization]',
       u'',
       u'Test argument parser.',
       u'',
@@ -129,6 +219,30 @@ class ExtractionToolTest(test_lib.CLIToolTestCase):
        u'change that'),
       (u'                        behavior. The choices are "proto" and '
        u'"json".'),
+      u'  --random_access, --random-access',
+      (u'                        Store the events without compression. This '
+       u'increases'),
+      (u'                        the size of the storage file but allows to '
+       u'read tagged'),
+      (u'                        and grouped events directly instead of '
+       u'decompressing'),
+      u'                        all events that precede them.',
+      u'  --storage_writers NUMBER, --storage-writers NUMBER',
+      (u'                        The number of storage writer processes '
+       u'[defaults to'),
+      (u'                        1]. If more than 1 every storage writer '
+       u'writes its'),
+      (u'                        stores to a separate part file, which are '
+       u'merged into'),
+      (u'                        the storage file when processing has '
+       u'completed. Only'),
+      u'                        applies to multi process mode.',
+      u'  --worker_serialization, --worker-serialization',
+      (u'                        Serialize the events in the extraction '
+       u'workers instead'),
+      (u'                        of in the storage writer. Only applies to '
+       u'multi'),
+      u'                        process mode.',
       u''])
 
   def testAddExtractionOptions(self):
@@ -197,6 +311,13 @@ class ExtractionToolTest(test_lib.CLIToolTestCase):
 
     test_tool.ParseOptions(options)
 
+    # The shared memory queue does not support the queues memory budget.
+    options.queues_memory_budget = u'64m'
+    options.shared_memory_queue = True
+
+    with self.assertRaises(errors.BadConfigOption):
+      test_tool.ParseOptions(options)
+
     # TODO: improve this test.
 
 
@@ -110,6 +110,82 @@ class CollectorTest(CollectorTestCase):
 
       self.assertEqual(test_collector_queue_consumer.number_of_path_specs, 4)
 
+  def testFileSystemCollectionScheduleLargestFirst(self):
+    """Test collection on the file system with schedule largest first."""
+    test_files = [
+        (u'small.txt', 10),
+        (u'large.txt', 1000),
+        (u'medium.evtx', 300)]
+
+    with shared_test_lib.TempDirectory() as dirname:
+      for filename, size in test_files:
+        with open(os.path.join(dirname, filename), 'wb') as file_object:
+          file_object.write(b'\x00' * size)
+
+      path_spec = path_spec_factory.Factory.NewPathSpec(
+          dfvfs_definitions.TYPE_INDICATOR_OS, location=dirname)
+
+      test_path_spec_queue = single_process.SingleProcessQueue()
+      resolver_context = context.Context()
+      test_collector = collector.Collector(
+          test_path_spec_queue, resolver_context=resolver_context)
+      test_collector.SetScheduleLargestFirst(True)
+      test_collector.Collect([path_spec])
+
+      test_collector_queue_consumer = TestCollectorQueueConsumer(
+          test_path_spec_queue)
+      test_collector_queue_consumer.ConsumeItems()
+
+      # The estimated cost of the EVTX file is 4 times its size.
+      expected_file_paths = [
+          os.path.join(dirname, u'medium.evtx'),
+          os.path.join(dirname, u'large.txt'),
+          os.path.join(dirname, u'small.txt')]
+
+      self.assertEqual(
+          test_collector_queue_consumer.GetFilePaths(), expected_file_paths)
+
+  def testFileSystemCollectionFileRanges(self):
+    """Test collection on the file system with a file range size."""
+    with shared_test_lib.TempDirectory() as dirname:
+      small_file_path = os.path.join(dirname, u'small.txt')
+      with open(small_file_path, 'wb') as file_object:
+        file_object.write(b'\x00' * 10)
+
+      large_file_path = os.path.join(dirname, u'large.txt')
+      with open(large_file_path, 'wb') as file_object:
+        file_object.write(b'\x00' * 250)
+
+      path_spec = path_spec_factory.Factory.NewPathSpec(
+          dfvfs_definitions.TYPE_INDICATOR_OS, location=dirname)
+
+      test_path_spec_queue = single_process.SingleProcessQueue()
+      resolver_context = context.Context()
+      test_collector = collector.Collector(
+          test_path_spec_queue, resolver_context=resolver_context)
+      test_collector.SetFileRangeSize(100)
+      test_collector.Collect([path_spec])
+
+      test_collector_queue_consumer = TestCollectorQueueConsumer(
+          test_path_spec_queue)
+      test_collector_queue_consumer.ConsumeItems()
+
+      self.assertEqual(test_collector_queue_consumer.number_of_path_specs, 4)
+
+      file_ranges = []
+      for item in test_collector_queue_consumer.path_specs:
+        if isinstance(item, collector.PathSpecRange):
+          file_ranges.append((
+              item.path_spec.location, item.range_offset, item.range_size))
+        else:
+          self.assertEqual(item.location, small_file_path)
+
+      expected_file_ranges = [
+          (large_file_path, 0, 100),
+          (large_file_path, 100, 100),
+          (large_file_path, 200, 50)]
+      self.assertEqual(file_ranges, expected_file_ranges)
+
   def testFileSystemWithFilterCollection(self):
     """Test collection on the file system with a filter."""
     dirname = u'.'
@@ -0,0 +1,105 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the file header and tail buffer."""
+
+import os
+import unittest
+
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+from dfvfs.resolver import resolver as path_spec_resolver
+
+from plaso.engine import file_buffer
+from plaso.hashers import hashing_engine
+from plaso.hashers import md5
+
+from tests.engine import test_lib
+
+
+class FileHeaderAndTailBufferTest(test_lib.EngineTestCase):
+  """Tests for the file header and tail buffer object."""
+
+  def _OpenFileObject(self, path_segments):
+    """Opens a file-like object of a test file.
+
+    Args:
+      path_segments: the path segments inside the test data directory.
+
+    Returns:
+      A file-like object (instance of dfvfs.FileIO).
+    """
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS,
+        location=self._GetTestFilePath(path_segments))
+    return path_spec_resolver.Resolver.OpenFileObject(path_spec)
+
+  def testRead(self):
+    """Tests the read function."""
+    file_object = self._OpenFileObject([u'syslog.tar'])
+    try:
+      file_object.seek(0, os.SEEK_SET)
+      expected_data = file_object.read()
+
+      test_buffer = file_buffer.FileHeaderAndTailBuffer(
+          file_object, header_size=1024, tail_size=512)
+      test_buffer.ReadHeaderAndTail()
+
+      self.assertEqual(test_buffer.get_size(), 10240)
+      self.assertEqual(test_buffer.number_of_read_bytes, 1536)
+      self.assertEqual(test_buffer.number_of_reads, 2)
+
+      # Read the header data from the buffer.
+      self.assertEqual(test_buffer.read(512), expected_data[:512])
+      self.assertEqual(test_buffer.get_offset(), 512)
+
+      # Read the tail data from the buffer.
+      test_buffer.seek(-256, os.SEEK_END)
+      self.assertEqual(test_buffer.read(), expected_data[-256:])
+      self.assertEqual(test_buffer.number_of_buffered_bytes, 768)
+      self.assertEqual(test_buffer.number_of_reads, 2)
+
+      # Read data that is not buffered from the file-like object.
+      test_buffer.seek(4096, os.SEEK_SET)
+      self.assertEqual(test_buffer.read(16), expected_data[4096:4112])
+      self.assertEqual(test_buffer.number_of_reads, 3)
+
+      test_buffer.seek(0, os.SEEK_END)
+      self.assertEqual(test_buffer.read(16), b'')
+
+    finally:
+      file_object.close()
+
+  def testReadHeaderAndTailWithHashingEngine(self):
+    """Tests the ReadHeaderAndTail function with a hashing engine."""
+    file_object = self._OpenFileObject([u'ímynd.dd'])
+    try:
+      test_hashing_engine = hashing_engine.HashingEngine([md5.MD5Hasher()])
+      test_buffer = file_buffer.FileHeaderAndTailBuffer(
+          file_object, header_size=1024, read_size=4096, tail_size=512)
+      test_buffer.ReadHeaderAndTail(hashing_engine=test_hashing_engine)
+
+      digests = test_hashing_engine.GetStringDigests()
+      self.assertEqual(digests[u'md5'], u'd73c51f10c7ee6a681b7b619ccc6f1c4')
+      self.assertEqual(
+          test_buffer.number_of_read_bytes, test_buffer.get_size())
+
+      number_of_reads = test_buffer.number_of_reads
+
+      file_object.seek(0, os.SEEK_SET)
+      expected_data = file_object.read(1024)
+      self.assertEqual(test_buffer.read(1024), expected_data)
+
+      file_object.seek(-512, os.SEEK_END)
+      expected_data = file_object.read(512)
+      test_buffer.seek(-512, os.SEEK_END)
+      self.assertEqual(test_buffer.read(512), expected_data)
+
+      self.assertEqual(test_buffer.number_of_buffered_bytes, 1536)
+      self.assertEqual(test_buffer.number_of_reads, number_of_reads)
+
+    finally:
+      file_object.close()
+
+
+if __name__ == '__main__':
+  unittest.main()
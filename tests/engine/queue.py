@@ -0,0 +1,125 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests the queue management implementation."""
+
+import time
+import unittest
+
+from plaso.engine import queue
+from plaso.engine import single_process
+
+
+class TestItemQueueConsumer(queue.ItemQueueConsumer):
+  """Class that implements a list based item queue consumer."""
+
+  def __init__(self, queue_object):
+    """Initializes the list based item queue consumer.
+
+    Args:
+      queue_object: the queue object (instance of Queue).
+    """
+    super(TestItemQueueConsumer, self).__init__(queue_object)
+    self.items = []
+
+  def _ConsumeItem(self, item, **unused_kwargs):
+    """Consumes an item callback for ConsumeItems."""
+    self.items.append(item)
+
+
+class ItemQueueProducerTest(unittest.TestCase):
+  """Tests the item queue producer."""
+
+  def testProduceItems(self):
+    """Tests the ProduceItems function."""
+    test_queue = single_process.SingleProcessQueue()
+    test_queue_producer = queue.ItemQueueProducer(test_queue)
+    test_queue_producer.ProduceItems([u'item1', u'item2', u'item3'])
+
+    self.assertEqual(test_queue_producer.number_of_produced_items, 3)
+    self.assertEqual(test_queue.PopItem(), u'item1')
+
+  def testProduceItemsInBatches(self):
+    """Tests the ProduceItems function with batching."""
+    test_queue = single_process.SingleProcessQueue()
+    test_queue_producer = queue.ItemQueueProducer(test_queue)
+    test_queue_producer.SetBatchSize(2, flush_interval=60.0)
+    test_queue_producer.ProduceItems([u'item1', u'item2', u'item3'])
+
+    self.assertEqual(test_queue_producer.number_of_produced_items, 3)
+
+    item = test_queue.PopItem()
+    self.assertIsInstance(item, queue.QueueItemBatch)
+    self.assertEqual(item.items, [u'item1', u'item2'])
+    self.assertTrue(test_queue.IsEmpty())
+
+    test_queue_producer.Flush()
+    item = test_queue.PopItem()
+    self.assertEqual(item.items, [u'item3'])
+
+    test_queue_producer.SetBatchSize(2, flush_interval=0.0)
+    test_queue_producer.ProduceItem(u'item4')
+    item = test_queue.PopItem()
+    self.assertEqual(item.items, [u'item4'])
+
+  def testProduceItemsWithFlushInterval(self):
+    """Tests that a partial batch is pushed after the flush interval."""
+    test_queue = single_process.SingleProcessQueue()
+    test_queue_producer = queue.ItemQueueProducer(test_queue)
+    test_queue_producer.SetBatchSize(100, flush_interval=0.05)
+    test_queue_producer.ProduceItem(u'item1')
+    self.assertTrue(test_queue.IsEmpty())
+
+    # The batch is pushed without a next item being produced.
+    time.sleep(0.5)
+    item = test_queue.PopItem()
+    self.assertIsInstance(item, queue.QueueItemBatch)
+    self.assertEqual(item.items, [u'item1'])
+
+    test_queue_producer.Close()
+
+
+class ItemQueueConsumerTest(unittest.TestCase):
+  """Tests the item queue consumer."""
+
+  def testConsumeItems(self):
+    """Tests the ConsumeItems function."""
+    test_queue = single_process.SingleProcessQueue()
+    test_queue_producer = queue.ItemQueueProducer(test_queue)
+    test_queue_producer.ProduceItem(u'item1')
+    test_queue_producer.SetBatchSize(2)
+    test_queue_producer.ProduceItems([u'item2', u'item3', u'item4'])
+    test_queue_producer.Close()
+
+    test_queue_consumer = TestItemQueueConsumer(test_queue)
+    test_queue_consumer.ConsumeItems()
+
+    self.assertEqual(test_queue_consumer.number_of_consumed_items, 4)
+    self.assertEqual(
+        test_queue_consumer.items, [u'item1', u'item2', u'item3', u'item4'])
+
+
+class QueueSizeBudgetTest(unittest.TestCase):
+  """Tests the queue size budget."""
+
+  def testAllocateAndFree(self):
+    """Tests the Allocate and Free functions."""
+    size_budget = queue.QueueSizeBudget(maximum_size=100)
+
+    self.assertTrue(size_budget.Allocate(60))
+    self.assertFalse(size_budget.IsExhausted())
+
+    self.assertTrue(size_budget.Allocate(60))
+    self.assertEqual(size_budget.size, 120)
+    self.assertTrue(size_budget.IsExhausted())
+
+    size_budget.Free(60)
+    self.assertEqual(size_budget.size, 60)
+    self.assertFalse(size_budget.IsExhausted())
+
+    size_budget = queue.QueueSizeBudget()
+    size_budget.Allocate(1024)
+    self.assertFalse(size_budget.IsExhausted())
+
+
+if __name__ == '__main__':
+  unittest.main()
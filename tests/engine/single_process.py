@@ -10,6 +10,7 @@ from dfvfs.helpers import file_system_searcher
 from dfvfs.path import factory as path_spec_factory
 from dfvfs.resolver import context
 
+from plaso.engine import queue
 from plaso.engine import single_process
 from plaso.lib import errors
 
@@ -135,6 +136,42 @@ class SingleProcessQueueTest(unittest.TestCase):
     self.assertEqual(
         test_queue_consumer.number_of_items, expected_number_of_items + 1)
 
+  def testQueueFullSize(self):
+    """Tests the queue raises the QueueFull exception on queued size."""
+    # The serialized form of an item is 15 bytes.
+    test_queue = single_process.SingleProcessQueue(maximum_queued_size=40)
+    self.assertEqual(test_queue.GetQueuedSize(), 0)
+
+    test_queue.PushItem(u'item1')
+    test_queue.PushItem(u'item2')
+
+    with self.assertRaises(errors.QueueFull):
+      test_queue.PushItem(u'item3')
+
+    self.assertEqual(test_queue.GetQueuedSize(), 45)
+
+    self.assertEqual(test_queue.PopItem(), u'item1')
+    self.assertEqual(test_queue.GetQueuedSize(), 30)
+
+    size_budget = queue.QueueSizeBudget(maximum_size=30)
+    test_queue1 = single_process.SingleProcessQueue(size_budget=size_budget)
+    test_queue2 = single_process.SingleProcessQueue(size_budget=size_budget)
+
+    test_queue1.PushItem(u'item1')
+
+    with self.assertRaises(errors.QueueFull):
+      test_queue2.PushItem(u'item2')
+
+    test_queue1.PopItem()
+    self.assertEqual(size_budget.size, 15)
+
+  def testGetQueuedSize(self):
+    """Tests the GetQueuedSize function without a queue size limit."""
+    test_queue = single_process.SingleProcessQueue()
+    test_queue.PushItem(u'item1')
+
+    self.assertIsNone(test_queue.GetQueuedSize())
+
 
 if __name__ == '__main__':
   unittest.main()
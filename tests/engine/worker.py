@@ -2,6 +2,8 @@
 # -*- coding: utf-8 -*-
 """Tests the worker."""
 
+import signal
+import time
 import unittest
 
 from dfvfs.lib import definitions as dfvfs_definitions
@@ -192,6 +194,48 @@ class BaseEventExtractionWorkerTest(test_lib.EngineTestCase):
 
     extraction_worker.InitializeParserObjects()
 
+  def testParserTimer(self):
+    """Tests the _StartParserTimer and _StopParserTimer functions."""
+    path_spec_queue = single_process.SingleProcessQueue()
+    event_object_queue = single_process.SingleProcessQueue()
+    parse_error_queue = single_process.SingleProcessQueue()
+    event_queue_producer = single_process.SingleProcessItemQueueProducer(
+        event_object_queue)
+    parse_error_queue_producer = single_process.SingleProcessItemQueueProducer(
+        parse_error_queue)
+
+    knowledge_base_object = knowledge_base.KnowledgeBase()
+
+    parser_mediator = parsers_mediator.ParserMediator(
+        event_queue_producer, parse_error_queue_producer,
+        knowledge_base_object)
+
+    extraction_worker = worker.BaseEventExtractionWorker(
+        0, path_spec_queue, event_queue_producer, parse_error_queue_producer,
+        parser_mediator, resolver_context=context.Context())
+    extraction_worker.SetParserTimeout(60)
+
+    if not hasattr(signal, u'setitimer'):
+      return
+
+    def _SignalHandler(unused_signal_number, unused_stack_frame):
+      """Signal handler that is replaced by the parser timer."""
+      return
+
+    previous_signal_handler = signal.signal(signal.SIGALRM, _SignalHandler)
+    try:
+      # pylint: disable=protected-access
+      extraction_worker._StartParserTimer(time.time() + 60)
+      self.assertNotEqual(signal.getsignal(signal.SIGALRM), _SignalHandler)
+
+      # The previous signal handler is restored when the timer is stopped.
+      extraction_worker._StopParserTimer()
+      self.assertEqual(signal.getsignal(signal.SIGALRM), _SignalHandler)
+      self.assertEqual(signal.getitimer(signal.ITIMER_REAL), (0.0, 0.0))
+
+    finally:
+      signal.signal(signal.SIGALRM, previous_signal_handler)
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -0,0 +1,60 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the threaded hashing engine."""
+
+import unittest
+
+from plaso.hashers import hashing_engine
+from plaso.hashers import md5
+from plaso.hashers import sha1
+from plaso.hashers import sha256
+
+
+class HashingEngineTest(unittest.TestCase):
+  """Tests the threaded hashing engine."""
+
+  def testGetStringDigests(self):
+    """Tests the GetStringDigests function."""
+    hasher_objects = [
+        md5.MD5Hasher(), sha1.SHA1Hasher(), sha256.SHA256Hasher()]
+    test_hashing_engine = hashing_engine.HashingEngine(hasher_objects)
+
+    digests = test_hashing_engine.GetStringDigests()
+    self.assertEqual(digests[u'md5'], u'd41d8cd98f00b204e9800998ecf8427e')
+    self.assertEqual(
+        digests[u'sha1'], u'da39a3ee5e6b4b0d3255bfef95601890afd80709')
+    self.assertEqual(digests[u'sha256'], (
+        u'e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855'))
+
+  def testUpdate(self):
+    """Tests the Update function."""
+    # pylint: disable=protected-access
+    hasher_objects = [md5.MD5Hasher(), sha256.SHA256Hasher()]
+    test_hashing_engine = hashing_engine.HashingEngine(hasher_objects)
+
+    # The first block of data is hashed without threads.
+    test_hashing_engine.Update(b'\x00' * 1024)
+    self.assertEqual(test_hashing_engine._hasher_threads, [])
+
+    for _ in range(16):
+      test_hashing_engine.Update(b'\x00' * 65536)
+    self.assertEqual(len(test_hashing_engine._hasher_threads), 2)
+
+    test_hashing_engine.Update(b'\x00' * 1024)
+
+    digests = test_hashing_engine.GetStringDigests()
+    self.assertEqual(test_hashing_engine._hasher_threads, [])
+    self.assertEqual(digests[u'md5'], u'8d12cff9c5386427a356aef8669d1142')
+    self.assertEqual(digests[u'sha256'], (
+        u'40ac2743013f984c5506e7ba2620b599ef097d478fe2b5adec481bc4a7ec6d9a'))
+
+    # A single hasher is updated without threads.
+    test_hashing_engine = hashing_engine.HashingEngine([md5.MD5Hasher()])
+    test_hashing_engine.Update(b'\x00' * 65536)
+    self.assertEqual(test_hashing_engine._hasher_threads, [])
+
+    test_hashing_engine.Close()
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -155,6 +155,41 @@ class PFilterTest(unittest.TestCase):
         '\'bad, bad thing [\\sa-zA-Z\\.]+ evil\'')
     self._RunPlasoTest(event_object, query, True)
 
+  def testGetAttributeConstraints(self):
+    """Tests the GetAttributeConstraints function."""
+    matcher = pfilter.GetMatcher('parser is \'winevtx\'')
+    constraints = pfilter.GetAttributeConstraints(matcher)
+    self.assertEqual(constraints, {'parser': set(['winevtx'])})
+
+    matcher = pfilter.GetMatcher(
+        'data_type is \'fs:stat\' and (parser is \'filestat\' or '
+        'parser is \'mactime\') and filename contains \'evil\'')
+    constraints = pfilter.GetAttributeConstraints(matcher)
+    self.assertEqual(constraints, {
+        'data_type': set(['fs:stat']),
+        'parser': set(['filestat', 'mactime'])})
+
+    # Only attributes constrained by every alternative are returned.
+    matcher = pfilter.GetMatcher(
+        'parser is \'filestat\' or (parser is \'syslog\' and '
+        'data_type is \'syslog:line\')')
+    constraints = pfilter.GetAttributeConstraints(matcher)
+    self.assertEqual(constraints, {'parser': set(['filestat', 'syslog'])})
+
+    matcher = pfilter.GetMatcher(
+        'parser is \'filestat\' or filename contains \'evil\'')
+    constraints = pfilter.GetAttributeConstraints(matcher)
+    self.assertEqual(constraints, {})
+
+    # Negated expressions do not constrain the values.
+    matcher = pfilter.GetMatcher('parser is not \'filestat\'')
+    constraints = pfilter.GetAttributeConstraints(matcher)
+    self.assertEqual(constraints, {})
+
+    matcher = pfilter.GetMatcher('parser != \'filestat\'')
+    constraints = pfilter.GetAttributeConstraints(matcher)
+    self.assertEqual(constraints, {})
+
 
 if __name__ == "__main__":
   unittest.main()
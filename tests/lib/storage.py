@@ -2,12 +2,16 @@
 # -*- coding: utf-8 -*-
 """This file contains the tests for the event storage."""
 
+import array
 import os
+import struct
 import tempfile
 import unittest
 import zipfile
 
 from plaso.engine import queue
+from plaso.engine import single_process
+from plaso.filters import eventfilter
 from plaso.events import text_events
 from plaso.events import windows_events
 from plaso.formatters import manager as formatters_manager
@@ -58,6 +62,91 @@ class GroupMock(object):
       yield dummy
 
 
+class EventTagSortedIndexTest(unittest.TestCase):
+  """Tests for the sorted event tag index."""
+
+  def testGetOffset(self):
+    """Tests the GetOffset function."""
+    # pylint: disable=protected-access
+    key_1_2 = storage._EventTagSortedIndex.GetKey(1, 2)
+    key_1_7 = storage._EventTagSortedIndex.GetKey(1, 7)
+    key_3_0 = storage._EventTagSortedIndex.GetKey(3, 0)
+
+    self.assertEqual(key_1_2, 0x100000002)
+
+    index_data = storage._EventTagSortedIndex.GetIndexData([
+        (key_3_0, 40), (key_1_7, 0), (key_1_2, 16), (key_1_7, 64)])
+    sorted_index = storage._EventTagSortedIndex(index_data)
+
+    self.assertEqual(len(sorted_index), 4)
+    self.assertEqual(sorted_index[0], key_1_2)
+    self.assertEqual(sorted_index[3], key_3_0)
+
+    self.assertEqual(sorted_index.GetOffset(key_1_2), 16)
+    self.assertEqual(sorted_index.GetOffset(key_3_0), 40)
+    # Of duplicate keys the last written entry is used.
+    self.assertEqual(sorted_index.GetOffset(key_1_7), 64)
+
+    self.assertIsNone(sorted_index.GetOffset(0))
+    self.assertIsNone(
+        sorted_index.GetOffset(storage._EventTagSortedIndex.GetKey(1, 3)))
+    self.assertIsNone(
+        sorted_index.GetOffset(storage._EventTagSortedIndex.GetKey(4, 0)))
+
+    empty_index = storage._EventTagSortedIndex(
+        storage._EventTagSortedIndex.GetIndexData([]))
+    self.assertIsNone(empty_index.GetOffset(key_1_2))
+
+
+class StoreIndexCacheTest(unittest.TestCase):
+  """Tests for the store index cache."""
+
+  def testGetAndSetStoreIndex(self):
+    """Tests the GetStoreIndex and SetStoreIndex functions."""
+    # pylint: disable=protected-access
+    store_index_cache = storage._StoreIndexCache(64)
+
+    store_index_cache.SetStoreIndex(1, array.array('I', range(8)))
+    store_index_cache.SetStoreIndex(2, array.array('I', range(8)))
+    self.assertIsNotNone(store_index_cache.GetStoreIndex(1))
+
+    # Store index 2 is the least recently used and is removed.
+    store_index_cache.SetStoreIndex(3, array.array('I', range(8)))
+    self.assertIsNotNone(store_index_cache.GetStoreIndex(1))
+    self.assertIsNone(store_index_cache.GetStoreIndex(2))
+    self.assertIsNotNone(store_index_cache.GetStoreIndex(3))
+
+    # The most recently used store index is kept even if it exceeds
+    # the maximum size.
+    store_index_cache.SetStoreIndex(4, array.array('I', range(32)))
+    self.assertIsNone(store_index_cache.GetStoreIndex(1))
+    self.assertIsNone(store_index_cache.GetStoreIndex(3))
+    self.assertEqual(store_index_cache.GetStoreIndex(4)[31], 31)
+
+    store_index_cache.Empty()
+    self.assertIsNone(store_index_cache.GetStoreIndex(4))
+
+
+class TimestampIndexTest(unittest.TestCase):
+  """Tests for the timestamp index."""
+
+  def testGetEntryIndexRange(self):
+    """Tests the GetEntryIndexRange function."""
+    timestamps = [1, 5, 5, 7, 9]
+    data = b''.join([struct.pack('<q', timestamp) for timestamp in timestamps])
+    # pylint: disable=protected-access
+    timestamp_index = storage._TimestampIndex(data)
+
+    self.assertEqual(len(timestamp_index), 5)
+    self.assertEqual(timestamp_index[1], 5)
+    self.assertEqual(timestamp_index[-1], 9)
+
+    self.assertEqual(timestamp_index.GetEntryIndexRange(5, 7), (1, 4))
+    self.assertEqual(timestamp_index.GetEntryIndexRange(0, 100), (0, 5))
+    self.assertEqual(timestamp_index.GetEntryIndexRange(2, 4), (1, 1))
+    self.assertEqual(timestamp_index.GetEntryIndexRange(10, 20), (5, 5))
+
+
 class StorageFileTest(unittest.TestCase):
   """Tests for the plaso storage file."""
 
@@ -123,11 +212,13 @@ class StorageFileTest(unittest.TestCase):
       z_file = zipfile.ZipFile(temp_file, 'r', zipfile.ZIP_DEFLATED)
 
       expected_z_filename_list = [
-          u'plaso_index.000001', u'plaso_meta.000001', u'plaso_proto.000001',
-          u'plaso_timestamps.000001', u'serializer.txt']
+          u'plaso_catalogue.000001', u'plaso_index.000001',
+          u'plaso_meta.000001', u'plaso_proto.000001',
+          u'plaso_string_table.000001', u'plaso_timestamps.000001',
+          u'serializer.txt']
 
       z_filename_list = sorted(z_file.namelist())
-      self.assertEqual(len(z_filename_list), 5)
+      self.assertEqual(len(z_filename_list), 7)
       self.assertEqual(z_filename_list, expected_z_filename_list)
 
   def testStorage(self):
@@ -272,6 +363,337 @@ class StorageFileTest(unittest.TestCase):
 
     self.assertEqual(same_events, proto_group_events)
 
+  def testStorageFlushBuffer(self):
+    """Test flushing the buffer into multiple stores."""
+    with shared_test_lib.TempDirectory() as dirname:
+      temp_file = os.path.join(dirname, 'plaso.db')
+      # Use a small buffer size to force a flush after each event.
+      store = storage.StorageFile(temp_file, buffer_size=1)
+      store.AddEventObjects(self._event_objects)
+      store.Close()
+
+      # The temporary files used during the flush should be removed.
+      self.assertEqual(os.listdir(dirname), ['plaso.db'])
+
+      read_store = storage.StorageFile(temp_file, read_only=True)
+      self.assertEqual(list(read_store.GetProtoNumbers()), [1, 2, 3, 4])
+
+      timestamps = []
+      for store_number in read_store.GetProtoNumbers():
+        for event_object in read_store.GetEntries(store_number):
+          timestamps.append(event_object.timestamp)
+
+      # pylint: disable=protected-access
+      store_index = read_store._GetStoreIndex(4)
+      timestamp_index = read_store._GetTimestampIndex(4)
+
+      read_store.Close()
+
+    expected_timestamps = [
+        1334961526929596, 1335966206929596, 1334940286000000, 1238934459000000]
+    self.assertEqual(timestamps, expected_timestamps)
+
+    self.assertEqual(list(store_index), [0])
+    self.assertEqual(list(timestamp_index), [1238934459000000])
+
+  def testCompact(self):
+    """Test the Compact function."""
+    group_mock = GroupMock()
+    group_mock.AddGroup(u'Malicious', [(1, 0), (2, 0)])
+
+    event_tag = event.EventTag()
+    event_tag.store_number = 2
+    event_tag.store_index = 0
+    event_tag.tags = [u'Malware']
+
+    with shared_test_lib.TempDirectory() as dirname:
+      temp_file = os.path.join(dirname, 'plaso.db')
+      store = storage.StorageFile(temp_file, buffer_size=1)
+      store.AddEventObjects(self._event_objects)
+      store.StoreTagging([event_tag])
+      store.StoreGrouping(group_mock)
+      store.Close()
+
+      compacted_file = os.path.join(dirname, 'compacted.db')
+      read_store = storage.StorageFile(temp_file, read_only=True)
+      number_of_events = read_store.Compact(compacted_file, buffer_size=1)
+      read_store.Close()
+
+      with self.assertRaises(IOError):
+        read_store = storage.StorageFile(temp_file, read_only=True)
+        read_store.Compact(compacted_file)
+      read_store.Close()
+
+      compacted_store = storage.StorageFile(compacted_file, read_only=True)
+      self.assertEqual(list(compacted_store.GetProtoNumbers()), [1, 2, 3, 4])
+
+      pfilter.TimeRangeCache.ResetTimeConstraints()
+      sorted_timestamps = []
+      event_object = compacted_store.GetSortedEntry()
+      while event_object:
+        sorted_timestamps.append(event_object.timestamp)
+        event_object = compacted_store.GetSortedEntry()
+
+      timestamps = []
+      for store_number in compacted_store.GetProtoNumbers():
+        event_object = compacted_store.GetEventObject(
+            store_number, entry_index=0)
+        timestamps.append(event_object.timestamp)
+
+      # pylint: disable=protected-access
+      self.assertTrue(compacted_store._StoresAreSequential([1, 2, 3, 4]))
+
+      tagged_events = [
+          compacted_store.GetTaggedEvent(event_tag)
+          for event_tag in compacted_store.GetTagging()]
+
+      groups = list(compacted_store.GetGrouping())
+      group_events = list(compacted_store.GetEventsFromGroup(groups[0]))
+
+      compacted_store.Close()
+
+    expected_timestamps = [
+        1238934459000000, 1334940286000000, 1334961526929596, 1335966206929596]
+    self.assertEqual(number_of_events, 4)
+    self.assertEqual(timestamps, expected_timestamps)
+    self.assertEqual(sorted_timestamps, expected_timestamps)
+
+    self.assertEqual(len(tagged_events), 1)
+    self.assertEqual(tagged_events[0].timestamp, 1335966206929596)
+    self.assertEqual(tagged_events[0].store_number, 4)
+    self.assertEqual(tagged_events[0].tag.tags, [u'Malware'])
+
+    self.assertEqual(len(group_events), 2)
+    self.assertEqual(group_events[0].timestamp, 1334961526929596)
+    self.assertEqual(group_events[1].timestamp, 1335966206929596)
+
+  def testMergeStorageFile(self):
+    """Test the MergeStorageFile function."""
+    with shared_test_lib.TempDirectory() as dirname:
+      part_paths = []
+      for part_number, event_objects in enumerate([
+          self._event_objects[:3], self._event_objects[3:]]):
+        part_path = os.path.join(dirname, 'plaso.db.part{0:d}'.format(
+            part_number + 1))
+        pre_obj = event.PreprocessObject()
+        pre_obj.collection_information = {}
+        store = storage.StorageFile(part_path, buffer_size=1, pre_obj=pre_obj)
+        store.AddEventObjects(event_objects)
+        store.Close()
+        part_paths.append(part_path)
+
+      temp_file = os.path.join(dirname, 'plaso.db')
+      pre_obj = event.PreprocessObject()
+      pre_obj.collection_information = {}
+      store = storage.StorageFile(temp_file, pre_obj=pre_obj)
+
+      # Use a small copy segment size so that the streams are copied in
+      # multiple segments.
+      # pylint: disable=protected-access
+      store._STREAM_COPY_SEGMENT_SIZE = 16
+
+      number_of_stores = 0
+      for part_path in part_paths:
+        part_store = storage.StorageFile(part_path, read_only=True)
+        number_of_stores += store.MergeStorageFile(part_store)
+        part_store.Close()
+      store.Close()
+
+      read_store = storage.StorageFile(temp_file, read_only=True)
+      store_numbers = list(read_store.GetProtoNumbers())
+
+      timestamps = []
+      for store_number in store_numbers:
+        event_object = read_store.GetEventObject(store_number, entry_index=0)
+        self.assertEqual(event_object.store_number, store_number)
+        timestamps.append(event_object.timestamp)
+
+      # pylint: disable=protected-access
+      self.assertEqual(sorted(read_store._catalogue.keys()), [1, 2, 3, 4])
+      store_metadata = read_store.ReadMeta(4)
+      storage_information = read_store.GetStorageInformation()
+      read_store.Close()
+
+    self.assertEqual(number_of_stores, 4)
+    self.assertEqual(store_numbers, [1, 2, 3, 4])
+    self.assertEqual(timestamps, [
+        1334961526929596, 1335966206929596, 1334940286000000,
+        1238934459000000])
+    self.assertEqual(store_metadata[u'data_type'], [u'text:entry'])
+    self.assertEqual(len(storage_information), 1)
+    self.assertEqual(storage_information[0].counter[u'total'], 4)
+    self.assertEqual(list(storage_information[0].store_range), [1, 5])
+
+  def testAddSerializedEventObject(self):
+    """Test the AddSerializedEventObject function."""
+    serializer = protobuf_serializer.ProtobufEventObjectSerializer
+
+    with shared_test_lib.TempDirectory() as dirname:
+      temp_file = os.path.join(dirname, 'plaso.db')
+      store = storage.StorageFile(temp_file)
+
+      # An event object with a timestamp that cannot be indexed is not
+      # buffered.
+      event_object = self._event_objects[0]
+      serialized_event_object = event.SerializedEventObject(
+          2**63, event_object.data_type, event_object.parser, None,
+          serializer.WriteSerialized(event_object))
+      store.AddSerializedEventObject(serialized_event_object)
+
+      for event_object in self._event_objects:
+        serialized_event_object = event.SerializedEventObject(
+            event_object.timestamp, event_object.data_type,
+            event_object.parser, None, serializer.WriteSerialized(event_object))
+        store.AddSerializedEventObject(serialized_event_object)
+      store.Close()
+
+      read_store = storage.StorageFile(temp_file, read_only=True)
+      timestamps = []
+      event_object = read_store.GetEventObject(1, entry_index=0)
+      while event_object:
+        timestamps.append(event_object.timestamp)
+        event_object = read_store.GetEventObject(1)
+
+      store_metadata = read_store.ReadMeta(1)
+      read_store.Close()
+
+    self.assertEqual(timestamps, [
+        1238934459000000, 1334940286000000, 1334961526929596,
+        1335966206929596])
+    self.assertEqual(store_metadata[u'count'], 4)
+    self.assertEqual(store_metadata[u'parsers'], [u'UNKNOWN'])
+    self.assertEqual(sorted(store_metadata[u'data_type']), [
+        u'text:entry', u'windows:registry:key_value'])
+
+  def testReadMeta(self):
+    """Test the ReadMeta function."""
+    with shared_test_lib.TempDirectory() as dirname:
+      temp_file = os.path.join(dirname, 'plaso.db')
+      store = storage.StorageFile(temp_file, buffer_size=1)
+      store.AddEventObjects(self._event_objects)
+      store.Close()
+
+      read_store = storage.StorageFile(temp_file, read_only=True)
+      # pylint: disable=protected-access
+      self.assertEqual(sorted(read_store._catalogue.keys()), [1, 2, 3, 4])
+
+      store_metadata = read_store.ReadMeta(4)
+      read_store.Close()
+
+    self.assertEqual(store_metadata[u'count'], 1)
+    self.assertEqual(store_metadata[u'data_type'], [u'text:entry'])
+    self.assertEqual(store_metadata[u'parsers'], [u'UNKNOWN'])
+    self.assertEqual(store_metadata[u'parser_count'], [[u'UNKNOWN', 1]])
+    self.assertEqual(store_metadata[u'range'], [
+        1238934459000000, 1238934459000000])
+    self.assertEqual(
+        store_metadata[u'version'], storage.StorageFile.STORAGE_VERSION)
+
+    # Storage files written with YAML metadata can still be read.
+    test_file = os.path.join(u'test_data', u'psort_test.out')
+    read_store = storage.StorageFile(test_file, read_only=True)
+    store_metadata = read_store.ReadMeta(1)
+    read_store.Close()
+
+    self.assertEqual(store_metadata[u'version'], 1)
+    self.assertEqual(store_metadata[u'count'], 3)
+
+  def testStorageRandomAccess(self):
+    """Test the storage object with random access enabled."""
+    with shared_test_lib.TempDirectory() as dirname:
+      temp_file = os.path.join(dirname, 'plaso.db')
+      store = storage.StorageFile(temp_file, random_access=True)
+      store.AddEventObjects(self._event_objects)
+      store.Close()
+
+      z_file = zipfile.ZipFile(temp_file, 'r', zipfile.ZIP_DEFLATED)
+      zip_info = z_file.getinfo(u'plaso_proto.000001')
+      self.assertEqual(zip_info.compress_type, zipfile.ZIP_STORED)
+      zip_info = z_file.getinfo(u'plaso_meta.000001')
+      self.assertEqual(zip_info.compress_type, zipfile.ZIP_DEFLATED)
+      z_file.close()
+
+      read_store = storage.StorageFile(temp_file, read_only=True)
+
+      # Read the entries in reverse order to force seeking backwards.
+      timestamps = []
+      for entry_index in range(3, -1, -1):
+        event_object = read_store.GetEventObject(1, entry_index=entry_index)
+        self.assertEqual(event_object.store_index, entry_index)
+        timestamps.append(event_object.timestamp)
+
+      file_object, _ = read_store._GetProtoStream(1)
+      self.assertTrue(file_object.seekable())
+
+      # Read the next entry after seeking.
+      event_object = read_store.GetEventObject(1)
+      self.assertEqual(event_object.store_index, 1)
+
+      read_store.Close()
+
+    expected_timestamps = [
+        1335966206929596, 1334961526929596, 1334940286000000, 1238934459000000]
+    self.assertEqual(timestamps, expected_timestamps)
+
+
+class FileStorageWriterTest(unittest.TestCase):
+  """Tests for the file storage writer object."""
+
+  def _CreateTextEvent(self, timestamp_string):
+    """Creates a text event object.
+
+    Args:
+      timestamp_string: the date and time string of the event object.
+
+    Returns:
+      An event object (instance of TextEvent).
+    """
+    event_object = text_events.TextEvent(
+        timelib.Timestamp.CopyFromString(timestamp_string), 12,
+        {'text': u'text', 'hostname': u'nomachine'})
+    event_object.parser = u'UNKNOWN'
+    return event_object
+
+  def testMergePartStorageFiles(self):
+    """Tests the MergePartStorageFiles function."""
+    event_object_queue = single_process.SingleProcessQueue()
+
+    with shared_test_lib.TempDirectory() as dirname:
+      temp_file = os.path.join(dirname, u'plaso.db')
+      storage_writer = storage.FileStorageWriter(
+          event_object_queue, temp_file)
+
+      for part_number, display_name in enumerate([u'file1', u'file2']):
+        part_storage_writer = storage_writer.GetPartStorageWriter(part_number)
+
+        event_object_queue.PushItem(
+            self._CreateTextEvent(u'2012-04-20 22:38:46.929596'))
+        event_object_queue.PushItem(event.SlowFileRecord(
+            u'test_parser', display_name, 1024, 60.0 + part_number, True))
+        event_object_queue.PushItem(queue.QueueAbort())
+
+        part_storage_writer.WriteEventObjects()
+
+      number_of_stores = storage_writer.MergePartStorageFiles()
+
+      # The part storage files are removed after they are merged.
+      self.assertEqual(os.listdir(dirname), [u'plaso.db'])
+
+      read_store = storage.StorageFile(temp_file, read_only=True)
+      analysis_reports = list(read_store.GetReports())
+      read_store.Close()
+
+    self.assertEqual(number_of_stores, 2)
+
+    # The slow file records of the parts are combined into a single report.
+    self.assertEqual(len(analysis_reports), 1)
+    self.assertEqual(analysis_reports[0].plugin_name, u'slow_files')
+
+    display_names = [
+        report_entry[u'display_name']
+        for report_entry in analysis_reports[0].report_array]
+    self.assertEqual(display_names, [u'file2', u'file1'])
+
 
 class StoreStorageTest(unittest.TestCase):
   """Test sorting storage file,"""
@@ -309,10 +731,113 @@ class StoreStorageTest(unittest.TestCase):
       event_object = store.GetSortedEntry()
 
     expected_timestamps = [
-        1344270407000000, 1392438730000000, 1427151678000000, 1451584472000000]
+        1343166324000000, 1344270407000000, 1392438730000000, 1418925272000000,
+        1427151678000000, 1427151678000123, 1451584472000000]
 
     self.assertEqual(read_list, expected_timestamps)
 
+  def testStorageSortPrefetching(self):
+    """Tests reading sorted entries with prefetching enabled."""
+    pfilter.TimeRangeCache.ResetTimeConstraints()
+    pfilter.TimeRangeCache.SetUpperTimestamp(self.last)
+    pfilter.TimeRangeCache.SetLowerTimestamp(self.first)
+
+    read_lists = []
+    for enable_prefetching in (False, True):
+      store = storage.StorageFile(self.test_file, read_only=True)
+      store.SetEnablePrefetching(enable_prefetching, number_of_processes=2)
+
+      store.store_range = [1, 5, 6]
+
+      read_list = []
+      event_object = store.GetSortedEntry()
+      while event_object:
+        read_list.append((
+            event_object.timestamp, event_object.store_number,
+            event_object.store_index))
+        event_object = store.GetSortedEntry()
+
+      store.Close()
+      read_lists.append(read_list)
+
+    pfilter.TimeRangeCache.ResetTimeConstraints()
+
+    self.assertEqual(len(read_lists[1]), 7)
+    self.assertEqual(read_lists[1], read_lists[0])
+
+  def testStorageSortPrefilter(self):
+    """Tests reading sorted entries with the prefilter enabled."""
+    pfilter.TimeRangeCache.ResetTimeConstraints()
+
+    filter_object = eventfilter.EventObjectFilter()
+    filter_object.CompileFilter(
+        u'data_type is \'syslog:line\' and hostname contains \'myhost\'')
+
+    read_lists = []
+    for prefilter_events in (False, True):
+      store = storage.StorageFile(self.test_file, read_only=True)
+      store.SetStoreLimit(filter_object, prefilter_events=prefilter_events)
+
+      read_list = []
+      event_object = store.GetSortedEntry()
+      while event_object:
+        if filter_object.Match(event_object):
+          read_list.append((
+              event_object.timestamp, event_object.store_number,
+              event_object.store_index))
+        event_object = store.GetSortedEntry()
+
+      read_lists.append((read_list, store.number_of_prefiltered_events))
+      store.Close()
+
+    self.assertEqual(read_lists[0][1], 0)
+    self.assertEqual(read_lists[1][0], read_lists[0][0])
+
+  def testGetPrefilterValues(self):
+    """Tests the _GetPrefilterValues function."""
+    store = storage.StorageFile(self.test_file, read_only=True)
+
+    # pylint: disable=protected-access
+    prefilter_values = store._GetPrefilterValues({
+        u'data_type': set([u'syslog:line']),
+        u'parser': set([u'syslog', u'quote"d'])})
+    self.assertEqual(prefilter_values, {u'data_type': (b'syslog:line',)})
+
+    self.assertTrue(store._PrefilterEventObjectData(1, b'syslog:line'))
+    self.assertEqual(store.number_of_prefiltered_events, 0)
+
+    store._prefilter_values = prefilter_values
+    self.assertTrue(store._PrefilterEventObjectData(1, b'xsyslog:linex'))
+    self.assertFalse(store._PrefilterEventObjectData(1, b'filestat'))
+    self.assertEqual(store.number_of_prefiltered_events, 1)
+
+    store.Close()
+
+  def testSetStoreLimit(self):
+    """Tests the SetStoreLimit function."""
+    pfilter.TimeRangeCache.ResetTimeConstraints()
+    store = storage.StorageFile(self.test_file, read_only=True)
+
+    store.SetStoreLimit()
+    self.assertEqual(store.store_range, [1, 2, 3, 4, 5, 6, 7])
+
+    filter_object = eventfilter.EventObjectFilter()
+    filter_object.CompileFilter(u'parser is \'filestat\'')
+    store.SetStoreLimit(filter_object)
+    self.assertEqual(store.store_range, [1])
+
+    filter_object.CompileFilter(
+        u'data_type is \'syslog:line\' and hostname contains \'myhost\'')
+    store.SetStoreLimit(filter_object)
+    self.assertEqual(store.store_range, [2, 3, 4, 5, 6, 7])
+
+    filter_object.CompileFilter(u'parser is \'winevtx\'')
+    store.SetStoreLimit(filter_object)
+    self.assertEqual(store.store_range, [])
+
+    store.Close()
+    pfilter.TimeRangeCache.ResetTimeConstraints()
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -3,12 +3,15 @@
 """Tests the multi-process processing engine."""
 
 import os
+import time
 import unittest
 
 from dfvfs.lib import definitions as dfvfs_definitions
 from dfvfs.path import factory as path_spec_factory
 
+from plaso.lib import definitions
 from plaso.multi_processing import multi_process
+from plaso.multi_processing import shared_memory_status
 
 from tests.engine import test_lib as engine_test_lib
 
@@ -16,6 +19,135 @@ from tests.engine import test_lib as engine_test_lib
 class MultiProcessEngineTest(engine_test_lib.EngineTestCase):
   """Tests for the multi-process engine object."""
 
+  def testCheckProcessStatusStoppedWorker(self):
+    """Tests the _CheckProcessStatus function with a stopped worker."""
+    if not shared_memory_status.SharedMemoryStatusTable.IsSupported():
+      return
+
+    test_engine = multi_process.MultiProcessEngine(
+        maximum_number_of_queued_items=100)
+    test_engine._parser_filter_string = u'filestat'
+    test_engine._status_table = shared_memory_status.SharedMemoryStatusTable()
+
+    worker_process = test_engine._StartExtractionWorkerProcess()
+    test_engine._StartMonitoringProcess(worker_process.pid)
+
+    # The worker stops after it has processed the path specification.
+    test_engine._stop_worker_events_per_pid[worker_process.pid].set()
+
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS,
+        location=self._GetTestFilePath([u'syslog']))
+    test_engine._path_spec_queue.PushItem(path_spec)
+
+    worker_process.join(30.0)
+    self.assertFalse(worker_process.is_alive())
+
+    test_engine._CheckProcessStatus(worker_process.pid)
+
+    self.assertFalse(test_engine._processing_status.error_detected)
+    self.assertEqual(test_engine._processing_status.lost_path_specs, [])
+    self.assertNotIn(
+        worker_process.pid, test_engine._process_information_per_pid)
+
+  def testGetExceededExtractionWorkerLimit(self):
+    """Tests the _GetExceededExtractionWorkerLimit function."""
+    test_engine = multi_process.MultiProcessEngine()
+
+    self.assertIsNone(test_engine._GetExceededExtractionWorkerLimit(
+        4096, 100, 3600.0))
+
+    test_engine._maximum_worker_memory_usage = 1024
+    test_engine._maximum_worker_number_of_path_specs = 100
+    test_engine._maximum_worker_runtime = 600
+
+    self.assertIsNone(test_engine._GetExceededExtractionWorkerLimit(
+        512, 10, 60.0))
+
+    self.assertEqual(test_engine._GetExceededExtractionWorkerLimit(
+        4096, 10, 60.0), u'maximum memory usage')
+
+    self.assertEqual(test_engine._GetExceededExtractionWorkerLimit(
+        512, 100, 60.0), u'maximum number of path specifications')
+
+    self.assertEqual(test_engine._GetExceededExtractionWorkerLimit(
+        512, 10, 3600.0), u'maximum runtime')
+
+  def testGetExtractionWorkerPoolAdjustment(self):
+    """Tests the _GetExtractionWorkerPoolAdjustment function."""
+    test_engine = multi_process.MultiProcessEngine()
+    test_engine._maximum_memory_usage = 1000
+    test_engine._maximum_number_of_extraction_workers = 4
+    test_engine._minimum_number_of_extraction_workers = 1
+    test_engine._number_of_extraction_workers = 2
+
+    processing_status = test_engine._processing_status
+    self.assertEqual(
+        test_engine._GetExtractionWorkerPoolAdjustment({}, 100.0), 0)
+
+    processing_status.UpdateCollectorStatus(
+        u'Collector', 1, 100, definitions.PROCESSING_STATUS_RUNNING, None)
+    processing_status.UpdateExtractionWorkerStatus(
+        u'Worker_00', 2, u'', 10, 10, 0,
+        definitions.PROCESSING_STATUS_RUNNING, None)
+    processing_status.UpdateExtractionWorkerStatus(
+        u'Worker_01', 3, u'', 10, 10, 0,
+        definitions.PROCESSING_STATUS_RUNNING, None)
+
+    timestamp = time.time()
+    memory_usage_per_pid = {1: 100, 2: 200, 3: 200}
+
+    # The workers are busy and there are 80 pending path specifications.
+    self.assertEqual(test_engine._GetExtractionWorkerPoolAdjustment(
+        memory_usage_per_pid, timestamp), 1)
+
+    # Another worker does not fit in the maximum memory usage.
+    test_engine._maximum_memory_usage = 600
+    self.assertEqual(test_engine._GetExtractionWorkerPoolAdjustment(
+        memory_usage_per_pid, timestamp), 0)
+
+    # The maximum memory usage is exceeded.
+    test_engine._maximum_memory_usage = 400
+    self.assertEqual(test_engine._GetExtractionWorkerPoolAdjustment(
+        memory_usage_per_pid, timestamp), -1)
+
+    test_engine._number_of_extraction_workers = 1
+    self.assertEqual(test_engine._GetExtractionWorkerPoolAdjustment(
+        memory_usage_per_pid, timestamp), 0)
+
+    # The storage writer is not keeping up.
+    test_engine._maximum_memory_usage = 0
+    test_engine._number_of_extraction_workers = 2
+    processing_status.UpdateExtractionWorkerStatus(
+        u'Worker_00', 2, u'', 200000, 10, 0,
+        definitions.PROCESSING_STATUS_RUNNING, None)
+    self.assertEqual(test_engine._GetExtractionWorkerPoolAdjustment(
+        memory_usage_per_pid, timestamp), 0)
+
+    # The workers are idle and there are no pending path specifications.
+    processing_status.UpdateCollectorStatus(
+        u'Collector', 1, 20, definitions.PROCESSING_STATUS_COMPLETED, None)
+    timestamp += 60.0
+    self.assertEqual(test_engine._GetExtractionWorkerPoolAdjustment(
+        memory_usage_per_pid, timestamp), -1)
+
+  def testGetFileRangeSize(self):
+    """Tests the _GetFileRangeSize function."""
+    test_engine = multi_process.MultiProcessEngine()
+
+    self.assertEqual(test_engine._GetFileRangeSize(
+        0, None, u'popularity_contest'), 0)
+    self.assertEqual(test_engine._GetFileRangeSize(
+        1024, None, u'popularity_contest'), 1024)
+
+    # Files are not split when hashers are enabled.
+    self.assertEqual(test_engine._GetFileRangeSize(
+        1024, u'md5', u'popularity_contest'), 0)
+
+    # Files are not split when no enabled parser supports splitting.
+    self.assertEqual(test_engine._GetFileRangeSize(
+        1024, None, u'filestat'), 0)
+
   def testProcessSources(self):
     """Tests the PreprocessSource and ProcessSources function."""
     test_engine = multi_process.MultiProcessEngine(
@@ -62,6 +194,63 @@ class MultiProcessingQueueTest(unittest.TestCase):
 
     self.assertEqual(test_queue_consumer.number_of_items, len(self._ITEMS))
 
+  def testPushPopItemSize(self):
+    """Tests the PushItem and PopItem functions with a queued size limit."""
+    size_budget = multi_process.MultiProcessingQueueSizeBudget(
+        maximum_size=40)
+    # The serialized form of an item is 15 bytes.
+    test_queue = multi_process.MultiProcessingQueue(
+        maximum_queued_size=20, size_budget=size_budget, timeout=0.1)
+
+    test_queue.PushItem(u'item1')
+    self.assertEqual(test_queue.GetQueuedSize(), 15)
+
+    # The item does not fit in the budget of the queue.
+    test_queue.PushItem(u'item2', block=False)
+    self.assertEqual(test_queue.GetQueuedSize(), 15)
+    self.assertEqual(size_budget.size, 15)
+
+    self.assertEqual(test_queue.PopItem(), u'item1')
+    self.assertEqual(test_queue.GetQueuedSize(), 0)
+    self.assertEqual(size_budget.size, 0)
+
+    # The size of the items is not tracked if the queue is not limited.
+    test_queue = multi_process.MultiProcessingQueue(timeout=0.1)
+
+    test_queue.PushItem(u'item1')
+    self.assertIsNone(test_queue.GetQueuedSize())
+    self.assertEqual(test_queue.PopItem(), u'item1')
+
+
+class MultiProcessingQueueSizeBudgetTest(unittest.TestCase):
+  """Tests the multi-processing queue size budget object."""
+
+  def testAllocateAndFree(self):
+    """Tests the Allocate and Free functions."""
+    size_budget = multi_process.MultiProcessingQueueSizeBudget(
+        maximum_size=100)
+
+    self.assertTrue(size_budget.Allocate(60))
+    self.assertFalse(size_budget.Allocate(60, block=False))
+    self.assertEqual(size_budget.size, 60)
+
+    size_budget.Free(60)
+    self.assertEqual(size_budget.size, 0)
+
+    # An item that exceeds the maximum size is allocated if the budget
+    # is not in use.
+    self.assertTrue(size_budget.Allocate(200, block=False))
+    self.assertTrue(size_budget.IsExhausted())
+
+    size_budget = multi_process.MultiProcessingQueueSizeBudget()
+
+    self.assertTrue(size_budget.Allocate(200, block=False))
+    self.assertFalse(size_budget.IsExhausted())
+    self.assertEqual(size_budget.size, 200)
+
+    size_budget.Free(300)
+    self.assertEqual(size_budget.size, 0)
+
 
 if __name__ == '__main__':
   unittest.main()
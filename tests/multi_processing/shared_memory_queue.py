@@ -0,0 +1,161 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests the shared memory ring buffer queue."""
+
+import multiprocessing
+import os
+import unittest
+
+from plaso.engine import queue
+from plaso.lib import errors
+from plaso.multi_processing import shared_memory_queue
+
+from tests.engine import test_lib as engine_test_lib
+
+
+def _PushItems(test_queue, number_of_items):
+  """Pushes items onto a queue followed by a queue abort.
+
+  Args:
+    test_queue: the test queue (instance of Queue).
+    number_of_items: the number of items to push.
+  """
+  for item_index in range(number_of_items):
+    test_queue.PushItem(u'item{0:d}'.format(item_index))
+  test_queue.PushItem(queue.QueueAbort())
+
+
+def _PushItemsAndClose(test_queue, number_of_items):
+  """Pushes items onto a queue and closes the queue on abort.
+
+  Args:
+    test_queue: the test queue (instance of Queue).
+    number_of_items: the number of items to push.
+  """
+  for item_index in range(number_of_items):
+    test_queue.PushItem(u'item{0:d}'.format(item_index))
+  test_queue.Close(abort=True)
+
+
+class SharedMemoryQueueTest(unittest.TestCase):
+  """Tests the shared memory ring buffer queue object."""
+
+  _ITEMS = [u'item1', u'item2', u'item3', u'item4']
+
+  def testPushPopItem(self):
+    """Tests the PushItem and PopItem functions."""
+    test_queue = shared_memory_queue.SharedMemoryQueue(
+        buffer_size=1024, timeout=0.1)
+
+    for item in self._ITEMS:
+      test_queue.PushItem(item)
+
+    self.assertFalse(test_queue.IsEmpty())
+
+    test_queue_consumer = engine_test_lib.TestQueueConsumer(test_queue)
+    test_queue_consumer.ConsumeItems()
+
+    self.assertEqual(test_queue_consumer.items, self._ITEMS)
+    self.assertTrue(test_queue.IsEmpty())
+
+    # An item that is larger than the ring buffer is spilled.
+    test_queue.PushItem(b'\x00' * 2048)
+    test_queue.PushItem(u'item5')
+    self.assertEqual(test_queue.PopItem(), b'\x00' * 2048)
+    self.assertEqual(test_queue.PopItem(), u'item5')
+
+  def testPushPopItemWrapAround(self):
+    """Tests the PushItem and PopItem functions with wrap around records."""
+    test_queue = shared_memory_queue.SharedMemoryQueue(
+        buffer_size=64, timeout=0.1)
+
+    for item_index in range(32):
+      item = u'{0:d}'.format(item_index) * 3
+      test_queue.PushItem(item)
+      self.assertEqual(test_queue.PopItem(), item)
+
+  def testPushItemFull(self):
+    """Tests the PushItem function on a full queue."""
+    test_queue = shared_memory_queue.SharedMemoryQueue(
+        maximum_number_of_queued_items=2, timeout=0.1)
+
+    for item in self._ITEMS:
+      test_queue.PushItem(item, block=False)
+
+    test_queue_consumer = engine_test_lib.TestQueueConsumer(test_queue)
+    test_queue_consumer.ConsumeItems()
+
+    self.assertEqual(test_queue_consumer.items, self._ITEMS[:2])
+
+  def testPushPopItemMultipleProcesses(self):
+    """Tests the PushItem and PopItem functions with multiple processes."""
+    test_queue = shared_memory_queue.SharedMemoryQueue(
+        buffer_size=256, timeout=5.0)
+
+    process = multiprocessing.Process(
+        target=_PushItems, args=(test_queue, 100))
+    process.start()
+
+    test_queue_consumer = engine_test_lib.TestQueueConsumer(test_queue)
+    test_queue_consumer.ConsumeItems()
+    process.join()
+
+    self.assertEqual(test_queue_consumer.number_of_items, 100)
+    self.assertEqual(test_queue_consumer.items[99], u'item99')
+
+  def testClose(self):
+    """Tests the Close function."""
+    test_queue = shared_memory_queue.SharedMemoryQueue(timeout=0.1)
+
+    with self.assertRaises(errors.QueueEmpty):
+      test_queue.PopItem()
+
+    test_queue.Close(abort=True)
+
+    with self.assertRaises(errors.QueueClose):
+      test_queue.PopItem()
+
+  def testCloseOtherProcess(self):
+    """Tests the Close function in a process other than the owner."""
+    test_queue = shared_memory_queue.SharedMemoryQueue(timeout=0.1)
+
+    process = multiprocessing.Process(
+        target=_PushItemsAndClose, args=(test_queue, 2))
+    process.start()
+    process.join()
+
+    test_queue.PushItem(u'item2')
+
+    test_queue_consumer = engine_test_lib.TestQueueConsumer(test_queue)
+    test_queue_consumer.ConsumeItems()
+
+    self.assertEqual(
+        test_queue_consumer.items, [u'item0', u'item1', u'item2'])
+
+  def testEmpty(self):
+    """Tests the Empty function."""
+    test_queue = shared_memory_queue.SharedMemoryQueue(timeout=0.1)
+
+    for item in self._ITEMS:
+      test_queue.PushItem(item)
+
+    test_queue.Empty()
+    self.assertTrue(test_queue.IsEmpty())
+
+  def testEmptyWithSpilledItem(self):
+    """Tests the Empty function with a spilled item."""
+    test_queue = shared_memory_queue.SharedMemoryQueue(
+        buffer_size=1024, timeout=0.1)
+    test_queue.PushItem(b'\x00' * 2048)
+
+    # pylint: disable=protected-access
+    path = test_queue._ReadBytes(4, test_queue.GetQueuedSize() - 4)
+    self.assertTrue(os.path.exists(path))
+
+    test_queue.Empty()
+    self.assertTrue(test_queue.IsEmpty())
+    self.assertFalse(os.path.exists(path))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,118 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests the shared memory process status table."""
+
+import multiprocessing
+import os
+import time
+import unittest
+
+from plaso.lib import definitions
+from plaso.multi_processing import shared_memory_status
+
+
+def _WriteStatus(status_table, index, number_of_events):
+  """Writes a worker status into a slot of the status table.
+
+  Args:
+    status_table: the status table (instance of SharedMemoryStatusTable).
+    index: the index of the slot.
+    number_of_events: the number of events.
+  """
+  status = {
+      u'number_of_events': number_of_events,
+      u'processing_status': definitions.PROCESSING_STATUS_COMPLETED}
+  status_table.WriteStatus(
+      index, os.getpid(), definitions.PROCESS_TYPE_WORKER, status)
+
+
+class SharedMemoryStatusTableTest(unittest.TestCase):
+  """Tests the shared memory process status table object."""
+
+  def testAllocateAndFreeSlot(self):
+    """Tests the AllocateSlot and FreeSlot functions."""
+    status_table = shared_memory_status.SharedMemoryStatusTable(
+        number_of_slots=2)
+
+    self.assertEqual(status_table.AllocateSlot(), 0)
+    self.assertEqual(status_table.AllocateSlot(), 1)
+    self.assertIsNone(status_table.AllocateSlot())
+
+    status_table.WriteStatus(1, 1234, definitions.PROCESS_TYPE_WORKER, {})
+    self.assertIsNotNone(status_table.ReadStatus(1))
+
+    status_table.FreeSlot(1)
+    self.assertEqual(status_table.AllocateSlot(), 1)
+    self.assertIsNone(status_table.ReadStatus(1))
+
+  def testWriteAndReadStatus(self):
+    """Tests the WriteStatus and ReadStatus functions."""
+    status_table = shared_memory_status.SharedMemoryStatusTable(
+        number_of_slots=4)
+    index = status_table.AllocateSlot()
+
+    self.assertIsNone(status_table.ReadStatus(index))
+
+    status = {
+        u'consumed_number_of_path_specs': 12,
+        u'display_name': u'OS:/tmp/ímynd.dd',
+        u'number_of_events': 345,
+        u'path_spec_hash': 0x1234567890abcdef,
+        u'processing_status': definitions.PROCESSING_STATUS_RUNNING,
+        u'produced_number_of_path_specs': None,
+        u'type': definitions.PROCESS_TYPE_WORKER}
+
+    timestamp = time.time()
+    status_table.WriteStatus(
+        index, 1234, definitions.PROCESS_TYPE_WORKER, status,
+        memory_usage=4096)
+
+    status = status_table.ReadStatus(index)
+    self.assertIsNotNone(status)
+    self.assertEqual(status[u'consumed_number_of_path_specs'], 12)
+    self.assertEqual(status[u'display_name'], u'OS:/tmp/ímynd.dd')
+    self.assertGreaterEqual(status[u'heartbeat'], timestamp)
+    self.assertEqual(status[u'memory_usage'], 4096)
+    self.assertEqual(status[u'number_of_events'], 345)
+    self.assertEqual(status[u'path_spec_hash'], 0x1234567890abcdef)
+    self.assertEqual(status[u'pid'], 1234)
+    self.assertEqual(
+        status[u'processing_status'], definitions.PROCESSING_STATUS_RUNNING)
+    self.assertEqual(status[u'produced_number_of_path_specs'], 0)
+    self.assertEqual(status[u'type'], definitions.PROCESS_TYPE_WORKER)
+    self.assertNotIn(u'path_spec', status)
+
+    # Strings that exceed the size of their field are truncated.
+    status = {
+        u'display_name': u'í' * 200,
+        u'path_spec': u'type: OS, location: /tmp/test\n',
+        u'processing_status': definitions.PROCESSING_STATUS_ERROR}
+    status_table.WriteStatus(
+        index, 1234, definitions.PROCESS_TYPE_WORKER, status)
+
+    status = status_table.ReadStatus(index)
+    self.assertEqual(status[u'display_name'], u'í' * 128)
+    self.assertEqual(status[u'path_spec'], u'type: OS, location: /tmp/test\n')
+    self.assertEqual(
+        status[u'processing_status'], definitions.PROCESSING_STATUS_ERROR)
+
+  def testWriteStatusOtherProcess(self):
+    """Tests the WriteStatus function in another process."""
+    status_table = shared_memory_status.SharedMemoryStatusTable(
+        number_of_slots=4)
+    index = status_table.AllocateSlot()
+
+    process = multiprocessing.Process(
+        target=_WriteStatus, args=(status_table, index, 100))
+    process.start()
+    process.join()
+
+    status = status_table.ReadStatus(index)
+    self.assertEqual(status[u'number_of_events'], 100)
+    self.assertEqual(status[u'pid'], process.pid)
+    self.assertEqual(
+        status[u'processing_status'], definitions.PROCESSING_STATUS_COMPLETED)
+
+
+if __name__ == '__main__':
+  unittest.main()
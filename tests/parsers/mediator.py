@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 """Tests for the parsers mediator."""
 
+import time
 import unittest
 
 from dfvfs.lib import definitions
@@ -9,10 +10,31 @@ from dfvfs.path import factory as path_spec_factory
 from dfvfs.resolver import resolver as path_spec_resolver
 
 from plaso.engine import single_process
+from plaso.lib import errors
+from plaso.lib import event
+from plaso.serializer import protobuf_serializer
 
 from tests.parsers import test_lib
 
 
+class TestSignalParserTimeoutQueue(single_process.SingleProcessQueue):
+  """Class that signals a parser timeout when an item is pushed."""
+
+  def __init__(self):
+    """Initializes the queue."""
+    super(TestSignalParserTimeoutQueue, self).__init__()
+    self.parser_mediator = None
+
+  def PushItem(self, item):
+    """Pushes an item onto the queue and signals a parser timeout.
+
+    Args:
+      item: the item object.
+    """
+    super(TestSignalParserTimeoutQueue, self).PushItem(item)
+    self.parser_mediator.SignalParserTimeout()
+
+
 class ParsersMediatorTest(test_lib.ParserTestCase):
   """Tests for the parsers mediator."""
 
@@ -67,6 +89,87 @@ class ParsersMediatorTest(test_lib.ParserTestCase):
 
     # TODO: add test with relative path.
 
+  def testProduceEvent(self):
+    """Tests the ProduceEvent function."""
+    event_queue = single_process.SingleProcessQueue()
+    parse_error_queue = single_process.SingleProcessQueue()
+
+    parsers_mediator = self._GetParserMediator(
+        event_queue, parse_error_queue, knowledge_base_values=None)
+
+    event_object = event.EventObject()
+    event_object.data_type = u'test:event'
+    event_object.timestamp = 1234124
+
+    parsers_mediator.ProduceEvent(event_object)
+    self.assertIs(event_queue.PopItem(), event_object)
+
+    parsers_mediator.SetEventObjectSerializer(
+        protobuf_serializer.ProtobufEventObjectSerializer)
+
+    event_object = event.EventObject()
+    event_object.data_type = u'test:event'
+    event_object.parser = u'test_parser'
+    event_object.timestamp = 1234124
+
+    parsers_mediator.ProduceEvent(event_object)
+    serialized_event_object = event_queue.PopItem()
+
+    self.assertIsInstance(serialized_event_object, event.SerializedEventObject)
+    self.assertEqual(serialized_event_object.timestamp, 1234124)
+    self.assertEqual(serialized_event_object.data_type, u'test:event')
+    self.assertEqual(serialized_event_object.parser, u'test_parser')
+    self.assertIsNone(serialized_event_object.plugin)
+    self.assertEqual(parsers_mediator.number_of_events, 2)
+
+    event_object = (
+        protobuf_serializer.ProtobufEventObjectSerializer.ReadSerialized(
+            serialized_event_object.data))
+    self.assertEqual(event_object.parser, u'test_parser')
+
+  def testSetParserDeadline(self):
+    """Tests the SetParserDeadline function."""
+    event_queue = single_process.SingleProcessQueue()
+    parse_error_queue = single_process.SingleProcessQueue()
+
+    parsers_mediator = self._GetParserMediator(
+        event_queue, parse_error_queue, knowledge_base_values=None)
+
+    self.assertFalse(parsers_mediator.abort)
+
+    parsers_mediator.SetParserDeadline(time.time() + 3600.0)
+    self.assertFalse(parsers_mediator.abort)
+
+    parsers_mediator.SetParserDeadline(time.time() - 1.0)
+    self.assertTrue(parsers_mediator.abort)
+
+    parsers_mediator.SetParserDeadline(None)
+    self.assertFalse(parsers_mediator.abort)
+
+  def testSignalParserTimeout(self):
+    """Tests the SignalParserTimeout function."""
+    event_queue = TestSignalParserTimeoutQueue()
+    parse_error_queue = single_process.SingleProcessQueue()
+
+    parsers_mediator = self._GetParserMediator(
+        event_queue, parse_error_queue, knowledge_base_values=None)
+    event_queue.parser_mediator = parsers_mediator
+
+    with self.assertRaises(errors.ParserTimeout):
+      parsers_mediator.SignalParserTimeout()
+
+    event_object = event.EventObject()
+    event_object.data_type = u'test:event'
+    event_object.timestamp = 1234124
+
+    # The parser timeout signaled while the event object is being produced
+    # is raised after the event object has been produced.
+    with self.assertRaises(errors.ParserTimeout):
+      parsers_mediator.ProduceEvent(event_object)
+
+    self.assertIs(event_queue.PopItem(), event_object)
+    self.assertEqual(parsers_mediator.number_of_events, 1)
+
   # TODO: add more tests.
 
 
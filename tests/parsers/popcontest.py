@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 """Tests for the Popularity Contest (popcontest) parser."""
 
+import os
 import unittest
 
 from plaso.formatters import popcontest as _  # pylint: disable=unused-import
@@ -124,6 +125,29 @@ class PopularityContestUnitTest(test_lib.ParserTestCase):
     self._TestGetMessageStrings(
         event_objects[12], expected_string, expected_short_string)
 
+  def testParseFileRanges(self):
+    """Tests the Parse function with file ranges."""
+    test_file = self._GetTestFilePath([u'popcontest1.log'])
+    event_queue_consumer = self._ParseFile(self._parser, test_file)
+    expected_event_objects = self._GetEventObjectsFromQueue(
+        event_queue_consumer)
+
+    # The ranges are not aligned on line boundaries.
+    event_objects = []
+    file_size = os.path.getsize(test_file)
+    for range_offset in range(0, file_size, 100):
+      event_queue_consumer = self._ParseFile(
+          self._parser, test_file, file_range=(range_offset, 100))
+      event_objects.extend(
+          self._GetEventObjectsFromQueue(event_queue_consumer))
+
+    self.assertEqual(len(event_objects), 13)
+
+    timestamps = [event_object.timestamp for event_object in event_objects]
+    expected_timestamps = [
+        event_object.timestamp for event_object in expected_event_objects]
+    self.assertEqual(timestamps, expected_timestamps)
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -164,12 +164,16 @@ class ParserTestCase(unittest.TestCase):
         definitions.TYPE_INDICATOR_OS, location=path)
     return path_spec_resolver.Resolver.OpenFileEntry(path_spec)
 
-  def _ParseFile(self, parser_object, path, knowledge_base_values=None):
+  def _ParseFile(
+      self, parser_object, path, file_range=None, knowledge_base_values=None):
     """Parses a file using the parser object.
 
     Args:
       parser_object: the parser object.
       path: the path of the file to parse.
+      file_range: optional tuple of the offset and size of the range of
+                  the file to parse. The default is None, which represents
+                  the entire file.
       knowledge_base_values: optional dict containing the knowledge base
                              values. The default is None.
 
@@ -180,15 +184,20 @@ class ParserTestCase(unittest.TestCase):
     path_spec = path_spec_factory.Factory.NewPathSpec(
         definitions.TYPE_INDICATOR_OS, location=path)
     return self._ParseFileByPathSpec(
-        parser_object, path_spec, knowledge_base_values=knowledge_base_values)
+        parser_object, path_spec, file_range=file_range,
+        knowledge_base_values=knowledge_base_values)
 
   def _ParseFileByPathSpec(
-      self, parser_object, path_spec, knowledge_base_values=None):
+      self, parser_object, path_spec, file_range=None,
+      knowledge_base_values=None):
     """Parses a file using the parser object.
 
     Args:
       parser_object: the parser object.
       path_spec: the path specification of the file to parse.
+      file_range: optional tuple of the offset and size of the range of
+                  the file to parse. The default is None, which represents
+                  the entire file.
       knowledge_base_values: optional dict containing the knowledge base
                              values. The default is None.
 
@@ -210,7 +219,10 @@ class ParserTestCase(unittest.TestCase):
     # AppendToParserChain needs to be run after SetFileEntry.
     parser_mediator.AppendToParserChain(parser_object)
 
-    parser_object.Parse(parser_mediator)
+    if file_range:
+      parser_object.Parse(parser_mediator, file_range=file_range)
+    else:
+      parser_object.Parse(parser_mediator)
 
     return event_queue_consumer
 
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 """This file contains the tests for the generic text parser."""
 
+import io
 import unittest
 
 import pyparsing
@@ -66,6 +67,43 @@ class TestTextParser(text_parser.SlowLexicalTextParser):
     return event_object
 
 
+class TestPyparsingSingleLineTextParser(
+    text_parser.PyparsingSingleLineTextParser):
+  """Implement a single-line text parser object to test reading lines."""
+
+  NAME = u'test_single_line_text'
+
+  MAX_LINE_LENGTH = 10
+
+  _RANGE_READ_SIZE = 4
+
+  def ParseRecord(self, unused_parser_mediator, unused_key, unused_structure):
+    return
+
+  def VerifyStructure(self, unused_parser_mediator, unused_line):
+    return True
+
+
+class PyparsingSingleLineTextParserTest(unittest.TestCase):
+  """Tests for the pyparsing single-line text parser object."""
+
+  def testReadLinesInRange(self):
+    """Tests the _ReadLinesInRange function."""
+    parser_object = TestPyparsingSingleLineTextParser()
+    data = b'line1\n{0:s}\nline3\nline4'.format(b'x' * 30)
+
+    # pylint: disable=protected-access
+    lines = list(parser_object._ReadLinesInRange(io.BytesIO(data), 0, 6))
+    self.assertEqual(lines, [(0, b'line1\n')])
+
+    # A line that is longer than the maximum line length is truncated.
+    lines = list(parser_object._ReadLinesInRange(io.BytesIO(data), 6, 31))
+    self.assertEqual(lines, [(6, b'x' * 10)])
+
+    lines = list(parser_object._ReadLinesInRange(io.BytesIO(data), 10, 40))
+    self.assertEqual(lines, [(37, b'line3\n'), (43, b'line4')])
+
+
 class TextParserTest(test_lib.ParserTestCase):
   """An unit test for the plaso parser library."""
 
@@ -8,6 +8,7 @@ import unittest
 
 from plaso.lib import event
 from plaso.serializer import json_serializer
+from plaso.serializer import string_table
 from plaso.storage import collection
 
 import pytz
@@ -220,6 +221,43 @@ class JSONEventObjectSerializerTest(JSONSerializerTestCase):
     # A None (or Null) value should not get stored.
     # self.assertFalse(hasattr(event_object, u'null_value'))
 
+  def testReadAndWriteSerializedWithStringTable(self):
+    """Tests the ReadSerialized and WriteSerialized with a string table."""
+    event_object = event.EventObject()
+
+    event_object.data_type = u'test:event2'
+    event_object.timestamp = 1234124
+    event_object.timestamp_desc = u'Written'
+    event_object.uuid = u'5a78777006de4ddb8d7bbe12ab92ccf8'
+    event_object.parser = u'test_parser'
+    event_object.hostname = u''
+
+    test_string_table = string_table.StringTable()
+    json_string = self._serializer.WriteSerialized(
+        event_object, string_table=test_string_table)
+
+    self.assertEqual(len(test_string_table), 3)
+
+    json_dict = json.loads(json_string)
+    self.assertNotIn(u'parser', json_dict)
+    self.assertEqual(json_dict[u'hostname'], u'')
+
+    parser_index = test_string_table.GetIndex(b'test_parser')
+    self.assertIsNotNone(parser_index)
+    serialized_string_index = self._serializer.GetSerializedStringIndex(
+        u'parser', parser_index)
+    self.assertIn(serialized_string_index, json_string)
+
+    event_object = self._serializer.ReadSerialized(
+        json_string, string_table=test_string_table)
+
+    self.assertEqual(event_object.data_type, u'test:event2')
+    self.assertEqual(event_object.timestamp_desc, u'Written')
+    self.assertEqual(event_object.parser, u'test_parser')
+    self.assertEqual(event_object.timestamp, 1234124)
+    self.assertFalse(
+        hasattr(event_object, json_serializer.STRING_INDEXES_KEY))
+
 
 class JSONEventTagSerializerTest(JSONSerializerTestCase):
   """Test for the JSON Event Tag serializer object."""
@@ -8,8 +8,11 @@ import unittest
 from plaso.lib import event
 from plaso.proto import plaso_storage_pb2
 from plaso.serializer import protobuf_serializer
+from plaso.serializer import string_table
 from plaso.storage import collection
 
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
 import pytz
 
 
@@ -218,6 +221,67 @@ class ProtobufEventObjectSerializerTest(ProtobufSerializerTestCase):
     # A None (or Null) value should not get stored.
     self.assertFalse(hasattr(event_object, u'null_value'))
 
+  def testReadAndWriteSerializedWithStringTable(self):
+    """Tests the ReadSerialized and WriteSerialized with a string table."""
+    event_object = event.EventObject()
+
+    event_object.data_type = u'test:event2'
+    event_object.timestamp = 1234124
+    event_object.timestamp_desc = u'Written'
+    event_object.uuid = u'5a78777006de4ddb8d7bbe12ab92ccf8'
+    event_object.parser = u'test_parser'
+    event_object.hostname = u''
+
+    test_string_table = string_table.StringTable()
+    proto_string = self._serializer.WriteSerialized(
+        event_object, string_table=test_string_table)
+
+    self.assertEqual(len(test_string_table), 3)
+    self.assertNotIn(b'test_parser', proto_string)
+
+    data_type_index = test_string_table.GetIndex(b'test:event2')
+    self.assertIsNotNone(data_type_index)
+    serialized_string_index = self._serializer.GetSerializedStringIndex(
+        u'data_type', data_type_index)
+    self.assertIn(serialized_string_index, proto_string)
+
+    event_object = self._serializer.ReadSerialized(
+        proto_string, string_table=test_string_table)
+
+    self.assertEqual(event_object.data_type, u'test:event2')
+    self.assertEqual(event_object.timestamp_desc, u'Written')
+    self.assertEqual(event_object.parser, u'test_parser')
+    self.assertEqual(event_object.timestamp, 1234124)
+    self.assertFalse(hasattr(event_object, u'hostname'))
+    self.assertFalse(hasattr(event_object, u'parser_string_index'))
+
+  def testReadSerializedPathSpecWithStringTable(self):
+    """Tests that events share the path specification in a string table."""
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=u'/tmp/test.evtx')
+
+    test_string_table = string_table.StringTable()
+    proto_strings = []
+    for timestamp in range(0, 3):
+      event_object = event.EventObject()
+      event_object.data_type = u'test:event'
+      event_object.timestamp = timestamp
+      event_object.pathspec = path_spec
+
+      proto_strings.append(self._serializer.WriteSerialized(
+          event_object, string_table=test_string_table))
+
+    self.assertEqual(len(test_string_table), 2)
+
+    event_objects = [
+        self._serializer.ReadSerialized(
+            proto_string, string_table=test_string_table)
+        for proto_string in proto_strings]
+
+    self.assertEqual(event_objects[0].pathspec.location, u'/tmp/test.evtx')
+    self.assertIs(event_objects[0].pathspec, event_objects[1].pathspec)
+    self.assertIs(event_objects[0].pathspec, event_objects[2].pathspec)
+
 
 class ProtobufEventTagSerializerTest(ProtobufSerializerTestCase):
   """Tests for the protobuf event tag serializer object."""
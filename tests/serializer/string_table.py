@@ -0,0 +1,81 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Tests for the string table object implementation."""
+
+import unittest
+
+from plaso.serializer import string_table
+
+
+class StringTableTest(unittest.TestCase):
+  """Tests for the string table object."""
+
+  def testAddAndGetObject(self):
+    """Tests the AddObject and GetObject functions."""
+    test_string_table = string_table.StringTable()
+
+    test_object = [u'syslog']
+    write_function = lambda value_object: value_object[0].encode(u'utf-8')
+
+    self.assertEqual(
+        test_string_table.AddObject(test_object, write_function), 0)
+    self.assertEqual(
+        test_string_table.AddObject([u'syslog'], write_function), 0)
+    self.assertEqual(test_string_table.AddString(u'syslog'), 0)
+    self.assertEqual(
+        test_string_table.AddObject([u'test'], write_function), 1)
+    self.assertEqual(len(test_string_table), 2)
+
+    read_function = lambda value: [value.decode(u'utf-8')]
+
+    value_object = test_string_table.GetObject(0, read_function)
+    self.assertEqual(value_object, [u'syslog'])
+    self.assertIs(test_string_table.GetObject(0, read_function), value_object)
+
+    with self.assertRaises(IndexError):
+      test_string_table.GetObject(2, read_function)
+
+  def testAddAndGetString(self):
+    """Tests the AddString and GetString functions."""
+    test_string_table = string_table.StringTable()
+
+    self.assertEqual(test_string_table.AddString(u'syslog'), 0)
+    self.assertEqual(test_string_table.AddString(u'f\xfcr'), 1)
+    self.assertEqual(test_string_table.AddString(u'syslog'), 0)
+    self.assertEqual(test_string_table.AddValue(b'\x00\x01'), 2)
+    self.assertEqual(len(test_string_table), 3)
+
+    self.assertEqual(test_string_table.GetIndex(b'f\xc3\xbcr'), 1)
+    self.assertIsNone(test_string_table.GetIndex(b'bogus'))
+
+    self.assertEqual(test_string_table.GetString(1), u'f\xfcr')
+    self.assertIs(
+        test_string_table.GetString(0), test_string_table.GetString(0))
+    self.assertEqual(test_string_table.GetValue(2), b'\x00\x01')
+
+    with self.assertRaises(IndexError):
+      test_string_table.GetValue(3)
+
+    with self.assertRaises(IndexError):
+      test_string_table.GetValue(-1)
+
+  def testReadAndWriteSerialized(self):
+    """Tests the ReadSerialized and WriteSerialized functions."""
+    test_string_table = string_table.StringTable()
+    test_string_table.AddString(u'syslog')
+    test_string_table.AddString(u'')
+    test_string_table.AddValue(b'\x00\x01')
+
+    serialized = test_string_table.WriteSerialized()
+    self.assertEqual(serialized, (
+        b'\x06\x00\x00\x00syslog\x00\x00\x00\x00\x02\x00\x00\x00\x00\x01'))
+
+    test_string_table = string_table.StringTable.ReadSerialized(serialized)
+    self.assertEqual(len(test_string_table), 3)
+    self.assertEqual(test_string_table.GetString(0), u'syslog')
+    self.assertEqual(test_string_table.GetString(1), u'')
+    self.assertEqual(test_string_table.GetValue(2), b'\x00\x01')
+
+
+if __name__ == '__main__':
+  unittest.main()
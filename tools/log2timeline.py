@@ -74,6 +74,13 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
     self._filter_expression = None
     self._foreman_verbose = False
     self._front_end = log2timeline.Log2TimelineFrontend()
+    self._maximum_memory_usage = 0
+    self._maximum_number_of_extraction_workers = 0
+    self._maximum_worker_memory_usage = 0
+    self._maximum_worker_number_of_path_specs = 0
+    self._maximum_worker_runtime = 0
+    self._minimum_number_of_extraction_workers = 0
+    self._number_of_extraction_workers = 0
     self._stdout_output_writer = isinstance(
         self._output_writer, cli_tools.StdoutOutputWriter)
     self._status_view_mode = u'linear'
@@ -187,7 +194,43 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
 
     self._foreman_verbose = getattr(options, u'foreman_verbose', False)
 
-    # TODO: add code to parse the worker options.
+    self._number_of_extraction_workers = getattr(options, u'workers', 0)
+    self._maximum_number_of_extraction_workers = getattr(
+        options, u'workers_maximum', 0)
+    self._minimum_number_of_extraction_workers = getattr(
+        options, u'workers_minimum', 0)
+
+    for description, number_of_workers in [
+        (u'number of workers', self._number_of_extraction_workers),
+        (u'maximum number of workers',
+         self._maximum_number_of_extraction_workers),
+        (u'minimum number of workers',
+         self._minimum_number_of_extraction_workers)]:
+      if number_of_workers < 0:
+        raise errors.BadConfigOption(
+            u'Invalid {0:s}: {1:d}.'.format(description, number_of_workers))
+
+    if (self._maximum_number_of_extraction_workers and
+        self._minimum_number_of_extraction_workers >
+        self._maximum_number_of_extraction_workers):
+      raise errors.BadConfigOption(
+          u'Minimum number of workers exceeds maximum number of workers.')
+
+    self._maximum_memory_usage = self._ParseSize(
+        getattr(options, u'workers_memory_limit', 0), u'workers memory limit')
+
+    self._maximum_worker_memory_usage = self._ParseSize(
+        getattr(options, u'worker_memory_limit', 0), u'worker memory limit')
+    self._maximum_worker_number_of_path_specs = getattr(
+        options, u'worker_files_limit', 0)
+    self._maximum_worker_runtime = getattr(options, u'worker_time_limit', 0)
+
+    for description, limit in [
+        (u'worker files limit', self._maximum_worker_number_of_path_specs),
+        (u'worker time limit', self._maximum_worker_runtime)]:
+      if limit < 0:
+        raise errors.BadConfigOption(
+            u'Invalid {0:s}: {1:d}.'.format(description, limit))
 
   def _PrintStatusUpdate(self, processing_status):
     """Prints the processing status.
@@ -232,20 +275,32 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
 
       status_table.append(status_row)
 
-    status_row = self._FormatStatusTableRow(
-        processing_status.storage_writer.identifier,
-        processing_status.storage_writer.pid,
-        processing_status.storage_writer.status,
-        processing_status.storage_writer.process_status,
-        processing_status.storage_writer.number_of_events,
-        processing_status.storage_writer.number_of_events_delta, u'')
+    for storage_writer_status in processing_status.storage_writers:
+      status_row = self._FormatStatusTableRow(
+          storage_writer_status.identifier,
+          storage_writer_status.pid,
+          storage_writer_status.status,
+          storage_writer_status.process_status,
+          storage_writer_status.number_of_events,
+          storage_writer_status.number_of_events_delta, u'')
 
-    status_table.append(status_row)
+      status_table.append(status_row)
 
     status_table.append(u'')
     self._output_writer.Write(u'\n'.join(status_table))
     self._output_writer.Write(u'\n')
 
+    queue_status_strings = []
+    for queue_status in processing_status.queues:
+      queue_status_strings.append(u'{0:s}: {1:.1f} MiB'.format(
+          queue_status.identifier, float(queue_status.queued_size) / (
+              1024 * 1024)))
+
+    if queue_status_strings:
+      self._output_writer.Write(u'Queued: {0:s}\n'.format(
+          u', '.join(queue_status_strings)))
+      self._output_writer.Write(u'\n')
+
     if processing_status.GetExtractionCompleted():
       self._output_writer.Write(
           u'All extraction workers completed - waiting for storage.\n')
@@ -328,6 +383,52 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
         help=(u'The number of worker threads [defaults to available system '
               u'CPUs minus three].'))
 
+    argument_group.add_argument(
+        u'--workers_maximum', u'--workers-maximum', dest=u'workers_maximum',
+        action=u'store', type=int, default=0, metavar=u'NUMBER', help=(
+            u'The maximum number of worker processes. If set the number of '
+            u'workers is adjusted at runtime based on the number of pending '
+            u'files and events, the idle time of the workers and the memory '
+            u'usage.'))
+
+    argument_group.add_argument(
+        u'--workers_minimum', u'--workers-minimum', dest=u'workers_minimum',
+        action=u'store', type=int, default=0, metavar=u'NUMBER', help=(
+            u'The minimum number of worker processes. If set the number of '
+            u'workers is adjusted at runtime, but not below this number.'))
+
+    argument_group.add_argument(
+        u'--workers_memory_limit', u'--workers-memory-limit',
+        dest=u'workers_memory_limit', action=u'store', default=0,
+        metavar=u'SIZE', help=(
+            u'The maximum total memory usage of the processes in bytes, or in '
+            u'MiB with an "m" suffix. If exceeded workers are stopped, down '
+            u'to the minimum number of workers. The number of workers is '
+            u'adjusted at runtime if set.'))
+
+    argument_group.add_argument(
+        u'--worker_memory_limit', u'--worker-memory-limit',
+        dest=u'worker_memory_limit', action=u'store', default=0,
+        metavar=u'SIZE', help=(
+            u'The maximum memory usage of a worker process in bytes, or in '
+            u'MiB with an "m" suffix. If exceeded the worker is replaced by '
+            u'a new worker after it has processed its current file.'))
+
+    argument_group.add_argument(
+        u'--worker_files_limit', u'--worker-files-limit',
+        dest=u'worker_files_limit', action=u'store', type=int, default=0,
+        metavar=u'NUMBER', help=(
+            u'The maximum number of files a worker process processes before '
+            u'it is replaced by a new worker.'))
+
+    argument_group.add_argument(
+        u'--worker_time_limit', u'--worker-time-limit',
+        dest=u'worker_time_limit', action=u'store', type=int, default=0,
+        metavar=u'SECONDS', help=(
+            u'The maximum number of seconds a worker process runs before it '
+            u'is replaced by a new worker, after it has processed its current '
+            u'file.'))
+
   def ListHashers(self):
     """Lists information about the available hashers."""
     hashers_information = self._front_end.GetHashersInformation()
@@ -591,7 +692,34 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
         self._enable_profiling,
         profiling_sample_rate=self._profiling_sample_rate,
         profiling_type=self._profiling_type)
+    self._front_end.SetEventObjectBatchingOptions(
+        batch_size=self._event_object_batch_size,
+        flush_interval=self._event_object_batch_flush_interval)
+    self._front_end.SetFileRangeSize(self._file_range_size)
+    self._front_end.SetHashingOptions(
+        file_size_limit=self._hasher_file_size_limit,
+        read_size=self._hasher_read_size)
     self._front_end.SetStorageFile(self._output)
+    self._front_end.SetStorageRandomAccess(self._storage_random_access)
+    self._front_end.SetNumberOfExtractionWorkers(
+        self._number_of_extraction_workers,
+        maximum_memory_usage=self._maximum_memory_usage,
+        maximum_number_of_extraction_workers=(
+            self._maximum_number_of_extraction_workers),
+        minimum_number_of_extraction_workers=(
+            self._minimum_number_of_extraction_workers))
+    self._front_end.SetNumberOfStorageWriters(self._number_of_storage_writers)
+    self._front_end.SetParserTimeout(self._parser_timeout)
+    self._front_end.SetQueueSizeBudget(
+        maximum_queued_size=self._maximum_queued_size,
+        maximum_total_queued_size=self._maximum_total_queued_size)
+    self._front_end.SetScheduleLargestFirst(self._schedule_largest_first)
+    self._front_end.SetUseSharedMemoryQueue(self._use_shared_memory_queue)
+    self._front_end.SetWorkerLimits(
+        maximum_memory_usage=self._maximum_worker_memory_usage,
+        maximum_number_of_path_specs=self._maximum_worker_number_of_path_specs,
+        maximum_runtime=self._maximum_worker_runtime)
+    self._front_end.SetWorkerSerialization(self._worker_serialization)
     self._front_end.SetShowMemoryInformation(show_memory=self._foreman_verbose)
 
     self.ScanSource(self._front_end)
@@ -635,6 +763,27 @@ class Log2TimelineTool(extraction_tool.ExtractionTool):
         self._output_writer.Write(path_spec_comparable)
         self._output_writer.Write(u'\n')
 
+    if processing_status and processing_status.lost_path_specs:
+      self._output_writer.Write(
+          u'Files that were being processed by killed workers:\n')
+      for display_name in processing_status.lost_path_specs:
+        self._output_writer.Write(display_name)
+        self._output_writer.Write(u'\n')
+
+    if processing_status and processing_status.collector:
+      number_of_lost_path_specs = processing_status.GetNumberOfLostPathSpecs()
+      if number_of_lost_path_specs:
+        self._output_writer.Write(
+            u'Number of path specifications not processed: {0:d}\n'.format(
+                number_of_lost_path_specs))
+
+      number_of_duplicated_path_specs = (
+          processing_status.GetNumberOfDuplicatedPathSpecs())
+      if number_of_duplicated_path_specs:
+        self._output_writer.Write((
+            u'Number of path specifications processed more than once: '
+            u'{0:d}\n').format(number_of_duplicated_path_specs))
+
   def ShowInfo(self):
     """Shows information about available hashers, parsers, plugins, etc."""
     plugin_list = self._front_end.GetPluginData()
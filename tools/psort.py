@@ -428,6 +428,12 @@ class PsortTool(analysis_tool.AnalysisTool):
 
     self.AddDataLocationOption(input_group)
 
+    input_group.add_argument(
+        u'--prefetch', dest=u'prefetch', action=u'store_true', default=False,
+        help=(
+            u'Deserialize the events of the storage file in worker '
+            u'processes while the events are sorted.'))
+
     output_group = argument_parser.add_argument_group(u'Output Arguments')
 
     output_group.add_argument(
@@ -573,6 +579,9 @@ class PsortTool(analysis_tool.AnalysisTool):
 
     self._deduplicate_events = getattr(options, u'dedup', True)
 
+    enable_prefetching = getattr(options, u'prefetch', False)
+    self._front_end.SetEnablePrefetching(enable_prefetching)
+
     self._output_filename = getattr(options, u'write', None)
     if self._output_filename:
       self._front_end.SetOutputFilename(self._output_filename)
@@ -0,0 +1,184 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Script to benchmark the throughput of the multi-processing queues."""
+
+from __future__ import print_function
+import argparse
+import multiprocessing
+import sys
+import time
+
+# Change PYTHONPATH to include plaso.
+sys.path.insert(0, u'.')
+
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+
+from plaso.engine import queue
+from plaso.lib import event
+from plaso.multi_processing import multi_process
+from plaso.multi_processing import shared_memory_queue
+
+
+class _BenchmarkQueueConsumer(queue.ItemQueueConsumer):
+  """Class that implements a queue consumer that discards the items."""
+
+  def _ConsumeItem(self, unused_item, **unused_kwargs):
+    """Consumes an item callback for ConsumeItems."""
+    return
+
+
+def _CreatePathSpecs(number_of_items):
+  """Creates path specifications.
+
+  Args:
+    number_of_items: the number of path specifications to create.
+
+  Returns:
+    A list of path specifications (instances of dfvfs.PathSpec).
+  """
+  os_path_spec = path_spec_factory.Factory.NewPathSpec(
+      dfvfs_definitions.TYPE_INDICATOR_OS, location=u'/tmp/image.raw')
+
+  path_specs = []
+  for item_index in range(number_of_items):
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_TSK, inode=item_index,
+        location=u'/Windows/System32/file{0:d}.dll'.format(item_index),
+        parent=os_path_spec)
+    path_specs.append(path_spec)
+
+  return path_specs
+
+
+def _CreateEventObjects(number_of_items):
+  """Creates event objects.
+
+  Args:
+    number_of_items: the number of event objects to create.
+
+  Returns:
+    A list of event objects (instances of EventObject).
+  """
+  path_specs = _CreatePathSpecs(1)
+
+  event_objects = []
+  for item_index in range(number_of_items):
+    event_object = event.EventObject()
+    event_object.data_type = u'fs:stat'
+    event_object.display_name = u'TSK:/Windows/System32/file.dll'
+    event_object.filename = u'/Windows/System32/file.dll'
+    event_object.inode = item_index
+    event_object.parser = u'filestat'
+    event_object.pathspec = path_specs[0]
+    event_object.timestamp = 1234567890000000 + item_index
+    event_object.timestamp_desc = u'Last Access Time'
+    event_objects.append(event_object)
+
+  return event_objects
+
+
+def _ProduceItems(queue_object, items, batch_size):
+  """Produces items onto a queue followed by a queue abort.
+
+  Args:
+    queue_object: the queue object (instance of Queue).
+    items: a list of item objects.
+    batch_size: the maximum number of items in a batch.
+  """
+  queue_producer = queue.ItemQueueProducer(queue_object)
+  queue_producer.SetBatchSize(batch_size)
+  queue_producer.ProduceItems(items)
+  queue_producer.Flush()
+
+  queue_object.PushItem(queue.QueueAbort())
+  queue_object.Close()
+
+
+def _BenchmarkQueue(queue_object, items, batch_size):
+  """Benchmarks passing items from a producer process through a queue.
+
+  Args:
+    queue_object: the queue object (instance of Queue).
+    items: a list of item objects.
+    batch_size: the maximum number of items in a batch.
+
+  Returns:
+    The elapsed time in seconds.
+  """
+  start_time = time.time()
+
+  process = multiprocessing.Process(
+      target=_ProduceItems, args=(queue_object, items, batch_size))
+  process.start()
+
+  queue_consumer = _BenchmarkQueueConsumer(queue_object)
+  queue_consumer.ConsumeItems()
+
+  elapsed_time = time.time() - start_time
+
+  process.join()
+  return elapsed_time
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    A boolean containing True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      u'Benchmarks the throughput of path specifications and events passed '
+      u'through the multi-processing and shared memory queues.'))
+
+  argument_parser.add_argument(
+      u'--items', dest=u'number_of_items', type=int, action=u'store',
+      default=100000, metavar=u'NUMBER', help=(
+          u'The number of items to pass through the queue, the default is '
+          u'100000.'))
+
+  argument_parser.add_argument(
+      u'--batch_size', u'--batch-size', dest=u'batch_size', type=int,
+      action=u'store', default=1, metavar=u'SIZE', help=(
+          u'The maximum number of items pushed onto the queue at once, the '
+          u'default is 1.'))
+
+  argument_parser.add_argument(
+      u'--buffer_size', u'--buffer-size', dest=u'buffer_size', type=int,
+      action=u'store',
+      default=shared_memory_queue.SharedMemoryQueue.DEFAULT_BUFFER_SIZE,
+      metavar=u'SIZE', help=(
+          u'The size of the shared memory ring buffer in bytes, the default '
+          u'is 64 MiB.'))
+
+  options = argument_parser.parse_args()
+
+  if not shared_memory_queue.SharedMemoryQueue.IsSupported():
+    print(u'Shared memory queue not supported on this platform.')
+    return False
+
+  items_per_type = [
+      (u'Path specifications', _CreatePathSpecs(options.number_of_items)),
+      (u'Events', _CreateEventObjects(options.number_of_items))]
+
+  for items_type, items in items_per_type:
+    print(u'{0:s}'.format(items_type))
+
+    queue_object = multi_process.MultiProcessingQueue()
+    elapsed_time = _BenchmarkQueue(queue_object, items, options.batch_size)
+    print(u'\tMulti-processing queue\t: {0:.3f} seconds'.format(elapsed_time))
+
+    queue_object = shared_memory_queue.SharedMemoryQueue(
+        buffer_size=options.buffer_size)
+    elapsed_time = _BenchmarkQueue(queue_object, items, options.batch_size)
+    print(u'\tShared memory queue\t: {0:.3f} seconds'.format(elapsed_time))
+    print(u'')
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)
@@ -0,0 +1,183 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""Script to benchmark tag and group lookups in the storage file."""
+
+from __future__ import print_function
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+# Change PYTHONPATH to include plaso.
+sys.path.insert(0, u'.')
+
+from plaso.events import text_events
+from plaso.lib import event
+from plaso.lib import storage
+
+
+class _EventGroup(object):
+  """Class that defines an event group."""
+
+  def __init__(self, name, events):
+    """Initializes the event group.
+
+    Args:
+      name: the name of the group.
+      events: a list of tuples of the store number and index of the events
+              that belong to the group.
+    """
+    super(_EventGroup, self).__init__()
+    self.events = events
+    self.name = name
+
+
+def _CreateStorageFile(
+    path, number_of_events, number_of_lookups, buffer_size, random_access):
+  """Creates a storage file with tagged and grouped events.
+
+  Args:
+    path: the path of the storage file.
+    number_of_events: the number of events to store.
+    number_of_lookups: the number of events to tag and group.
+    buffer_size: the maximum size of a single store.
+    random_access: boolean value to indicate the store streams should be
+                   written for random access.
+
+  Returns:
+    A list of tuples of the store number and index of the tagged events.
+  """
+  storage_file = storage.StorageFile(
+      path, buffer_size=buffer_size, random_access=random_access)
+
+  for index in range(number_of_events):
+    event_object = text_events.TextEvent(
+        1420070400000000 + index * 1000000, index, {
+            u'body': u'Benchmark event: {0:d}'.format(index),
+            u'hostname': u'benchmark'})
+    event_object.parser = u'benchmark'
+    storage_file.AddEventObject(event_object)
+
+  # Close the storage file so that the last store is written and the store
+  # numbers are known, the tagging and grouping are added afterwards.
+  storage_file.Close()
+
+  storage_file = storage.StorageFile(
+      path, buffer_size=buffer_size, random_access=random_access)
+
+  entries = []
+  for store_number in storage_file.GetProtoNumbers():
+    number_of_entries = storage_file.ReadMeta(store_number).get(u'count', 0)
+    entries.extend([
+        (store_number, store_index)
+        for store_index in range(number_of_entries)])
+
+  random.seed(0)
+  entries = random.sample(entries, min(number_of_lookups, len(entries)))
+
+  tags = []
+  for store_number, store_index in entries:
+    event_tag = event.EventTag()
+    event_tag.store_number = store_number
+    event_tag.store_index = store_index
+    event_tag.tags = [u'Benchmark']
+    tags.append(event_tag)
+
+  storage_file.StoreTagging(tags)
+  storage_file.StoreGrouping([_EventGroup(u'Benchmark', entries)])
+  storage_file.Close()
+
+  return entries
+
+
+def _BenchmarkLookups(path):
+  """Benchmarks the tag and group lookups.
+
+  Args:
+    path: the path of the storage file.
+
+  Returns:
+    A tuple of the elapsed time of the tag and the group lookups in seconds.
+  """
+  storage_file = storage.StorageFile(path, read_only=True)
+
+  start_time = time.time()
+  for event_tag in storage_file.GetTagging():
+    storage_file.GetTaggedEvent(event_tag)
+  tag_lookups_time = time.time() - start_time
+
+  start_time = time.time()
+  for group_proto in storage_file.GetGrouping():
+    for _ in storage_file.GetEventsFromGroup(group_proto):
+      pass
+  group_lookups_time = time.time() - start_time
+
+  storage_file.Close()
+
+  return tag_lookups_time, group_lookups_time
+
+
+def Main():
+  """The main program function.
+
+  Returns:
+    A boolean containing True if successful or False if not.
+  """
+  argument_parser = argparse.ArgumentParser(description=(
+      u'Benchmarks tag and group lookups in compressed and random access '
+      u'storage files.'))
+
+  argument_parser.add_argument(
+      u'--events', dest=u'number_of_events', type=int, action=u'store',
+      default=100000, metavar=u'NUMBER', help=(
+          u'The number of events to store, the default is 100000.'))
+
+  argument_parser.add_argument(
+      u'--lookups', dest=u'number_of_lookups', type=int, action=u'store',
+      default=1000, metavar=u'NUMBER', help=(
+          u'The number of events to tag and group, the default is 1000.'))
+
+  argument_parser.add_argument(
+      u'--buffer_size', u'--buffer-size', dest=u'buffer_size', type=int,
+      action=u'store', default=0, metavar=u'SIZE', help=(
+          u'The maximum size of a single store in bytes, the default is '
+          u'196 MiB.'))
+
+  options = argument_parser.parse_args()
+
+  temporary_directory = tempfile.mkdtemp()
+  try:
+    for random_access in (False, True):
+      path = os.path.join(
+          temporary_directory, u'benchmark-{0!s}.plaso'.format(random_access))
+
+      start_time = time.time()
+      _CreateStorageFile(
+          path, options.number_of_events, options.number_of_lookups,
+          options.buffer_size, random_access)
+      write_time = time.time() - start_time
+
+      tag_lookups_time, group_lookups_time = _BenchmarkLookups(path)
+
+      print(u'Random access: {0!s}'.format(random_access))
+      print(u'\tStorage file size\t: {0:d} bytes'.format(
+          os.path.getsize(path)))
+      print(u'\tWrite time\t\t: {0:.3f} seconds'.format(write_time))
+      print(u'\tTag lookups\t\t: {0:.3f} seconds'.format(tag_lookups_time))
+      print(u'\tGroup lookups\t\t: {0:.3f} seconds'.format(group_lookups_time))
+      print(u'')
+
+  finally:
+    shutil.rmtree(temporary_directory, True)
+
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)